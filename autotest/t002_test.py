@@ -22,5 +22,49 @@ def test_modflow():
     assert isinstance(pcg, flopy.modflow.ModflowPcg)
     return
 
+
+def test_dis_time_discretization():
+    import numpy as np
+    import flopy
+    mf = flopy.modflow.Modflow()
+    dis = flopy.modflow.ModflowDis(mf, nlay=2, nrow=3, ncol=4, nper=3,
+                                   perlen=[1., 10., 7.], nstp=[1, 3, 2],
+                                   tsmult=[1., 2., 1.])
+    totim = dis.get_totim()
+    assert np.allclose(totim, [1., 1 + 10. / 7, 1 + 30. / 7, 11., 14.5, 18.])
+    assert dis.get_final_totim() == totim[-1]
+
+    # scalar and array time lookups
+    assert dis.get_kstp_kper_toffset(0.5) == (0, 0, 0.5)
+    kstp, kper, toffset = dis.get_kstp_kper_toffset(12.)
+    assert (kstp, kper) == (0, 2) and np.isclose(toffset, 1.)
+    kstp, kper, toffset = dis.get_kstp_kper_toffset(np.array([0., 2.,
+                                                              11., 100.]))
+    assert np.array_equal(kstp, [0, 0, 0, 1])
+    assert np.array_equal(kper, [0, 1, 2, 2])
+    assert np.allclose(toffset, [0., 1., 0., 7.])
+    assert dis.get_totim_from_kper_toffset(1, 2.) == 3.
+    assert np.allclose(dis.get_totim_from_kper_toffset([0, 2], [1., 2.]),
+                       [1., 13.])
+
+    # the cached time step table is updated with the time discretization
+    dis.perlen = [2., 10., 7.]
+    assert np.allclose(dis.get_totim(), totim + 1.)
+    dis.nstp[2] = 1
+    assert np.allclose(dis.get_totim()[-2:], [12., 19.])
+
+    # node conversions
+    assert dis.get_node([(0, 0, 0), (1, 2, 3)]) == [0, 23]
+    assert dis.get_lrc([1, 24]) == [(1, 1, 1), (2, 3, 4)]
+    nodes = dis.get_node(np.array([[0, 1, 2], [1, 0, 3]]))
+    assert np.array_equal(nodes, [6, 15])
+    k, i, j = dis.get_lrc(nodes + 1)
+    assert np.array_equal(k, [1, 2])
+    assert np.array_equal(i, [2, 1])
+    assert np.array_equal(j, [3, 4])
+    return
+
+
 if __name__ == '__main__':
     test_modflow()
+    test_dis_time_discretization()
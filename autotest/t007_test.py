@@ -234,6 +234,89 @@ def test_write_shapefile():
             pass
 
 
+def test_write_shapefile_active():
+    from flopy.utils.reference import SpatialReference
+    from flopy.export.shapefile_utils import shp2recarray, \
+        write_grid_shapefile, write_grid_shapefile2
+
+    sr = SpatialReference(delr=np.ones(7) * 2., delc=np.ones(5), rotation=30.)
+    ibound = np.ones((5, 7), dtype=np.int)
+    ibound[1, 2:5] = 0
+    ibound[4, :] = 0
+    hk = np.arange(35, dtype=np.float).reshape(5, 7)
+    hk[0, 0] = np.nan
+    hk0 = hk.copy()
+    outshp = os.path.join(tpth, 'junk_active.shp')
+    prj = os.path.join(tpth, 'junk_active_src.prj')
+    with open(prj, 'w') as f:
+        f.write('PROJCS["test"]')
+    write_grid_shapefile2(outshp, sr, array_dict={'hk': hk}, active=ibound,
+                          prj=prj, chunksize=4)
+    # attribute arrays are not modified
+    assert np.array_equal(np.isnan(hk), np.isnan(hk0))
+    with open(outshp.replace('.shp', '.prj')) as f:
+        assert f.read() == 'PROJCS["test"]'
+
+    ra = shp2recarray(outshp)
+    i, j = np.nonzero(ibound)
+    assert len(ra) == len(i)
+    assert np.array_equal(ra.row, i + 1)
+    assert np.array_equal(ra.column, j + 1)
+    assert ra.hk[0] == -1.0e9
+    assert np.allclose(ra.hk[1:], hk[i, j][1:])
+    verts = sr.get_vertices(i, j)
+    assert verts.shape == (len(i), 5, 2)
+    for g, v in zip(ra.geometry, verts):
+        assert np.allclose(np.array(g.exterior), v)
+
+    # cells active in any layer of a 3D array are written
+    ibound3d = np.zeros((2, 5, 7), dtype=np.int)
+    ibound3d[0] = ibound
+    ibound3d[1, 4, 6] = -1
+    write_grid_shapefile(outshp, sr, array_dict={'hk': hk},
+                         verts=sr.vertices, active=ibound3d, chunksize=4)
+    ra = shp2recarray(outshp)
+    assert len(ra) == len(i) + 1
+    assert (ra.row[-1], ra.column[-1]) == (5, 7)
+    assert np.allclose(np.array(ra.geometry[-1].exterior),
+                       sr.get_vertices(4, 6))
+
+
+def test_write_grid_shapefile_util3d():
+    from flopy.export.shapefile_utils import shp2recarray, write_grid_shapefile
+
+    m = flopy.modflow.Modflow('junk', nrow=4, ncol=6, nlay=2)
+    dis = flopy.modflow.ModflowDis(m, nlay=2, nrow=4, ncol=6, nper=3)
+    hk = np.arange(48, dtype=np.float).reshape(2, 4, 6)
+    hk[1, 0, 0] = np.nan
+    lpf = flopy.modflow.ModflowLpf(m, hk=hk)
+    rch = flopy.modflow.ModflowRch(m, rech={0: 0.1, 2: 0.3})
+    strt = np.ones((4, 6)) * 10.
+    strt[2, 3] = np.nan
+    outshp = os.path.join(tpth, 'junk_util3d.shp')
+    write_grid_shapefile(outshp, m.sr,
+                         {'hk': lpf.hk, 'rech': rch.rech, 'strt': strt},
+                         verts=m.sr.vertices, chunksize=5)
+    # attribute arrays are not modified
+    assert np.isnan(strt[2, 3])
+    assert np.isnan(lpf.hk.array[1, 0, 0])
+
+    ra = shp2recarray(outshp)
+    assert list(ra.dtype.names) == ['row', 'column', 'hk_001', 'hk_002',
+                                    'rech_001', 'rech_002', 'rech_003',
+                                    'strt', 'geometry']
+    assert np.array_equal(ra.row, np.repeat(np.arange(1, 5), 6))
+    assert np.array_equal(ra.column, np.tile(np.arange(1, 7), 4))
+    assert np.allclose(ra.hk_001, hk[0].ravel())
+    assert ra.hk_002[0] == -1.0e9
+    assert np.allclose(ra.hk_002[1:], hk[1].ravel()[1:])
+    assert np.allclose(ra.rech_002, 0.1)
+    assert np.allclose(ra.rech_003, 0.3)
+    assert ra.strt[15] == -1.0e9
+    for g, v in zip(ra.geometry, m.sr.vertices):
+        assert np.allclose(np.array(g.exterior), v)
+
+
 def test_export_array():
 
     try:
@@ -775,6 +858,42 @@ def test_sr_with_Map():
     linecollection = modelxsect.plot_grid()
     plt.close()
 
+def test_modelcrosssection_plot_array():
+    import matplotlib.pyplot as plt
+    m = flopy.modflow.Modflow()
+    nlay, nrow, ncol = 2, 5, 8
+    botm = np.array([6., 4., 0.])[:, None, None] * np.ones((3, nrow, ncol))
+    dis = flopy.modflow.ModflowDis(m, nlay=nlay, nrow=nrow, ncol=ncol,
+                                   delr=10., delc=10., top=10., botm=botm,
+                                   laycbd=[1, 0])
+    ibound = np.ones((nlay, nrow, ncol), dtype=np.int)
+    ibound[0, 2, :3] = 0
+    bas = flopy.modflow.ModflowBas(m, ibound=ibound)
+    xsect = flopy.plot.ModelCrossSection(model=m, line={'row': 2})
+
+    # cell geometry is cached and shared between plots
+    verts = xsect.get_cell_verts()
+    assert verts.shape == (nlay + 1, ncol, 4, 2)
+    assert xsect.get_cell_verts() is verts
+
+    a = np.arange(nlay * nrow * ncol, dtype=np.float).reshape(
+        (nlay, nrow, ncol))
+    pc = xsect.plot_array(a, masked_values=[a[1, 2, 0]])
+    # confining bed and masked cell are not plotted
+    assert len(pc.get_paths()) == nlay * ncol - 1
+    assert np.array_equal(pc.get_array(),
+                          np.concatenate((a[0, 2, :], a[1, 2, 1:])))
+    pc = xsect.update_array(pc, a * 2.)
+    assert len(pc.get_paths()) == nlay * ncol
+    assert np.array_equal(pc.get_array(), 2. * a[:, 2, :].ravel())
+
+    pc = xsect.plot_ibound()
+    assert len(pc.get_paths()) == 3
+    lc = xsect.plot_grid()
+    assert len(lc.get_paths()) == 4 * (nlay + 1) * ncol
+    plt.close()
+
+
 def test_get_vertices():
     m = flopy.modflow.Modflow(rotation=20.)
     nrow, ncol = 40, 20
@@ -801,6 +920,104 @@ def test_get_rc_from_node_coordinates():
     assert np.array_equal(r, np.array([9, 7]))
     assert np.array_equal(c, np.array([0, 1]))
 
+def test_get_rc():
+    from flopy.utils.reference import SpatialReferenceUnstructured
+    nrow, ncol = 15, 20
+    delr = np.linspace(5., 15., ncol)
+    sr = flopy.utils.SpatialReference(delr=delr, delc=np.ones(nrow) * 5.,
+                                      xll=100., yll=200., rotation=30.)
+    ii, jj = np.meshgrid(np.arange(nrow), np.arange(ncol), indexing='ij')
+
+    # cell centers of a rotated grid with variable spacing
+    r, c = sr.get_rc(sr.xcentergrid.ravel(), sr.ycentergrid.ravel())
+    assert np.array_equal(r, ii.ravel())
+    assert np.array_equal(c, jj.ravel())
+    assert sr.get_rc(sr.xcentergrid[3, 4], sr.ycentergrid[3, 4]) == (3, 4)
+
+    # interpolation reuses the cell center triangulation
+    a = np.arange(nrow * ncol, dtype=np.float).reshape((nrow, ncol))
+    b = sr.interpolate(a, (sr.xcentergrid, sr.ycentergrid), method='linear')
+    assert np.allclose(a, b)
+    tri = sr._delaunay
+    b = sr.interpolate(2. * a, (sr.xcentergrid, sr.ycentergrid),
+                       method='linear')
+    assert sr._delaunay is tri
+    assert np.allclose(2. * a, b)
+    sr.rotation = 0.
+    assert sr._delaunay is None
+
+    # unstructured grid cell locator
+    verts, iverts = sr.get_2d_vertex_connectivity()
+    sru = SpatialReferenceUnstructured(sr.xcentergrid.ravel(),
+                                       sr.ycentergrid.ravel(), verts, iverts,
+                                       np.array([len(iverts)]))
+    x = np.append(sr.xcentergrid.ravel(), -1.e6)
+    y = np.append(sr.ycentergrid.ravel(), -1.e6)
+    node = sru.intersect(x, y, chunksize=50)
+    assert np.array_equal(node[:-1], np.arange(nrow * ncol))
+    assert node[-1] == -1
+    assert sru.intersect(sr.xgrid[0, 0] + 0.1, sr.ygrid[0, 0] - 2.) == 0
+
+    # grid with a hole, the points in the hole are not in a cell
+    keep = ((ii < 4) | (ii > 10) | (jj < 5) | (jj > 14)).ravel()
+    cells = np.flatnonzero(keep)
+    sru = SpatialReferenceUnstructured(sr.xcentergrid.ravel()[keep],
+                                       sr.ycentergrid.ravel()[keep], verts,
+                                       [iverts[i] for i in cells],
+                                       np.array([len(cells)]))
+    expected = np.full(nrow * ncol, -1)
+    expected[cells] = np.arange(len(cells))
+    node = sru.intersect(sr.xcentergrid.ravel(), sr.ycentergrid.ravel(),
+                         chunksize=50)
+    assert np.array_equal(node, expected)
+
+
+def test_grid_intersect():
+    from flopy.utils.gridgen import features_to_shapefile
+    sr = flopy.utils.SpatialReference(delr=np.array([1., 2., 1., 3.]),
+                                      delc=np.array([2., 1., 1.]),
+                                      xll=10., yll=20., rotation=30.)
+    ix = flopy.utils.GridIntersect(sr)
+
+    def transform(pts):
+        pts = np.array(pts, dtype=np.float)
+        x, y = sr.transform(pts[:, 0], pts[:, 1])
+        return list(zip(x, y))
+
+    # points, the last point is outside of the grid
+    pts = [transform([(0.5, 0.5)])[0], transform([(6.9, 3.9)])[0],
+           transform([(-1., 0.5)])[0]]
+    result = ix.intersect(pts, 'point', layer=1)
+    assert result.nodenumber.tolist() == [20, 15]
+    assert result.pointid.tolist() == [0, 1]
+
+    # a line that starts outside of the grid, pieces in the same cell
+    # are combined
+    line = transform([(-1., 0.5), (3.5, 0.5), (3.5, 3.5), (8., 3.5)])
+    result = ix.intersect([[line]], 'line')
+    assert result.nodenumber.tolist() == [8, 9, 10, 6, 2, 3]
+    assert np.allclose(result.length, [1., 2., 1., 1., 2., 3.])
+    assert np.allclose(result.starting_distance, [1., 2., 4., 5., 6., 8.])
+    assert np.allclose(result.ending_distance, [2., 4., 5., 6., 8., 11.])
+
+    # a square with a hole, from a shapefile
+    polygon = [transform([(0.5, 0.5), (0.5, 2.5), (2.5, 2.5), (2.5, 0.5)]),
+               transform([(1., 1.), (1.5, 1.), (1.5, 1.5), (1., 1.5)])]
+    shpname = os.path.join(tpth, 'intersect_polygon')
+    features_to_shapefile([polygon], 'polygon', shpname)
+    result = ix.intersect(shpname, 'polygon')
+    assert result.nodenumber.tolist() == [0, 1, 4, 5, 8, 9]
+    assert np.allclose(result.area, [0.25, 0.75, 0.5, 1.25, 0.25, 0.75])
+    assert np.allclose(result.fraction,
+                       [0.125, 0.1875, 0.5, 0.625, 0.25, 0.375])
+
+    # a polygon that covers the grid
+    polygon = transform([(-5., -5.), (-5., 50.), (50., 50.), (50., -5.)])
+    result = ix.intersect([[polygon]], 'polygon')
+    assert result.nodenumber.tolist() == list(range(12))
+    assert np.allclose(result.fraction, 1.)
+
+
 def test_netcdf_classmethods():
     import os
     import flopy
@@ -251,6 +251,92 @@ def test_sfr_renumbering():
     assert isequal(sfr.reach_data.slope[21], 0.2)
     assert isequal(sfr.reach_data.slope[-1], default_slope)
 
+def test_routing_graph():
+    m = flopy.modflow.Modflow()
+    r, d = create_sfr_data()
+    sfr = flopy.modflow.ModflowSfr2(m, reach_data=r, segment_data={0: d})
+
+    graph = sfr.get_routing_graph()
+    assert not graph.circular.any()
+    assert np.array_equal(graph.headwaters, [5, 7, 9])
+    assert sfr.paths[5] == [5, 3, 6, 8, 2, 0]
+    assert sfr.paths[9] == [9, 8, 2, 0]
+    assert graph.get_upstream(8).tolist() == [1, 3, 4, 5, 6, 7, 9]
+    upsegs = sfr.get_upsegs()[0]
+    assert upsegs[2] == [1, 3, 4, 5, 6, 7, 8, 9]
+    assert upsegs[6] == [3, 5]
+    # upstream segments come before their outsegs
+    order = graph.nodes[graph.order].tolist()
+    for seg, outseg in zip(d.nseg, d.outseg):
+        if outseg > 0:
+            assert order.index(seg) < order.index(outseg)
+    sfr.get_outlets()
+    assert set(sfr.outlets[0].values()) == {2}
+    assert sfr.outsegs[0][4].tolist()[:6] == [5, 3, 6, 8, 2, 0]
+
+    # the graph is cached until the routing changes
+    assert sfr.get_routing_graph() is graph
+    sfr.segment_data[0]['outseg'][1] = 9
+    graph = sfr.get_routing_graph()
+    assert sfr.get_routing_graph() is graph
+    assert set(graph.nodes[graph.circular]) == {1, 2, 3, 4, 5, 6, 7, 8, 9}
+    assert sfr.paths[9] is None
+    chk = sfr.check()
+    assert 'circular routing' in chk.errors
+
+
+def test_routing_graph_large_cycle():
+    # 50000 segments in a branching network, with one cycle of two
+    # segments; the routing array is only as wide as the longest path
+    nseg = 50000
+    nodes = np.arange(1, nseg + 1)
+    tonodes = nodes // 2
+    tonodes[-2:] = [nseg, nseg - 1]
+    graph = flopy.modflow.mfsfr2.RoutingGraph(nodes, tonodes)
+    assert set(graph.nodes[graph.circular]) == {nseg - 1, nseg}
+    downstream = graph.get_downstream_array()
+    assert downstream.shape == (nseg, graph.distance.max() + 2)
+    assert downstream[0].tolist()[:2] == [1, 0]
+    assert downstream[-1].tolist()[:3] == [nseg, nseg - 1, nseg]
+    assert downstream[-2].tolist()[:3] == [nseg - 1, nseg, nseg - 1]
+    assert not downstream[-2:, 3:].any()
+
+
+def test_sfr_check_large_network():
+    # synthetic network of 100000 reaches (20000 segments of 5 reaches)
+    # winding through a 250 x 400 grid
+    nrow, ncol, nseg, nreach = 250, 400, 20000, 5
+    m = flopy.modflow.Modflow('large_sfr', model_ws=outpath)
+    dis = flopy.modflow.ModflowDis(m, nlay=1, nrow=nrow, ncol=ncol,
+                                   top=100., botm=0.)
+    n = np.arange(nseg * nreach)
+    i = n // ncol
+    j = np.where(i % 2 == 0, n % ncol, ncol - 1 - n % ncol)
+    rd = flopy.modflow.ModflowSfr2.get_empty_reach_data(len(n))
+    rd['i'], rd['j'] = i, j
+    rd['iseg'] = n // nreach + 1
+    rd['ireach'] = n % nreach + 1
+    rd['rchlen'] = 1.
+    rd['strtop'] = 90. - n * 1e-4
+    rd['slope'] = 1e-3 + n % nreach * 1e-4
+    rd['strthick'] = 1.
+    rd['strhc1'] = 1.
+    sd = flopy.modflow.ModflowSfr2.get_empty_segment_data(nseg)
+    sd['nseg'] = np.arange(1, nseg + 1)
+    sd['outseg'] = np.arange(2, nseg + 2)
+    sd['outseg'][-1] = 0
+    sd['width1'], sd['width2'] = 1., 2.
+    sfr = flopy.modflow.ModflowSfr2(m, nstrm=-len(n), nss=nseg, isfropt=1,
+                                    reach_data=rd, segment_data={0: sd})
+    chk = sfr.check(verbose=False)
+    for test in ['nan values', 'continuity in segment and reach numbering',
+                 'segment numbering order', 'circular routing',
+                 'reach connections', 'overlapping conductance',
+                 'minimum slope', 'reach elevations']:
+        assert test in chk.passed, test
+    assert sfr.get_routing_graph().distance.max() == nseg - 1
+
+
 def test_const():
 
     fm = flopy.modflow
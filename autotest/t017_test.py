@@ -172,6 +172,45 @@ def test_cellbudgetfile_readrecord_waux():
     return
 
 
+def test_ucnfileset_read():
+    import os
+    import flopy
+
+    pth = os.path.join('..', 'examples', 'data', 'mt3d_test', 'mf2kmt3d',
+                       'MultiDiffusion')
+    mt = flopy.mt3d.Mt3dms.load('P7MT.NAM', model_ws=pth, verbose=False)
+    ucnset = flopy.utils.UcnFileSet(mt)
+    assert ucnset.nspecies == 3, 'nspecies != 3'
+    ucns = [flopy.utils.UcnFile(fname) for fname in ucnset.filenames]
+    times = ucnset.get_times()
+    assert times == ucns[0].get_times(), 'times are not equal'
+
+    # all species for one time
+    c = ucnset.get_data(totim=times[3])
+    assert c.shape == (3, 8, 15, 21)
+    for s, ucn in enumerate(ucns):
+        assert np.array_equal(c[s], ucn.get_data(totim=times[3])), \
+            'concentration of species {} is not equal'.format(s)
+
+    # selected species for all times
+    c = ucnset.get_data(species=[2, 0], totim=times)
+    assert c.shape == (len(times), 2, 8, 15, 21)
+    assert np.array_equal(c[:, 0], ucns[2].get_alldata(nodata=1e30))
+    c = ucnset.get_data(species=1, kstpkper=(0, 0), mflay=2)
+    assert np.array_equal(c, ucns[1].get_data(kstpkper=(0, 0), mflay=2))
+
+    # time series of all species
+    idx = [(0, 7, 5), (3, 1, 2)]
+    ts = ucnset.get_ts(idx)
+    assert ts.shape == (len(times), 7)
+    for s, ucn in enumerate(ucns):
+        assert np.array_equal(ts[:, [0, 2 * s + 1, 2 * s + 2]],
+                              ucn.get_ts(idx)), \
+            'time series of species {} is not equal'.format(s)
+    ucnset.close()
+    return
+
+
 def test_binaryfile_writeread():
     import os
     import numpy as np
@@ -238,6 +277,7 @@ if __name__ == '__main__':
     test_binaryfile_writeread()
     test_formattedfile_read()
     test_binaryfile_read()
+    test_ucnfileset_read()
     test_cellbudgetfile_read()
     test_cellbudgetfile_readrecord()
     test_cellbudgetfile_readrecord_waux()
@@ -1,4 +1,8 @@
 import os
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 import numpy as np
 import flopy
 
@@ -133,6 +137,32 @@ def test_tpl_zoned():
     tplfile = os.path.join(mpth, 'tpl3.lpf.tpl')
     assert os.path.isfile(tplfile)
 
+    # every cell in a parameter zone has the parameter name, unless the
+    # zone covers a whole layer and a constant is written
+    with open(tplfile) as f:
+        entries = f.read().split()
+    for p in plisthk[:2]:
+        assert entries.count(p.name) == len(p.span['idx'][0])
+    assert entries.count('hk_4') == 1
+
+    # template arrays are written with 10 entries on a line
+    hk = flopy.pest.tplarray.Util3dTpl(lpf.hk)
+    for p in plisthk:
+        hk.add_parameter(p)
+    lines = hk[0].get_file_entry().splitlines()
+    assert lines[0].startswith('INTERNAL 1.0 (FREE) -1')
+    assert len(lines) == 1 + nrow * 2
+    assert lines[1] == ' {0:>15s}'.format('10.0') * 10
+    assert lines[-1] == ' {0:>15s}'.format('~    hk_3     ~') * 10
+    assert hk[2].get_file_entry() == 'CONSTANT 10.0    #hk Layer 3\n'
+
+    # the package writers write template arrays in blocks of rows
+    f = StringIO()
+    hk[0].write_file_entry(f, nrows=3)
+    assert f.getvalue() == hk[0].get_file_entry()
+    with open(tplfile) as f:
+        assert hk[0].get_file_entry() in f.read()
+
     return
 
 
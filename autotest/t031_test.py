@@ -203,6 +203,90 @@ def test_get_destination_data():
                            sr=m.sr)
 
 
+def test_pathline_index():
+    import matplotlib.pyplot as plt
+    pthobj = PathlineFile(os.path.join(path, 'EXAMPLE-3.pathline'))
+    pid = pthobj._data['particleid']
+
+    # grouped data should be identical to a boolean selection on the data
+    plines = pthobj.get_alldata()
+    assert len(plines) == pthobj.nid
+    for partid in [0, 7, pthobj.nid - 1]:
+        ra = pthobj._data[pid == partid]
+        assert np.array_equal(plines[partid].x, ra['x'])
+        assert np.array_equal(plines[partid].time, ra['time'])
+        assert np.array_equal(pthobj.get_data(partid).k, ra['k'])
+    assert pthobj.get_data(pthobj.nid).shape[0] == 0
+
+    totim = pthobj._data['time'].max() / 2.
+    plines = pthobj.get_alldata(totim=totim, ge=False)
+    ra = pthobj._data[(pid == 7) & (pthobj._data['time'] <= totim)]
+    assert np.array_equal(plines[7].time, ra['time'])
+
+    epobj = EndpointFile(os.path.join(path, 'EXAMPLE-3.endpoint'))
+    ep = epobj.get_data(partid=4)
+    assert ep.shape[0] == 1 and ep['particleid'][0] == 4
+
+    # plot all pathlines as a single line collection
+    m = flopy.modflow.Modflow.load('EXAMPLE.nam', model_ws=path)
+    mm = flopy.plot.ModelMap(model=m)
+    lc = mm.plot_pathline(plines, layer='all')
+    assert len(lc.get_segments()) == len([p for p in plines if len(p) > 0])
+    plines = pthobj.get_alldata()
+    lc = mm.plot_pathline(plines, layer='all',
+                          travel_time='<= {}'.format(totim))
+    nlines = len([p for p in plines if (p.time <= totim).any()])
+    assert len(lc.get_segments()) == nlines
+    plt.close()
+
+
+def test_pathline_chunks():
+    pthfile = os.path.join(path, 'EXAMPLE-3.pathline')
+    epfile = os.path.join(path, 'EXAMPLE-3.endpoint')
+    pthobj = PathlineFile(pthfile)
+    epobj = EndpointFile(epfile)
+    ra = pthobj._data
+
+    # chunked reading gives the same data
+    pthobj2 = PathlineFile(pthfile, chunksize=100)
+    for n in ra.dtype.names:
+        assert np.array_equal(pthobj2._data[n], ra[n])
+
+    # particle id and time selection while reading the file
+    pthobj2 = PathlineFile(pthfile, partids=range(5, 10), chunksize=100)
+    idx = (ra['particleid'] >= 5) & (ra['particleid'] < 10)
+    assert np.array_equal(pthobj2._data['x'], ra['x'][idx])
+    assert np.array_equal(pthobj2.get_data(7).x, pthobj.get_data(7).x)
+    pthobj2 = PathlineFile(pthfile, partids=[3, 12],
+                           time_window=(None, 1.e5), chunksize=100)
+    idx = np.in1d(ra['particleid'], [3, 12]) & (ra['time'] <= 1.e5)
+    assert np.array_equal(pthobj2._data['time'], ra['time'][idx])
+
+    # destination cell selection
+    well = [(4, 12, 12)]
+    pthobj2 = PathlineFile(pthfile, dest_cells=well, chunksize=100)
+    pthld = pthobj.get_destination_pathline_data(dest_cells=well)
+    assert np.array_equal(np.unique(pthobj2._data['particleid']),
+                          np.unique(pthld.particleid))
+    epobj2 = EndpointFile(epfile, dest_cells=well, chunksize=100)
+    epd = epobj.get_destination_endpoint_data(dest_cells=well)
+    assert np.array_equal(epobj2._data['particleid'], epd.particleid)
+
+    # binary cache is created once and memory-mapped in later sessions
+    pthobj2 = PathlineFile(pthfile, cache=True, chunksize=100)
+    assert os.path.isfile(pthfile + '.npy')
+    mtime = os.path.getmtime(pthfile + '.npy')
+    pthobj2 = PathlineFile(pthfile, cache=True)
+    assert os.path.getmtime(pthfile + '.npy') == mtime
+    for n in ra.dtype.names:
+        assert np.array_equal(pthobj2._data[n], ra[n])
+    pthobj2 = PathlineFile(pthfile, cache=True, partids=range(5, 10))
+    assert np.array_equal(pthobj2.get_data(7).x, pthobj.get_data(7).x)
+    epobj2 = EndpointFile(epfile, cache=True)
+    assert np.array_equal(epobj2.get_alldata().finaltime,
+                          epobj.get_alldata().finaltime)
+
+
 def test_loadtxt():
     from flopy.utils.flopy_io import loadtxt
     pthfile = os.path.join(path, 'EXAMPLE-3.pathline')
@@ -219,4 +303,6 @@ def test_loadtxt():
 if __name__ == '__main__':
     test_mpsim()
     test_get_destination_data()
+    test_pathline_index()
+    test_pathline_chunks()
     test_loadtxt()
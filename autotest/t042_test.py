@@ -93,6 +93,109 @@ def test_get_sat_thickness_gradients():
     sat_thick = get_saturated_thickness(hds, m, nodata)
     assert np.abs(np.sum(sat_thick[:, 1, 1] - np.array([0.2, 1., 1.]))) < 1e-6
 
+def test_postprocessing_headfile():
+    import os
+    from flopy.utils.binaryfile import BinaryHeader
+    tpth = os.path.join('temp', 't042')
+    if not os.path.isdir(tpth):
+        os.makedirs(tpth)
+    nodata = -999.
+    nl, nr, nc = 3, 4, 5
+    botm = np.ones((nl, nr, nc), dtype=float)
+    botm[0], botm[1], botm[2] = 6., 3., 0.
+    m = mf.Modflow('junk', version='mfnwt', model_ws=tpth)
+    dis = mf.ModflowDis(m, nlay=nl, nrow=nr, ncol=nc, botm=botm, top=10.)
+
+    # write a binary head file with three times
+    rng = np.random.RandomState(0)
+    hds = rng.uniform(1., 9., (3, nl, nr, nc)).astype(np.float32)
+    hds[rng.rand(*hds.shape) < 0.3] = nodata
+    hds[1, :, 0, 0] = nodata
+    fname = os.path.join(tpth, 'junk.hds')
+    f = open(fname, 'wb')
+    for n in range(3):
+        for k in range(nl):
+            header = BinaryHeader.create(bintype='head', kstp=1, kper=n + 1,
+                                         pertim=1., totim=n + 1., ncol=nc,
+                                         nrow=nr, ilay=k + 1, text='head')
+            header.tofile(f)
+            hds[n, k].tofile(f)
+    f.close()
+    hdsobj = flopy.utils.HeadFile(fname)
+
+    # head file objects give the same results as head arrays
+    wt = get_water_table(hdsobj, nodata=nodata)
+    assert np.array_equal(wt, get_water_table(hds, nodata=nodata))
+    assert wt[1, 0, 0] == nodata
+    k = np.argmax(hds[2] != nodata, axis=0)
+    assert wt[2, 1, 1] == hds[2, k[1, 1], 1, 1]
+    grad = get_gradients(hdsobj, m, nodata, per_idx=1)
+    assert np.allclose(grad, get_gradients(hds, m, nodata, per_idx=1),
+                       equal_nan=True)
+    assert np.isnan(grad[:, 0, 0]).all()
+
+    # results can be written to a memory-mapped .npy file
+    npyname = os.path.join(tpth, 'sat_thickness.npy')
+    sat_thick = get_saturated_thickness(hdsobj, m, nodata, filename=npyname)
+    assert isinstance(sat_thick, np.memmap)
+    assert sat_thick.shape == (3, nl, nr, nc)
+    assert np.allclose(np.load(npyname),
+                       get_saturated_thickness(hds, m, nodata),
+                       equal_nan=True)
+    del sat_thick
+
+
+def test_plotutil_time_stacks():
+    from flopy.plot import plotutil
+    rng = np.random.RandomState(0)
+    nt, nl, nr, nc = 4, 3, 5, 6
+    top = np.ones((nr, nc)) * 10.
+    botm = np.ones((nl, nr, nc)) * np.array([6., 3., 0.])[:, None, None]
+    laytyp = [1, 0, 0]
+    hds = rng.uniform(2., 12., (nt, nl, nr, nc))
+    hds[0, 0, 0, 0] = 999.
+    frf, fff, flf = [rng.randn(nt, nl, nr, nc) for i in range(3)]
+    delr, delc = np.ones(nc) * 10., np.ones(nr) * 20.
+
+    # a stack of time steps gives the same results as each time step
+    thickness = plotutil.cell_thickness(top, botm)
+    sat_thk = plotutil.saturated_thickness(hds, top, botm, laytyp, [999.],
+                                           thickness=thickness, nthreads=2)
+    assert sat_thk.shape == hds.shape
+    assert sat_thk[0, 0, 0, 0] == 4.
+    assert np.allclose(sat_thk[:, 1:], 3.)
+    q = plotutil.centered_specific_discharge(frf, fff, flf, delr, delc,
+                                             sat_thk, nthreads=2)
+    for t in range(nt):
+        s = plotutil.saturated_thickness(hds[t], top, botm, laytyp, [999.])
+        assert np.allclose(s, sat_thk[t])
+        qt = plotutil.centered_specific_discharge(frf[t], fff[t], flf[t],
+                                                  delr, delc, s)
+        for q1, q2 in zip(q, qt):
+            assert np.allclose(q1[t], q2)
+    assert np.allclose(q[0][1, 1, 2, 3],
+                       0.5 * (frf[1, 1, 2, 2] + frf[1, 1, 2, 3]) / 60.)
+
+    # swi concentrations for a stack of zeta surfaces
+    c = plotutil.SwiConcentration(botm=np.vstack((top[None], botm)),
+                                  nu=[0., 0.025], istrat=1)
+    zeta = {0: np.ones((nt, nl, nr, nc)) * 8.}
+    conc = c.calc_conc(zeta, layer=0)
+    assert conc.shape == (nt, nr, nc)
+    assert np.allclose(conc, 0.025 * 0.5)
+
+    # exceptions in the worker threads are raised in the calling thread
+    def fail(a):
+        if a.shape[0] < nt:
+            raise ValueError('time chunk failed')
+        return a
+    try:
+        plotutil._run_time_chunks(fail, [np.ones((nt, nl, nr, nc))], 2)
+        raise AssertionError('exception was not raised')
+    except ValueError as e:
+        assert str(e) == 'time chunk failed'
+
+
 if __name__ == '__main__':
     #test_get_transmissivities()
     #test_get_water_table()
@@ -26,5 +26,94 @@ def test_mtlist():
     mt = flopy.utils.MtListBudget(os.path.join(mt_dir, "mcomp_fail2.list"))
     df_gw, df_sw = mt.parse(forgive=True, start_datetime="1-1-1970")
 
+
+def build_list_file(fname, nbudget=5):
+    # build a list file with several budgets from the single budget in
+    # mcomp_fail2.list
+    mt_dir = os.path.join("..", "examples", "data", "mt3d_test")
+    f = open(os.path.join(mt_dir, "mcomp_fail2.list"))
+    lines = f.readlines()
+    f.close()
+    ibeg = [i for i, line in enumerate(lines)
+            if "STREAM MASS BUDGETS" in line]
+    header, budget = lines[:ibeg[0]], lines[ibeg[0]:ibeg[-1]]
+    text = "".join(header)
+    for n in range(nbudget):
+        text += "".join(budget).replace("365.0000    D",
+                                        "{0:9.4f}    D".format(n + 1.))
+    tpth = os.path.dirname(fname)
+    if not os.path.isdir(tpth):
+        os.makedirs(tpth)
+    f = open(fname, "w")
+    f.write(text)
+    f.close()
+    return text
+
+
+def test_mtlist_resume():
+    try:
+        import pandas as pd
+    except:
+        return
+
+    fname = os.path.join("temp", "t055", "mcomp_resume.list")
+    text = build_list_file(fname)
+
+    mt = flopy.utils.MtListBudget(fname)
+    df_gw, df_sw = mt.parse(forgive=False)
+    assert df_gw.shape[0] == 5
+    assert df_gw.index.tolist() == [1., 2., 3., 4., 5.]
+    assert df_sw.shape[0] == 5
+
+    # only read the budgets of the second component
+    df_gw2, df_sw2 = mt.parse(forgive=False, diff=False, species=[2])
+    assert df_gw2.shape[0] == 5
+    assert all(c.endswith("2") or "_2_" in c for c in df_gw2.columns)
+    assert all("_2_" in c or c.endswith("_2") for c in df_sw2.columns)
+
+    # tail the file while it is being written
+    f = open(fname, "w")
+    f.write(text[:len(text) // 2])
+    f.close()
+    mt = flopy.utils.MtListBudget(fname)
+    df_gw_part, df_sw_part = mt.parse(resume=True)
+    assert 0 < df_gw_part.shape[0] < 5
+    offset = mt.offset
+    f = open(fname, "w")
+    f.write(text)
+    f.close()
+    df_gw_tail, df_sw_tail = mt.parse(resume=True)
+    assert mt.offset > offset
+    assert mt.index[0][0] < offset
+    assert df_gw_tail.equals(df_gw)
+    assert df_sw_tail.equals(df_sw)
+
+
+def test_mtlist_window():
+    try:
+        import pandas as pd
+    except:
+        return
+
+    # budget blocks are decoded in windows that are widened if the budget
+    # is longer, small windows cut the budget lines at many places
+    from flopy.utils import mtlistfile
+    fname = os.path.join("temp", "t055", "mcomp_window.list")
+    build_list_file(fname)
+    df_gw, df_sw = flopy.utils.MtListBudget(fname).parse(forgive=False)
+    block_size = mtlistfile._block_size
+    try:
+        for nbytes in [50, 333, 1000, 4321]:
+            mtlistfile._block_size = nbytes
+            mt = flopy.utils.MtListBudget(fname)
+            df_gw2, df_sw2 = mt.parse(forgive=False)
+            assert df_gw2.equals(df_gw)
+            assert df_sw2.equals(df_sw)
+    finally:
+        mtlistfile._block_size = block_size
+
+
 if __name__ == '__main__':
-    test_mtlist()
\ No newline at end of file
+    test_mtlist()
+    test_mtlist_resume()
+    test_mtlist_window()
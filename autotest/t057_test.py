@@ -0,0 +1,130 @@
+"""
+Test the native quadtree grid builder for Gridgen
+"""
+import os
+import numpy as np
+import flopy
+from flopy.utils.gridgen import Gridgen
+
+tpth = os.path.join('temp', 't057')
+if not os.path.isdir(tpth):
+    os.makedirs(tpth)
+
+
+def get_gridgen(rotation=0.):
+    m = flopy.modflow.Modflow('quadtree', model_ws=tpth)
+    dis = flopy.modflow.ModflowDis(m, nlay=3, nrow=10, ncol=10, delr=100.,
+                                   delc=100., top=10., botm=[5., 0., -5.],
+                                   xul=1000., yul=2000., rotation=rotation)
+    g = Gridgen(dis, model_ws=tpth, native=True)
+    return m, g
+
+
+def transform(sr, pts):
+    pts = np.array(pts, dtype=np.float)
+    x, y = sr.transform(pts[:, 0], pts[:, 1])
+    return list(zip(x, y))
+
+
+def test_quadtree_refinement():
+    m, g = get_gridgen(rotation=10.)
+    line = transform(m.sr, [(100., 100.), (900., 900.)])
+    g.add_refinement_features([[line]], 'line', 2, [0, 1])
+    point = transform(m.sr, [(450., 450.)])
+    g.add_refinement_features(point, 'point', 3, [1])
+    g.build()
+    qt = g._qtbuilder
+
+    # no files are written and the layers cover the base grid
+    assert not os.path.isfile(os.path.join(tpth, 'rf0.shp'))
+    assert not os.path.isfile(os.path.join(tpth, 'qtg.nod'))
+    for k in range(3):
+        idx = qt.layer == k
+        assert np.isclose(qt.area[idx].sum(), 1000. * 1000.)
+    assert qt.level[qt.layer == 1].max() == 3
+
+    # connections are symmetric and the level difference between connected
+    # cells is no more than one
+    gridprops = g.get_gridprops()
+    iac, ja, fldr = gridprops['iac'], gridprops['ja'] - 1, gridprops['fldr']
+    n = np.repeat(np.arange(gridprops['nodes']), iac)
+    assert np.array_equal(ja[np.cumsum(iac) - iac], np.arange(len(iac)))
+    pairs = set(zip(n, ja))
+    assert all((m2, n2) in pairs for n2, m2 in pairs)
+    assert np.abs(qt.level[n] - qt.level[ja]).max() == 1
+
+    # horizontal faces add up to the perimeter of the interior cells and
+    # vertical faces to the cell area
+    hor = gridprops['ihc'] == 1
+    width = np.bincount(n[hor], weights=gridprops['hwva'][hor],
+                        minlength=len(iac))
+    interior = (qt.xmin > 0.) & (qt.xmax < 1000.) & (qt.ymin > 0.) & \
+               (qt.ymax < 1000.)
+    assert np.allclose(width[interior], 2. * (qt.dx + qt.dy)[interior])
+    vert = np.abs(fldr) == 3
+    area = np.bincount(n[vert], weights=gridprops['fahl'][vert],
+                       minlength=len(iac))
+    assert np.allclose(area[qt.layer != 1], qt.area[qt.layer != 1])
+
+    disu = g.get_disu(m)
+    assert disu.nodes == qt.nodes
+    assert disu.njag == qt.nja
+
+    # intersect a point with the refined layer
+    result = g.intersect(point, 'point', 1)
+    node = result.nodenumber[0]
+    assert qt.layer[node] == 1
+    assert qt.level[node] == 3
+    assert np.isclose(qt.dx[node], 12.5)
+
+
+def test_quadtree_active_domain():
+    m, g = get_gridgen()
+    polygon = transform(m.sr, [(0., 0.), (0., 500.), (500., 500.),
+                               (500., 0.)])
+    g.add_active_domain([[polygon]], [0, 1, 2])
+    g.add_refinement_features([[polygon]], 'polygon', 1, [0, 1, 2])
+    g.build()
+    assert g.nodelay.tolist() == [100, 100, 100]
+    fname = os.path.join(tpth, 'quadtree.disv')
+    g.to_disv6(fname)
+    assert os.path.isfile(fname)
+
+
+def test_to_cvfd_large_quadtree():
+    from flopy.utils.cvfdutil import to_cvfd
+    from flopy.utils.quadtree import QuadtreeBuilder
+    m = flopy.modflow.Modflow('quadtree', model_ws=tpth)
+    dis = flopy.modflow.ModflowDis(m, nlay=1, nrow=100, ncol=100, delr=100.,
+                                   delc=100., top=10., botm=[0.])
+    qt = QuadtreeBuilder(m.sr, 1, [dis.top.array, dis.botm.array[0]])
+    rng = np.random.RandomState(0)
+    pts = transform(m.sr, rng.uniform(0., 10000., (1000, 2)))
+    qt.add_refinement_features(pts, 'point', 4, [0])
+    qt.build()
+    assert qt.nodes > 50000
+
+    # every neighbour of a cell is separated by a face, so the number of
+    # faces of an interior cell matches its horizontal connections
+    verts, iverts = to_cvfd(qt.get_vertices())
+    n = np.repeat(np.arange(qt.nodes), qt.iac)
+    hor = np.abs(qt.fldr) == 1
+    hor |= np.abs(qt.fldr) == 2
+    nconn = np.bincount(n[hor], minlength=qt.nodes)
+    nfaces = np.array([len(iv) - 1 for iv in iverts])
+    interior = (qt.xmin > 0.) & (qt.xmax < 10000.) & (qt.ymin > 0.) & \
+               (qt.ymax < 10000.)
+    assert np.array_equal(nfaces[interior], nconn[interior])
+
+    # jittered vertices are merged back together with snap_tolerance
+    v = qt.get_vertices()[:2000]
+    v = v + rng.uniform(-1e-4, 1e-4, v.shape)
+    v[:, -1] = v[:, 0]
+    verts2, iverts2 = to_cvfd(v, snap_tolerance=1e-2)
+    assert iverts2 == to_cvfd(qt.get_vertices()[:2000])[1]
+
+
+if __name__ == '__main__':
+    test_quadtree_refinement()
+    test_quadtree_active_domain()
+    test_to_cvfd_large_quadtree()
@@ -0,0 +1,65 @@
+"""
+Test the parent/child exchange data for local grid refinement
+"""
+import numpy as np
+import flopy
+from flopy.utils.lgrutil import Lgr
+
+
+def get_lgr(ncpp=3, ncppl=(2, 1), ibndp=None):
+    m = flopy.modflow.Modflow()
+    flopy.modflow.ModflowDis(m, nlay=2, nrow=9, ncol=9, delr=100.,
+                             delc=100., top=50., botm=[20., 0.])
+    return Lgr(m, 0, 0, 2, 6, 2, 6, ncpp, list(ncppl), ibndp=ibndp)
+
+
+def get_exchange_data_by_cell(lgr):
+    # reference implementation that loops over every child cell
+    exglist = []
+    for kc in range(lgr.nlay):
+        for ic in range(lgr.nrow):
+            for jc in range(lgr.ncol):
+                for (kp, ip, jp), idir in lgr.get_parent_connections(kc, ic,
+                                                                     jc):
+                    exglist.append((kp, ip, jp, kc, ic, jc, idir))
+    return exglist
+
+
+def test_lgr_exchange_data():
+    ibndp = np.ones((2, 9, 9), dtype=np.int)
+    ibndp[0, 2:7, 2:7] = 0
+    ibndp[0, 2, 2] = 1
+    ibndp[0, 4, 4] = 1
+    for lgr in [get_lgr(), get_lgr(5, (3, 1), ibndp)]:
+        exg = lgr.get_exchange_data()
+        ref = get_exchange_data_by_cell(lgr)
+        assert [e[:6] for e in exg] == [e[:6] for e in ref]
+
+        idir = np.array([e[6] for e in ref])
+        ihc = np.array([e[6] for e in exg])
+        angldegx = np.array([e[10] for e in exg])
+        assert np.all((ihc == 0) == (idir == -3))
+        assert np.all(ihc[idir != -3] == 2)
+        assert np.all(angldegx[idir == -1] == 180.)
+        assert np.all(angldegx[idir == 2] == 90.)
+        assert np.all(angldegx[idir == -2] == 270.)
+
+        # the vertical connections cover the bottom of the child grid
+        dx = 100. / lgr.ncpp
+        hwva = np.array([e[9] for e in exg])
+        vertical = idir == -3
+        assert np.isclose(hwva[vertical].sum(), 500. * 500.)
+        assert np.allclose(hwva[~vertical], dx)
+
+    # recarray that can be passed to ModflowGwfgwf
+    lgr = get_lgr()
+    exg = lgr.get_exchange_data(recarray=True)
+    assert len(exg) == len(get_exchange_data_by_cell(lgr))
+    assert exg.cellidm1[0] == (0, 2, 1)
+    assert exg.cellidm2[0] == (0, 0, 0)
+    assert exg.angldegx[0] == 180.
+    assert np.isclose(exg.cl1[0], 50.)
+
+
+if __name__ == '__main__':
+    test_lgr_exchange_data()
@@ -0,0 +1,107 @@
+"""
+Test running a batch of models with run_models using a stub model
+"""
+import os
+import sys
+import time
+import flopy
+
+tpth = os.path.join('temp', 't059')
+if not os.path.isdir(tpth):
+    os.makedirs(tpth)
+
+stub = '''import sys
+import time
+time.sleep(float(sys.argv[1]))
+print('Solving:  Stress period:     1    Time step:     2')
+if int(sys.argv[2]) == 0:
+    print('Normal termination of stub model')
+sys.exit(int(sys.argv[2]))
+'''
+
+
+def get_jobs():
+    fname = 'stub.py'
+    jobs = []
+    for i, (sleep, returncode) in enumerate([(0., 0), (0.2, 0), (0., 1),
+                                             (10., 0), (0., 0)]):
+        model_ws = os.path.join(tpth, 'run{}'.format(i))
+        if not os.path.isdir(model_ws):
+            os.makedirs(model_ws)
+        f = open(os.path.join(model_ws, fname), 'w')
+        f.write(stub)
+        f.close()
+        jobs.append((sys.executable, fname, model_ws,
+                     [str(sleep), str(returncode)]))
+    return jobs
+
+
+def test_run_models():
+    jobs = get_jobs()
+    results = flopy.run_models(jobs, nworkers=2, report=True, timeout=3.)
+    assert len(results) == len(jobs)
+    assert results.model_ws.tolist() == [job[2] for job in jobs]
+    assert results.success.tolist() == [True, True, False, False, True]
+    assert results.returncode[2] == 1
+    assert results.timed_out.tolist() == [False, False, False, True, False]
+    assert results.elapsed[3] < 10.
+    assert results.elapsed[1] >= 0.2
+    assert results.buff[0] == ['Solving:  Stress period:     1    '
+                               'Time step:     2',
+                               'Normal termination of stub model']
+
+    # run_model uses the same timeout
+    exe_name, namefile, model_ws, cargs = jobs[3]
+    success, buff = flopy.run_model(exe_name, namefile, model_ws=model_ws,
+                                    silent=True, cargs=cargs, timeout=0.5)
+    assert not success
+
+    # missing namefiles are reported before any model is run
+    try:
+        flopy.run_models([(sys.executable, 'missing.nam', tpth)])
+        raise AssertionError('run_models should fail for a missing namefile')
+    except Exception as e:
+        assert 'missing.nam' in str(e)
+
+
+def test_run_model_async():
+    if sys.version_info < (3, 6):
+        return
+    import asyncio
+    from flopy.mbase_async import run_model_async, parse_model_output
+    event = parse_model_output(' Solving:  Stress period:     3    '
+                               'Time step:    12    Ground-Water Flow Eqn.')
+    assert event['type'] == 'timestep'
+    assert (event['kper'], event['kstp']) == (2, 11)
+    event = parse_model_output('FAILED TO MEET SOLVER CONVERGENCE CRITERIA')
+    assert event['type'] == 'convergence_failure'
+
+    # run the stub models concurrently from one event loop
+    jobs = get_jobs()
+    events = []
+    runs = []
+    for i, job in enumerate(jobs):
+        exe_name, namefile, model_ws, cargs = job
+        if i == 1:
+            cargs = ['1.0', '0']
+        runs.append(run_model_async(exe_name, namefile, model_ws=model_ws,
+                                    silent=True, report=True, cargs=cargs,
+                                    timeout=1.5, callback=events.append))
+    loop = asyncio.get_event_loop()
+    start = time.time()
+    results = loop.run_until_complete(asyncio.gather(*runs))
+    assert time.time() - start < 2.5
+    assert [success for success, buff in results] == [True, True, False,
+                                                      False, True]
+    assert results[0][1][1] == 'Normal termination of stub model'
+    timesteps = [e for e in events if e['type'] == 'timestep']
+    assert len(timesteps) == 4
+    assert all(e['kstp'] == 1 for e in timesteps)
+    finished = [e for e in events if e['type'] == 'finished']
+    assert sorted(e['returncode'] for e in finished)[-1] == 1
+    assert sum(e['timed_out'] for e in finished) == 1
+
+
+if __name__ == '__main__':
+    test_run_models()
+    test_run_model_async()
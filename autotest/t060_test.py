@@ -0,0 +1,129 @@
+"""
+Test the lazy imports of flopy and the cache of the MF6 structure
+"""
+import os
+import sys
+import time
+import shutil
+import subprocess
+import flopy
+
+tpth = os.path.abspath(os.path.join('temp', 't060'))
+if not os.path.isdir(tpth):
+    os.makedirs(tpth)
+
+# the tests start new python sessions that have to import this flopy
+flopypth = os.path.dirname(os.path.dirname(os.path.abspath(flopy.__file__)))
+
+# the sessions use a cache directory in the test folder instead of the
+# cache in the home directory
+default_cache_dir = os.path.join(tpth, 'cache')
+
+structure_summary = """
+from flopy.mf6.data.mfstructure import MFStructure
+s = MFStructure()
+items = []
+packages = list(s.sim_struct.package_struct_objs.items())
+for model_key, model_struct in s.sim_struct.model_struct_objs.items():
+    packages += list(model_struct.package_struct_objs.items())
+for key, package in packages:
+    for block_key, block in package.blocks.items():
+        items.append((key, block_key, len(block.data_structures)))
+print(s.from_cache, len(items), hash(tuple(sorted(items))))
+"""
+
+
+def run_python(code, cache_dir=default_cache_dir, eager=False):
+    env = os.environ.copy()
+    env['PYTHONPATH'] = flopypth
+    env['PYTHONHASHSEED'] = '0'
+    env['FLOPY_CACHE_DIR'] = cache_dir
+    env.pop('FLOPY_EAGER_IMPORT', None)
+    if eager:
+        env['FLOPY_EAGER_IMPORT'] = '1'
+    if not os.path.isdir(tpth):
+        os.makedirs(tpth)
+    start = time.time()
+    out = subprocess.check_output([sys.executable, '-c', code], env=env,
+                                  cwd=tpth)
+    elapsed = time.time() - start
+    lines = out.decode().strip().splitlines()
+    if len(lines) == 0:
+        return '', elapsed
+    return lines[-1], elapsed
+
+
+def test_lazy_import():
+    code = 'import sys, flopy\n' + \
+           'heavy = [m for m in ["flopy.modflow", "flopy.mf6", ' + \
+           '"flopy.plot", "matplotlib", "pandas"] if m in sys.modules]\n' + \
+           'm = flopy.modflow.Modflow()\n' + \
+           'from flopy import mf6\n' + \
+           'print(heavy, "flopy.mf6" in sys.modules, ' + \
+           '"run_model" in dir(flopy))'
+    out, elapsed = run_python(code)
+    assert out == '[] True True', out
+
+
+def test_mf6_structure_cache():
+    cache_dir = os.path.join(tpth, 'cache')
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+
+    # the first session builds the structure and writes the cache file,
+    # the second session reads the same structure from the cache file
+    built, elapsed = run_python(structure_summary, cache_dir)
+    assert built.startswith('False')
+    assert len(os.listdir(cache_dir)) == 1
+    cached, elapsed = run_python(structure_summary, cache_dir)
+    assert cached.startswith('True')
+    assert built.split()[1:] == cached.split()[1:]
+
+    # older cache files of this python version and flopy installation are
+    # removed when the cache file is written, the cache files of other
+    # python versions or installations are kept
+    cache_name = os.listdir(cache_dir)[0]
+    cache_file = os.path.join(cache_dir, cache_name)
+    prefix = cache_name[:cache_name.rindex('_') + 1]
+    old_name = '{}old.pkl'.format(prefix)
+    other_name = 'mf6structure_py00_other_old.pkl'
+    shutil.copy(cache_file, os.path.join(cache_dir, old_name))
+    shutil.copy(cache_file, os.path.join(cache_dir, other_name))
+    os.remove(cache_file)
+    out, elapsed = run_python(structure_summary, cache_dir)
+    assert out == built
+    assert sorted(os.listdir(cache_dir)) == sorted([cache_name, other_name])
+    os.remove(os.path.join(cache_dir, other_name))
+
+    # a damaged cache file is ignored and replaced
+    cache_file = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    with open(cache_file, 'wb') as f:
+        f.write(b'not a structure')
+    out, elapsed = run_python(structure_summary, cache_dir)
+    assert out == built
+    out, elapsed = run_python(structure_summary, cache_dir)
+    assert out == cached
+
+
+def test_import_time():
+    # import flopy does not import the subpackages and is faster than
+    # importing everything with FLOPY_EAGER_IMPORT
+    code = 'import sys, flopy\n' + \
+           'print([m for m in ["flopy.modflow", "flopy.mf6", ' + \
+           '"flopy.plot", "matplotlib"] if m in sys.modules])'
+    lazy_times = []
+    eager_times = []
+    for i in range(3):
+        out, elapsed = run_python(code)
+        assert out == '[]', out
+        lazy_times.append(elapsed)
+        out, elapsed = run_python(code, eager=True)
+        assert "'flopy.modflow'" in out, out
+        eager_times.append(elapsed)
+    assert min(lazy_times) < min(eager_times)
+
+
+if __name__ == '__main__':
+    test_lazy_import()
+    test_mf6_structure_cache()
+    test_import_time()
@@ -1,4 +1,5 @@
 import os
+import filecmp
 
 import numpy as np
 
@@ -121,6 +122,56 @@ def test001a_tharmonic():
     return
 
 
+def test001a_tharmonic_modified_only():
+    # init paths
+    test_ex_name = 'test001a_Tharmonic'
+    model_name = 'flow15'
+
+    pth = os.path.join('..', 'examples', 'data', 'mf6', test_ex_name)
+    run_folder = os.path.join(cpth, test_ex_name + '_modified')
+    if not os.path.isdir(run_folder):
+        os.makedirs(run_folder)
+    save_folder = os.path.join(run_folder, 'temp')
+    if not os.path.isdir(save_folder):
+        os.makedirs(save_folder)
+
+    # load simulation and write it with a pool of threads
+    sim = MFSimulation.load(model_name, 'mf6', exe_name, pth,
+                            verbosity_level=VerbosityLevel.quiet)
+    sim.simulation_data.mfpath.set_sim_path(run_folder)
+    sim.write_simulation(nthreads=4)
+    model = sim.get_model(model_name)
+    for package in [sim.name_file, model.name_file] + model.packages:
+        assert not package.is_modified()
+
+    # change the npf package and mark the ic file, which is not rewritten
+    npf = model.get_package('npf')
+    ic_file = os.path.join(run_folder, 'flow15.ic')
+    with open(ic_file, 'a') as f:
+        f.write('# not rewritten\n')
+    hk_array = npf.k.get_data()
+    hk_array[0, 0, 1] = 20.0
+    npf.k.set_data(hk_array)
+    assert npf.is_modified()
+    assert not model.get_package('ic').is_modified()
+    sim.write_simulation(modified_only=True, nthreads=4)
+    assert not npf.is_modified()
+    with open(ic_file) as f:
+        assert f.read().endswith('# not rewritten\n')
+    sim2 = MFSimulation.load(model_name, 'mf6', exe_name, run_folder,
+                             verbosity_level=VerbosityLevel.quiet)
+    npf2 = sim2.get_model(model_name).get_package('npf')
+    assert npf2.k.get_data()[0, 0, 1] == 20.0
+
+    # all packages are written to a new simulation path
+    sim.simulation_data.mfpath.set_sim_path(save_folder)
+    sim.write_simulation(modified_only=True)
+    for fname in ['mfsim.nam', 'flow15.nam', 'flow15.dis', 'flow15.ic',
+                  'flow15.npf']:
+        assert os.path.isfile(os.path.join(save_folder, fname))
+    return
+
+
 def test003_gwfs_disv():
     # init paths
     test_ex_name = 'test003_gwfs_disv'
@@ -273,6 +324,59 @@ def test005_advgw_tidal():
         assert pymake.compare_heads(None, None, files1=head_file, files2=head_new)
     """
 
+def test005_advgw_tidal_lazy_load():
+    # init paths
+    test_ex_name = 'test005_advgw_tidal'
+    model_name = 'gwf_1'
+
+    pth = os.path.join('..', 'examples', 'data', 'mf6', test_ex_name)
+    run_folder = os.path.join(cpth, test_ex_name + '_lazy')
+    if not os.path.isdir(run_folder):
+        os.makedirs(run_folder)
+
+    # only the discretization package is loaded
+    sim = MFSimulation.load(model_name, 'mf6', exe_name, pth,
+                            verbosity_level=VerbosityLevel.quiet,
+                            lazy_load=True)
+    model = sim.get_model(model_name)
+    assert model.get_package('dis').is_loaded()
+    assert model.dis.nlay.get_data() == 3
+    npf = model.get_package('npf')
+    for package in model.packages:
+        if package.package_type != 'dis':
+            assert not package.is_loaded()
+
+    # packages are loaded when their data is accessed
+    sim_eager = MFSimulation.load(model_name, 'mf6', exe_name, pth,
+                                  verbosity_level=VerbosityLevel.quiet)
+    npf_eager = sim_eager.get_model(model_name).get_package('npf')
+    assert np.array_equal(npf.k.get_data(), npf_eager.k.get_data())
+    assert npf.is_loaded()
+    assert not npf.is_modified()
+    npf.k = 7.0
+
+    # unloaded packages and the files they reference are copied, the npf
+    # package is written
+    sim.simulation_data.mfpath.set_sim_path(run_folder)
+    sim.write_simulation(nthreads=2)
+    for fname in ['AdvGW_tidal.riv', 'AdvGW_tidal_1.rch', 'AdvGW_tidal.obs']:
+        assert filecmp.cmp(os.path.join(pth, fname),
+                           os.path.join(run_folder, fname), shallow=False)
+    for fname in ['river_stages.ts', 'AdvGW_tidal.riv.obs',
+                  'AdvGW_tidal.head.cont.opncls']:
+        assert os.path.isfile(os.path.join(run_folder, fname))
+    assert not model.get_package('riv').is_loaded()
+    sim2 = MFSimulation.load(model_name, 'mf6', exe_name, run_folder,
+                             verbosity_level=VerbosityLevel.quiet)
+    model2 = sim2.get_model(model_name)
+    assert np.all(model2.npf.k.get_data() == 7.0)
+    riv_eager = sim_eager.get_model(model_name).get_package('riv')
+    assert np.array_equal(model2.get_package('riv').stress_period_data.
+                          get_data(0), riv_eager.stress_period_data.
+                          get_data(0))
+    return
+
+
 def test006_gwf3():
     # init paths
     test_ex_name = 'test006_gwf3'
@@ -792,6 +896,8 @@ if __name__ == '__main__':
     test001e_uzf_3lay()
     test045_lake1ss_table()
     test001a_tharmonic()
+    test001a_tharmonic_modified_only()
     test003_gwfs_disv()
     test005_advgw_tidal()
+    test005_advgw_tidal_lazy_load()
     test006_gwf3()
\ No newline at end of file
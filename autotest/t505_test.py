@@ -4,9 +4,9 @@ import numpy as np
 
 import flopy
 import flopy.utils.binaryfile as bf
-from flopy.mf6.data.mfdata import DataStorageType
+from flopy.mf6.data.mfdata import ColumnarList, DataStorageType
 from flopy.mf6.data.mfdatautil import ArrayUtil
-from flopy.mf6.mfbase import FlopyException
+from flopy.mf6.mfbase import FlopyException, MFDataException
 from flopy.mf6.modflow.mfgwf import ModflowGwf
 from flopy.mf6.modflow.mfgwfchd import ModflowGwfchd
 from flopy.mf6.modflow.mfgwfdis import ModflowGwfdis
@@ -1577,6 +1577,166 @@ def test028_sfr():
     return
 
 
+def test_binary_external():
+    # init paths
+    test_ex_name = 'binary_external'
+    model_name = 'binext'
+    run_folder = os.path.join(cpth, test_ex_name)
+    if not os.path.isdir(run_folder):
+        os.makedirs(run_folder)
+
+    # create simulation
+    sim = MFSimulation(sim_name=test_ex_name, version='mf6', exe_name=exe_name,
+                       sim_ws=run_folder)
+    tdis = ModflowTdis(sim, time_units='DAYS', nper=2,
+                       perioddata=[(1.0, 1, 1.0), (1.0, 1, 1.0)])
+    model = ModflowGwf(sim, modelname=model_name,
+                       model_nam_file='{}.nam'.format(model_name))
+    ims = ModflowIms(sim, print_option='SUMMARY')
+    sim.register_ims_package(ims, [model.name])
+    dis = ModflowGwfdis(model, nlay=3, nrow=4, ncol=5, top=10.,
+                        botm=[5., 0., -5.])
+    k = np.arange(60, dtype=np.float64).reshape((3, 4, 5)) + 1.
+    npf = ModflowGwfnpf(model, icelltype=[1, 0, 0], k=k)
+    strt = np.linspace(0., 1., 60).reshape((3, 4, 5))
+    ic = ModflowGwfic(model, strt=strt)
+    welrec = [((0, 1, 1), -10.), ((2, 3, 4), -20.5)]
+    wel = ModflowGwfwel(model, maxbound=2,
+                        stress_period_data={0: {'filename': 'wel.bin',
+                                                'binary': True,
+                                                'data': welrec},
+                                            1: welrec})
+
+    # store k in a binary file.  k is not LAYERED, so the file contains a
+    # single header for all of the values
+    npf.k.store_as_external_file('k.bin', binary=True)
+    fname = os.path.join(run_folder, 'k.bin')
+    assert os.path.getsize(fname) == 52 + 3 * 4 * 5 * 8
+    hds = bf.HeadFile(fname, text='k', precision='double')
+    header = hds.recordarray[0]
+    assert (header['ncol'], header['nrow'], header['ilay']) == (60, 1, 1)
+    assert np.array_equal(hds.get_data().ravel(), k.ravel())
+    assert np.array_equal(npf.k.get_data(), k)
+
+    # arrays with at least 60 values are written to binary files
+    sim.simulation_data.binary_external_threshold = 60
+    sim.write_simulation()
+    assert os.path.isfile(os.path.join(run_folder, 'wel.bin'))
+    fname = os.path.join(run_folder, '{}.ic.strt.bin'.format(model_name))
+    assert os.path.getsize(fname) == 52 + 3 * 4 * 5 * 8
+    with open(os.path.join(run_folder, '{}.npf'.format(model_name))) as f:
+        assert '(BINARY)' in f.read()
+
+    # load the simulation and compare the data
+    sim2 = MFSimulation.load(test_ex_name, 'mf6', exe_name, run_folder)
+    model2 = sim2.get_model(model_name)
+    assert np.array_equal(model2.npf.k.get_data(), k)
+    assert np.allclose(model2.ic.strt.get_data(), strt)
+    for kper in range(2):
+        data = model2.wel.stress_period_data.get_data(kper)
+        assert [tuple(row[0]) for row in data] == [(0, 1, 1), (2, 3, 4)]
+        assert np.allclose(data['q'], [-10., -20.5])
+
+    # convert the binary array back to a text file
+    model2.npf.k.store_as_external_file('k.txt')
+    sim2.write_simulation()
+    sim3 = MFSimulation.load(test_ex_name, 'mf6', exe_name, run_folder)
+    assert np.array_equal(sim3.get_model(model_name).npf.k.get_data(), k)
+
+    # boundnames can not be stored in a binary list file
+    welrec = [((0, 1, 1), -10., 'well1'), ((2, 3, 4), -20.5, 'well2')]
+    try:
+        ModflowGwfwel(sim3.get_model(model_name), boundnames=True,
+                      maxbound=2, pname='wel2',
+                      fname='{}.wel2'.format(model_name),
+                      stress_period_data={0: {'filename': 'wel2.bin',
+                                              'binary': True,
+                                              'data': welrec}})
+        raise AssertionError('boundnames were stored in a binary file')
+    except MFDataException:
+        pass
+
+    if run:
+        sim.run_simulation()
+
+    return
+
+
+def test_columnar_list_storage():
+    # init paths
+    test_ex_name = 'columnar_list'
+    model_name = 'collist'
+    run_folder = os.path.join(cpth, test_ex_name)
+    if not os.path.isdir(run_folder):
+        os.makedirs(run_folder)
+
+    # create simulation that stores list data in columns
+    sim = MFSimulation(sim_name=test_ex_name, version='mf6', exe_name=exe_name,
+                       sim_ws=run_folder)
+    sim.simulation_data.columnar_list_storage = True
+    tdis = ModflowTdis(sim, time_units='DAYS', nper=3,
+                       perioddata=[(1.0, 1, 1.0)] * 3)
+    model = ModflowGwf(sim, modelname=model_name,
+                       model_nam_file='{}.nam'.format(model_name))
+    ims = ModflowIms(sim, print_option='SUMMARY')
+    sim.register_ims_package(ims, [model.name])
+    dis = ModflowGwfdis(model, nlay=2, nrow=10, ncol=10, top=10.,
+                        botm=[5., 0.])
+    npf = ModflowGwfnpf(model)
+    ic = ModflowGwfic(model)
+    cells = [(k, i, j) for k in range(2) for i in range(10)
+             for j in range(10)]
+    welrec = [(cellid, -float(n)) for n, cellid in enumerate(cells)]
+    welrec2 = [(cellid, -1.) for cellid in cells]
+    wel = ModflowGwfwel(model, maxbound=len(cells),
+                        stress_period_data={0: welrec, 1: welrec,
+                                            2: welrec2})
+
+    # cellids are stored as an integer array and unchanged stress periods
+    # share their columns
+    spd = wel.stress_period_data
+    columns = spd.get_data(0, columnar=True)
+    assert columns['cellid'].dtype == np.int32
+    assert columns['cellid'].shape == (200, 3)
+    assert np.array_equal(columns['cellid'], np.array(cells))
+    assert not columns['q'].flags.writeable
+    assert spd.get_data(1, columnar=True) is columns
+    assert spd.get_data(2, columnar=True) is not columns
+    assert columns.nbytes == 200 * (3 * 4 + 8)
+
+    # checking for data does not build recarrays from the columns
+    to_recarray = ColumnarList.to_recarray
+    ColumnarList.to_recarray = None
+    try:
+        assert spd.has_data()
+        wel._update_size_defs()
+        assert wel.maxbound.get_data() == 200
+    finally:
+        ColumnarList.to_recarray = to_recarray
+
+    # get_data returns the same recarray as without columns
+    data = spd.get_data(0)
+    assert data[5][0] == (0, 0, 5)
+    assert data['q'][5] == -5.
+
+    # write and load the simulation with columns
+    sim.write_simulation()
+    sim2 = MFSimulation.load(test_ex_name, 'mf6', exe_name, run_folder,
+                             columnar_list_storage=True)
+    spd2 = sim2.get_model(model_name).wel.stress_period_data
+    for kper, rec in enumerate([welrec, welrec, welrec2]):
+        assert spd2.get_data(kper).tolist() == rec
+    assert spd2.get_data(0, columnar=True) is \
+        spd2.get_data(1, columnar=True)
+
+    # changing a shared stress period does not change the other one
+    spd2.set_data(welrec2, key=0)
+    assert spd2.get_data(0)['q'][5] == -1.
+    assert spd2.get_data(1)['q'][5] == -5.
+
+    return
+
+
 if __name__ == '__main__':
     test028_sfr()
     np001()
@@ -1588,3 +1748,5 @@ if __name__ == '__main__':
     test021_twri()
     test035_fhb()
     test050_circle_island()
+    test_binary_external()
+    test_columnar_list_storage()
@@ -25,14 +25,71 @@ __author__ = 'Mark Bakker, Vincent Post, Chris Langevin, Joe Hughes, Jeremy Whit
 from .version import __version__, __build__, __git_commit__
 
 #imports
-from . import modflow
-from . import mt3d
-from . import seawat
-from . import modpath
-from . import modflowlgr
-from . import utils
-from . import plot
-from . import export
-from . import pest
-from . import mf6
-from .mbase import run_model, which
+import sys as _sys
+import importlib as _importlib
+from types import ModuleType as _ModuleType
+
+# subpackages and functions are imported when they are first used, because
+# importing all of them (and numpy, matplotlib, ...) is slow compared to the
+# run time of small scripts.  Set the FLOPY_EAGER_IMPORT environment
+# variable to import everything with flopy.
+_lazy_imports = {'modflow': None,
+                 'mt3d': None,
+                 'seawat': None,
+                 'modpath': None,
+                 'modflowlgr': None,
+                 'utils': None,
+                 'plot': None,
+                 'export': None,
+                 'pest': None,
+                 'mf6': None,
+                 'run_model': 'mbase',
+                 'run_models': 'mbase',
+                 'which': 'mbase'}
+if _sys.version_info >= (3, 6):
+    _lazy_imports['run_model_async'] = 'mbase_async'
+
+__all__ = sorted(_lazy_imports)
+
+
+def _lazy_import(name):
+    """
+    Import a subpackage or function of flopy and add it to the flopy
+    namespace.
+
+    """
+    module = _lazy_imports[name]
+    if module is None:
+        value = _importlib.import_module('.' + name, __name__)
+    else:
+        module = _importlib.import_module('.' + module, __name__)
+        value = getattr(module, name)
+    setattr(_sys.modules[__name__], name, value)
+    return value
+
+
+class _LazyModule(_ModuleType):
+    """
+    Module class for flopy that imports the subpackages and functions
+    in _lazy_imports when they are first accessed.
+
+    """
+
+    def __getattr__(self, name):
+        if name in _lazy_imports:
+            return _lazy_import(name)
+        raise AttributeError("module '{}' has no attribute "
+                             "'{}'".format(__name__, name))
+
+    def __dir__(self):
+        return sorted(set(list(self.__dict__) + list(_lazy_imports)))
+
+
+import os as _os
+if _sys.version_info >= (3, 5) and \
+        not _os.environ.get('FLOPY_EAGER_IMPORT'):
+    _sys.modules[__name__].__class__ = _LazyModule
+else:
+    # modules cannot have a __getattr__ method in older versions of python
+    for _name in __all__:
+        _lazy_import(_name)
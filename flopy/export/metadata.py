@@ -1,11 +1,6 @@
 from flopy.utils.flopy_io import get_url_text
 import numpy as np
 
-try:
-    import pandas as pd
-except:
-    pd = False
-
 
 class acdd:
     """Translate ScienceBase global metadata attributes to CF and ACDD
@@ -149,6 +144,10 @@ class acdd:
         for t in ['start', 'end']:
             tc[t] = [d.get('dateString') for d in l
                      if t in d['type'].lower()][0]
+        try:
+            import pandas as pd
+        except:
+            pd = False
         if not np.all(self.model.dis.steady) and pd:
             # replace with times from model reference
             tc['start'] = self.model.dis.start_datetime
@@ -1,8 +1,10 @@
 """
 Module for exporting and importing flopy model attributes
 """
-import copy
+import os
 import shutil
+import struct
+import time
 import numpy as np
 import numpy.lib.recfunctions as rf
 
@@ -49,9 +51,13 @@ def write_gridlines_shapefile(filename, sr):
     wr.save(filename)
 
 
-def write_grid_shapefile(filename, sr, array_dict, nan_val=-1.0e9):
+def write_grid_shapefile(filename, sr, array_dict, nan_val=-1.0e9,
+                         verts=None, chunksize=100000, epsg=None, prj=None,
+                         active=None):
     """
-    Write a grid shapefile array_dict attributes.
+    Write a grid shapefile array_dict attributes. The .shp, .shx and .dbf
+    files are written directly in binary form in chunks of cells, so
+    pyshp is not required.
 
     Parameters
     ----------
@@ -61,82 +67,275 @@ def write_grid_shapefile(filename, sr, array_dict, nan_val=-1.0e9):
         spatial reference object for model grid
     array_dict : dict
        Dictionary of name and 2D array pairs.  Additional 2D arrays to add as
-       attributes to the grid shapefile.
+       attributes to the grid shapefile. Values can also be 3D arrays,
+       Util2d, Util3d or Transient2d instances; a field is written for each
+       layer or stress period of 3D values (name_001, name_002, ...).
+       The arrays are not modified.
+    nan_val : float
+        value written for nan values in the attribute arrays.
+        (default is -1.0e9)
+    verts : numpy.ndarray
+        (nrow * ncol, 5, 2) array with the vertices of each cell in row major
+        order (e.g. sr.vertices). If verts is None, the vertices are
+        calculated from sr for each chunk of cells. (default is None)
+    chunksize : int
+        number of cells written at a time. (default is 100000)
+    epsg : int
+        EPSG code used to write the projection (.prj) file. (default is None)
+    prj : str
+        Existing projection file to copy to the .prj file. (default is None)
+    active : numpy.ndarray
+        (nrow, ncol) array (e.g. ibound) that is non-zero for the cells
+        written to the shapefile. If active is three-dimensional, cells that
+        are active in any layer are written. All cells are written if active
+        is None. (default is None)
 
     Returns
     -------
     None
 
     """
-
-    try:
-        import shapefile
-    except Exception as e:
-        raise Exception("io.to_shapefile(): error " +
-                        "importing shapefile - try pip install pyshp")
-
-    wr = shapefile.Writer(shapeType=shapefile.POLYGON)
-    wr.field("row", "N", 10, 0)
-    wr.field("column", "N", 10, 0)
-
-    arrays = []
-    names = list(array_dict.keys())
-    names.sort()
-    # for name,array in array_dict.items():
-    for name in names:
-        array = array_dict[name]
-        if array.ndim == 3:
-            assert array.shape[0] == 1
-            array = array[0, :, :]
-        assert array.shape == (sr.nrow, sr.ncol)
-        array[np.where(np.isnan(array))] = nan_val
-        if array.dtype in [np.int, np.int32, np.int64]:
-            wr.field(name, "N", 18, 0)
+    nrow, ncol = sr.nrow, sr.ncol
+    ncells = nrow * ncol
+    if verts is not None:
+        verts = np.asarray(verts)
+        if verts.shape != (ncells, 5, 2):
+            raise Exception('write_grid_shapefile(): verts must have a ' +
+                            'shape of ({}, 5, 2)'.format(ncells))
+
+    # cells to write
+    if active is None:
+        cells = np.arange(ncells)
+    else:
+        active = np.asarray(active)
+        if active.ndim == 3:
+            active = (active != 0).any(axis=0)
+        if active.shape != (nrow, ncol):
+            raise Exception('write_grid_shapefile(): active must have a ' +
+                            'shape of ({}, {})'.format(nrow, ncol))
+        cells = np.flatnonzero(active.ravel())
+    nrecords = len(cells)
+
+    # attribute names, arrays and dbf field definitions
+    names, arrays = _get_grid_attribute_arrays(array_dict, nrow, ncol)
+    names = enforce_10ch_limit(names)
+    fields = [('row', 'N', 10, 0), ('column', 'N', 10, 0)]
+    for name, array in zip(names, arrays):
+        if array.dtype.kind in 'iub':
+            fields.append((name, 'N', 18, 0))
         else:
-            wr.field(name, "N", 18, 12)
-        arrays.append(array)
-
-    for i in range(sr.nrow):
-        for j in range(sr.ncol):
-            pts = sr.get_vertices(i, j)
-            wr.poly(parts=[pts])
-            rec = [i + 1, j + 1]
-            for array in arrays:
-                rec.append(array[i, j])
-            wr.record(*rec)
-    wr.save(filename)
+            fields.append((name, 'F', 20, 12))
+    rec_dtype = np.dtype([('deletion', 'S1')] +
+                         [('f{}'.format(i), 'S{}'.format(f[2]))
+                          for i, f in enumerate(fields)])
+
+    shpname = os.path.splitext(filename)[0]
+    pth = os.path.dirname(shpname)
+    if pth and not os.path.isdir(pth):
+        os.makedirs(pth)
+    bbox = [np.inf, np.inf, -np.inf, -np.inf]
+    with open(shpname + '.shp', 'wb') as fshp, \
+            open(shpname + '.shx', 'wb') as fshx, \
+            open(shpname + '.dbf', 'wb') as fdbf:
+        # headers are rewritten once the bounding box is known
+        fshp.write(b'\x00' * 100)
+        fshx.write(b'\x00' * 100)
+        _write_dbf_header(fdbf, fields, nrecords)
+
+        for i0 in range(0, nrecords, chunksize):
+            recnums = np.arange(i0, min(i0 + chunksize, nrecords))
+            nodes = cells[recnums]
+            row, col = np.divmod(nodes, ncol)
+            if verts is None:
+                v = sr.get_vertices(row, col)
+            else:
+                v = verts[nodes]
+
+            # polygon records
+            recs = np.empty(len(nodes), dtype=_shp_polygon_dtype)
+            recs['recnum'] = recnums + 1
+            recs['length'] = (_shp_polygon_dtype.itemsize - 8) // 2
+            recs['shapetype'] = 5
+            vmin, vmax = v.min(axis=1), v.max(axis=1)
+            recs['bbox'] = np.column_stack((vmin, vmax))
+            recs['nparts'] = 1
+            recs['npoints'] = 5
+            recs['parts'] = 0
+            recs['points'] = v
+            fshp.write(recs.tobytes())
+            bbox[:2] = np.minimum(bbox[:2], vmin.min(axis=0))
+            bbox[2:] = np.maximum(bbox[2:], vmax.max(axis=0))
+
+            # index records
+            idx = np.empty(len(nodes), dtype=[('offset', '>i4'),
+                                              ('length', '>i4')])
+            idx['offset'] = (100 +
+                             recnums * _shp_polygon_dtype.itemsize) // 2
+            idx['length'] = recs['length']
+            fshx.write(idx.tobytes())
+
+            # attribute records
+            dbfrecs = np.empty(len(nodes), dtype=rec_dtype)
+            dbfrecs['deletion'] = b' '
+            dbfrecs['f0'] = _format_int_field(row + 1, 10)
+            dbfrecs['f1'] = _format_int_field(col + 1, 10)
+            for i, array in enumerate(arrays):
+                a = array[row, col]
+                if fields[i + 2][3] == 0:
+                    txt = _format_int_field(a, 18)
+                else:
+                    a = np.where(np.isnan(a), nan_val, a)
+                    txt = np.char.mod('%20.12f', a)
+                    toolong = np.char.str_len(txt) > 20
+                    if toolong.any():
+                        txt[toolong] = np.char.mod('%20.12e', a[toolong])
+                dbfrecs['f{}'.format(i + 2)] = txt
+            fdbf.write(dbfrecs.tobytes())
+        fdbf.write(b'\x1a')
+
+        if nrecords == 0:
+            bbox = [0., 0., 0., 0.]
+        _write_shp_header(fshp,
+                          50 + nrecords * _shp_polygon_dtype.itemsize // 2,
+                          bbox)
+        _write_shp_header(fshx, 50 + nrecords * 4, bbox)
     print('wrote {}'.format(filename))
+    # write the projection file
+    if epsg is not None or prj is not None:
+        write_prj(filename, epsg, prj)
+
+
+# fixed size polygon record (one part, five points) of a grid cell
+_shp_polygon_dtype = np.dtype([('recnum', '>i4'), ('length', '>i4'),
+                               ('shapetype', '<i4'), ('bbox', '<f8', 4),
+                               ('nparts', '<i4'), ('npoints', '<i4'),
+                               ('parts', '<i4'), ('points', '<f8', (5, 2))])
+
+
+def _format_int_field(a, width):
+    """Right justify integers in a dBase numeric field of width characters
+    without formatting each value in python."""
+    a = np.asarray(a).astype(np.int64)
+    v = np.abs(a)
+    chars = np.full((a.shape[0], width), ord(' '), dtype=np.uint8)
+    ndigits = np.zeros(a.shape[0], dtype=np.int)
+    p = 1
+    for k in range(width):
+        present = (v >= p) | (k == 0)
+        if not present.any():
+            break
+        chars[present, width - 1 - k] = 48 + (v[present] // p) % 10
+        ndigits += present
+        p *= 10
+    neg = np.flatnonzero(a < 0)
+    chars[neg, np.maximum(width - 1 - ndigits[neg], 0)] = ord('-')
+    return chars.view('S{}'.format(width)).ravel()
+
+
+def _write_shp_header(f, length, bbox):
+    """Write the 100 byte header of a polygon .shp or .shx file."""
+    f.seek(0)
+    f.write(struct.pack('>6i', 9994, 0, 0, 0, 0, 0))
+    f.write(struct.pack('>i', length))
+    f.write(struct.pack('<2i', 1000, 5))
+    f.write(struct.pack('<4d', *bbox))
+    f.write(struct.pack('<4d', 0., 0., 0., 0.))
+
+
+def _write_dbf_header(f, fields, nrecords):
+    """Write a dBase III header with (name, type, size, decimal) fields."""
+    year, month, day = time.localtime()[:3]
+    headerlength = len(fields) * 32 + 33
+    recordlength = sum([fld[2] for fld in fields]) + 1
+    f.write(struct.pack('<BBBBLHH20x', 3, year - 1900, month, day, nrecords,
+                        headerlength, recordlength))
+    for name, fieldtype, size, decimal in fields:
+        name = name.replace(' ', '_').encode('ascii')[:10]
+        f.write(struct.pack('<11sc4xBB14x', name, fieldtype.encode('ascii'),
+                            size, decimal))
+    f.write(b'\r')
+
+
+def _get_grid_attribute_arrays(array_dict, nrow, ncol):
+    """
+    Get the attribute names and (nrow, ncol) arrays for a grid shapefile,
+    sorted by name. Util2d, Util3d, Transient2d and 3D array values are
+    split into an array for each layer or stress period.
+    """
+    names, arrays = [], []
+    for name in sorted(array_dict.keys()):
+        value = array_dict[name]
+        if isinstance(value, Util2d):
+            layers = [(name, value.array)]
+        elif isinstance(value, Util3d):
+            layers = [('{}_{:03d}'.format(name, k + 1), u2d.array)
+                      for k, u2d in enumerate(value)]
+        elif isinstance(value, Transient2d):
+            layers, u2darrays = [], {}
+            for kper in range(value.model.nper):
+                u2d = value[kper]
+                # periods reusing the previous data share the same array
+                if id(u2d) not in u2darrays:
+                    u2darrays[id(u2d)] = u2d.array
+                layers.append(('{}_{:03d}'.format(name, kper + 1),
+                               u2darrays[id(u2d)]))
+        else:
+            value = np.asarray(value)
+            if value.ndim == 3 and value.shape[0] == 1:
+                layers = [(name, value[0])]
+            elif value.ndim == 3:
+                layers = [('{}_{:03d}'.format(name, k + 1), value[k])
+                          for k in range(value.shape[0])]
+            else:
+                layers = [(name, value)]
+        for lname, array in layers:
+            if array.shape != (nrow, ncol):
+                raise Exception('write_grid_shapefile(): array ' +
+                                '{} does not have a '.format(lname) +
+                                'shape of ({}, {})'.format(nrow, ncol))
+            names.append(lname)
+            arrays.append(array)
+    return names, arrays
+
 
 def write_grid_shapefile2(filename, sr, array_dict, nan_val=-1.0e9,
-                          epsg=None, prj=None):
-    sf = import_shapefile()
-    verts = copy.deepcopy(sr.vertices)
+                          epsg=None, prj=None, active=None, chunksize=100000):
+    """
+    Write a grid shapefile with array_dict attributes. The shapefile is
+    written by write_grid_shapefile.
 
-    w = sf.Writer(5)  # polygon
-    w.autoBalance = 1
-    # set up the attribute fields
-    names = ['row', 'column'] + list(array_dict.keys())
-    names = enforce_10ch_limit(names)
-    dtypes = [('row', np.dtype('int')), ('column', np.dtype('int'))] + \
-             [(name, arr.dtype) for name, arr in array_dict.items()]
-
-    # set-up array of attributes of shape ncells x nattributes
-    col = list(range(1, sr.ncol + 1)) * sr.nrow
-    row = sorted(list(range(1, sr.nrow + 1)) * sr.ncol)
-    at = np.vstack(
-        [row, col] + [arr.ravel() for arr in array_dict.values()]).transpose()
-    at[np.isnan(at)] = nan_val
-
-    for i, npdtype in enumerate(dtypes):
-        w.field(names[i], *get_pyshp_field_info(npdtype[1].name))
-
-    for i, r in enumerate(at):
-        w.poly([verts[i]])
-        w.record(*r)
-    w.save(filename)
-    print('wrote {}'.format(filename))
-    # write the projection file
-    write_prj(filename, epsg, prj)
+    Parameters
+    ----------
+    filename : string
+        name of the shapefile to write
+    sr : spatial reference instance
+        spatial reference object for model grid
+    array_dict : dict
+       Dictionary of name and 2D array pairs.  Additional 2D arrays to add as
+       attributes to the grid shapefile.
+    nan_val : float
+        value written for nan values in the attribute arrays.
+        (default is -1.0e9)
+    epsg : int
+        EPSG code used to write the projection (.prj) file. (default is None)
+    prj : str
+        Existing projection file to copy to the .prj file. (default is None)
+    active : numpy.ndarray
+        (nrow, ncol) array (e.g. ibound) that is non-zero for the cells
+        written to the shapefile. If active is three-dimensional, cells that
+        are active in any layer are written. All cells are written if active
+        is None. (default is None)
+    chunksize : int
+        number of cells processed at a time. (default is 100000)
+
+    Returns
+    -------
+    None
+
+    """
+    write_grid_shapefile(filename, sr, array_dict, nan_val=nan_val,
+                         chunksize=chunksize, epsg=epsg, prj=prj,
+                         active=active)
 
 
 def model_attributes_to_shapefile(filename, ml, package_names=None,
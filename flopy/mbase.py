@@ -1299,10 +1299,127 @@ class BaseModel(object):
         return
 
 
+def _get_normal_msg(normal_msg):
+    """
+    Convert normal_msg to a list of lower case strings for comparison.
+
+    """
+    if isinstance(normal_msg, str):
+        normal_msg = [normal_msg.lower()]
+    elif isinstance(normal_msg, list):
+        for idx, s in enumerate(normal_msg):
+            normal_msg[idx] = s.lower()
+    return normal_msg
+
+
+def _get_model_argv(exe_name, namefile, model_ws='./', cargs=None,
+                    silent=False):
+    """
+    Check that the program and namefile exist and return the list of
+    arguments to pass to Popen.
+
+    """
+    exe = which(exe_name)
+    if exe is None:
+        import platform
+        if platform.system() in 'Windows':
+            if not exe_name.lower().endswith('.exe'):
+                exe = which(exe_name + '.exe')
+    if exe is None:
+        s = 'The program {} does not exist or is not executable.'.format(
+            exe_name)
+        raise Exception(s)
+    else:
+        if not silent:
+            s = 'FloPy is using the following ' + \
+                ' executable to run the model: {}'.format(exe)
+            print(s)
+
+    if namefile is not None:
+        if not os.path.isfile(os.path.join(model_ws, namefile)):
+            s = 'The namefile for this model ' + \
+                'does not exists: {}'.format(namefile)
+            raise Exception(s)
+
+    # create a list of arguments to pass to Popen
+    argv = [exe_name]
+    if namefile is not None:
+        argv.append(namefile)
+
+    # add additional arguments to Popen arguments
+    if cargs is not None:
+        if isinstance(cargs, str):
+            cargs = [cargs]
+        for t in cargs:
+            argv.append(t)
+    return argv
+
+
+def _run_model_process(argv, model_ws, normal_msg, silent=False,
+                       report=False, timeout=None, prefix='', lock=None):
+    """
+    Run a model with Popen and read its stdout line by line until the
+    model finishes.  The model is killed if it is still running after
+    timeout seconds.
+
+    Returns
+    -------
+    (success, buff, returncode, timed_out)
+
+    """
+    success = False
+    buff = []
+    proc = sp.Popen(argv,
+                    stdout=sp.PIPE, stderr=sp.STDOUT, cwd=model_ws)
+
+    # kill the model if it runs longer than timeout seconds
+    timed_out = []
+    timer = None
+    if timeout is not None:
+        def kill():
+            if proc.poll() is None:
+                timed_out.append(True)
+                proc.kill()
+
+        timer = threading.Timer(timeout, kill)
+        timer.daemon = True
+        timer.start()
+
+    try:
+        while True:
+            line = proc.stdout.readline()
+            c = line.decode('utf-8')
+            if c != '':
+                for msg in normal_msg:
+                    if msg in c.lower():
+                        success = True
+                        break
+                c = c.rstrip('\r\n')
+                if not silent:
+                    if lock is None:
+                        print('{}{}'.format(prefix, c))
+                    else:
+                        with lock:
+                            print('{}{}'.format(prefix, c))
+                if report == True:
+                    buff.append(c)
+            else:
+                break
+        returncode = proc.wait()
+    finally:
+        if timer is not None:
+            timer.cancel()
+        proc.stdout.close()
+
+    if timed_out:
+        success = False
+    return success, buff, returncode, len(timed_out) > 0
+
+
 def run_model(exe_name, namefile, model_ws='./',
               silent=False, pause=False, report=False,
               normal_msg='normal termination',
-              async=False, cargs=None):
+              async=False, cargs=None, timeout=None):
     """
     This function will run the model using subprocess.Popen.  It
     communicates with the model's stdout asynchronously and reports
@@ -1337,6 +1454,10 @@ def run_model(exe_name, namefile, model_ws='./',
     cargs : str or list of strings
         additional command line arguments to pass to the executable.
         Default is None
+    timeout : float
+        maximum run time in seconds.  The model is killed and the run is
+        not successful if it takes longer.  Only used if async is False.
+        Default is None
     Returns
     -------
     (success, buff)
@@ -1348,34 +1469,17 @@ def run_model(exe_name, namefile, model_ws='./',
     buff = []
 
     # convert normal_msg to lower case for comparison
-    if isinstance(normal_msg, str):
-        normal_msg = [normal_msg.lower()]
-    elif isinstance(normal_msg, list):
-        for idx, s in enumerate(normal_msg):
-            normal_msg[idx] = s.lower()
+    normal_msg = _get_normal_msg(normal_msg)
 
     # Check to make sure that program and namefile exist
-    exe = which(exe_name)
-    if exe is None:
-        import platform
-        if platform.system() in 'Windows':
-            if not exe_name.lower().endswith('.exe'):
-                exe = which(exe_name + '.exe')
-    if exe is None:
-        s = 'The program {} does not exist or is not executable.'.format(
-            exe_name)
-        raise Exception(s)
-    else:
-        if not silent:
-            s = 'FloPy is using the following ' + \
-                ' executable to run the model: {}'.format(exe)
-            print(s)
+    argv = _get_model_argv(exe_name, namefile, model_ws=model_ws,
+                           cargs=cargs, silent=silent)
 
-    if namefile is not None:
-        if not os.path.isfile(os.path.join(model_ws, namefile)):
-            s = 'The namefile for this model ' + \
-                'does not exists: {}'.format(namefile)
-            raise Exception(s)
+    if not async:
+        success, buff = _run_model_process(argv, model_ws, normal_msg,
+                                           silent=silent, report=report,
+                                           timeout=timeout)[:2]
+        return success, buff
 
     # simple little function for the thread to target
     def q_output(output, q):
@@ -1384,40 +1488,10 @@ def run_model(exe_name, namefile, model_ws='./',
             # time.sleep(1)
             # output.close()
 
-    # create a list of arguments to pass to Popen
-    argv = [exe_name]
-    if namefile is not None:
-        argv.append(namefile)
-
-    # add additional arguments to Popen arguments
-    if cargs is not None:
-        if isinstance(cargs, str):
-            cargs = [cargs]
-        for t in cargs:
-            argv.append(t)
-
     # run the model with Popen
     proc = sp.Popen(argv,
                     stdout=sp.PIPE, stderr=sp.STDOUT, cwd=model_ws)
 
-    if not async:
-        while True:
-            line = proc.stdout.readline()
-            c = line.decode('utf-8')
-            if c != '':
-                for msg in normal_msg:
-                    if msg in c.lower():
-                        success = True
-                        break
-                c = c.rstrip('\r\n')
-                if not silent:
-                    print('{}'.format(c))
-                if report == True:
-                    buff.append(c)
-            else:
-                break
-        return success, buff
-
     # some tricks for the async stdout reading
     q = Queue.Queue()
     thread = threading.Thread(target=q_output, args=(proc.stdout, q))
@@ -1429,7 +1503,8 @@ def run_model(exe_name, namefile, model_ws='./',
     lastsec = 0.
     while True:
         try:
-            line = q.get_nowait()
+            # block for a short time instead of spinning on the queue
+            line = q.get(timeout=0.1)
         except Queue.Empty:
             pass
         else:
@@ -1453,11 +1528,14 @@ def run_model(exe_name, namefile, model_ws='./',
             break
     proc.wait()
     thread.join(timeout=1)
-    buff.extend(proc.stdout.readlines())
+    while not q.empty():
+        buff.append(q.get().decode().lower().strip())
+    buff.extend([line.decode().lower().strip() for line in
+                 proc.stdout.readlines()])
     proc.stdout.close()
 
     for line in buff:
-        if normal_msg in line:
+        if any(msg in line for msg in normal_msg):
             print("success")
             success = True
             break
@@ -1465,3 +1543,126 @@ def run_model(exe_name, namefile, model_ws='./',
     if pause:
         input('Press Enter to continue...')
     return success, buff
+
+
+def run_models(jobs, nworkers=None, silent=True, report=False,
+               normal_msg='normal termination', cargs=None, timeout=None):
+    """
+    Run a batch of models, for example the model variants of a calibration
+    or Monte Carlo analysis, with a bounded number of concurrent model
+    runs.  The jobs are put in a queue and each worker takes the next job
+    from the queue as soon as its previous model run has finished.
+
+    Parameters
+    ----------
+    jobs : list
+        list of (exe_name, namefile, model_ws) or
+        (exe_name, namefile, model_ws, cargs) tuples.  See run_model for
+        a description of the items.  A flopy model can also be passed,
+        in which case its exe_name, namefile and model_ws are used.
+    nworkers : int
+        maximum number of models that are run at the same time.
+        (default is the number of cpus)
+    silent : boolean
+        Do not echo model stdout to the screen.  If False, each line is
+        prefixed with the zero-based job number. (default is True)
+    report : boolean, optional
+        Save stdout lines of each run to a list (buff) in the
+        results. (default is False)
+    normal_msg : str or list of str
+        Normal termination message used to determine if a
+        run terminated normally. (default is 'normal termination')
+    cargs : str or list of strings
+        additional command line arguments to pass to the executable of
+        jobs that do not define their own cargs. Default is None
+    timeout : float
+        maximum run time of each job in seconds.  Models that run longer
+        are killed and are not successful. Default is None
+
+    Returns
+    -------
+    results : np.recarray
+        recarray with one record per job, in the order of jobs, with
+        exe_name, namefile, model_ws, success, returncode, timed_out,
+        elapsed (wall time in seconds) and buff (list of stdout lines)
+        fields
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> jobs = [('mf2005', 'model.nam', ws) for ws in ['run0', 'run1']]
+    >>> results = flopy.run_models(jobs, nworkers=2, timeout=600.)
+    >>> failed = results.model_ws[~results.success]
+
+    """
+    normal_msg = _get_normal_msg(normal_msg)
+
+    # check all of the jobs before any model is run
+    argvs = []
+    for job in jobs:
+        if isinstance(job, BaseModel):
+            job = (job.exe_name, job.namefile, job.model_ws)
+        if len(job) == 3:
+            job = tuple(job) + (cargs,)
+        exe_name, namefile, model_ws, jcargs = job
+        argv = _get_model_argv(exe_name, namefile, model_ws=model_ws,
+                               cargs=jcargs, silent=True)
+        argvs.append((exe_name, namefile, model_ws, argv))
+
+    dtype = np.dtype([('exe_name', np.object), ('namefile', np.object),
+                      ('model_ws', np.object), ('success', np.bool),
+                      ('returncode', np.int), ('timed_out', np.bool),
+                      ('elapsed', np.float), ('buff', np.object)])
+    results = np.recarray(len(argvs), dtype=dtype)
+    for idx, (exe_name, namefile, model_ws, argv) in enumerate(argvs):
+        results[idx] = (exe_name, namefile, model_ws, False, 0, False, 0.,
+                        None)
+
+    q = Queue.Queue()
+    for idx in range(len(argvs)):
+        q.put(idx)
+    lock = threading.Lock()
+    errors = []
+
+    def worker():
+        while not errors:
+            try:
+                idx = q.get_nowait()
+            except Queue.Empty:
+                break
+            model_ws, argv = argvs[idx][2:]
+            start = datetime.now()
+            try:
+                success, buff, returncode, timed_out = \
+                    _run_model_process(argv, model_ws, normal_msg,
+                                       silent=silent, report=report,
+                                       timeout=timeout,
+                                       prefix='[{}] '.format(idx),
+                                       lock=lock)
+            except Exception as e:
+                errors.append(e)
+                break
+            elapsed = (datetime.now() - start).total_seconds()
+            with lock:
+                results.success[idx] = success
+                results.returncode[idx] = returncode
+                results.timed_out[idx] = timed_out
+                results.elapsed[idx] = elapsed
+                results.buff[idx] = buff
+
+    if nworkers is None:
+        import multiprocessing
+        nworkers = multiprocessing.cpu_count()
+    nworkers = max(1, min(nworkers, len(argvs)))
+    threads = []
+    for i in range(nworkers):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,205 @@
+"""
+mbase_async module
+  This module contains asyncio versions of the mbase.run_model function
+  that allow many models to be run concurrently from one event loop.
+  The module requires python 3.6 or later.
+
+"""
+
+import re
+import asyncio
+from datetime import datetime
+from .mbase import _get_normal_msg, _get_model_argv
+
+_timestep_re = re.compile(r'stress\s+period:?\s*(\d+)\s*,?\s*'
+                          r'time\s+step:?\s*(\d+)', re.IGNORECASE)
+
+
+def parse_model_output(line, normal_msg='normal termination'):
+    """
+    Parse a line of model stdout into a progress event.
+
+    Parameters
+    ----------
+    line : str
+        line of model stdout without the line terminator
+    normal_msg : str or list of str
+        Normal termination message. (default is 'normal termination')
+
+    Returns
+    -------
+    event : dict
+        dictionary with the type of the event and the line.  The type is
+        'timestep' for lines that report the stress period and time step
+        that is being solved (kper and kstp are added as zero-based
+        integers), 'convergence_failure' for lines that report that the
+        solver failed to converge, 'normal_termination' for lines that
+        contain normal_msg and 'output' for all other lines.
+
+    """
+    normal_msg = _get_normal_msg(normal_msg)
+    event = {'type': 'output', 'line': line}
+    lower = line.lower()
+    match = _timestep_re.search(line)
+    if match is not None:
+        event['type'] = 'timestep'
+        event['kper'] = int(match.group(1)) - 1
+        event['kstp'] = int(match.group(2)) - 1
+    elif 'fail' in lower and 'conver' in lower:
+        event['type'] = 'convergence_failure'
+    else:
+        for msg in normal_msg:
+            if msg in lower:
+                event['type'] = 'normal_termination'
+                break
+    return event
+
+
+async def iter_model_events(exe_name, namefile, model_ws='./',
+                            normal_msg='normal termination', cargs=None,
+                            timeout=None):
+    """
+    Run a model with asyncio.create_subprocess_exec and yield a progress
+    event for each line of model stdout.  The event loop is free to run
+    other tasks, for example other models, while the model is waiting
+    for output.
+
+    Parameters
+    ----------
+    exe_name : str
+        Executable name (with path, if necessary) to run.
+    namefile : str
+        Namefile of model to run. See mbase.run_model.
+    model_ws : str
+        Path to the location of the namefile. (default is the
+        current working directory - './')
+    normal_msg : str or list of str
+        Normal termination message used to determine if the
+        run terminated normally. (default is 'normal termination')
+    cargs : str or list of strings
+        additional command line arguments to pass to the executable.
+        Default is None
+    timeout : float
+        maximum run time in seconds.  The model is killed and the run is
+        not successful if it takes longer.  Default is None
+
+    Yields
+    ------
+    event : dict
+        progress event for each line of stdout (see parse_model_output)
+        with the elapsed run time in seconds added.  The last event has
+        type 'finished' with success, returncode and timed_out items.
+
+    """
+    normal_msg = _get_normal_msg(normal_msg)
+    argv = _get_model_argv(exe_name, namefile, model_ws=model_ws,
+                           cargs=cargs, silent=True)
+    proc = await asyncio.create_subprocess_exec(
+        *argv, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT, cwd=model_ws)
+
+    start = datetime.now()
+    success = False
+    timed_out = False
+    try:
+        while True:
+            elapsed = (datetime.now() - start).total_seconds()
+            try:
+                if timeout is None:
+                    line = await proc.stdout.readline()
+                else:
+                    line = await asyncio.wait_for(proc.stdout.readline(),
+                                                  max(timeout - elapsed, 0.))
+            except asyncio.TimeoutError:
+                timed_out = True
+                proc.kill()
+                break
+            if not line:
+                break
+            event = parse_model_output(
+                line.decode('utf-8', 'replace').rstrip('\r\n'), normal_msg)
+            if event['type'] == 'normal_termination':
+                success = True
+            event['elapsed'] = (datetime.now() - start).total_seconds()
+            yield event
+        returncode = await proc.wait()
+    except BaseException:
+        # stop the model if the consumer stops iterating or is cancelled
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+    yield {'type': 'finished', 'success': success and not timed_out,
+           'returncode': returncode, 'timed_out': timed_out,
+           'elapsed': (datetime.now() - start).total_seconds()}
+
+
+async def run_model_async(exe_name, namefile, model_ws='./', silent=False,
+                          report=False, normal_msg='normal termination',
+                          cargs=None, timeout=None, callback=None):
+    """
+    Coroutine version of mbase.run_model.  Several models can be run at
+    the same time by awaiting run_model_async for each of them, for
+    example with asyncio.gather.
+
+    Parameters
+    ----------
+    exe_name : str
+        Executable name (with path, if necessary) to run.
+    namefile : str
+        Namefile of model to run. See mbase.run_model.
+    model_ws : str
+        Path to the location of the namefile. (default is the
+        current working directory - './')
+    silent : boolean
+        Echo run information to screen (default is False).
+    report : boolean, optional
+        Save stdout lines to a list (buff) which is returned. (default is
+        False).
+    normal_msg : str or list of str
+        Normal termination message used to determine if the
+        run terminated normally. (default is 'normal termination')
+    cargs : str or list of strings
+        additional command line arguments to pass to the executable.
+        Default is None
+    timeout : float
+        maximum run time in seconds. Default is None
+    callback : callable
+        function that is called with every progress event (see
+        iter_model_events), for example to report the time step that is
+        being solved.  Default is None
+
+    Returns
+    -------
+    (success, buff)
+    success : boolean
+    buff : list of lines of stdout
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> from flopy.mbase_async import run_model_async
+    >>> runs = [run_model_async('mf2005', 'model.nam', model_ws=ws,
+    ...                         silent=True) for ws in ['run0', 'run1']]
+    >>> loop = asyncio.get_event_loop()
+    >>> results = loop.run_until_complete(asyncio.gather(*runs))
+
+    """
+    success = False
+    buff = []
+    async for event in iter_model_events(exe_name, namefile,
+                                         model_ws=model_ws,
+                                         normal_msg=normal_msg, cargs=cargs,
+                                         timeout=timeout):
+        if callback is not None:
+            callback(event)
+        if event['type'] == 'finished':
+            success = event['success']
+            continue
+        if not silent:
+            print(event['line'])
+        if report:
+            buff.append(event['line'])
+    return success, buff
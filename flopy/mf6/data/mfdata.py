@@ -1,7 +1,9 @@
 from operator import itemgetter
 from copy import deepcopy
+import os
 import sys
 import inspect
+import tempfile
 from shutil import copyfile
 from collections import OrderedDict
 from enum import Enum
@@ -14,6 +16,14 @@ from ..data.mfdatautil import DatumUtil, FileIter, MultiListIter, ArrayUtil, \
                               ConstIter, ArrayIndexIter, MultiList
 from ..coordinates.modeldimensions import DataDimensions, DiscretizationType
 
+# header of every record in a binary array file.  this is the header MODFLOW
+# writes to binary head files, m1 and m2 are the number of columns and rows
+# of the record and m3 is the layer number.
+_binary_header_dtype = np.dtype([('kstp', '<i4'), ('kper', '<i4'),
+                                 ('pertim', '<f8'), ('totim', '<f8'),
+                                 ('text', 'S16'), ('m1', '<i4'),
+                                 ('m2', '<i4'), ('m3', '<i4')])
+
 
 class MFComment(object):
     """
@@ -239,6 +249,10 @@ class LayerStorage(object):
     ----------
     internal_data : ndarray or recarray
         data being stored, if full data is being stored internally in memory
+    columns : ColumnarList
+        list data being stored internally in columns, None if the data is
+        not stored in columns.  internal_data returns the columns as a new
+        recarray
     data_const_value : int/float
         constant value of data being stored, if data is a constant
     data_storage_type : DataStorageType
@@ -259,6 +273,9 @@ class LayerStorage(object):
         must be "internal_constant".
     get_data(layer) : ndarray/recarray/string
         returns the data for the specified layer
+    has_internal_data() : bool
+        returns whether data is stored internally, without building a
+        recarray from the columns
     set_data(data, layer=None, multiplier=[1.0]
         sets the data being stored to "data" for layer "layer", replacing all
         data for that layer.  a multiplier can be specified.
@@ -309,6 +326,25 @@ class LayerStorage(object):
     def get_data(self):
         return self._data_storage_parent.get_data(self._lay_indexes, False)
 
+    @property
+    def internal_data(self):
+        if isinstance(self._internal_data, ColumnarList):
+            return self._internal_data.to_recarray()
+        return self._internal_data
+
+    @internal_data.setter
+    def internal_data(self, data):
+        self._internal_data = data
+
+    @property
+    def columns(self):
+        if isinstance(self._internal_data, ColumnarList):
+            return self._internal_data
+        return None
+
+    def has_internal_data(self):
+        return self._internal_data is not None
+
     def get_data_const_val(self):
         if isinstance(self.data_const_value, list):
             return self.data_const_value[0]
@@ -316,6 +352,140 @@ class LayerStorage(object):
             return self.data_const_value
 
 
+class ColumnarList(object):
+    """
+    Stores the records of list data in columns.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype
+        dtype of the recarray that holds the records
+    columns : OrderedDict
+        column of every field in dtype.  cellid fields can be stored as
+        integer arrays with one row per record and one column per cellid
+        index
+
+    Attributes
+    ----------
+    dtype : numpy.dtype
+        dtype of the recarray that holds the records
+    columns : OrderedDict
+        read-only column of every field
+    nbytes : int
+        number of bytes used by the columns
+
+    Methods
+    -------
+    from_recarray(data, cellid_names) : ColumnarList
+        stores the records of recarray "data" in columns.  cellid fields in
+        cellid_names that only contain tuples of integers are stored as
+        integer arrays
+    to_recarray() : recarray
+        returns a new recarray of the records with the cellids as tuples
+    equals(other) : bool
+        returns whether ColumnarList "other" contains the same records
+
+    See Also
+    --------
+
+    Notes
+    -----
+    A recarray of list data holds a python tuple of python integers for
+    every cellid.  The columns hold the cellid indices of all records in a
+    single contiguous integer array and every other field in an array of
+    the field type, so the memory used by a record is the size of the raw
+    data.  Columns are read-only, which allows the same ColumnarList to be
+    shared by several stress periods.
+
+    Examples
+    --------
+
+
+    """
+    def __init__(self, dtype, columns):
+        self.dtype = dtype
+        self.columns = columns
+        for column in self.columns.values():
+            column.flags.writeable = False
+
+    def __repr__(self):
+        return repr(self.to_recarray())
+
+    def __str__(self):
+        return str(self.to_recarray())
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def nbytes(self):
+        return sum([column.nbytes for column in self.columns.values()])
+
+    @staticmethod
+    def from_recarray(data, cellid_names=()):
+        columns = OrderedDict()
+        for name in data.dtype.names:
+            column = None
+            if name in cellid_names:
+                column = ColumnarList._get_cellid_array(data[name])
+            if column is None:
+                column = np.array(data[name])
+            columns[name] = column
+        return ColumnarList(data.dtype, columns)
+
+    @staticmethod
+    def _get_cellid_array(column):
+        values = column.tolist()
+        if len(values) == 0:
+            return None
+        for value in values:
+            if type(value) != tuple:
+                return None
+        cellid = np.array(values)
+        if cellid.ndim != 2 or cellid.dtype.kind not in 'iu' or \
+                cellid.max() > np.iinfo(np.int32).max:
+            return None
+        return cellid.astype(np.int32)
+
+    def to_recarray(self):
+        data = np.empty(len(self), dtype=self.dtype)
+        for name, column in self.columns.items():
+            if column.ndim == 2:
+                # convert cellid indices to python tuples
+                cellid = np.frompyfunc(lambda *index: index,
+                                       column.shape[1], 1)
+                data[name] = cellid(*column.T.astype(object))
+            else:
+                data[name] = column
+        return data.view(np.recarray)
+
+    def equals(self, other):
+        if other is self:
+            return True
+        if not isinstance(other, ColumnarList) or \
+                self.dtype.names != other.dtype.names or \
+                len(self) != len(other):
+            return False
+        for name, column in self.columns.items():
+            other_column = other.columns[name]
+            if column.shape != other_column.shape or \
+                    column.dtype != other_column.dtype:
+                return False
+            if column.dtype.kind == 'f':
+                equal = (column == other_column) | (np.isnan(column) &
+                                                    np.isnan(other_column))
+                if not equal.all():
+                    return False
+            elif not np.array_equal(column, other_column):
+                return False
+        return True
+
+
 class DataStorage(object):
     """
     Stores and retrieves data.
@@ -378,6 +548,10 @@ class DataStorage(object):
         returns true if data exists for the specified layer, false otherwise
     get_data(layer) : ndarray/recarray/string
         returns the data for the specified layer
+    get_columns() : ColumnarList
+        returns the list data stored in columns.  if the data are stored
+        in columns the stored columns are returned without a copy.  data
+        structure type must be recarray
     update_item(data, key_index)
         updates the data in a recarray at index "key_index" with data "data".
         data is a list containing all data for a single record in the
@@ -393,8 +567,9 @@ class DataStorage(object):
     store_internal(data, layer=None, const=False, multiplier=[1.0])
         store data "data" at layer "layer" internally
     store_external(file_path, layer=None, multiplier=[1.0], print_format=None,
-        data=None, do_not_verify=False) store data "data" at layer "layer"
-        externally in file "file_path"
+        data=None, do_not_verify=False, binary=False) store data "data" at
+        layer "layer" externally in file "file_path".  if binary is True the
+        file is a MODFLOW 6 binary file
     external_to_external(new_external_file, multiplier=None, layer=None)
         copies existing external data to the new file location and points to
         the new file
@@ -404,12 +579,13 @@ class DataStorage(object):
         store_internal is True it also storages the data internally,
         changing the storage type for "layer_num" layer to internal.
     internal_to_external(new_external_file, multiplier=None, layer=None,
-                         print_format=None)
+                         print_format=None, binary=False)
         stores existing internal data for layer "layer" to external file
         "new_external_file"
     read_data_from_file(layer, fd=None, multiplier=None) : (ndarray, int)
         reads in data from a given file "fd" as data from layer "layer".
-        returns data as an ndarray along with the size of the data
+        returns data as an ndarray along with the size of the data.  binary
+        external files are memory-mapped instead of read
     to_string(val, type, is_cellid=False, possible_cellid=False)
         converts data "val" of type "type" to a string.  is_cellid is True if
         the data type is known to be a cellid and is treated as such.  when
@@ -556,7 +732,7 @@ class DataStorage(object):
         # Assemble strings for internal array data
         for index, storage in enumerate(self.layer_storage.elements()):
             if storage.data_storage_type == DataStorageType.internal_array:
-                if storage.internal_data is not None:
+                if storage.has_internal_data():
                     header = self._get_layer_header_str(index)
                     if formal:
                         data_str = '{}Layer_{}{{{}}}' \
@@ -681,6 +857,21 @@ class DataStorage(object):
     def get_data(self, layer=None, apply_mult=True):
         return self._access_data(layer, True, apply_mult=apply_mult)
 
+    def get_columns(self):
+        layer_storage = self.layer_storage.first_item()
+        if layer_storage.data_storage_type == \
+                DataStorageType.internal_array and \
+                layer_storage.columns is not None:
+            return layer_storage.columns
+        if layer_storage.data_storage_type == \
+                DataStorageType.external_file and layer_storage.binary:
+            # binary list files are read into columns directly
+            return self._read_binary_list()
+        data = self.get_data()
+        if data is None:
+            return None
+        return ColumnarList.from_recarray(data, self._get_cellid_names())
+
     def _access_data(self, layer, return_data=False, apply_mult=True):
         layer_check = self._resolve_layer(layer)
         if self.layer_storage[layer_check].data_storage_type == \
@@ -690,7 +881,7 @@ class DataStorage(object):
             else:
                 return True
         else:
-            if (self.layer_storage[layer_check].internal_data is None and
+            if (not self.layer_storage[layer_check].has_internal_data() and
               self.layer_storage[layer_check].data_storage_type ==
                     DataStorageType.internal_array) or \
               (self.layer_storage[layer_check].data_const_value is None and
@@ -699,7 +890,7 @@ class DataStorage(object):
                 return None
             if self.data_structure_type == DataStructureType.ndarray and \
                self.layer_storage[layer_check].data_const_value is None and \
-               self.layer_storage[layer_check].internal_data is None:
+               not self.layer_storage[layer_check].has_internal_data():
                 return None
             if not (layer is None or self.layer_storage.in_shape(layer)):
                 message = 'Layer "{}" is an invalid layer.'.format(layer)
@@ -728,12 +919,12 @@ class DataStorage(object):
                     else:
                         if self.data_structure_type == DataStructureType.scalar:
                             return self.layer_storage.first_item().\
-                                    internal_data is not None
+                                    has_internal_data()
                         check_storage = self.layer_storage[layer_check]
                         return (check_storage.data_const_value is not None and
                                 check_storage.data_storage_type ==
                                 DataStorageType.internal_constant) or (
-                                   check_storage.internal_data is not None and
+                                   check_storage.has_internal_data() and
                                    check_storage.data_storage_type ==
                                    DataStorageType.internal_array)
                 else:
@@ -776,7 +967,7 @@ class DataStorage(object):
                 if return_data:
                     return self.layer_storage[layer].internal_data
                 else:
-                    return self.layer_storage[layer].internal_data is not None
+                    return self.layer_storage[layer].has_internal_data()
             elif self.layer_storage[layer].data_storage_type == \
                     DataStorageType.internal_constant:
                 layer_storage = self.layer_storage[layer]
@@ -819,8 +1010,7 @@ class DataStorage(object):
                 self.build_type_list(data=data)
             self.set_data(np.rec.array(data, self._recarray_type_list))
         else:
-            if len(self.layer_storage.first_item().internal_data[0]) < \
-                    len(data[0]):
+            if len(internal_data[0]) < len(data[0]):
                 # Rebuild recarray to fit larger size
                 for index in range(len(internal_data[0]), len(data[0])):
                     self._duplicate_last_item()
@@ -831,8 +1021,7 @@ class DataStorage(object):
                 self.set_data(np.rec.array(internal_data_list,
                                            self._recarray_type_list))
             else:
-                if len(self.layer_storage.first_item().internal_data[0]) \
-                        > len(data[0]):
+                if len(internal_data[0]) > len(data[0]):
                     # Add placeholders to data
                     self._add_placeholders(data)
                 self.set_data(np.hstack(
@@ -989,7 +1178,7 @@ class DataStorage(object):
             resolved_path = \
                     self._simulation_data.mfpath.resolve_path(new_data[1],
                                                               model_name)
-            if self._verify_data(FileIter(resolved_path), layer):
+            if binary or self._verify_data(FileIter(resolved_path), layer):
                 # store location to file
                 self.store_external(new_data[1], layer, [multiplier],
                                     print_format=iprn, binary=binary,
@@ -1010,7 +1199,7 @@ class DataStorage(object):
         layer_index = []
         for index in self.layer_storage.indexes():
             if self.layer_storage[index].fname is not None or \
-                    self.layer_storage[index].internal_data is not None:
+                    self.layer_storage[index].has_internal_data():
                 layer_index.append(index)
         return layer_index
 
@@ -1039,8 +1228,10 @@ class DataStorage(object):
             else:
                 self.layer_storage.first_item().data_storage_type = \
                         DataStorageType.internal_array
-                if data is None or isinstance(data, np.recarray):
-                    self.layer_storage.first_item().internal_data = data
+                if data is None or isinstance(data, np.recarray) or \
+                        isinstance(data, ColumnarList):
+                    self.layer_storage.first_item().internal_data = \
+                        self._prep_list_storage(data)
                 else:
                     if autofill and data is not None:
                         if isinstance(data, tuple) and isinstance(data[0],
@@ -1131,6 +1322,22 @@ class DataStorage(object):
             self.layer_storage[layer].factor = multiplier
             self.layer_storage[layer].iprn = print_format
 
+    def _prep_list_storage(self, data):
+        # store lists in columns if the simulation is set up to do so
+        if self._simulation_data.columnar_list_storage:
+            if isinstance(data, np.recarray):
+                return ColumnarList.from_recarray(data,
+                                                  self._get_cellid_names())
+        elif isinstance(data, ColumnarList):
+            return data.to_recarray()
+        return data
+
+    def _get_cellid_names(self):
+        structure = self.data_dimensions.structure
+        return [data_item.name for data_item in
+                structure.data_item_structures
+                if getattr(data_item, 'is_cellid', False)]
+
     def _resolve_multitype_fields(self, data):
         # find any data fields where the data is not a consistent type
         itype_len = len(self._recarray_type_list)
@@ -1155,12 +1362,17 @@ class DataStorage(object):
                 # store data internally first so that a file entry can be generated
                 self.store_internal(data, layer, False, [multiplier], None,
                                     False, print_format)
-                ext_file_entry = self._get_file_entry()
-                # create external file and write file entry to the file
                 data_dim = self.data_dimensions
                 model_name = data_dim.package_dim.model_dim[0].model_name
                 fp = self._simulation_data.mfpath.resolve_path(file_path,
                                                                model_name)
+                if binary:
+                    self._write_binary_list(fp, self.get_columns())
+                    self.layer_storage.first_item().internal_data = None
+                    self._set_external(file_path, layer, print_format, binary)
+                    return
+                ext_file_entry = self._get_file_entry()
+                # create external file and write file entry to the file
                 try:
                     fd = open(fp, 'w')
                 except:
@@ -1189,6 +1401,12 @@ class DataStorage(object):
                 model_name = data_dim.package_dim.model_dim[0].model_name
                 fp = self._simulation_data.mfpath.resolve_path(file_path,
                                                                model_name)
+                if binary:
+                    self._write_binary_array(fp, data, layer)
+                    self.layer_storage[layer].factor = multiplier
+                    self.layer_storage[layer].internal_data = None
+                    self._set_external(file_path, layer, print_format, binary)
+                    return
                 try:
                     fd = open(fp, 'w')
                 except:
@@ -1237,6 +1455,9 @@ class DataStorage(object):
                 self.layer_storage[layer].factor = multiplier
                 self.layer_storage[layer].internal_data = None
 
+        self._set_external(file_path, layer, print_format, binary)
+
+    def _set_external(self, file_path, layer, print_format, binary):
         # point to the external file and set flags
         self.layer_storage[layer].fname = file_path
         self.layer_storage[layer].iprn = print_format
@@ -1305,6 +1526,13 @@ class DataStorage(object):
                             binary=self.layer_storage[layer].binary)
 
     def external_to_internal(self, layer=None, store_internal=False):
+        if self.data_structure_type == DataStructureType.recarray and \
+                self.layer_storage.first_item().binary:
+            # load list from binary file
+            columns = self._read_binary_list()
+            if store_internal:
+                self.store_internal(columns)
+            return columns.to_recarray()
         # currently only support files containing ndarrays
         if self.data_structure_type != DataStructureType.ndarray:
             path = self.data_dimensions.structure.path
@@ -1325,23 +1553,29 @@ class DataStorage(object):
         else:
             # load data from external file
             data_out, current_size = self.read_data_from_file(layer)
-            if self.layer_storage[layer].factor is not None:
-                data_out = data_out * self.layer_storage[layer].factor
+            factor = self.layer_storage[layer].factor
+            if factor is not None and (factor != 1 or
+                                       not self.layer_storage[layer].binary):
+                data_out = data_out * factor
 
         if store_internal:
             self.store_internal(data_out, layer)
         return data_out
 
     def internal_to_external(self, new_external_file, multiplier=None,
-                             layer=None, print_format=None):
+                             layer=None, print_format=None, binary=False):
         if layer is None:
-            self.store_external(new_external_file, layer, multiplier,
-                                print_format,
-                                self.layer_storage.first_item().internal_data)
+            layer_storage = self.layer_storage.first_item()
+        else:
+            layer_storage = self.layer_storage[layer]
+        if layer_storage.data_storage_type == DataStorageType.external_file:
+            # converting between text and binary files, copy the data so
+            # that the old file can be replaced
+            data = np.array(self.read_data_from_file(layer)[0])
         else:
-            self.store_external(new_external_file, layer, multiplier,
-                                print_format,
-                                self.layer_storage[layer].internal_data)
+            data = layer_storage.internal_data
+        self.store_external(new_external_file, layer, multiplier,
+                            print_format, data, binary=binary)
 
     def read_data_from_file(self, layer, fd=None, multiplier=None,
                             print_format=None, data_item=None):
@@ -1361,6 +1595,8 @@ class DataStorage(object):
             model_dim = self.data_dimensions.package_dim.model_dim[0]
             read_file = self._simulation_data.mfpath.resolve_path(
                         self.layer_storage[layer].fname, model_dim.model_name)
+            if self.layer_storage[layer].binary:
+                return self._read_binary_array(read_file, layer)
             try:
                 fd = open(read_file, 'r')
             except:
@@ -1422,6 +1658,251 @@ class DataStorage(object):
         data_out = np.reshape(data_out, dimensions)
         return data_out, current_size
 
+    def _binary_exception(self, action, message):
+        type_, value_, traceback_ = sys.exc_info()
+        return MFDataException(self.data_dimensions.structure.get_model(),
+                               self.data_dimensions.structure.get_package(),
+                               self.data_dimensions.structure.path, action,
+                               self.data_dimensions.structure.name,
+                               inspect.stack()[1][3], type_, value_,
+                               traceback_, message,
+                               self._simulation_data.debug)
+
+    def _get_binary_type(self):
+        if self._data_type == DatumType.integer:
+            return np.dtype('<i4')
+        elif self._data_type == DatumType.double_precision:
+            return np.dtype('<f8')
+        message = 'Data "{}" can not be stored in a binary file.  Only ' \
+                  'integer and double precision data are supported' \
+                  '.'.format(self.data_dimensions.structure.name)
+        raise self._binary_exception('storing binary data', message)
+
+    def _read_binary_array(self, read_file, layer):
+        """
+        Reads layer "layer" from a binary array file.  Every record in the
+        file is a header followed by m1 * m2 values, so a binary head file
+        can be read as well.  The file is memory-mapped and the data
+        returned are a view of the file.
+        """
+        binary_type = self._get_binary_type()
+        isize = binary_type.itemsize
+        hsize = _binary_header_dtype.itemsize
+        dimensions = self.get_data_dimensions(layer)
+        data_size = self._get_data_size(layer)
+        try:
+            file_size = os.path.getsize(read_file)
+            mm = None
+            if file_size > 0:
+                mm = np.memmap(read_file, dtype=np.uint8, mode='c')
+        except (IOError, OSError, ValueError):
+            message = 'Unable to open binary file {}.  Make sure the file ' \
+                      'exists and is not locked.'.format(read_file)
+            raise self._binary_exception('reading binary file', message)
+
+        # find the position and size of the records
+        offsets = []
+        sizes = []
+        pos = 0
+        current_size = 0
+        while current_size < data_size and pos + hsize <= file_size:
+            header = mm[pos:pos + hsize].view(_binary_header_dtype)[0]
+            nval = int(header['m1']) * int(header['m2'])
+            if current_size == 0 and \
+                    file_size - hsize == data_size * isize:
+                # a single header for all layers
+                nval = data_size
+            nval = min(nval, data_size - current_size)
+            if nval <= 0 or pos + hsize + nval * isize > file_size:
+                break
+            offsets.append(pos + hsize)
+            sizes.append(nval)
+            current_size += nval
+            pos += hsize + nval * isize
+        if current_size != data_size:
+            message = 'Not enough data in binary file {} for data "{}".  ' \
+                      'Expected data size {} but only found ' \
+                      '{}.'.format(read_file,
+                                   self.data_dimensions.structure.name,
+                                   data_size, current_size)
+            raise self._binary_exception('reading binary file', message)
+
+        if len(offsets) == 1:
+            data_out = mm[offsets[0]:offsets[0] + sizes[0] * isize].view(
+                binary_type)
+        elif len(set(sizes)) == 1:
+            # records of the same size are evenly spaced
+            data_out = np.ndarray((len(offsets), sizes[0]), dtype=binary_type,
+                                  buffer=mm, offset=offsets[0],
+                                  strides=(hsize + sizes[0] * isize, isize))
+        else:
+            data_out = np.concatenate(
+                [mm[offset:offset + size * isize].view(binary_type)
+                 for offset, size in zip(offsets, sizes)])
+        return np.reshape(data_out, dimensions), current_size
+
+    def _write_binary_array(self, file_path, data, layer):
+        """
+        Writes layer "layer" to a binary array file with a single header.
+        MODFLOW 6 reads an array that is not LAYERED as one record, so the
+        header of such an array describes all of its values (m1 is the
+        number of values and m2 and m3 are 1).  The file is written to a
+        temporary file first, so that arrays that are memory-mapped from an
+        existing file stay valid.
+        """
+        binary_type = self._get_binary_type()
+        dimensions = self.get_data_dimensions(layer)
+        try:
+            data = np.reshape(np.array(data, dtype=binary_type), dimensions)
+        except (TypeError, ValueError):
+            message = 'Unable to write data "{}" to binary file {}.  ' \
+                      'Expected data dimensions: ' \
+                      '{}'.format(self.data_dimensions.structure.name,
+                                  file_path, dimensions)
+            raise self._binary_exception('writing binary file', message)
+        header = np.zeros(1, dtype=_binary_header_dtype)
+        header['kstp'] = 1
+        header['kper'] = 1
+        header['text'] = '{:>16}'.format(
+            self.data_dimensions.structure.name.upper()[:16]).encode()
+        if self.layered:
+            # the file of a single layer of a LAYERED array
+            header['m1'] = dimensions[-1]
+            header['m2'] = data.size // max(dimensions[-1], 1)
+            header['m3'] = layer[0] + 1
+        else:
+            header['m1'] = data.size
+            header['m2'] = 1
+            header['m3'] = 1
+
+        folder = os.path.dirname(os.path.abspath(file_path))
+        tmp_file = None
+        try:
+            fd, tmp_file = tempfile.mkstemp(dir=folder, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                header.tofile(f)
+                data.tofile(f)
+            os.chmod(tmp_file, 0o644)
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            os.rename(tmp_file, file_path)
+        except (IOError, OSError):
+            if tmp_file is not None and os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+            message = 'Unable to write binary file {}.  Make sure the file ' \
+                      'is not locked and the folder exists' \
+                      '.'.format(file_path)
+            raise self._binary_exception('writing binary file', message)
+
+    def _get_binary_list_type(self, names):
+        """
+        Returns the numpy dtype of a record in a binary list file for the
+        recarray fields "names", the names of the cellid fields and the
+        number of cellid indices.  A record contains the cellid indices as
+        integers followed by the values and auxiliary variables as double
+        precision numbers.  Boundnames are not stored.
+        """
+        structure = self.data_dimensions.structure
+        model_grid = self.data_dimensions.get_model_grid()
+        ncelldim = model_grid.get_num_spatial_coordinates()
+        item_types = {}
+        for data_item in structure.data_item_structures:
+            item_types[data_item.name] = data_item.type
+        cellid_names = self._get_cellid_names()
+        fields = []
+        for name in names:
+            if name in cellid_names:
+                for index in range(ncelldim):
+                    fields.append(('{}_{}'.format(name, index), '<i4'))
+            elif name != 'boundname':
+                if item_types.get(name, DatumType.double_precision) not in \
+                        (DatumType.double_precision, DatumType.integer):
+                    message = 'Data "{}" can not be stored in a binary ' \
+                              'file.  Only lists of cellids and numbers are ' \
+                              'supported.'.format(structure.name)
+                    raise self._binary_exception('storing binary data',
+                                                 message)
+                fields.append((name, '<f8'))
+        return np.dtype(fields), cellid_names, ncelldim
+
+    def _read_binary_list(self):
+        """
+        Reads the list from a binary list file.  The file is memory-mapped
+        and its fields are copied to the columns of a ColumnarList.
+        """
+        model_name = self.data_dimensions.package_dim.model_dim[0].model_name
+        read_file = self._simulation_data.mfpath.resolve_path(
+            self.layer_storage.first_item().fname, model_name)
+        type_list = self.build_type_list()
+        names = [name for name, data_type in type_list]
+        binary_type, cellid_names, ncelldim = \
+            self._get_binary_list_type(names)
+        try:
+            if os.path.getsize(read_file) == 0:
+                records = np.zeros(0, dtype=binary_type)
+            else:
+                records = np.memmap(read_file, dtype=binary_type, mode='r')
+        except (IOError, OSError, ValueError):
+            message = 'Unable to read binary list file {}.  Make sure the ' \
+                      'file exists and its size is a multiple of the record ' \
+                      'size ({} bytes).'.format(read_file,
+                                                binary_type.itemsize)
+            raise self._binary_exception('reading binary file', message)
+        dtype = np.empty(0, dtype=type_list).view(np.recarray).dtype
+        columns = OrderedDict()
+        for name in names:
+            if name in cellid_names:
+                columns[name] = np.column_stack(
+                    [records['{}_{}'.format(name, index)]
+                     for index in range(ncelldim)]) - 1
+            elif name == 'boundname':
+                columns[name] = np.empty(len(records), dtype=dtype[name])
+            else:
+                columns[name] = records[name].astype(dtype[name])
+        return ColumnarList(dtype, columns)
+
+    def _write_binary_list(self, file_path, data):
+        """
+        Writes recarray or ColumnarList "data" to a binary list file.
+        Boundnames can not be stored in a binary list file, so lists with
+        boundnames are not written.
+        """
+        if 'boundname' in data.dtype.names and \
+                any(val is not None and str(val).strip() != '' for val in
+                    data['boundname']):
+            message = 'Data "{}" can not be stored in a binary file.  ' \
+                      'Binary list files can not contain boundnames' \
+                      '.'.format(self.data_dimensions.structure.name)
+            raise self._binary_exception('storing binary data', message)
+        binary_type, cellid_names, ncelldim = \
+            self._get_binary_list_type(data.dtype.names)
+        records = np.zeros(len(data), dtype=binary_type)
+        try:
+            for name in data.dtype.names:
+                if name in cellid_names:
+                    cellid = data[name]
+                    if cellid.ndim != 2:
+                        cellid = np.array(cellid.tolist(), dtype=np.int32)
+                    cellid = cellid.reshape(len(data), ncelldim) + 1
+                    for index in range(ncelldim):
+                        records['{}_{}'.format(name, index)] = cellid[:, index]
+                elif name != 'boundname':
+                    records[name] = np.array(data[name], dtype=np.float64)
+        except (TypeError, ValueError):
+            message = 'Unable to write data "{}" to binary file {}.  Binary ' \
+                      'list files can only contain cellids and numbers, ' \
+                      'time series names are not supported' \
+                      '.'.format(self.data_dimensions.structure.name,
+                                 file_path)
+            raise self._binary_exception('writing binary file', message)
+        try:
+            records.tofile(file_path)
+        except (IOError, OSError):
+            message = 'Unable to write binary file {}.  Make sure the file ' \
+                      'is not locked and the folder exists' \
+                      '.'.format(file_path)
+            raise self._binary_exception('writing binary file', message)
+
     def to_string(self, val, type, is_cellid=False, possible_cellid=False,
                   data_item=None):
         if type == DatumType.double_precision:
@@ -1589,7 +2070,8 @@ class DataStorage(object):
                             index + 1 < len(arr_line):
                         data = arr_line[index+1]
                         index += 2
-                    elif arr_line[index].lower() == 'binary':
+                    elif arr_line[index].lower() in ('binary',
+                                                     '(binary)'):
                         binary = True
                         index += 1
                     else:
@@ -1738,11 +2220,15 @@ class DataStorage(object):
                 else:
                     full_data[layer] = self._fill_const_layer(layer) * mult
             else:
+                data = self.read_data_from_file(layer)[0]
+                if not self.layer_storage[layer].binary or mult != 1:
+                    # keep memory-mapped data without a multiplier mapped
+                    data = data * mult
                 if self.layer_storage.get_total_size() == 1 or \
                         not self.layered:
-                    full_data = self.read_data_from_file(layer)[0] * mult
+                    full_data = data
                 else:
-                    full_data[layer] = self.read_data_from_file(layer)[0]*mult
+                    full_data[layer] = data
         return full_data
 
     def _resolve_layer(self, layer):
@@ -1884,14 +2370,17 @@ class DataStorage(object):
                 type_, value_, traceback_, message,
                 self._simulation_data.debug)
 
-        if len(self.layer_storage.first_item().internal_data[0]) <= index:
+        # read the names from the columns if the data are stored in
+        # columns, so that no recarray is built
+        internal_data = self.layer_storage.first_item().columns
+        if internal_data is None:
+            internal_data = self.layer_storage.first_item().internal_data
+        if len(internal_data.dtype.names) <= index:
             return 0
-        label = self.layer_storage.first_item().\
-                internal_data.dtype.names[index]
+        label = internal_data.dtype.names[index]
         label_list = label.split('_')
         if len(label_list) == 1:
             return 1
-        internal_data = self.layer_storage.first_item().internal_data
         for forward_index in range(index+1, len(internal_data.dtype.names)):
             forward_label = internal_data.dtype.names[forward_index]
             forward_label_list = forward_label.split('_')
@@ -2235,10 +2724,12 @@ class MFTransient(object):
         self._data_storage = None
 
     def add_transient_key(self, transient_key):
+        self._modified = True
         if isinstance(transient_key, int):
             self._verify_sp(transient_key)
 
     def update_transient_key(self, old_transient_key, new_transient_key):
+        self._modified = True
         if old_transient_key in self._data_storage:
             # replace dictionary key
             self._data_storage[new_transient_key] = \
@@ -2341,6 +2832,10 @@ class MFData(object):
     -------
     new_simulation(sim_data)
         points data object to a new simulation
+    is_modified() : bool
+        returns whether the data has changed since it was last written
+    set_modified(modified : bool)
+        sets or clears the flag that the data has changed
     layer_shape() : tuple
         returns the shape of the layered dimensions
 
@@ -2371,6 +2866,8 @@ class MFData(object):
         self._data_storage = None
         self._data_type = structure.type
         self._keyword = ''
+        # data has not been written yet
+        self._modified = True
         if self._simulation_data is not None:
             self._data_dimensions = DataDimensions(dimensions, structure)
             # build a unique path in the simulation dictionary
@@ -2398,6 +2895,13 @@ class MFData(object):
     def new_simulation(self, sim_data):
         self._simulation_data = sim_data
         self._data_storage = None
+        self._modified = True
+
+    def is_modified(self):
+        return self._modified
+
+    def set_modified(self, modified):
+        self._modified = modified
 
     def find_dimension_size(self, dimension_name):
         parent_path = self._path[:-1]
@@ -2479,6 +2983,7 @@ class MFData(object):
 
     def load(self, first_line, file_handle, block_header,
              pre_data_comments=None):
+        self._modified = True
         self.enabled = True
 
     def is_valid(self):
@@ -2635,6 +3140,13 @@ class MFMultiDimVar(MFData):
                                                    ext_file_action)
         layer_storage.fname = ext_file_path
         ext_format = ['OPEN/CLOSE', "'{}'".format(ext_file_path)]
+        if self._get_storage_obj().data_structure_type == \
+                DataStructureType.recarray:
+            # lists do not have a factor or print code
+            if layer_storage.binary:
+                ext_format.append('(BINARY)')
+            return '{}\n'.format(
+                    self._simulation_data.indent_string.join(ext_format))
         ext_format.append('FACTOR')
         if layer_storage.factor is not None:
             ext_format.append(str(layer_storage.factor))
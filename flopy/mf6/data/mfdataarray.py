@@ -35,10 +35,11 @@ class MFArray(mfdata.MFMultiDimVar):
     set_layered_data : (layered_data : bool)
         Sets whether this MFArray supports layered data
     store_as_external_file : (external_file_path : string, multiplier : float,
-        layer_num : int)
+        layer_num : int, binary : bool)
         Stores data from layer "layer_num" to an external file at
         "external_file_path" with a multiplier "multiplier".  For unlayered
-        data do not pass in "layer".
+        data do not pass in "layer".  If "binary" is True the data are
+        written to a MODFLOW 6 binary file.
     store_as_internal_array : (multiplier : float, layer_num : int)
         Stores data from layer "layer_num" internally within the MODFLOW file
         with a multiplier "multiplier". For unlayered data do not pass in
@@ -56,8 +57,8 @@ class MFArray(mfdata.MFMultiDimVar):
         1) ndarray - numpy ndarray containing all of the data
         2) [data] - python list containing all of the data
         3) val - a single constant value to be used for all of the data
-        4) {'filename':filename, 'factor':fct, 'iprn':print, 'data':data} -
-        dictionary defining external file information
+        4) {'filename':filename, 'factor':fct, 'iprn':print, 'data':data,
+        'binary':binary} - dictionary defining external file information
         5) {'data':data, 'factor':fct, 'iprn':print) - dictionary defining
         internal information. Data that is layered can also be set by defining
         a list with a length equal to the number of layers in the model.
@@ -82,6 +83,12 @@ class MFArray(mfdata.MFMultiDimVar):
 
     Notes
     -----
+    Binary external files have the layout MODFLOW 6 reads for (BINARY)
+    arrays: every layer is a record with the header of a binary head file
+    followed by the values.  Binary files are memory-mapped when the data
+    are accessed.  Internal arrays with at least
+    simulation_data.binary_external_threshold values are moved to binary
+    external files when the simulation is written.
 
     Examples
     --------
@@ -143,6 +150,8 @@ class MFArray(mfdata.MFMultiDimVar):
                                       self._simulation_data.debug, ex)
 
     def __setattr__(self, name, value):
+        if name in ('fname', 'factor', 'iprn', 'binary'):
+            self._modified = True
         if name == 'fname':
             self._get_storage_obj().layer_storage.first_item().fname = value
         elif name == 'factor':
@@ -230,6 +239,7 @@ class MFArray(mfdata.MFMultiDimVar):
                                           self._simulation_data.debug, ex)
 
     def __setitem__(self, k, value):
+        self._modified = True
         storage = self._get_storage_obj()
         if storage.layered:
             if isinstance(k, int):
@@ -290,6 +300,7 @@ class MFArray(mfdata.MFMultiDimVar):
             model_grid.grid_type() != DiscretizationType.DISU
 
     def set_layered_data(self, layered_data):
+        self._modified = True
         if layered_data is True and self.structure.layered is False:
             if self._data_dimensions.get_model_grid().grid_type() == \
                     DiscretizationType.DISU:
@@ -309,6 +320,7 @@ class MFArray(mfdata.MFMultiDimVar):
         self._get_storage_obj().layered = layered_data
 
     def make_layered(self):
+        self._modified = True
         if self.supports_layered():
             try:
                 self._get_storage_obj().make_layered()
@@ -341,7 +353,8 @@ class MFArray(mfdata.MFMultiDimVar):
                                   self._simulation_data.debug)
 
     def store_as_external_file(self, external_file_path, multiplier=[1.0],
-                               layer=None):
+                               layer=None, binary=False):
+        self._modified = True
         if isinstance(layer, int):
             layer = (layer,)
         storage = self._get_storage_obj()
@@ -351,13 +364,15 @@ class MFArray(mfdata.MFMultiDimVar):
 
         try:
             # move data to file
-            if storage.layer_storage[ds_index[0]].data_storage_type == \
-                    mfdata.DataStorageType.external_file:
+            layer_storage = storage.layer_storage[ds_index[0]]
+            if layer_storage.data_storage_type == \
+                    mfdata.DataStorageType.external_file and \
+                    layer_storage.binary == binary:
                 storage.external_to_external(external_file_path, multiplier,
                                              layer)
             else:
                 storage.internal_to_external(external_file_path, multiplier,
-                                             layer)
+                                             layer, binary=binary)
         except Exception as ex:
             type_, value_, traceback_ = sys.exc_info()
             raise MFDataException(self.structure.get_model(),
@@ -417,6 +432,7 @@ class MFArray(mfdata.MFMultiDimVar):
                                   self._simulation_data.debug, ex)
 
     def set_data(self, data, multiplier=[1.0], layer=None):
+        self._modified = True
         if self._get_storage_obj() is None:
             self._data_storage = self._new_storage(False)
         if isinstance(layer, int):
@@ -865,6 +881,9 @@ class MFArray(mfdata.MFMultiDimVar):
                                           self._simulation_data.indent_string)
 
         data_storage = self._get_storage_obj()
+        if storage_type == mfdata.DataStorageType.internal_array and \
+                self._auto_store_binary(layer):
+            storage_type = mfdata.DataStorageType.external_file
         if storage_type == mfdata.DataStorageType.internal_array:
             # internal data header + data
             format_str = self._get_internal_formatting_string(layer).upper()
@@ -916,6 +935,46 @@ class MFArray(mfdata.MFMultiDimVar):
             self._simulation_data.mfpath.add_ext_file(file_path, model_name)
         return file_entry
 
+    def _auto_store_binary(self, layer):
+        # move large internal arrays to binary external files
+        threshold = self._simulation_data.binary_external_threshold
+        if threshold is None or self._data_type not in \
+                (DatumType.integer, DatumType.double_precision):
+            return False
+        data_storage = self._get_storage_obj()
+        if layer is None:
+            layer_storage = data_storage.layer_storage.first_item()
+        else:
+            layer_storage = data_storage.layer_storage[layer]
+        if not layer_storage.has_internal_data() or \
+                np.size(layer_storage.internal_data) < threshold:
+            return False
+        # file name from the model, package and data names
+        name = list(self._path[:-2]) + [self._path[-1]]
+        if self._current_key is not None:
+            name.append(str(self._current_key + 1))
+        if layer is not None and data_storage.layered:
+            name.append('layer{}'.format(layer[0] + 1))
+        file_name = '{}.bin'.format('.'.join(name))
+        try:
+            data_storage.store_external(file_name, layer,
+                                        [layer_storage.factor],
+                                        layer_storage.iprn,
+                                        layer_storage.internal_data,
+                                        binary=True)
+        except Exception as ex:
+            type_, value_, traceback_ = sys.exc_info()
+            raise MFDataException(self.structure.get_model(),
+                                  self.structure.get_package(),
+                                  self._path,
+                                  'storing data in binary file '
+                                  '{}'.format(file_name),
+                                  self.structure.name,
+                                  inspect.stack()[0][3], type_,
+                                  value_, traceback_, None,
+                                  self._simulation_data.debug, ex)
+        return True
+
     def _get_data_layer_string(self, layer, data_indent):
         layer_data_string = ['']
         line_data_count = 0
@@ -1114,6 +1173,7 @@ class MFTransientArray(MFArray, mfdata.MFTransient):
         return super(MFTransientArray, self).get_data(apply_mult=apply_mult)
 
     def set_data(self, data, multiplier=[1.0], layer=None, key=None):
+        self._modified = True
         if isinstance(data, dict) or isinstance(data, OrderedDict):
             # each item in the dictionary is a list for one stress period
             # the dictionary key is the stress period the list is for
@@ -35,9 +35,12 @@ class MFList(mfdata.MFMultiDimVar):
     has_data : (layer_num : int) : bool
         Returns whether layer "layer_num" has any data associated with it.
         For unlayered data do not pass in "layer".
-    get_data : (layer_num : int) : ndarray
+    get_data : (layer_num : int, columnar : bool) : ndarray
         Returns the data associated with layer "layer_num".  If "layer_num" is
-        None, returns all data.
+        None, returns all data.  If "columnar" is True the data is returned
+        as a ColumnarList, which holds the cellids as an integer array and
+        every other field as a separate array.  Columns stored with
+        columnar_list_storage are returned as read-only views.
     set_data : (data : ndarray/list/dict, multiplier : float, layer_num : int)
         Sets the contents of the data at layer "layer_num" to "data" with
         multiplier "multiplier".  For unlayered data do not pass in
@@ -45,8 +48,10 @@ class MFList(mfdata.MFMultiDimVar):
             1) ndarray - ndarray containing the datalist
             2) [(line_one), (line_two), ...] - list where each like of the
                datalist is a tuple within the list
-            3) {'filename':filename, factor=fct, iprn=print_code, data=data}
-               - dictionary defining the external file containing the datalist.
+            3) {'filename':filename, factor=fct, iprn=print_code, data=data,
+               binary=binary} - dictionary defining the external file
+               containing the datalist.  binary lists contain cellids and
+               numbers and are read when the data are accessed.
         If the data is transient, a dictionary can be used to specify each
         stress period where the dictionary key is <stress period> - 1 and
         the dictionary value is the datalist data defined above:
@@ -146,10 +151,12 @@ class MFList(mfdata.MFMultiDimVar):
                                   traceback_, None,
                                   self._simulation_data.debug, ex)
 
-    def get_data(self, apply_mult=False):
+    def get_data(self, apply_mult=False, columnar=False):
         try:
             if self._get_storage_obj() is None:
                 return None
+            if columnar:
+                return self._get_storage_obj().get_columns()
             return self._get_storage_obj().get_data()
         except Exception as ex:
             type_, value_, traceback_ = sys.exc_info()
@@ -161,6 +168,7 @@ class MFList(mfdata.MFMultiDimVar):
                                   self._simulation_data.debug, ex)
 
     def set_data(self, data, autofill=False):
+        self._modified = True
         try:
             if self._get_storage_obj() is None:
                 self._data_storage = self._new_storage()
@@ -176,6 +184,7 @@ class MFList(mfdata.MFMultiDimVar):
                                   self._simulation_data.debug, ex)
 
     def append_data(self, data):
+        self._modified = True
         try:
             if self._get_storage_obj() is None:
                 self._data_storage = self._new_storage()
@@ -192,6 +201,7 @@ class MFList(mfdata.MFMultiDimVar):
                                   self._simulation_data.debug, ex)
 
     def append_list_as_record(self, record):
+        self._modified = True
         try:
             # convert to tuple
             tuple_record = ()
@@ -616,7 +626,7 @@ class MFList(mfdata.MFMultiDimVar):
         if len(arr_line) >= 2 and arr_line[0].upper() == 'OPEN/CLOSE':
             line_num = 0
             try:
-                storage.process_open_close_line(arr_line, 0)
+                storage.process_open_close_line(arr_line, (0,))
             except Exception as ex:
                 message = 'An error occurred while processing the following' \
                           'open/close line: {}'.format(current_line)
@@ -1283,8 +1293,11 @@ class MFTransientList(MFList, mfdata.MFTransient):
         retrieved using the key "transient_key"
     add_one :(transient_key : int)
         Adds one to the data stored at key "transient_key"
-    get_data : (key : int) : ndarray
-        Returns the data during time "key".
+    get_data : (key : int, columnar : bool) : ndarray
+        Returns the data during time "key".  If "columnar" is True the data
+        is returned as a ColumnarList.  With columnar_list_storage, stress
+        periods with the same data as the previous stress period share its
+        columns.
     set_data : (data : ndarray/list, multiplier : float, key : int)
         Sets the contents of the data at time "key" to "data" with
         multiplier "multiplier".
@@ -1331,13 +1344,15 @@ class MFTransientList(MFList, mfdata.MFTransient):
         self._data_storage[transient_key] = super(MFTransientList,
                                                   self)._new_storage()
 
-    def get_data(self, key=None, apply_mult=False):
+    def get_data(self, key=None, apply_mult=False, columnar=False):
         if key is None:
             key = self._current_key
         self.get_data_prep(key)
-        return super(MFTransientList, self).get_data(apply_mult=apply_mult)
+        return super(MFTransientList, self).get_data(apply_mult=apply_mult,
+                                                     columnar=columnar)
 
     def set_data(self, data, key=None, autofill=False):
+        self._modified = True
         if (isinstance(data, dict) or isinstance(data, OrderedDict)) and \
                 'filename' not in data:
             # each item in the dictionary is a list for one stress period
@@ -1346,6 +1361,7 @@ class MFTransientList(MFList, mfdata.MFTransient):
                 self._set_data_prep(list_item, key)
                 super(MFTransientList, self).set_data(list_item,
                                                       autofill=autofill)
+                self._share_columns(key)
         else:
             if key is None:
                 # search for a key
@@ -1356,6 +1372,7 @@ class MFTransientList(MFList, mfdata.MFTransient):
                     key = 0
             self._set_data_prep(data, key)
             super(MFTransientList, self).set_data(data)
+            self._share_columns(key)
 
     def get_file_entry(self, key=0,
                        ext_file_action=ExtFileAction.copy_relative_paths):
@@ -1366,8 +1383,10 @@ class MFTransientList(MFList, mfdata.MFTransient):
     def load(self, first_line, file_handle, block_header,
              pre_data_comments=None):
         self._load_prep(block_header)
-        return super(MFTransientList, self).load(first_line, file_handle,
-                                                 pre_data_comments)
+        result = super(MFTransientList, self).load(first_line, file_handle,
+                                                   pre_data_comments)
+        self._share_columns(self._current_key)
+        return result
 
     def append_list_as_record(self, record, key=0):
         self._append_list_as_record_prep(record, key)
@@ -1377,6 +1396,23 @@ class MFTransientList(MFList, mfdata.MFTransient):
         self._update_record_prep(key)
         super(MFTransientList, self).update_record(record, key_index)
 
+    def _share_columns(self, key):
+        # share the columns of the previous stress period if the data did
+        # not change, columns are read-only so they can not change later
+        keys = list(self._data_storage.keys())
+        if key not in keys or keys.index(key) == 0:
+            return
+        storage = self._data_storage[key]
+        previous = self._data_storage[keys[keys.index(key) - 1]]
+        if storage is None or previous is None:
+            return
+        columns = storage.layer_storage.first_item().columns
+        previous_columns = previous.layer_storage.first_item().columns
+        if columns is not None and previous_columns is not None and \
+                columns.equals(previous_columns):
+            storage.layer_storage.first_item().internal_data = \
+                previous_columns
+
     def _new_storage(self):
         return OrderedDict()
 
@@ -94,6 +94,7 @@ class MFScalar(mfdata.MFData):
                                   self._simulation_data.debug, ex)
 
     def set_data(self, data):
+        self._modified = True
         if self.structure.type == DatumType.record:
             if data is not None:
                 if not isinstance(data, list) or isinstance(data, np.ndarray) or \
@@ -139,6 +140,7 @@ class MFScalar(mfdata.MFData):
                                   self._simulation_data.debug, ex)
 
     def add_one(self):
+        self._modified = True
         datum_type = self.structure.get_datum_type()
         if datum_type == int or datum_type == np.int:
             if self._get_storage_obj().get_data() is None:
@@ -610,6 +612,7 @@ class MFScalarTransient(MFScalar, mfdata.MFTransient):
         return super(MFScalarTransient, self).get_data()
 
     def set_data(self, data, key=None):
+        self._modified = True
         if isinstance(data, dict) or isinstance(data, OrderedDict):
             # each item in the dictionary is a list for one stress period
             # the dictionary key is the stress period the list is for
@@ -4,14 +4,23 @@ mfstructure module.  Contains classes related to package structure
 
 """
 import os
+import sys
 import traceback
 import ast
 import keyword
+import hashlib
+import tempfile
 from enum import Enum
 from textwrap import TextWrapper
 from collections import OrderedDict
 import numpy as np
 from ..mfbase import PackageContainer, StructException
+from ...version import __version__
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 
 class DfnType(Enum):
@@ -1931,6 +1940,87 @@ class MFSimulationStructure(object):
                     package_struct.read_as_arrays = True
 
 
+def get_structure_cache_dir():
+    """
+    Get the directory of the MFStructure cache files.  The directory is
+    the FLOPY_CACHE_DIR environment variable if it is set and .flopy/cache
+    in the home directory otherwise.
+
+    Returns
+    -------
+    cache_dir : str
+    """
+    cache_dir = os.environ.get('FLOPY_CACHE_DIR')
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser('~'), '.flopy', 'cache')
+    return cache_dir
+
+
+def get_structure_cache_key():
+    """
+    Get the version key of the MFStructure cache.  The key changes with
+    the flopy version, the python version and the size and modification
+    time of the package files that the structure is built from, so a
+    cache file is never used with other package definitions.
+
+    Returns
+    -------
+    key : str
+    """
+    file_paths = PackageContainer.get_package_file_paths()
+    file_paths.append(os.path.realpath(__file__.replace('.pyc', '.py')))
+    md5 = hashlib.md5()
+    md5.update('{} {}.{} {}'.format(__version__, sys.version_info[0],
+                                    sys.version_info[1],
+                                    pickle.HIGHEST_PROTOCOL).encode())
+    for file_path in sorted(file_paths):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        md5.update('{} {} {}'.format(os.path.basename(file_path),
+                                     stat.st_size,
+                                     int(stat.st_mtime)).encode())
+    return md5.hexdigest()
+
+
+def get_structure_cache_prefix():
+    """
+    Get the file name prefix of the MFStructure cache files of this python
+    version and flopy installation.  Other python versions and flopy
+    installations (in other virtual environments, for example) that share
+    the cache directory use other prefixes and keep their own cache files.
+
+    Returns
+    -------
+    prefix : str
+    """
+    flopy_dir = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.realpath(__file__))))
+    return 'mf6structure_py{}{}_{}_'.format(
+        sys.version_info[0], sys.version_info[1],
+        hashlib.md5(flopy_dir.encode()).hexdigest()[:8])
+
+
+def get_structure_cache_file(cache_dir=None):
+    """
+    Get the path of the MFStructure cache file for this version of flopy.
+
+    Parameters
+    ----------
+    cache_dir : str
+        directory of the cache file.  Default is get_structure_cache_dir().
+
+    Returns
+    -------
+    cache_file : str
+    """
+    if cache_dir is None:
+        cache_dir = get_structure_cache_dir()
+    return os.path.join(cache_dir, '{}{}.pkl'.format(
+        get_structure_cache_prefix(), get_structure_cache_key()))
+
+
 class MFStructure(object):
     """
     Singleton class for accessing the contents of the json structure file
@@ -1948,8 +2038,21 @@ class MFStructure(object):
     dimension_dict : dict
         Dictionary mapping paths to dimension information to the dataitem whose
         dimension information is being described
+    from_cache : bool
+        whether the structure information was loaded from the cache file
+
+    Notes
+    -----
+    Building the structure from the package definitions takes longer than
+    the rest of the startup of a small simulation.  Unless
+    load_from_dfn_files is used, the structure is therefore pickled to a
+    cache file (see get_structure_cache_file) the first time it is built,
+    and later python sessions load it with one read.  Set use_cache to
+    False before the first MFStructure() call to always build the
+    structure.
     """
     _instance = None
+    use_cache = True
 
     def __new__(cls, internal_request=False, load_from_dfn_files=False):
         if cls._instance is None:
@@ -1961,6 +2064,7 @@ class MFStructure(object):
             cls._instance.sim_struct = None
             cls._instance.dimension_dict = {}
             cls._instance.load_from_dfn_files = load_from_dfn_files
+            cls._instance.from_cache = False
 
             # Read metadata from file
             cls._instance.valid = cls._instance.__load_structure()
@@ -1973,7 +2077,90 @@ class MFStructure(object):
     def get_version_string(self):
         return format(str(self.mf_version))
 
+    def write_cache(self, cache_file=None):
+        """
+        Write the structure to a cache file.  The file is written to a
+        temporary file first and then renamed, so that python sessions
+        that start at the same time never read an incomplete file.  Older
+        cache files of this python version and flopy installation in the
+        same directory are removed (see get_structure_cache_prefix).
+
+        Parameters
+        ----------
+        cache_file : str
+            path of the cache file.  Default is get_structure_cache_file().
+
+        Returns
+        -------
+        success : bool
+        """
+        if cache_file is None:
+            cache_file = get_structure_cache_file()
+        cache = {'key': get_structure_cache_key(),
+                 'sim_struct': self.sim_struct,
+                 'dimension_dict': self.dimension_dict}
+        cache_dir = os.path.dirname(os.path.abspath(cache_file))
+        tmp_file = None
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(cache, f, pickle.HIGHEST_PROTOCOL)
+            os.chmod(tmp_file, 0o644)
+            if os.path.isfile(cache_file):
+                os.remove(cache_file)
+            os.rename(tmp_file, cache_file)
+        except Exception:
+            # the cache is optional, so a read-only or full file system only
+            # means that the structure is built again next time
+            if tmp_file is not None and os.path.isfile(tmp_file):
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+            return False
+        self._remove_old_cache_files(cache_file)
+        return True
+
+    @staticmethod
+    def _remove_old_cache_files(cache_file):
+        # cache files of older package definitions of this python version
+        # and flopy installation are never read again
+        cache_name = os.path.basename(cache_file)
+        cache_dir = os.path.dirname(os.path.abspath(cache_file))
+        prefix = get_structure_cache_prefix()
+        for file_name in os.listdir(cache_dir):
+            if file_name != cache_name and file_name.startswith(prefix) and \
+                    file_name.endswith('.pkl'):
+                try:
+                    os.remove(os.path.join(cache_dir, file_name))
+                except OSError:
+                    pass
+
+    def __read_cache(self, cache_file):
+        if not os.path.isfile(cache_file):
+            return False
+        try:
+            with open(cache_file, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception:
+            return False
+        if not isinstance(cache, dict) or \
+                cache.get('key') != get_structure_cache_key():
+            return False
+        self.sim_struct = cache['sim_struct']
+        self.dimension_dict = cache['dimension_dict']
+        self.from_cache = True
+        return True
+
     def __load_structure(self):
+        use_cache = self.use_cache and not self.load_from_dfn_files
+        if use_cache:
+            cache_file = get_structure_cache_file()
+            if self.__read_cache(cache_file):
+                return True
+
         # set up structure classes
         self.sim_struct = MFSimulationStructure()
 
@@ -1994,5 +2181,7 @@ class MFStructure(object):
             for package in package_list:
                 self.sim_struct.process_dfn(DfnPackage(package))
             self.sim_struct.tag_read_as_arrays()
+            if use_cache:
+                self.write_cache(cache_file)
 
         return True
@@ -2,8 +2,13 @@ import glob
 import importlib
 import inspect, sys, traceback
 import os, collections, copy
+import threading
 from shutil import copyfile
 from enum import Enum
+try:
+    import queue as Queue
+except ImportError:
+    import Queue
 
 
 # internal handled exceptions
@@ -176,6 +181,57 @@ class MFFilePath(object):
         return os.path.isabs(self.file_path)
 
 
+def run_in_threads(func, items, nthreads=1):
+    """
+    Calls func for every item in items.  If nthreads is larger than one the
+    calls are made from a pool of nthreads threads, which take the next
+    item as soon as their previous call has finished.  The first exception
+    raised by func stops the remaining calls and is raised again.
+
+    Parameters
+    ----------
+    func : callable
+        function that is called with one item
+    items : list
+        items to call func with
+    nthreads : int
+        number of threads.  With one thread the calls are made in order
+        from the calling thread.  (default is 1)
+    """
+    if nthreads is None or nthreads <= 1 or len(items) <= 1:
+        for item in items:
+            func(item)
+        return
+
+    q = Queue.Queue()
+    for item in items:
+        q.put(item)
+    errors = []
+
+    def worker():
+        while not errors:
+            try:
+                item = q.get_nowait()
+            except Queue.Empty:
+                break
+            try:
+                func(item)
+            except Exception as e:
+                errors.append(e)
+                break
+
+    threads = []
+    for i in range(min(nthreads, len(items))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
 class MFFileMgmt(object):
     """
     Class containing MODFLOW path data
@@ -212,8 +268,8 @@ class MFFileMgmt(object):
         self._last_loaded_sim_path = None
         self._last_loaded_model_relative_path = collections.OrderedDict()
 
-    def copy_files(self, copy_relative_only=True):
-        num_files_copied = 0
+    def copy_files(self, copy_relative_only=True, nthreads=1):
+        copy_list = []
         if self._last_loaded_sim_path is not None:
             for key, mffile_path in self.existing_file_dict.items():
 #                for model_name in mffile_path.model_name:
@@ -233,23 +289,24 @@ class MFFileMgmt(object):
                         new_folders, new_leaf = os.path.split(path_new)
                         if not os.path.exists(new_folders):
                             os.makedirs(new_folders)
-                        try:
-                            copyfile(path_old,
-                                     path_new)
-                        except:
-                            type_, value_, traceback_ = sys.exc_info()
-                            raise MFDataException(self.structure.get_model(),
-                                                  self.structure.get_package(),
-                                                  self._path,
-                                                  'appending data',
-                                                  self.structure.name,
-                                                  inspect.stack()[0][3], type_,
-                                                  value_,
-                                                  traceback_, None,
-                                                  self._simulation_data.debug)
-
-                        num_files_copied += 1
-        return num_files_copied
+                        copy_list.append((path_old, path_new))
+
+        # copy the files, which are independent of each other
+        run_in_threads(self._copy_file, copy_list, nthreads)
+        return len(copy_list)
+
+    @staticmethod
+    def _copy_file(paths):
+        path_old, path_new = paths
+        try:
+            copyfile(path_old, path_new)
+        except:
+            type_, value_, traceback_ = sys.exc_info()
+            message = 'Unable to copy external file "{}" to ' \
+                      '"{}".'.format(path_old, path_new)
+            raise MFDataException(None, None, None, 'copying external file',
+                                  None, inspect.stack()[0][3], type_, value_,
+                                  traceback_, message, False)
 
     def get_updated_path(self, external_file_path, model_name,
                          ext_file_action):
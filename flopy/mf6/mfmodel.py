@@ -6,8 +6,8 @@ import os, sys, inspect
 import numpy as np
 from .mfbase import PackageContainer, ExtFileAction, PackageContainerType, \
                     MFDataException, ReadAsArraysException, FlopyException, \
-                    VerbosityLevel
-from .mfpackage import MFPackage
+                    VerbosityLevel, MFFileMgmt
+from .mfpackage import MFPackage, write_packages, _is_read_as_arrays
 from .coordinates import modeldimensions
 from .utils.reference import SpatialReference, StructuredSpatialReference, \
                              VertexSpatialReference
@@ -54,7 +54,7 @@ class MFModel(PackageContainer):
     -------
     load : (simulation : MFSimulationData, model_name : string,
       namfile : string, type : string, version : string, exe_name : string,
-      model_ws : string, strict : boolean) : MFSimulation
+      model_ws : string, strict : boolean, lazy_load : boolean) : MFSimulation
         a class method that loads a model from files
     write
         writes the simulation to files
@@ -172,7 +172,8 @@ class MFModel(PackageContainer):
     @classmethod
     def load_base(cls, simulation, structure, modelname='NewModel',
                   model_nam_file='modflowtest.nam', type='gwf', version='mf6',
-                  exe_name='mf6.exe', strict=True, model_rel_path='.'):
+                  exe_name='mf6.exe', strict=True, model_rel_path='.',
+                  lazy_load=False):
         """
         Load an existing model.
 
@@ -198,6 +199,11 @@ class MFModel(PackageContainer):
             strict mode when loading files
         model_rel_path : string
             relative path of model folder to simulation folder
+        lazy_load : boolean
+            register the packages from the model name file and load each
+            package when its data is first accessed.  The discretization
+            package is always loaded, because the other packages depend on
+            it.
         Returns
         -------
         model : MFModel
@@ -241,11 +247,14 @@ class MFModel(PackageContainer):
                     filemgr = simulation.simulation_data.mfpath
                     fname = filemgr.strip_model_relative_path(modelname,
                                                               fname)
+                lazy_package = lazy_load and \
+                    '{}{}'.format(ftype, vnum) not in priority_packages
                 if simulation.simulation_data.verbosity_level.value >= \
-                        VerbosityLevel.normal.value:
+                        VerbosityLevel.normal.value and not lazy_package:
                     print('    loading package {}...'.format(ftype))
                 # load package
-                instance.load_package(ftype, fname, pname, strict, None)
+                instance.load_package(ftype, fname, pname, strict, None,
+                                      lazy_load=lazy_package)
 
         # load referenced packages
         if modelname in instance.simulation_data.referenced_files:
@@ -263,7 +272,8 @@ class MFModel(PackageContainer):
 
         return instance
 
-    def write(self, ext_file_action=ExtFileAction.copy_relative_paths):
+    def write(self, ext_file_action=ExtFileAction.copy_relative_paths,
+              modified_only=False, nthreads=1):
         """
         write model to model files
 
@@ -273,6 +283,11 @@ class MFModel(PackageContainer):
             defines what to do with external files when the simulation path has
             changed.  defaults to copy_relative_paths which copies only files
             with relative paths, leaving files defined by absolute paths fixed.
+        modified_only : bool
+            only write packages that have been modified since they were last
+            written.  defaults to False.
+        nthreads : int
+            number of threads that write package files.  defaults to 1.
 
         Returns
         -------
@@ -280,20 +295,16 @@ class MFModel(PackageContainer):
         Examples
         --------
         """
+        write_packages(self._get_write_list(), self.simulation_data,
+                       ext_file_action, modified_only, nthreads)
 
-        # write name file
-        if self.simulation_data.verbosity_level.value >= \
-                VerbosityLevel.normal.value:
-            print('    writing model name file...')
-
-        self.name_file.write(ext_file_action=ext_file_action)
-
-        # write packages
+    def _get_write_list(self):
+        # name file first, then the packages
+        write_list = [(self.name_file, '    writing model name file...')]
         for pp in self.packages:
-            if self.simulation_data.verbosity_level.value >= \
-                    VerbosityLevel.normal.value:
-                print('    writing package {}...'.format(pp._get_pname()))
-            pp.write(ext_file_action=ext_file_action)
+            write_list.append((pp, '    writing package {}...'.format(
+                pp._get_pname())))
+        return write_list
 
     def is_valid(self):
         """
@@ -579,7 +590,8 @@ class MFModel(PackageContainer):
         return None, None
 
     def load_package(self, ftype, fname, pname, strict, ref_path,
-                     dict_package_name=None, parent_package=None):
+                     dict_package_name=None, parent_package=None,
+                     lazy_load=False):
         """
         loads a package from a file
 
@@ -599,6 +611,9 @@ class MFModel(PackageContainer):
             package name for dictionary lookup
         parent_package : MFPackage
             parent package
+        lazy_load : bool
+            register the package and load the file when the package data is
+            first accessed
 
         Examples
         --------
@@ -644,11 +659,23 @@ class MFModel(PackageContainer):
 
         # create package
         package_obj = self.package_factory(ftype, model_type)
+        if lazy_load:
+            # the file is checked for the READASARRAYS option now, because
+            # the package type can not change when it is loaded later
+            array_package_obj = self.package_factory('{}a'.format(ftype),
+                                                     model_type)
+            if array_package_obj is not None and _is_read_as_arrays(
+                    os.path.join(self.simulation_data.mfpath.get_model_path(
+                        self.name), MFFileMgmt.string_to_file_path(fname))):
+                package_obj = array_package_obj
         package = package_obj(self, fname=fname, pname=dict_package_name,
                               loading_package=True,
                               parent_file=parent_package)
         try:
-            package.load(strict)
+            if lazy_load:
+                package._set_lazy_load(strict)
+            else:
+                package.load(strict)
         except ReadAsArraysException:
             #  create ReadAsArrays package and load it instead
             package_obj = self.package_factory('{}a'.format(ftype), model_type)
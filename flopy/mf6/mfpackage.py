@@ -1,11 +1,15 @@
 import os
+import re
 import sys
 import errno
 import inspect
+import threading
+from shutil import copyfile
 import numpy as np
 from collections import OrderedDict
 
-from .mfbase import PackageContainer, ExtFileAction, PackageContainerType
+from .mfbase import PackageContainer, ExtFileAction, PackageContainerType, \
+                    run_in_threads
 from .mfbase import MFFileMgmt, MFDataException, ReadAsArraysException, \
                     MFInvalidTransientBlockHeaderException, VerbosityLevel, \
                     FlopyException
@@ -14,6 +18,83 @@ from .data import mfstructure, mfdatautil, mfdata
 from .data import mfdataarray, mfdatalist, mfdatascalar
 from .coordinates import modeldimensions
 
+_open_close_re = re.compile(r'''\bOPEN/CLOSE\s+('[^']*'|"[^"]*"|\S+)''',
+                            re.IGNORECASE)
+_filein_re = re.compile(r'''\bFILEIN\s+('[^']*'|"[^"]*"|\S+)''',
+                        re.IGNORECASE)
+
+
+def _is_read_as_arrays(file_path):
+    """
+    Returns whether the options block of a package file contains the
+    READASARRAYS keyword, without loading the package.
+    """
+    try:
+        fd = open(file_path, 'r')
+    except (IOError, OSError):
+        return False
+    with fd:
+        in_options = False
+        for line in fd:
+            arr_line = line.strip().split()
+            if not arr_line or mfdata.MFComment.is_comment(arr_line[0],
+                                                           True):
+                continue
+            key = arr_line[0].upper()
+            if key == 'BEGIN':
+                if len(arr_line) < 2 or arr_line[1].upper() != 'OPTIONS':
+                    return False
+                in_options = True
+            elif key == 'END':
+                if in_options:
+                    return False
+            elif in_options and key == 'READASARRAYS':
+                return True
+    return False
+
+
+def _get_referenced_files(file_path):
+    """
+    Returns the files that a package file reads with OPEN/CLOSE and the
+    package files that it references with FILEIN, without loading the
+    package.
+    """
+    with open(file_path, 'r') as fd:
+        text = fd.read()
+    external_files = [m.strip('\'"') for m in _open_close_re.findall(text)]
+    package_files = [m.strip('\'"') for m in _filein_re.findall(text)]
+    return external_files, package_files
+
+
+def _lazy_property(name):
+    # property that loads a lazy package before the attribute is used
+    def fget(self):
+        self._load_lazy()
+        return getattr(self, name)
+
+    def fset(self, value):
+        self._load_lazy()
+        setattr(self, name, value)
+    return property(fget, fset)
+
+
+_lazy_classes = {}
+
+
+def _get_lazy_class(package_class, names):
+    """
+    Returns a subclass of package_class with a property for each of the
+    names that loads the package when the attribute is accessed.  The
+    properties take precedence over the instance attributes.  A lazy
+    package is an instance of the subclass until it is loaded.
+    """
+    key = (package_class, names)
+    if key not in _lazy_classes:
+        attrs = dict((name, _lazy_property(name)) for name in names)
+        _lazy_classes[key] = type(package_class.__name__, (package_class,),
+                                  attrs)
+    return _lazy_classes[key]
+
 
 class MFBlockHeader(object):
     """
@@ -553,8 +634,10 @@ class MFBlock(object):
 
         # if block not empty
         if not (len(arr_line[0]) > 2 and arr_line[0][:3].upper() == 'END'):
-            if arr_line[0].lower() == 'open/close':
-                # open block contents from external file
+            if arr_line[0].lower() == 'open/close' and \
+                    '(binary)' not in [item.lower() for item in arr_line]:
+                # open block contents from external file.  binary files
+                # are left to the data set
                 fd_block.readline()
                 fd_path, filename = os.path.split(
                   os.path.realpath(fd_block.name))
@@ -1047,10 +1130,16 @@ class MFPackage(PackageContainer):
         up based on var_name) and any data supplied
     load : (strict : bool) : bool
         Loads the package from file
+    is_loaded : bool
+        Returns whether the package file has been loaded.  Packages of a
+        simulation loaded with lazy_load are loaded when their data is first
+        accessed
     is_valid : bool
         Returns whether or not this package is valid
     write
         Writes the package to a file
+    is_modified : bool
+        Returns whether the package has changed since it was last written
     get_file_path : string
         Returns the package file's path
     remove
@@ -1061,12 +1150,20 @@ class MFPackage(PackageContainer):
 
     Notes
     -----
+    A package that is loaded lazily (see MFSimulation.load) is registered
+    with its model but its file is not read until one of its data
+    attributes or its blocks are accessed.  A lazy package that is written
+    before it is loaded is copied from the file it was registered from.
 
     Examples
     --------
 
 
     """
+    # (strict, file path, package class) of a package whose file has not
+    # been loaded yet
+    _lazy_load = None
+
     def __init__(self, model_or_sim, package_type, filename=None, pname=None,
                  loading_package=False, parent_file=None):
         self._model_or_sim = model_or_sim
@@ -1143,6 +1240,8 @@ class MFPackage(PackageContainer):
         # init variables that may be used later
         self.post_block_comments = None
         self.last_error = None
+        # path of the file the package was last written to
+        self._last_write_path = None
 
     def __setattr__(self, name, value):
         if hasattr(self, name):
@@ -1157,6 +1256,56 @@ class MFPackage(PackageContainer):
                 return
         super(MFPackage, self).__setattr__(name, value)
 
+    def _set_lazy_load(self, strict=True):
+        """
+        Defers loading the package file until a data attribute or the blocks
+        of the package are accessed.
+        """
+        names = ['blocks']
+        for name, value in self.__dict__.items():
+            if isinstance(value, mfdata.MFData):
+                names.append(name)
+        package_class = type(self)
+        file_path = self.get_file_path()
+        self.__dict__['_lazy_load'] = (strict, file_path, package_class)
+        object.__setattr__(self, '__class__', _get_lazy_class(
+            package_class, tuple(sorted(names))))
+        # the package file is identical to the unloaded package
+        self._last_write_path = file_path
+
+    def _load_lazy(self):
+        strict, file_path, package_class = self._lazy_load
+        object.__setattr__(self, '__class__', package_class)
+        self.__dict__['_lazy_load'] = None
+        if self._simulation_data.verbosity_level.value >= \
+                VerbosityLevel.normal.value:
+            print('    loading package {}...'.format(self._get_pname()))
+        # files referenced by the package are read from the simulation path
+        # the package was last loaded or written in, and sizes are not
+        # updated from the data, so that external files are not read until
+        # their data is used
+        mfpath = self._simulation_data.mfpath
+        sim_path = mfpath.get_sim_path()
+        mfpath.set_sim_path(mfpath.get_sim_path(True))
+        try:
+            self._load_file(file_path, strict, update_sizes=False)
+        finally:
+            mfpath.set_sim_path(sim_path)
+        for key, block in self.blocks.items():
+            for ds_key, dataset in block.datasets.items():
+                dataset.set_modified(False)
+
+    def is_loaded(self):
+        """
+        Returns whether the package file has been loaded.
+
+        Returns
+        -------
+        is_loaded : bool
+
+        """
+        return self._lazy_load is None
+
     def _get_pname(self):
         if self.package_name is not None:
             return '{}'.format(self.package_name)
@@ -1220,9 +1369,18 @@ class MFPackage(PackageContainer):
                         if isinstance(dataset, mfdata.MFTransient):
                             # for transient data always use the maximum size
                             new_size = -1
+                            # lists stored in columns are measured without
+                            # building a recarray
+                            columnar = isinstance(
+                                dataset, mfdatalist.MFTransientList) and \
+                                self._simulation_data.columnar_list_storage
                             for key in dataset.get_active_key_list():
                                 try:
-                                    data = dataset.get_data(key=key[0])
+                                    if columnar:
+                                        data = dataset.get_data(
+                                            key=key[0], columnar=True)
+                                    else:
+                                        data = dataset.get_data(key=key[0])
                                 except (IOError,
                                         OSError,
                                         MFDataException):
@@ -1296,13 +1454,19 @@ class MFPackage(PackageContainer):
             package.set_model_relative_path(model_ws)
 
     def load(self, strict=True):
+        if self._lazy_load is not None:
+            self._load_lazy()
+            return self.is_valid()
+        return self._load_file(self.get_file_path(), strict)
+
+    def _load_file(self, file_path, strict=True, update_sizes=True):
         # open file
         try:
-            fd_input_file = open(self.get_file_path(), 'r')
+            fd_input_file = open(file_path, 'r')
         except OSError as e:
             if e.errno == errno.ENOENT:
                 message = 'File {} of type {} could not be opened' \
-                          '.'.format(self.get_file_path(), self.package_type)
+                          '.'.format(file_path, self.package_type)
                 type_, value_, traceback_ = sys.exc_info()
                 raise MFDataException(self.model_name,
                                       self.structure.get_package(),
@@ -1319,7 +1483,7 @@ class MFPackage(PackageContainer):
         # close file
         fd_input_file.close()
 
-        if self.simulation_data.auto_set_sizes:
+        if self.simulation_data.auto_set_sizes and update_sizes:
             self._update_size_defs()
 
         # return validity of file
@@ -1450,7 +1614,41 @@ class MFPackage(PackageContainer):
                     # treat unresolved text as a comment for now
                     self._store_comment(line, found_first_block)
 
+    def is_modified(self):
+        """
+        Returns whether any data in the package has been set or loaded
+        since the package was last written, or whether the package file
+        path has changed.  Changes made in place to arrays returned by
+        get_data are not detected.
+
+        Returns
+        -------
+        is_modified : bool
+
+        """
+        if self._last_write_path != self.get_file_path():
+            return True
+        if self._lazy_load is not None:
+            return False
+        for key, block in self.blocks.items():
+            for ds_key, dataset in block.datasets.items():
+                if dataset.is_modified():
+                    return True
+        return False
+
+    def _set_unmodified(self, package_file_path):
+        self._last_write_path = package_file_path
+        for key, block in self.blocks.items():
+            for ds_key, dataset in block.datasets.items():
+                dataset.set_modified(False)
+
     def write(self, ext_file_action=ExtFileAction.copy_relative_paths):
+        if self._lazy_load is not None:
+            if self._can_copy_lazy(ext_file_action):
+                self._copy_lazy()
+                return
+            self._load_lazy()
+
         if self.simulation_data.auto_set_sizes:
             self._update_size_defs()
 
@@ -1467,6 +1665,52 @@ class MFPackage(PackageContainer):
         self._write_blocks(fd, ext_file_action)
 
         fd.close()
+        self._set_unmodified(package_file_path)
+
+    def _can_copy_lazy(self, ext_file_action):
+        # the package file can be copied unless the paths of external files
+        # in the file have to change
+        if ext_file_action == ExtFileAction.copy_relative_paths:
+            return True
+        return os.path.abspath(self.get_file_path()) == \
+            os.path.abspath(self._lazy_load[1])
+
+    def _copy_lazy(self):
+        """
+        Writes a package that is not loaded by copying the file it was
+        registered from.  Files referenced with OPEN/CLOSE and FILEIN are
+        added to the external files of the simulation, so that they are
+        copied with the package.
+        """
+        load_path = self._lazy_load[1]
+        package_file_path = self.get_file_path()
+        if os.path.abspath(package_file_path) != os.path.abspath(load_path):
+            package_folder = os.path.split(package_file_path)[0]
+            if package_folder and not os.path.isdir(package_folder):
+                os.makedirs(package_folder)
+            copyfile(load_path, package_file_path)
+
+            # register referenced files, including the files referenced by
+            # child packages that are read with FILEIN
+            mfpath = self._simulation_data.mfpath
+            sim_path = mfpath.get_sim_path(True)
+            file_list = [load_path]
+            file_set = set()
+            while file_list:
+                file_path = file_list.pop()
+                if file_path in file_set or not os.path.isfile(file_path):
+                    continue
+                file_set.add(file_path)
+                external_files, package_files = \
+                    _get_referenced_files(file_path)
+                for ext_file in external_files + package_files:
+                    mfpath.add_ext_file(MFFileMgmt.string_to_file_path(
+                        ext_file), self.model_name)
+                for package_file in package_files:
+                    file_list.append(os.path.join(
+                        sim_path, MFFileMgmt.string_to_file_path(
+                            package_file)))
+        self._last_write_path = package_file_path
 
     def create_package_dimensions(self):
         model_dims = None
@@ -1546,4 +1790,57 @@ class MFPackage(PackageContainer):
                 self.path[0]), self.filename)
         else:
             return os.path.join(self._simulation_data.mfpath.get_sim_path(),
-                                self.filename)
\ No newline at end of file
+                                self.filename)
+
+
+def write_packages(packages, simulation_data,
+                   ext_file_action=ExtFileAction.copy_relative_paths,
+                   modified_only=False, nthreads=1):
+    """
+    Writes a list of packages.  Every package is written to its own file,
+    so the packages can be written by a pool of threads.
+
+    Parameters
+    ----------
+    packages : list of (MFPackage, str) tuples
+        packages to write, with the message that is printed when the
+        package is written (or None)
+    simulation_data : MFSimulationData
+        simulation data with the verbosity level
+    ext_file_action : ExtFileAction
+        defines what to do with external files when the simulation path has
+        changed
+    modified_only : bool
+        only write packages that have been modified since they were last
+        written, or whose file does not exist (default is False)
+    nthreads : int
+        number of threads that write packages (default is 1)
+    """
+    verbose = simulation_data.verbosity_level.value >= \
+        VerbosityLevel.normal.value
+    write_list = []
+    for package, message in packages:
+        if modified_only and not package.is_modified() and \
+                os.path.isfile(package.get_file_path()):
+            if simulation_data.verbosity_level.value >= \
+                    VerbosityLevel.verbose.value:
+                print('    skipping unmodified package {}...'.format(
+                    package._get_pname()))
+            continue
+        if package._lazy_load is not None and \
+                not package._can_copy_lazy(ext_file_action):
+            # packages are not loaded by more than one thread at a time
+            package._load_lazy()
+        write_list.append((package, message))
+
+    lock = threading.Lock()
+
+    def write_package(item):
+        package, message = item
+        if verbose and message is not None:
+            with lock:
+                print(message)
+        package.write(ext_file_action=ext_file_action)
+
+    run_in_threads(write_package, write_list, nthreads)
+    return len(write_list)
@@ -11,7 +11,7 @@ from flopy.mf6.mfbase import PackageContainer, MFFileMgmt, ExtFileAction, \
                              PackageContainerType, MFDataException, \
                              FlopyException, VerbosityLevel
 from flopy.mf6.mfmodel import MFModel
-from flopy.mf6.mfpackage import MFPackage
+from flopy.mf6.mfpackage import MFPackage, write_packages
 from flopy.mf6.data.mfstructure import DatumType
 from flopy.mf6.data import mfstructure, mfdata
 from flopy.mf6.utils import binaryfile_utils
@@ -150,6 +150,15 @@ class MFSimulationData(object):
         numbers greater than this threshold are written in scientific notation
     sci_note_lower_thres : float
         numbers less than this threshold are written in scientific notation
+    binary_external_threshold : int
+        internal arrays with at least this many values are moved to binary
+        external files when the simulation is written.  None keeps arrays
+        internal.  Default is None.
+    columnar_list_storage : bool
+        store the records of list data in columns (ColumnarList) instead of
+        recarrays with cellid tuples.  get_data then returns a new recarray
+        on every call and get_data(columnar=True) returns the stored
+        read-only columns.  Default is False.
     mfpath : MFFileMgmt
         file path location information for the simulation
     model_dimensions : OrderedDict
@@ -171,6 +180,8 @@ class MFSimulationData(object):
         self.verify_external_data = True
         self.comments_on = False
         self.auto_set_sizes = True
+        self.binary_external_threshold = None
+        self.columnar_list_storage = False
         self.debug = False
         self.verbose = True
         self.verbosity_level = VerbosityLevel.normal
@@ -366,7 +377,8 @@ class MFSimulation(PackageContainer):
 
     @classmethod
     def load(cls, sim_name='modflowsim', version='mf6', exe_name='mf6.exe',
-             sim_ws='.', strict=True, verbosity_level=VerbosityLevel.normal):
+             sim_ws='.', strict=True, verbosity_level=VerbosityLevel.normal,
+             lazy_load=False, columnar_list_storage=False):
         """
         Load an existing model.
 
@@ -388,6 +400,17 @@ class MFSimulation(PackageContainer):
             strict enforcement of file formatting
         verbosity_level : VerbosityLevel
             verbosity level of console output messages
+        lazy_load : boolean
+            register the model packages from the model name files without
+            reading them.  A package file is loaded when the data or the
+            blocks of the package are first accessed, and packages that are
+            written before they are loaded are copied from the original
+            file.  The simulation name file, tdis, ims and exchange packages
+            and the discretization packages of the models are always
+            loaded.
+        columnar_list_storage : boolean
+            store the list data of the packages in columns
+            (see MFSimulationData.columnar_list_storage)
         Returns
         -------
         sim : MFSimulation object
@@ -395,10 +418,13 @@ class MFSimulation(PackageContainer):
         Examples
         --------
         >>> s = flopy6.mfsimulation.load('my simulation')
+        >>> s = flopy6.mfsimulation.load('my simulation', lazy_load=True)
+        >>> nlay = s.get_model('model').dis.nlay.get_data()
         """
         # initialize
         instance = cls(sim_name, version, exe_name, sim_ws)
         instance.simulation_data.verbosity_level = verbosity_level
+        instance.simulation_data.columnar_list_storage = columnar_list_storage
 
         if verbosity_level.value >= VerbosityLevel.normal.value:
             print('loading simulation...')
@@ -444,7 +470,8 @@ class MFSimulation(PackageContainer):
             instance._models[item[2]] = model_obj.load(
                 instance,
                 instance.structure.model_struct_objs[item[0].lower()], item[2],
-                name_file, version, exe_name, strict, path)
+                name_file, version, exe_name, strict, path,
+                lazy_load=lazy_load)
 
         # load exchange packages and dependent packages
         try:
@@ -731,7 +758,8 @@ class MFSimulation(PackageContainer):
                                       message=message)
 
     def write_simulation(self,
-                         ext_file_action=ExtFileAction.copy_relative_paths):
+                         ext_file_action=ExtFileAction.copy_relative_paths,
+                         modified_only=False, nthreads=1):
         """
         writes the simulation to files
 
@@ -742,34 +770,35 @@ class MFSimulation(PackageContainer):
             has changed.  defaults to copy_relative_paths which copies only
             files with relative paths, leaving files defined by absolute
             paths fixed.
+        modified_only : bool
+            only write packages that have been modified since they were
+            last written, or whose file does not exist.  Data are modified
+            when they are set, appended or loaded, but changes made in place
+            to arrays returned by get_data are not detected.  defaults to
+            False.
+        nthreads : int
+            number of threads that write package files and copy external
+            files.  Every package is written to its own file, so the
+            packages are independent of each other.  defaults to 1.
 
         Examples
         --------
         """
-        # write simulation name file
         if self.simulation_data.verbosity_level.value >= \
                 VerbosityLevel.normal.value:
             print('writing simulation...')
-            print('  writing simulation name file...')
-        self.name_file.write(ext_file_action=ext_file_action)
 
-        # write TDIS file
-        if self.simulation_data.verbosity_level.value >= \
-                VerbosityLevel.normal.value:
-            print('  writing simulation tdis package...')
-        self._tdis_file.write(ext_file_action=ext_file_action)
-
-        # write ims files
+        # simulation name file, tdis and ims files
+        write_list = [(self.name_file, '  writing simulation name file...'),
+                      (self._tdis_file,
+                       '  writing simulation tdis package...')]
         for index, ims_file in self._ims_files.items():
-            if self.simulation_data.verbosity_level.value >= \
-                    VerbosityLevel.normal.value:
-                print('  writing ims package {}...'.format(
-                    ims_file._get_pname()))
-            ims_file.write(ext_file_action=ext_file_action)
+            write_list.append((ims_file, '  writing ims package {}...'.format(
+                ims_file._get_pname())))
 
-        # write exchange files
+        # exchange files
         for key, exchange_file in self._exchange_files.items():
-            exchange_file.write()
+            write_list.append((exchange_file, None))
             if hasattr(exchange_file, 'gnc_filerecord') and \
                     exchange_file.gnc_filerecord.has_data():
                 try:
@@ -782,12 +811,10 @@ class MFSimulation(PackageContainer):
                                           package=exchange_file._get_pname(),
                                           message=message)
                 if gnc_file in self._ghost_node_files:
-                    if self.simulation_data.verbosity_level.value >= \
-                            VerbosityLevel.normal.value:
-                        print('  writing gnc package {}...'.format(
-                            self._ghost_node_files[gnc_file]._get_pname()))
-                    self._ghost_node_files[gnc_file].write(ext_file_action=
-                                                           ext_file_action)
+                    gnc_package = self._ghost_node_files[gnc_file]
+                    write_list.append((gnc_package,
+                                       '  writing gnc package {}...'.format(
+                                           gnc_package._get_pname())))
                 else:
                     if self.simulation_data.verbosity_level.value >= \
                             VerbosityLevel.normal.value:
@@ -807,12 +834,10 @@ class MFSimulation(PackageContainer):
                                           message=message)
 
                 if mvr_file in self._mover_files:
-                    if self.simulation_data.verbosity_level.value >= \
-                            VerbosityLevel.normal.value:
-                        print('  writing mvr package {}...'.format(
-                            self._mover_files[mvr_file]._get_pname()))
-                    self._mover_files[mvr_file].write(ext_file_action=
-                                                      ext_file_action)
+                    mvr_package = self._mover_files[mvr_file]
+                    write_list.append((mvr_package,
+                                       '  writing mvr package {}...'.format(
+                                           mvr_package._get_pname())))
                 else:
                     if self.simulation_data.verbosity_level.value >= \
                             VerbosityLevel.normal.value:
@@ -820,29 +845,32 @@ class MFSimulation(PackageContainer):
                               'writing. File will not be '
                               'written.'.format(mvr_file))
 
-        # write other packages
+        # other packages
         for index, pp in self._other_files.items():
-            if self.simulation_data.verbosity_level.value >= \
-                    VerbosityLevel.normal.value:
-                print('  writing package {}...'.format(pp._get_pname()))
-            pp.write(ext_file_action=ext_file_action)
+            write_list.append((pp, '  writing package {}...'.format(
+                pp._get_pname())))
 
         # FIX: model working folder should be model name file folder
 
-        # write models
+        # models
         for key, model in self._models.items():
-            if self.simulation_data.verbosity_level.value >= \
-                    VerbosityLevel.normal.value:
-                print('  writing model {}...'.format(model.name))
-            model.write(ext_file_action=ext_file_action)
+            model_list = model._get_write_list()
+            model_list[0] = (model_list[0][0],
+                             '  writing model {}...\n{}'.format(
+                                 model.name, model_list[0][1]))
+            write_list += model_list
+
+        write_packages(write_list, self.simulation_data, ext_file_action,
+                       modified_only, nthreads)
 
         if ext_file_action == ExtFileAction.copy_relative_paths:
             # move external files with relative paths
-            num_files_copied = self.simulation_data.mfpath.copy_files()
+            num_files_copied = self.simulation_data.mfpath.copy_files(
+                nthreads=nthreads)
         elif ext_file_action == ExtFileAction.copy_all:
             # move all external files
             num_files_copied = self.simulation_data.mfpath.copy_files(
-                copy_relative_only=False)
+                copy_relative_only=False, nthreads=nthreads)
         else:
             num_files_copied = 0
         if self.simulation_data.verbosity_level.value >= \
@@ -209,6 +209,8 @@ class ModflowDis(Package):
         self.tr = reference.TemporalReference(itmuni=self.itmuni,
                                               start_datetime=start_datetime)
         self.start_datetime = start_datetime
+        # cached time step table
+        self._time_table = None
         # calculate layer thicknesses
         self.__calculate_thickness()
 
@@ -219,6 +221,65 @@ class ModflowDis(Package):
         """
         return (self.thickness > 0).all()
 
+    def _get_time_table(self):
+        """
+        Get the time step table of the simulation. The table is cached and
+        recalculated when perlen, nstp, or tsmult change.
+
+        Returns
+        -------
+        kper : numpy array
+            zero-based stress period of each time step
+        kstp : numpy array
+            zero-based time step (in the stress period) of each time step
+        totim : numpy array
+            simulation totim at the end of each time step
+        tper : numpy array
+            simulation totim at the beginning of each stress period
+
+        """
+        perlen = self.perlen.array
+        nstp = self.nstp.array
+        tsmult = self.tsmult.array
+        table = getattr(self, '_time_table', None)
+        if table is not None:
+            key = table[0]
+            if np.array_equal(key[0], perlen) and \
+                    np.array_equal(key[1], nstp) and \
+                    np.array_equal(key[2], tsmult):
+                return table[1]
+
+        # stress period and time step of each time step
+        nsteps = nstp.sum()
+        kper = np.repeat(np.arange(self.nper), nstp)
+        first = np.cumsum(nstp) - nstp
+        kstp = np.arange(nsteps) - np.repeat(first, nstp)
+
+        # length of the first time step in each stress period
+        dt = perlen.astype(np.float)
+        p = nstp.astype(np.float)
+        geometric = tsmult > 1
+        m = tsmult[geometric].astype(np.float)
+        dt[geometric] *= (m - 1.) / (m**p[geometric] - 1.)
+        dt[~geometric] = dt[~geometric] / p[~geometric]
+
+        # time step lengths, each step in a stress period with a tsmult
+        # greater than one is tsmult times longer than the previous step
+        dts = np.repeat(tsmult.astype(np.float), nstp)
+        dts[~np.repeat(geometric, nstp)] = 1.
+        dts[first[nstp > 0]] = dt[nstp > 0]
+        if geometric.any():
+            dts = np.concatenate([np.cumprod(v) for v in
+                                  np.split(dts, first[1:])])
+        else:
+            dts = np.repeat(dt, nstp)
+        totim = np.cumsum(dts, dtype=np.float)
+        tper = np.append(0., totim)[first]
+
+        self._time_table = ((perlen.copy(), nstp.copy(), tsmult.copy()),
+                            (kper, kstp, totim, tper))
+        return self._time_table[1]
+
     def get_totim(self):
         """
         Get the totim at the end of each time step
@@ -229,25 +290,7 @@ class ModflowDis(Package):
             numpy array with simulation totim at the end of each time step
 
         """
-        totim = []
-        nstp = self.nstp.array
-        perlen = self.perlen.array
-        tsmult = self.tsmult.array
-        t = 0.
-        for kper in range(self.nper):
-            m = tsmult[kper]
-            p = float(nstp[kper])
-            dt = perlen[kper]
-            if m > 1:
-                dt *= (m - 1.) / (m**p - 1.)
-            else:
-                dt = dt / p
-            for kstp in range(nstp[kper]):
-                t += dt
-                totim.append(t)
-                if m > 1:
-                    dt *= m
-        return np.array(totim, dtype=np.float)
+        return self._get_time_table()[2].copy()
 
     def get_final_totim(self):
         """
@@ -259,7 +302,7 @@ class ModflowDis(Package):
             maximum simulation totim
 
         """
-        return self.get_totim()[-1]
+        return self._get_time_table()[2][-1]
 
     def get_kstp_kper_toffset(self, t=0.):
         """
@@ -267,45 +310,31 @@ class ModflowDis(Package):
 
         Parameters
         ----------
-        t : float
+        t : float or array of floats
             totim to return the stress period, time step, and toffset for
             based on time discretization data. Default is 0.
 
         Returns
         -------
-        kstp : int
+        kstp : int or numpy array
             time step in stress period corresponding to passed totim
-        kper : int
+        kper : int or numpy array
             stress period corresponding to passed totim
-        toffset : float
+        toffset : float or numpy array
             time offset of passed totim from the beginning of kper
 
         """
-
-        if t < 0.:
-            t = 0.
-        totim = self.get_totim()
-        nstp = self.nstp.array
-        ipos = 0
-        t0 = 0.
-        kper = self.nper - 1
-        kstp = nstp[-1] - 1
-        toffset = self.perlen.array[-1]
-        done = False
-        for iper in range(self.nper):
-            tp0 = t0
-            for istp in range(nstp[iper]):
-                t1 = totim[ipos]
-                if t >= t0 and t < t1:
-                    done = True
-                    kper = iper
-                    kstp = istp
-                    toffset = t - tp0
-                    break
-                ipos += 1
-                t0 = t1
-            if done:
-                break
+        kpers, kstps, totim, tper = self._get_time_table()
+        t = np.maximum(np.asarray(t, dtype=np.float), 0.)
+        ipos = np.searchsorted(totim, t, side='right')
+        # times after the end of the simulation are in the last time step
+        found = ipos < totim.shape[0]
+        ipos = np.minimum(ipos, totim.shape[0] - 1)
+        kper = kpers[ipos]
+        kstp = kstps[ipos]
+        toffset = np.where(found, t - tper[kper], self.perlen.array[-1])
+        if t.ndim == 0:
+            return int(kstp), int(kper), toffset[()]
         return kstp, kper, toffset
 
     def get_totim_from_kper_toffset(self, kper=0, toffset=0.):
@@ -315,42 +344,29 @@ class ModflowDis(Package):
 
         Parameters
         ----------
-        kper : int
+        kper : int or array of ints
             stress period. Default is 0
-        toffset : float
+        toffset : float or array of floats
             time offset relative to the beginning of kper
 
         Returns
         -------
-        t : float
+        t : float or numpy array
             totim to return the stress period, time step, and toffset for
             based on time discretization data. Default is 0.
 
         """
-
-        if kper < 0:
-            kper = 0.
-        if kper >= self.nper:
+        kper = np.maximum(np.asarray(kper, dtype=np.int), 0)
+        if (kper >= self.nper).any():
             msg = 'kper ({}) '.format(kper) + 'must be less than ' + \
                   'to nper ({}).'.format(self.nper)
-            raise ValueError()
-        totim = self.get_totim()
-        nstp = self.nstp.array
-        ipos = 0
-        t0 = 0.
-        tp0 = 0.
-        for iper in range(kper+1):
-            tp0 = t0
-            if iper == kper:
-                break
-            for istp in range(nstp[iper]):
-                t1 = totim[ipos]
-                ipos += 1
-                t0 = t1
-        t = tp0 + toffset
+            raise ValueError(msg)
+        tper = self._get_time_table()[3]
+        t = tper[kper] + toffset
+        if np.ndim(t) == 0:
+            return float(t)
         return t
 
-
     def get_cell_volumes(self):
         """
         Get an array of cell volumes.
@@ -444,44 +460,49 @@ class ModflowDis(Package):
         """
         Get layer, row, column from a list of MODFLOW node numbers.
 
+        Parameters
+        ----------
+        nodes : int, list of ints, or numpy array
+            one-based MODFLOW node numbers
+
         Returns
         -------
-        v : list of tuples containing the layer (k), row (i), 
-            and column (j) for each node in the input list
+        v : list of tuples containing the layer (k), row (i),
+            and column (j) for each node in the input list. If nodes is a
+            numpy array, a tuple of (k, i, j) numpy arrays is returned.
         """
+        if isinstance(nodes, np.ndarray):
+            k, i, j = np.unravel_index(nodes - 1,
+                                       (self.nlay, self.nrow, self.ncol))
+            return k + 1, i + 1, j + 1
         if not isinstance(nodes, list):
             nodes = [nodes]
-        nrc = self.nrow * self.ncol
-        v = []
-        for node in nodes:
-            k = int(node / nrc)
-            if (k * nrc) < node:
-                k += 1
-            ij = int(node - (k - 1) * nrc)
-            i = int(ij / self.ncol)
-            if (i * self.ncol) < ij:
-                i += 1
-            j = ij - (i - 1) * self.ncol
-            v.append((k, i, j))
-        return v
+        k, i, j = self.get_lrc(np.array(nodes, dtype=np.int))
+        return list(zip(k.tolist(), i.tolist(), j.tolist()))
 
     def get_node(self, lrc_list):
         """
         Get node number from a list of MODFLOW layer, row, column tuples.
 
+        Parameters
+        ----------
+        lrc_list : tuple, list of tuples, or numpy array
+            zero-based layer (k), row (i), and column (j). A numpy array
+            must have a shape of (nnodes, 3).
+
         Returns
         -------
-        v : list of MODFLOW nodes for each layer (k), row (i), 
-            and column (j) tuple in the input list
+        v : list of MODFLOW nodes for each layer (k), row (i),
+            and column (j) tuple in the input list. If lrc_list is a
+            two-dimensional numpy array, a numpy array is returned.
         """
+        if isinstance(lrc_list, np.ndarray) and lrc_list.ndim == 2:
+            return np.ravel_multi_index(tuple(lrc_list.T),
+                                        (self.nlay, self.nrow, self.ncol))
         if not isinstance(lrc_list, list):
             lrc_list = [lrc_list]
-        nrc = self.nrow * self.ncol
-        v = []
-        for [k, i, j] in lrc_list:
-            node = int(((k) * nrc) + ((i) * self.ncol) + j)
-            v.append(node)
-        return v
+        lrc = np.array(lrc_list, dtype=np.int).reshape(-1, 3)
+        return self.get_node(lrc).tolist()
 
     def get_layer(self, i, j, elev):
         """Return the layer for an elevation at an i, j location.
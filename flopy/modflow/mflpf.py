@@ -328,18 +328,18 @@ class ModflowLpf(Package):
                                                      self.ihdwet))
         transient = not dis.steady.all()
         for k in range(nlay):
-            f.write(self.hk[k].get_file_entry())
+            self.hk[k].write_file_entry(f)
             if self.chani[k] <= 0.:
-                f.write(self.hani[k].get_file_entry())
-            f.write(self.vka[k].get_file_entry())
+                self.hani[k].write_file_entry(f)
+            self.vka[k].write_file_entry(f)
             if transient == True:
-                f.write(self.ss[k].get_file_entry())
+                self.ss[k].write_file_entry(f)
                 if self.laytyp[k] != 0:
-                    f.write(self.sy[k].get_file_entry())
+                    self.sy[k].write_file_entry(f)
             if dis.laycbd[k] > 0:
-                f.write(self.vkcb[k].get_file_entry())
+                self.vkcb[k].write_file_entry(f)
             if (self.laywet[k] != 0 and self.laytyp[k] != 0):
-                f.write(self.wetdry[k].get_file_entry())
+                self.wetdry[k].write_file_entry(f)
         f.close()
         return
 
@@ -13,10 +13,14 @@ from ..utils.flopy_io import line_parse
 from ..utils import SpatialReference
 from ..utils.recarray_utils import create_empty_recarray
 
-try:
-    import pandas as pd
-except:
-    pd = False
+
+def _import_pandas():
+    # pandas is slow to import, so it is only imported when it is used
+    try:
+        import pandas as pd
+    except:
+        pd = False
+    return pd
 
 
 class ModflowSfr2(Package):
@@ -414,7 +418,7 @@ class ModflowSfr2(Package):
         assert isfropt in [0, 1, 2, 3, 4, 5]
 
         # derived attributes
-        self._paths = None
+        self._routing_graphs = {}  # routing graph by stress period
 
         self.parent.add_package(self)
 
@@ -486,29 +490,47 @@ class ModflowSfr2(Package):
 
     @property
     def paths(self):
-        if self._paths is None:
-            self._set_paths()
-            return self._paths
-        # check to see if routing in segment data was changed
-        nseg = np.array(sorted(self._paths.keys()), dtype=int)
-        nseg = nseg[nseg > 0].copy()
-        outseg = np.array([self._paths[k][1] for k in nseg])
-        sd = self.segment_data[0]
-        if not np.array_equal(nseg, sd.nseg) or not np.array_equal(outseg,
-                                                                   sd.outseg):
-            self._set_paths()
-        return self._paths
+        """Dictionary of the routing path ([segment, outseg, ..., 0]) of each
+        segment in the first stress period; None for circular routing."""
+        return self.get_routing_graph(0).paths
 
     @property
     def df(self):
+        pd = _import_pandas()
         if pd:
             return pd.DataFrame(self.reach_data)
         else:
             return None
 
-    def _set_paths(self):
-        graph = self.graph
-        self._paths = {seg: find_path(graph, seg) for seg in graph.keys()}
+    def get_routing_graph(self, per=0):
+        """Get the segment routing graph for a stress period. Graphs are
+        cached and shared between stress periods with the same routing, and
+        are rebuilt when nseg or outseg in segment_data change.
+
+        Parameters
+        ----------
+        per : int
+            Stress period (default 0). Stress periods without segment data
+            use the segment data of the previous stress period.
+
+        Returns
+        -------
+        graph : RoutingGraph
+
+        """
+        per = max([k for k in self.segment_data.keys() if k <= per] + [0])
+        sd = self.segment_data[per]
+        graph = self._routing_graphs.get(per)
+        if graph is None or not graph.equals(sd.nseg, sd.outseg):
+            # reuse the graph of another stress period with the same routing
+            for g in set(self._routing_graphs.values()):
+                if g.equals(sd.nseg, sd.outseg):
+                    graph = g
+                    break
+            else:
+                graph = RoutingGraph(sd.nseg, sd.outseg)
+            self._routing_graphs[per] = graph
+        return graph
 
     def _get_flag(self, flagname):
         """populate values for each stress period"""
@@ -917,89 +939,37 @@ class ModflowSfr2(Package):
 
     def get_outlets(self, level=0, verbose=True):
         """Traces all routing connections from each headwater to the outlet.
+
+        Populates the outlets and outsegs attributes. The outlet of a
+        segment is the last segment (or lake) in its routing path; segments
+        with circular routing have an outlet of None.
         """
         txt = ''
         for per in range(self.nper):
             if per > 0 > self.dataset_5[per][
                 0]:  # skip stress periods where seg data not defined
                 continue
+            graph = self.get_routing_graph(per)
             segments = self.segment_data[per].nseg
-            outsegs = self.segment_data[per].outseg
-            '''
-            all_outsegs = np.vstack([segments, outsegs])
-            max_outseg = all_outsegs[-1].max()
-            knt = 1
-            while max_outseg > 0:
-
-                nextlevel = np.array([outsegs[s - 1] if s > 0 and s < 999999 else 0
-                                      for s in all_outsegs[-1]])
-
-                all_outsegs = np.vstack([all_outsegs, nextlevel])
-                max_outseg = nextlevel.max()
-                if max_outseg == 0:
-                    break
-                knt += 1
-                if knt > self.nss:
-                    # subset outsegs map to only include rows with outseg number > 0 in last column
-                    circular_segs = all_outsegs.T[all_outsegs[-1] > 0]
-
-                    # only retain one instance of each outseg number at iteration=nss
-                    vals = []  # append outseg values to vals after they've appeared once
-                    mask = [(True, vals.append(v))[0]
-                            if v not in vals
-                            else False for v in circular_segs[-1]]
-                    circular_segs = circular_segs[:, np.array(mask)]
-
-                    # cull the circular segments array to remove duplicate instances of routing circles
-                    circles = []
-                    duplicates = []
-                    for i in range(np.shape(circular_segs)[0]):
-                        # find where values in the row equal the last value;
-                        # record the index of the second to last instance of last value
-                        repeat_start_ind = np.where(circular_segs[i] == circular_segs[i, -1])[0][-2:][0]
-                        # use that index to slice out the repeated segment sequence
-                        circular_seq = circular_segs[i, repeat_start_ind:].tolist()
-                        # keep track of unique sequences of repeated segments
-                        if set(circular_seq) not in circles:
-                            circles.append(set(circular_seq))
-                            duplicates.append(False)
-                        else:
-                            duplicates.append(True)
-                    circular_segs = circular_segs[~np.array(duplicates), :]
-
-                    txt += '{0} instances where an outlet was not found after {1} consecutive segments!\n' \
-                        .format(len(circular_segs), self.nss)
-                    if level == 1:
-                        txt += '\n'.join([' '.join(map(str, row)) for row in circular_segs]) + '\n'
-                    else:
-                        f = 'circular_routing.csv'
-                        np.savetxt(f, circular_segs, fmt='%d', delimiter=',', header=txt)
-                        txt += 'See {} for details.'.format(f)
-                    if verbose:
-                        print(txt)
-                    break
-            # the array of segment sequence is useful for other other operations,
-            # such as plotting elevation profiles
-            self.outsegs[per] = all_outsegs
-            '''
-            # use graph instead of above loop
-            nrow = len(self.segment_data[per].nseg)
-            ncol = np.max(
-                [len(v) if v is not None else 0 for v in self.paths.values()])
-            all_outsegs = np.zeros((nrow, ncol), dtype=int)
-            for i, (k, v) in enumerate(self.paths.items()):
-                if k > 0:
-                    all_outsegs[i, :len(v)] = v
-            all_outsegs.sort(axis=0)
-            self.outsegs[per] = all_outsegs
-            # create a dictionary listing outlets associated with each segment
-            # outlet is the last value in each row of outseg array that is != 0 or 999999
-            # self.outlets[per] = {i + 1: r[(r != 0) & (r != 999999)][-1]
-            # if len(r[(r != 0) & (r != 999999)]) > 0
-            # else i + 1
-            #                     for i, r in enumerate(all_outsegs.T)}
-            self.outlets[per] = {k: self.paths[k][-1] if k in self.paths
-            else k for k in self.segment_data[per].nseg}
+
+            # array of segment sequences from each segment to its outlet
+            # (useful for other operations, such as plotting elevation
+            # profiles)
+            self.outsegs[per] = graph.get_downstream_array()
+            outlets = graph.outlets.tolist()
+            self.outlets[per] = {
+                n: o if not c else None for n, o, c in
+                zip(graph.nodes.tolist(), outlets, graph.circular)}
+
+            circular_segs = graph.nodes[graph.circular]
+            if len(circular_segs) > 0:
+                txt += '{0} instances where an outlet was not found after ' \
+                       '{1} consecutive segments!\n' \
+                    .format(len(circular_segs), len(segments))
+                if level == 1:
+                    txt += ' '.join(map(str, circular_segs)) + '\n'
+                if verbose:
+                    print(txt)
         return txt
 
     def reset_reaches(self):
@@ -1070,13 +1040,11 @@ class ModflowSfr2(Package):
         if np.diff(self.reach_data.outreach).max() == 0:
             self.set_outreaches()
         rd = self.reach_data
-        elev = dict(zip(rd.reachID, rd.strtop))
-        dist = dict(zip(rd.reachID, rd.rchlen))
-        dnelev = {rid: elev[rd.outreach[i]] if rd.outreach[i] != 0
-        else -9999 for i, rid in enumerate(rd.reachID)}
-        slopes = np.array(
-            [(elev[i] - dnelev[i]) / dist[i] if dnelev[i] != -9999
-             else default_slope for i in rd.reachID])
+        isoutlet = rd.outreach == 0
+        out = _get_reach_index(rd.reachID, np.where(isoutlet, rd.reachID,
+                                                    rd.outreach))
+        slopes = np.where(isoutlet, default_slope,
+                          (rd.strtop - rd.strtop[out]) / rd.rchlen)
         slopes[slopes < minimum_slope] = minimum_slope
         slopes[slopes > maximum_slope] = maximum_slope
         self.reach_data['slope'] = slopes
@@ -1092,7 +1060,7 @@ class ModflowSfr2(Package):
 
         Notes
         -----
-        This method will not work if there are instances of circular routing.
+        Segments with circular routing are not included in the upsegs.
 
         """
         all_upsegs = {}
@@ -1100,35 +1068,7 @@ class ModflowSfr2(Package):
             if per > 0 > self.dataset_5[per][
                 0]:  # skip stress periods where seg data not defined
                 continue
-            segment_data = self.segment_data[per]
-
-            # make a list of adjacent upsegments keyed to outseg list in Mat2
-            upsegs = {o: segment_data.nseg[segment_data.outseg == o].tolist()
-                      for o in np.unique(segment_data.outseg)}
-
-            outsegs = [k for k in list(upsegs.keys()) if
-                       k > 0]  # exclude 0, which is the outlet designator
-
-            # for each outseg key, for each upseg, check for more upsegs, append until headwaters has been reached
-            for outseg in outsegs:
-
-                up = True
-                upsegslist = upsegs[outseg]
-                while up:
-                    added_upsegs = []
-                    for us in upsegslist:
-                        if us in outsegs:
-                            added_upsegs += upsegs[us]
-                    if len(added_upsegs) == 0:
-                        up = False
-                        break
-                    else:
-                        upsegslist = added_upsegs
-                        upsegs[outseg] += added_upsegs
-
-            # the above algorithm is recursive, so lower order streams get duplicated many times
-            # use a set to get unique upsegs
-            all_upsegs[per] = {u: list(set(upsegs[u])) for u in outsegs}
+            all_upsegs[per] = self.get_routing_graph(per).get_all_upstream()
         return all_upsegs
 
     def get_variable_by_stress_period(self, varname):
@@ -1253,6 +1193,7 @@ class ModflowSfr2(Package):
         ax : matplotlib.axes._subplots.AxesSubplot object
         """
         import matplotlib.pyplot as plt
+        pd = _import_pandas()
         if not pd:
             print('This method requires pandas')
             return
@@ -1264,7 +1205,7 @@ class ModflowSfr2(Package):
         to_miles = {'feet': 1 / 5280., 'meters': 1 / (.3048 * 5280.)}
 
         # slice the path
-        path = np.array(self.paths[start_seg])
+        path = np.array(self.get_routing_graph().get_path(start_seg))
         endidx = np.where(path == end_seg)[0]
         endidx = endidx if len(endidx) > 0 else None
         path = path[:np.squeeze(endidx)]
@@ -1320,11 +1261,7 @@ class ModflowSfr2(Package):
         headwaters : np.ndarray (1-D)
             One dimmensional array listing all headwater segments.
         """
-        upsegs = [self.segment_data[per].nseg[
-                      self.segment_data[per].outseg == s].tolist()
-                  for s in self.segment_data[0].nseg]
-        return self.segment_data[per].nseg[
-            np.array([i for i, u in enumerate(upsegs) if len(u) == 0])]
+        return self.get_routing_graph(per).headwaters
 
     def _interpolate_to_reaches(self, segvar1, segvar2, per=0):
         """Interpolate values in datasets 6b and 6c to each reach in stream segment
@@ -1356,27 +1293,47 @@ class ModflowSfr2(Package):
         segment_data = self.segment_data[per]
         segment_data.sort(order='nseg')
         reach_data.sort(order=['iseg', 'ireach'])
-        reach_values = []
-        for seg in segment_data.nseg:
-            reaches = reach_data[reach_data.iseg == seg]
-            dist = np.cumsum(reaches.rchlen) - 0.5 * reaches.rchlen
-            icalc = segment_data.icalc[segment_data.nseg == seg]
-            if 'width' in segvar1 and icalc == 2:  # get width from channel cross section length
+
+        # segment of each reach
+        iseg = reach_data.iseg
+        idx = np.searchsorted(segment_data.nseg, iseg)
+        idx[idx == len(segment_data)] = 0
+        isvalid = segment_data.nseg[idx] == iseg
+
+        # distance from the start of the segment to each reach center
+        # and to the centers of the first and last reaches
+        segments, starts = np.unique(iseg, return_index=True)
+        ends = np.append(starts[1:], len(iseg)) - 1
+        group = np.searchsorted(segments, iseg)
+        rchlen = reach_data.rchlen.astype(np.float)
+        cumlen = np.cumsum(rchlen)
+        dist = cumlen - (cumlen - rchlen)[starts][group] - 0.5 * rchlen
+        x0, x1 = dist[starts][group], dist[ends][group]
+
+        # interpolate between segvar1 and segvar2 (see np.interp)
+        fp0 = segment_data[segvar1][idx].astype(np.float)
+        fp1 = segment_data[segvar2][idx].astype(np.float)
+        reach_values = fp1.copy()
+        interp = dist < x1
+        reach_values[interp] = (fp1 - fp0)[interp] / \
+                               (x1 - x0)[interp] * \
+                               (dist - x0)[interp] + fp0[interp]
+
+        if 'width' in segvar1:
+            icalc = segment_data.icalc[idx]
+            # get width from channel cross section length
+            for seg in np.unique(iseg[isvalid & (icalc == 2)]):
                 channel_geometry_data = self.channel_geometry_data[per]
-                reach_values += list(
-                    np.ones(len(reaches)) * channel_geometry_data[seg][0][-1])
-            elif 'width' in segvar1 and icalc == 3:  # assign arbitrary width since width is based on flow
-                reach_values += list(np.ones(len(reaches)) * 5)
-            elif 'width' in segvar1 and icalc == 4:  # assume width to be mean from streamflow width/flow table
+                reach_values[iseg == seg] = channel_geometry_data[seg][0][-1]
+            # assign arbitrary width since width is based on flow
+            reach_values[icalc == 3] = 5
+            # assume width to be mean from streamflow width/flow table
+            for seg in np.unique(iseg[isvalid & (icalc == 4)]):
                 channel_flow_data = self.channel_flow_data[per]
-                reach_values += list(
-                    np.ones(len(reaches)) * np.mean(channel_flow_data[seg][2]))
-            else:
-                fp = [segment_data[segment_data['nseg'] == seg][segvar1][0],
-                      segment_data[segment_data['nseg'] == seg][segvar2][0]]
-                xp = [dist[0], dist[-1]]
-                reach_values += np.interp(dist, xp, fp).tolist()
-        return np.array(reach_values)
+                reach_values[iseg == seg] = np.mean(
+                    channel_flow_data[seg][2])
+        reach_values[~isvalid] = np.nan
+        return reach_values
 
     def _write_1c(self, f_sfr):
 
@@ -1752,6 +1709,237 @@ class ModflowSfr2(Package):
         return 17
 
 
+class RoutingGraph(object):
+    """
+    Routing connections between SFR segments (or reaches). Each node routes
+    to at most one downstream node, so outlets, distances and cycles are
+    found for all nodes at once by repeatedly following (and doubling) the
+    downstream connections. Upstream connections are stored in compressed
+    sparse row (CSR) format.
+
+    Parameters
+    ----------
+    nodes : 1-D array of ints
+        node (segment) numbers
+    tonodes : 1-D array of ints
+        downstream node (outseg) of each node. Nodes with a tonode of 0
+        (outlet), a negative tonode (lake), or a tonode that is not in nodes
+        route out of the network.
+
+    Attributes
+    ----------
+    next : 1-D array of ints
+        index of the downstream node of each node, -1 if the node routes out
+        of the network
+    indptr, indices : 1-D arrays of ints
+        indices of the nodes routing to node i are
+        indices[indptr[i]:indptr[i + 1]]
+    circular : 1-D array of bools
+        True for nodes in, or routed to, a circular routing sequence
+    distance : 1-D array of ints
+        number of connections from each node to the last node in the
+        network on its routing path
+    order : 1-D array of ints
+        indices of the nodes without circular routing in topological
+        order (each node before its downstream node)
+
+    """
+
+    def __init__(self, nodes, tonodes):
+        self.nodes = np.array(nodes, dtype=int)
+        self.tonodes = np.array(tonodes, dtype=int)
+        n = len(self.nodes)
+
+        # downstream node indices
+        srt = np.argsort(self.nodes, kind='mergesort')
+        pos = np.searchsorted(self.nodes[srt], self.tonodes)
+        pos[pos == n] = 0
+        internal = (self.tonodes > 0) & (self.nodes[srt][pos] == self.tonodes)
+        self.next = np.where(internal, srt[pos], -1)
+
+        # upstream connections (CSR)
+        up = np.flatnonzero(internal)
+        self.indices = up[np.argsort(self.next[up], kind='mergesort')]
+        self.indptr = np.zeros(n + 1, dtype=int)
+        self.indptr[1:] = np.cumsum(np.bincount(self.next[up], minlength=n))
+
+        # follow the downstream connections by doubling the number of
+        # connections in each pass; nodes whose last node is not a node
+        # routing out of the network are in (or routed to) a cycle
+        terminal = self.next < 0
+        jump = np.where(terminal, np.arange(n), self.next)
+        distance = (~terminal).astype(int)
+        for i in range(n.bit_length() + 1):
+            distance += distance[jump]
+            jump = jump[jump]
+        self.circular = ~terminal[jump]
+        self._last = np.where(self.circular, -1, jump)
+        # a node on the cycle reached by each node with circular routing
+        self._cycle = np.where(self.circular, jump, -2)
+        self.distance = np.where(self.circular, -1, distance)
+        valid = np.flatnonzero(~self.circular)
+        self.order = valid[np.argsort(-self.distance[valid], kind='mergesort')]
+        self._paths = None
+
+    def equals(self, nodes, tonodes):
+        """Check if the graph has the routing of nodes and tonodes."""
+        return np.array_equal(self.nodes, nodes) and \
+               np.array_equal(self.tonodes, tonodes)
+
+    @property
+    def outlets(self):
+        """Outlet of each node: the last node of its routing path before
+        0 (a negative lake number for nodes routed to lakes); 0 for nodes
+        with circular routing."""
+        last = self._last[~self.circular]
+        outlets = np.zeros(len(self.nodes), dtype=int)
+        outlets[~self.circular] = np.where(self.tonodes[last] != 0,
+                                           self.tonodes[last],
+                                           self.nodes[last])
+        return outlets
+
+    @property
+    def headwaters(self):
+        """Nodes without upstream nodes."""
+        return self.nodes[np.diff(self.indptr) == 0]
+
+    def _get_index(self, node):
+        idx = np.flatnonzero(self.nodes == node)
+        if len(idx) == 0:
+            raise ValueError('{} is not in the routing graph'.format(node))
+        return idx[0]
+
+    def get_upstream(self, node):
+        """Get all nodes upstream of a node.
+
+        Parameters
+        ----------
+        node : int
+            node number
+
+        Returns
+        -------
+        upstream : 1-D array
+            sorted node numbers
+        """
+        frontier = np.array([self._get_index(node)])
+        upstream = []
+        visited = np.zeros(len(self.nodes), dtype=bool)
+        while len(frontier) > 0:
+            # gather the CSR rows of the current frontier
+            starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+            counts = ends - starts
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            frontier = self.indices[offsets + np.arange(counts.sum())]
+            frontier = frontier[~visited[frontier]]
+            visited[frontier] = True
+            upstream.append(frontier)
+        return np.sort(self.nodes[np.concatenate(upstream)])
+
+    def get_all_upstream(self):
+        """Get all upstream nodes of each node with upstream nodes.
+
+        Returns
+        -------
+        upstream : dict
+            {node: [sorted list of upstream nodes]}, also including
+            positive outlet numbers that are not nodes
+        """
+        # pairs of (node, downstream node) for every node downstream
+        # of each node without circular routing
+        valid = np.flatnonzero(~self.circular)
+        up, down = [], []
+        current = valid
+        while len(current) > 0:
+            nxt = self.next[current]
+            # nodes routing out of the network to a lake or missing number
+            out = (nxt < 0) & (self.tonodes[current] != 0)
+            up.append(valid[out])
+            down.append(self.tonodes[current][out])
+            valid, current = valid[nxt >= 0], nxt[nxt >= 0]
+            up.append(valid)
+            down.append(self.nodes[current])
+        up = self.nodes[np.concatenate(up)] if len(up) > 0 else \
+            np.zeros(0, dtype=int)
+        down = np.concatenate(down) if len(down) > 0 else \
+            np.zeros(0, dtype=int)
+        srt = np.lexsort((up, down))
+        up, down = up[srt], down[srt]
+        keys, starts = np.unique(down, return_index=True)
+        return {k: v.tolist() for k, v in
+                zip(keys.tolist(), np.split(up, starts[1:])) if k > 0}
+
+    def get_path(self, node):
+        """Get the routing path of a node.
+
+        Parameters
+        ----------
+        node : int
+            node number
+
+        Returns
+        -------
+        path : list
+            node numbers from node to 0 (including the number of lakes or
+            outlets that are not nodes), or None for circular routing
+        """
+        if node not in self.paths:
+            return [node, 0] if node != 0 else [0]
+        return self.paths[node]
+
+    @property
+    def paths(self):
+        """Dictionary of the routing path of every node (see get_path)."""
+        if self._paths is None:
+            paths = {}
+            for t in np.unique(self.tonodes[self.next < 0]).tolist():
+                paths[t] = [t, 0] if t != 0 else [0]
+            nodes = self.nodes.tolist()
+            tonodes = self.tonodes.tolist()
+            nxt = self.next.tolist()
+            # downstream nodes first
+            for i in self.order[::-1].tolist():
+                if nxt[i] < 0:
+                    paths[nodes[i]] = [nodes[i]] + paths[tonodes[i]]
+                else:
+                    paths[nodes[i]] = [nodes[i]] + paths[nodes[nxt[i]]]
+            for i in np.flatnonzero(self.circular).tolist():
+                paths[nodes[i]] = None
+            self._paths = paths
+        return self._paths
+
+    def get_downstream_array(self):
+        """Get an array of the routing paths of each node, with a row
+        for each node; the first column contains the nodes, the second
+        column their downstream nodes, and so on until 0 (or a lake) is
+        reached. Routing of nodes with circular routing is listed once
+        around the cycle, and is cut off at the width of the array
+        (the largest distance plus two columns).
+
+        Returns
+        -------
+        downstream : 2-D array
+        """
+        n = len(self.nodes)
+        ncol = max(self.distance.max(), 0) + 2 if n > 0 else 1
+        columns = [self.nodes]
+        current = np.arange(n)
+        # rows with circular routing become inactive when the node on
+        # their cycle is reached for the second time
+        nvisits = (current == self._cycle).astype(int)
+        for i in range(ncol - 1):
+            active = (current >= 0) & (nvisits < 2)
+            if not active.any():
+                break
+            col = np.zeros(n, dtype=int)
+            col[active] = self.tonodes[current[active]]
+            columns.append(col)
+            current = np.where(active, self.next[np.maximum(current, 0)],
+                               -1)
+            nvisits += current == self._cycle
+        return np.array(columns).transpose()
+
+
 class check:
     """
     Check SFR2 package for common errors
@@ -1899,14 +2087,14 @@ class check:
         headertxt = 'Checking for nan values...\n'
         txt = ''
         passed = False
-        isnan = np.any(np.isnan(np.array(self.reach_data.tolist())), axis=1)
+        isnan = _isnan_rows(self.reach_data)
         nanreaches = self.reach_data[isnan]
         if np.any(isnan):
             txt += 'Found {} reachs with nans:\n'.format(len(nanreaches))
             if self.level == 1:
                 txt += _print_rec_array(nanreaches, delimiter=' ')
         for per, sd in self.segment_data.items():
-            isnan = np.any(np.isnan(np.array(sd.tolist())), axis=1)
+            isnan = _isnan_rows(sd)
             nansd = sd[isnan]
             if np.any(isnan):
                 txt += 'Per {}: found {} segments with nans:\n'.format(per,
@@ -1939,14 +2127,22 @@ class check:
                               datatype='segment')
 
         # check reach numbering
-        for segment in np.arange(1, self.sfr.nss + 1):
-            reaches = self.reach_data.ireach[self.reach_data.iseg == segment]
+        # (reaches of each segment must be numbered 1, 2, ... in order)
+        iseg = self.reach_data.iseg
+        ireach = self.reach_data.ireach
+        srt = np.argsort(iseg, kind='mergesort')
+        srt = srt[(iseg[srt] > 0) & (iseg[srt] <= self.sfr.nss)]
+        iseg, ireach = iseg[srt], ireach[srt]
+        starts = np.unique(iseg, return_index=True)[1]
+        expected = np.arange(len(iseg)) - np.repeat(starts, np.diff(
+            np.append(starts, len(iseg)))) + 1
+        for segment in np.unique(iseg[ireach != expected]):
+            reaches = ireach[iseg == segment]
             t = _check_numbers(len(reaches),
                                reaches,
                                level=self.level,
                                datatype='reach')
-            if len(t) > 0:
-                txt += 'Segment {} has {}'.format(segment, t)
+            txt += 'Segment {} has {}'.format(segment, t)
         if txt == '':
             passed = True
         self._txt_footer(headertxt, txt,
@@ -1973,7 +2169,7 @@ class check:
                 for nseg, outseg in decreases:
                     t += '{} {}\n'.format(nseg, outseg)
                 txt += t  # '\n'.join(textwrap.wrap(t, width=10))
-        if len(t) == 0:
+        if len(txt) == 0:
             passed = True
         self._txt_footer(headertxt, txt, 'segment numbering order', passed)
 
@@ -1987,7 +2183,8 @@ class check:
 
         # txt += self.sfr.get_outlets(level=self.level, verbose=False)  # will print twice if verbose=True
         # simpler check method using paths from routing graph
-        circular_segs = [k for k, v in self.sfr.paths.items() if v is None]
+        graph = self.sfr.get_routing_graph(0)
+        circular_segs = graph.nodes[graph.circular].tolist()
         if len(circular_segs) > 0:
             txt += '{0} instances where an outlet was not found after {1} consecutive segments!\n' \
                 .format(len(circular_segs), self.sfr.nss)
@@ -2009,23 +2206,18 @@ class check:
             rd.sort(order=['reachID'])
             x0 = self.sr.xcentergrid[rd.i, rd.j]
             y0 = self.sr.ycentergrid[rd.i, rd.j]
-            loc = dict(zip(rd.reachID, zip(x0, y0)))
 
             # compute distances between node centers of connected reaches
             headertxt = 'Checking reach connections for proximity...\n'
             txt = ''
             if self.verbose:
                 print(headertxt.strip())
-            dist = []
-            for r in rd.reachID:
-                x0, y0 = loc[r]
-                outreach = rd.outreach[r - 1]
-                if outreach == 0:
-                    dist.append(0)
-                else:
-                    x1, y1 = loc[outreach]
-                    dist.append(np.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2))
-            dist = np.array(dist)
+            outreach = rd.outreach[rd.reachID - 1]
+            isoutlet = outreach == 0
+            out = _get_reach_index(rd.reachID, np.where(isoutlet, rd.reachID,
+                                                        outreach))
+            dist = np.where(isoutlet, 0.,
+                            np.sqrt((x0[out] - x0) ** 2 + (y0[out] - y0) ** 2))
 
             # compute max width of reach nodes (hypotenuse for rectangular nodes)
             dx = (self.sr.delr * self.sr.length_multiplier)[rd.j]
@@ -2039,7 +2231,7 @@ class check:
             breaks = np.where(dist > hyp * 1.25)
             breaks_reach_data = rd[breaks]
             segments_with_breaks = set(breaks_reach_data.iseg)
-            if len(breaks) > 0:
+            if len(segments_with_breaks) > 0:
                 txt += '{0} segments with non-adjacent reaches found.\n'.format(
                     len(segments_with_breaks))
                 if self.level == 1:
@@ -2072,12 +2264,12 @@ class check:
         # make nodes based on unique row, col pairs
         # if np.diff(reach_data.node).max() == 0:
         # always use unique rc, since flopy assigns nodes by k, i, j
-        uniquerc = {}
-        for i, (r, c) in enumerate(reach_data[['i', 'j']]):
-            if (r, c) not in uniquerc:
-                uniquerc[(r, c)] = i + 1
-        reach_data['node'] = [uniquerc[(r, c)] for r, c in
-                              reach_data[['i', 'j']]]
+        # (cells are numbered by the position of their first reach)
+        rc = reach_data['i'].astype(np.int64) * \
+             (reach_data['j'].max() + 1) + reach_data['j']
+        _, first, inverse = np.unique(rc, return_index=True,
+                                              return_inverse=True)
+        reach_data['node'] = first[inverse] + 1
 
         K = reach_data['strhc1']
         if K.max() == 0:
@@ -2094,19 +2286,18 @@ class check:
         binv[idx] = 1. / b[idx]
         Cond = K * w * L * binv
 
-        shared_cells = _get_duplicates(reach_data['node'])
-
-        nodes_with_multiple_conductance = set()
-        for node in shared_cells:
+        # smallest and largest conductance of the reaches in each cell
+        srt = np.lexsort((Cond, reach_data['node']))
+        nodes, starts, counts = np.unique(reach_data['node'][srt],
+                                          return_index=True,
+                                          return_counts=True)
+        cmin = Cond[srt][starts]
+        cmax = Cond[srt][starts + counts - 1]
 
-            # select the collocated reaches for this cell
-            conductances = Cond[reach_data['node'] == node].copy()
-            conductances.sort()
-
-            # list nodes with multiple non-zero SFR reach conductances
-            if (conductances[-1] != 0.0 and
-                    (conductances[0] / conductances[-1] > tol)):
-                nodes_with_multiple_conductance.update({node})
+        # list nodes with multiple non-zero SFR reach conductances
+        shared = (counts > 1) & (cmax != 0.)
+        shared[shared] = cmin[shared] / cmax[shared] > tol
+        nodes_with_multiple_conductance = set(nodes[shared])
 
         if len(nodes_with_multiple_conductance) > 0:
             txt += '{} model cells with multiple non-zero SFR conductances found.\n' \
@@ -2126,9 +2317,7 @@ class check:
                     reach_data,
                     names=['width', 'conductance'], data=[w, Cond],
                     usemask=False, asrecarray=False)
-                has_multiple = np.array(
-                    [True if n in nodes_with_multiple_conductance
-                     else False for n in reach_data['node']])
+                has_multiple = np.in1d(reach_data['node'], nodes[shared])
                 reach_data = reach_data[has_multiple]
                 reach_data = reach_data[cols]
                 txt += _print_rec_array(reach_data, delimiter='\t')
@@ -2234,9 +2423,8 @@ class check:
                 non_outlets = segment_data.outseg > 0
                 non_outlets_seg_data = segment_data[
                     non_outlets]  # lake outsegs are < 0
-                outseg_elevup = np.array(
-                    [segment_data.elevup[o - 1] for o in segment_data.outseg if
-                     o > 0])
+                outseg_elevup = segment_data.elevup[
+                    segment_data.outseg[non_outlets] - 1]
                 d_elev2 = outseg_elevup - segment_data.elevdn[non_outlets]
                 non_outlets_seg_data = recfunctions.append_fields(
                     non_outlets_seg_data,
@@ -2276,12 +2464,11 @@ class check:
 
             # compute changes in elevation
             rd = self.reach_data.copy()
-            elev = dict(zip(rd.reachID, rd.strtop))
-            dnelev = {rid: elev[rd.outreach[i]] if rd.outreach[i] != 0
-            else -9999 for i, rid in enumerate(rd.reachID)}
-            strtopdn = np.array([dnelev[r] for r in rd.reachID])
-            diffs = np.array([(dnelev[i] - elev[i]) if dnelev[i] != -9999
-                              else -.001 for i in rd.reachID])
+            isoutlet = rd.outreach == 0
+            out = _get_reach_index(rd.reachID, np.where(isoutlet, rd.reachID,
+                                                        rd.outreach))
+            strtopdn = np.where(isoutlet, -9999, rd.strtop[out])
+            diffs = np.where(isoutlet, -.001, strtopdn - rd.strtop)
 
             reach_data = self.sfr.reach_data  # inconsistent with other checks that work with
             # reach_data attribute of check class. Want to have get_outreaches as a method of sfr class
@@ -2555,6 +2742,22 @@ def _get_dataset(line, dataset):
     return dataset
 
 
+def _isnan_rows(recarray):
+    """Returns a boolean array that is True for rows of a record array with
+    nan values."""
+    isnan = np.zeros(len(recarray), dtype=bool)
+    for name in recarray.dtype.names:
+        if recarray.dtype[name].kind == 'f':
+            isnan |= np.isnan(recarray[name])
+    return isnan
+
+
+def _get_reach_index(reachID, reaches):
+    """Returns the indices of reaches (reachID numbers) in reachID."""
+    srt = np.argsort(reachID, kind='mergesort')
+    return srt[np.searchsorted(reachID, reaches, sorter=srt)]
+
+
 def _get_duplicates(a):
     """Returns duplcate values in an array, similar to pandas .duplicated() method
     http://stackoverflow.com/questions/11528078/determining-duplicate-values-in-an-array
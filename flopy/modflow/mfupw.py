@@ -270,16 +270,16 @@ class ModflowUpw(Package):
             raise Exception('LAYWET should be 0 for UPW')
         transient = not self.parent.get_package('DIS').steady.all()
         for k in range(nlay):
-            f_upw.write(self.hk[k].get_file_entry())
+            self.hk[k].write_file_entry(f_upw)
             if self.chani[k] < 1:
-                f_upw.write(self.hani[k].get_file_entry())
-            f_upw.write(self.vka[k].get_file_entry())
+                self.hani[k].write_file_entry(f_upw)
+            self.vka[k].write_file_entry(f_upw)
             if transient == True:
-                f_upw.write(self.ss[k].get_file_entry())
+                self.ss[k].write_file_entry(f_upw)
                 if self.laytyp[k] != 0:
-                    f_upw.write(self.sy[k].get_file_entry())
+                    self.sy[k].write_file_entry(f_upw)
             if self.parent.get_package('DIS').laycbd[k] > 0:
-                f_upw.write(self.vkcb[k].get_file_entry())
+                self.vkcb[k].write_file_entry(f_upw)
             if (self.laywet[k] != 0 and self.laytyp[k] != 0):
                 f_upw.write(self.laywet[k].get_file_entry())
         f_upw.close()
@@ -15,7 +15,6 @@ import webbrowser as wb
 import numpy as np
 from numpy.lib.recfunctions import stack_arrays
 
-from .modflow.mfparbc import ModflowParBc as mfparbc
 from .utils import Util2d, Util3d, Transient2d, MfList, check
 
 
@@ -714,6 +713,8 @@ class Package(object):
 
         # read parameter data
         if nppak > 0:
+            # imported here, because flopy.modflow imports this module
+            from .modflow.mfparbc import ModflowParBc as mfparbc
             dt = pack_type.get_empty(1, aux_names=aux_names,
                                      structured=model.structured).dtype
             pak_parms = mfparbc.load(f, nppak, dt, model.verbose)
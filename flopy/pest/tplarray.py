@@ -15,6 +15,42 @@ def get_template_array(pakarray):
         tpla = Transient2dTpl(pakarray)
     return tpla
 
+
+def _get_parname_entry(name):
+    """
+    Get the fixed-width template entry for a parameter name.
+
+    """
+    return '~{0:^13s}~'.format(name)
+
+
+def _get_template_codes(array, parindex=None, parnames=None):
+    """
+    Get a table of unique byte strings and an integer array of the same
+    shape as array with the position of every cell in the table.  Array
+    values are converted to strings once for every unique value and cells
+    with a parindex larger than zero get the name of parameter
+    parnames[parindex - 1].
+
+    """
+    array = np.asarray(array)
+    values, codes = np.unique(array, return_inverse=True)
+    if values.dtype.kind in 'SU':
+        table = np.char.encode(values.astype('U'), 'ascii') \
+            if values.dtype.kind == 'U' else values
+    else:
+        table = np.array(values, dtype='S')
+    codes = codes.reshape(array.shape)
+    if parindex is not None and parnames:
+        names = np.array([_get_parname_entry(name).encode('ascii')
+                          for name in parnames])
+        parindex = np.asarray(parindex)
+        codes = np.where(parindex > 0, len(table) + parindex - 1, codes)
+        table = np.concatenate((table.astype(np.result_type(table, names)),
+                                names))
+    return table, codes
+
+
 class Transient2dTpl:
     def __init__(self, transient2d):
         self.transient2d = transient2d
@@ -66,12 +102,18 @@ class Transient2dTpl:
         # regular transient2d array
         if parameterized:
             u2d = self.transient2d[kper]
-            chararray = np.array(u2d.array, dtype='str')
+            array = u2d.array
+            parindex = None
+            parnames = []
             if kper in self.params:
+                # number the parameters so that later parameters replace
+                # earlier ones, as with assignment by index
+                parindex = np.zeros(array.shape, dtype=np.int32)
                 for p in self.params[kper]:
-                    idx = p.span['idx']
-                    chararray[idx] = '~{0:^13s}~'.format(p.name)
-            u2dtpl = Util2dTpl(chararray, u2d.name, multiplier, indexed_param)
+                    parnames.append(p.name)
+                    parindex[p.span['idx']] = len(parnames)
+            u2dtpl = Util2dTpl(array, u2d.name, multiplier, indexed_param,
+                               parindex=parindex, parnames=parnames)
             return (1, u2dtpl.get_file_entry())
         else:
             return self.transient2d.get_kper_entry(kper)
@@ -89,22 +131,36 @@ class Util3dTpl(object):
     """
     def __init__(self, u3d):
         self.u3d = u3d
-        self.chararray = np.array(u3d.array, dtype='str')
+        self.array = u3d.array
+        self.parindex = np.zeros(self.array.shape, dtype=np.int32)
+        self.parnames = []
         self.multipliers = {}
         self.indexed_params = False
-        if self.chararray.ndim == 3:
+        if self.array.ndim == 3:
             # Then multi layer array, so set all multipliers to None
-            for k in range(self.chararray.shape[0]):
+            for k in range(self.array.shape[0]):
                 self.multipliers[k] = None
         return
 
+    @property
+    def chararray(self):
+        """
+        Template array with the parameter names substituted, as an array
+        of strings.
+
+        """
+        table, codes = _get_template_codes(self.array, self.parindex,
+                                           self.parnames)
+        return np.char.decode(table, 'ascii')[codes]
+
     def __getitem__(self, k):
-        return Util2dTpl(self.chararray[k], self.u3d.name_base[k] + str(k + 1),
-                         self.multipliers[k], self.indexed_params)
+        return Util2dTpl(self.array[k], self.u3d.name_base[k] + str(k + 1),
+                         self.multipliers[k], self.indexed_params,
+                         parindex=self.parindex[k], parnames=self.parnames)
 
     def add_parameter(self, p):
         """
-        Fill the chararray with the parameter name.
+        Fill the parameter index array with the parameter number.
 
         Parameters
         ----------
@@ -123,7 +179,8 @@ class Util3dTpl(object):
 
         if 'idx' in p.span and p.span['idx'] is not None:
             idx = p.span['idx']
-            self.chararray[idx] = '~{0:^13s}~'.format(p.name)
+            self.parnames.append(p.name)
+            self.parindex[idx] = len(self.parnames)
             self.indexed_params = True
 
         return
@@ -136,19 +193,89 @@ class Util2dTpl(object):
 
     Parameters
     ----------
-    chararray : A Numpy ndarray of dtype 'str'.
+    chararray : A Numpy ndarray of dtype 'str' or of the array values.
     name : The parameter type.  This will be written to the control record
         as a comment.
     indexed_param : bool
         A flag to indicated whether or not the array contains parameter names
         within the array itself.
+    parindex : A Numpy ndarray of ints with the same shape as chararray.
+        Cells with a value larger than zero are replaced by parameter
+        parnames[parindex - 1].  Default is None.
+    parnames : list of parameter names.  Default is None.
 
     """
-    def __init__(self, chararray, name, multiplier, indexed_param):
+    def __init__(self, chararray, name, multiplier, indexed_param,
+                 parindex=None, parnames=None):
         self.chararray = chararray
         self.name = name
         self.multiplier = multiplier
         self.indexed_param = indexed_param
+        self.parindex = parindex
+        self.parnames = parnames
+        return
+
+    def iter_file_entry(self, nrows=1000):
+        """
+        Convert the array into strings, nrows rows at a time.
+
+        Parameters
+        ----------
+        nrows : int
+            number of array rows in every string.  Default is 1000.
+
+        Returns
+        -------
+        file_entry : generator of str
+
+        """
+        table, codes = _get_template_codes(self.chararray, self.parindex,
+                                           self.parnames)
+        if codes.ndim == 1:
+            codes = codes.reshape(1, -1)
+        ncol = codes.shape[-1]
+        if codes.size > 0 and self.multiplier is None and \
+                codes.min() == codes.max():
+            yield 'CONSTANT {0}    #{1}\n'.format(
+                table[codes.flat[0]].decode(), self.name)
+            return
+
+        mult = 1.0
+        if self.multiplier is not None:
+            mult = self.multiplier
+        yield 'INTERNAL {0} (FREE) -1      #{1}\n'.format(mult, self.name)
+
+        # every entry is right justified in 15 characters and a line
+        # terminator follows every 10th entry and the last entry of a row,
+        # so the entries of a row can be joined without formatting
+        ntable = len(table)
+        short = np.char.str_len(table) < 15
+        table = np.where(short, np.char.rjust(table, 15), table)
+        table = np.char.add(b' ', table)
+        table = np.concatenate((table, np.char.add(table, b'\n')))
+        eol = np.zeros(ncol, dtype=np.int64)
+        eol[9::10] = ntable
+        eol[-1] = ntable
+        for i0 in range(0, codes.shape[0], nrows):
+            rows = codes[i0:i0 + nrows] + eol
+            yield b''.join(table[rows.ravel()]).decode()
+        return
+
+    def write_file_entry(self, f, nrows=1000):
+        """
+        Write the array to an open file, nrows rows at a time, so that the
+        file entry of a large array is never held in memory as one string.
+
+        Parameters
+        ----------
+        f : file object
+            open file
+        nrows : int
+            number of array rows in every write.  Default is 1000.
+
+        """
+        for entry in self.iter_file_entry(nrows=nrows):
+            f.write(entry)
         return
 
     def get_file_entry(self):
@@ -160,24 +287,4 @@ class Util2dTpl(object):
         file_entry : str
 
         """
-        ncol = self.chararray.shape[-1]
-        au = np.unique(self.chararray)
-        if au.shape[0] == 1 and self.multiplier is None:
-            file_entry = 'CONSTANT {0}    #{1}\n'.format(au[0], self.name)
-        else:
-            mult = 1.0
-            if self.multiplier is not None:
-                mult = self.multiplier
-            cr = 'INTERNAL {0} (FREE) -1      #{1}\n'.format(mult, self.name)
-            astring = ''
-            icount = 0
-            for i in range(self.chararray.shape[0]):
-                for j in range(self.chararray.shape[1]):
-                    icount += 1
-                    astring += ' {0:>15s}'.format(self.chararray[i, j])
-                    if icount == 10 or j == ncol - 1:
-                        astring += '\n'
-                        icount = 0
-            file_entry = cr + astring
-        return file_entry
-
+        return ''.join(self.iter_file_entry())
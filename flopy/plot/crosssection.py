@@ -230,11 +230,11 @@ class ModelCrossSection(object):
             of the top of a layer or the head value. Used to create
             patches that conform to water-level elevations.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
         if 'ax' in kwargs:
@@ -242,33 +242,13 @@ class ModelCrossSection(object):
         else:
             ax = self.ax
 
-        vpts = []
-        for k in range(self.dis.nlay):
-            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
-                                                   self.sr.yedge,
-                                                   a[k, :, :]))
-            if self.laycbd[k] > 0:
-                ta = np.empty((self.dis.nrow, self.dis.ncol), dtype=np.float)
-                ta[:, :] = -1e9
-                vpts.append(plotutil.cell_value_points(self.xpts,
-                                                       self.sr.xedge,
-                                                       self.sr.yedge, ta))
-        vpts = np.array(vpts)
-        if masked_values is not None:
-            for mval in masked_values:
-                vpts = np.ma.masked_equal(vpts, mval)
+        vpts = self._get_array_points(a, masked_values)
 
         if isinstance(head, np.ndarray):
             zpts = self.set_zpts(head)
         else:
             zpts = self.zpts
 
-        if masked_values is not None:
-            for mval in masked_values:
-                vpts = np.ma.masked_equal(vpts, mval)
-        if self.ncb > 0:
-            vpts = np.ma.masked_equal(vpts, -1e9)
-
         pc = self.get_grid_patch_collection(zpts, vpts, **kwargs)
         if pc != None:
             ax.add_collection(pc)
@@ -478,11 +458,11 @@ class ModelCrossSection(object):
             of the top of a layer or the head value. Used to create
             patches that conform to water-level elevations.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
         if ibound is None:
@@ -550,11 +530,11 @@ class ModelCrossSection(object):
             of the top of a layer or the head value. Used to create
             patches that conform to water-level elevations.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
 
@@ -763,7 +743,7 @@ class ModelCrossSection(object):
 
     def get_grid_patch_collection(self, zpts, plotarray, **kwargs):
         """
-        Get a PatchCollection of plotarray in unmasked cells
+        Get a PolyCollection of plotarray in unmasked cells
 
         Parameters
         ----------
@@ -774,16 +754,14 @@ class ModelCrossSection(object):
         plotarray : numpy.ndarray
             Three-dimensional array to attach to the Patch Collection.
         **kwargs : dictionary
-            keyword arguments passed to matplotlib.collections.PatchCollection
+            keyword arguments passed to matplotlib.collections.PolyCollection
 
         Returns
         -------
-        patches : matplotlib.collections.PatchCollection
+        patches : matplotlib.collections.PolyCollection
 
         """
-        from matplotlib.patches import Polygon
-        from matplotlib.collections import PatchCollection
-        rectcol = []
+        from matplotlib.collections import PolyCollection
 
         if 'vmin' in kwargs:
             vmin = kwargs.pop('vmin')
@@ -794,38 +772,148 @@ class ModelCrossSection(object):
         else:
             vmax = None
 
-        v = []
+        verts, colors = self._get_patch_data(zpts, plotarray)
 
-        colors = []
-        for k in range(zpts.shape[0] - 1):
-            for idx in range(0, len(self.xpts) - 1, 2):
-                try:
-                    ll = ((self.xpts[idx][2], zpts[k + 1, idx]))
-                    try:
-                        dx = self.xpts[idx + 2][2] - self.xpts[idx][2]
-                    except:
-                        dx = self.xpts[idx + 1][2] - self.xpts[idx][2]
-                    dz = zpts[k, idx] - zpts[k + 1, idx]
-                    pts = (ll,
-                           (ll[0], ll[1] + dz), (ll[0] + dx, ll[1] + dz),
-                           (ll[0] + dx, ll[1]))  # , ll)
-                    if np.isnan(plotarray[k, idx]):
-                        continue
-                    if plotarray[k, idx] is np.ma.masked:
-                        continue
-                    rectcol.append(Polygon(pts, closed=True))
-                    colors.append(plotarray[k, idx])
-                except:
-                    pass
-
-        if len(rectcol) > 0:
-            patches = PatchCollection(rectcol, **kwargs)
-            patches.set_array(np.array(colors))
+        if len(verts) > 0:
+            patches = PolyCollection(verts, **kwargs)
+            patches.set_array(colors)
             patches.set_clim(vmin, vmax)
         else:
             patches = None
         return patches
 
+    def update_array(self, patches, a, masked_values=None, head=None):
+        """
+        Update the cells and colors of a collection created by plot_array
+        (or plot_ibound, plot_bc) with a new three-dimensional array. The
+        cached cell geometry is reused so only the colors (and the set of
+        unmasked cells) are updated, which is useful for animations.
+
+        Parameters
+        ----------
+        patches : matplotlib.collections.PolyCollection
+            collection returned by a previous call to plot_array.
+        a : numpy.ndarray
+            Three-dimensional array to plot.
+        masked_values : iterable of floats, ints
+            Values to mask.
+        head : numpy.ndarray
+            Three-dimensional array to set top of patches to the minimum
+            of the top of a layer or the head value.
+
+        Returns
+        -------
+        patches : matplotlib.collections.PolyCollection
+
+        """
+        vpts = self._get_array_points(a, masked_values)
+
+        if isinstance(head, np.ndarray):
+            zpts = self.set_zpts(head)
+        else:
+            zpts = self.zpts
+
+        verts, colors = self._get_patch_data(zpts, vpts)
+        patches.set_verts(verts)
+        patches.set_array(colors)
+        return patches
+
+    def get_cell_verts(self, zpts=None):
+        """
+        Get the vertices of every cell in the cross-section as a single
+        array. The vertices are cached and only recalculated if zpts
+        changes.
+
+        Parameters
+        ----------
+        zpts : numpy.ndarray
+            array of z elevations that correspond to the x, y, and horizontal
+            distance along the cross-section (self.xpts). If zpts is None
+            self.zpts is used. (Default is None)
+
+        Returns
+        -------
+        verts : numpy.ndarray
+            array of cell vertices with a shape of (nlay, ncell, 4, 2), where
+            nlay is zpts.shape[0] - 1 and ncell is the number of cells
+            intersected by the cross-section. The vertices of each cell are
+            ordered lower left, upper left, upper right, and lower right.
+
+        """
+        if zpts is None:
+            zpts = self.zpts
+        zpts = np.asarray(zpts)
+
+        cache = getattr(self, '_verts_cache', None)
+        if cache is not None and cache[0].shape == zpts.shape and \
+                np.array_equal(cache[0], zpts):
+            return cache[1]
+
+        d = self.xpts[:, 2]
+        idx = np.arange(0, len(self.xpts) - 1, 2)
+        idx1 = idx + 2
+        idx1[idx1 >= len(self.xpts)] -= 1
+        x0 = d[idx]
+        x1 = x0 + (d[idx1] - x0)
+        nlay = zpts.shape[0] - 1
+        top = zpts[:-1, idx]
+        bot = zpts[1:, idx]
+
+        verts = np.empty((nlay, len(idx), 4, 2), dtype=np.float)
+        verts[:, :, 0, 0] = x0
+        verts[:, :, 0, 1] = bot
+        verts[:, :, 1, 0] = x0
+        verts[:, :, 1, 1] = top
+        verts[:, :, 2, 0] = x1
+        verts[:, :, 2, 1] = top
+        verts[:, :, 3, 0] = x1
+        verts[:, :, 3, 1] = bot
+
+        self._verts_cache = (zpts.copy(), verts)
+        return verts
+
+    def _get_array_points(self, a, masked_values=None):
+        """
+        Get the values of a three-dimensional array at the cross-section
+        points, including masked values for quasi-3D confining beds.
+
+        """
+        vpts = []
+        for k in range(self.dis.nlay):
+            vpts.append(plotutil.cell_value_points(self.xpts, self.sr.xedge,
+                                                   self.sr.yedge,
+                                                   a[k, :, :]))
+            if self.laycbd[k] > 0:
+                ta = np.empty((self.dis.nrow, self.dis.ncol), dtype=np.float)
+                ta[:, :] = -1e9
+                vpts.append(plotutil.cell_value_points(self.xpts,
+                                                       self.sr.xedge,
+                                                       self.sr.yedge, ta))
+        vpts = np.array(vpts)
+        if masked_values is not None:
+            for mval in masked_values:
+                vpts = np.ma.masked_equal(vpts, mval)
+        if self.ncb > 0:
+            vpts = np.ma.masked_equal(vpts, -1e9)
+        return vpts
+
+    def _get_patch_data(self, zpts, plotarray):
+        """
+        Get the vertices and values of the unmasked cells in plotarray.
+
+        """
+        verts = self.get_cell_verts(zpts)
+        nlay = min(verts.shape[0], plotarray.shape[0])
+        idx = np.arange(0, len(self.xpts) - 1, 2)
+        values = plotarray[:nlay, idx]
+        mask = np.ma.getmaskarray(values)
+        data = np.ma.getdata(values)
+        if data.dtype.kind == 'f':
+            mask = mask | np.isnan(data)
+        valid = ~mask.ravel()
+        verts = verts[:nlay].reshape((-1, 4, 2))[valid]
+        return verts, data.ravel()[valid]
+
     def get_grid_line_collection(self, **kwargs):
         """
         Get a LineCollection of the grid
@@ -841,28 +929,16 @@ class ModelCrossSection(object):
         """
         from matplotlib.collections import LineCollection
 
-        linecol = []
-        for k in range(self.zpts.shape[0] - 1):
-            for idx in range(0, len(self.xpts) - 1, 2):
-                try:
-                    ll = ((self.xpts[idx][2], self.zpts[k + 1, idx]))
-                    try:
-                        dx = self.xpts[idx + 2][2] - self.xpts[idx][2]
-                    except:
-                        dx = self.xpts[idx + 1][2] - self.xpts[idx][2]
-                    dz = self.zpts[k, idx] - self.zpts[k + 1, idx]
-                    # horizontal lines
-                    linecol.append(((ll), (ll[0] + dx, ll[1])))
-                    linecol.append(
-                        ((ll[0], ll[1] + dz), (ll[0] + dx, ll[1] + dz)))
-                    # vertical lines
-                    linecol.append(((ll), (ll[0], ll[1] + dz)))
-                    linecol.append(
-                        ((ll[0] + dx, ll[1]), (ll[0] + dx, ll[1] + dz)))
-                except:
-                    pass
-
-        linecollection = LineCollection(linecol, **kwargs)
+        verts = self.get_cell_verts(self.zpts).reshape((-1, 4, 2))
+        # horizontal (bottom, top) and vertical (left, right) lines
+        linecol = np.empty((verts.shape[0], 4, 2, 2), dtype=np.float)
+        linecol[:, 0] = verts[:, [0, 3]]
+        linecol[:, 1] = verts[:, [1, 2]]
+        linecol[:, 2] = verts[:, [0, 1]]
+        linecol[:, 3] = verts[:, [3, 2]]
+
+        linecollection = LineCollection(linecol.reshape((-1, 2, 2)),
+                                        **kwargs)
         return linecollection
 
     def set_zpts(self, vs):
@@ -675,58 +675,43 @@ class ModelMap(object):
         if 'colors' not in kwargs:
             kwargs['colors'] = '0.5'
 
-        linecol = []
-        for p in pl:
-            if travel_time is None:
-                tp = p.copy()
-            else:
-                if isinstance(travel_time, str):
-                    if '<=' in travel_time:
-                        time = float(travel_time.replace('<=', ''))
-                        idx = (p['time'] <= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('<', ''))
-                        idx = (p['time'] < time)
-                    elif '>=' in travel_time:
-                        time = float(travel_time.replace('>=', ''))
-                        idx = (p['time'] >= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('>', ''))
-                        idx = (p['time'] > time)
-                    else:
-                        try:
-                            time = float(travel_time)
-                            idx = (p['time'] <= time)
-                        except:
-                            errmsg = 'flopy.map.plot_pathline travel_time ' + \
-                                     'variable cannot be parsed. ' + \
-                                     'Acceptable logical variables are , ' + \
-                                     '<=, <, >=, and >. ' + \
-                                     'You passed {}'.format(travel_time)
-                            raise Exception(errmsg)
-                else:
-                    time = float(travel_time)
-                    idx = (p['time'] <= time)
-                tp = p[idx]
-
-            vlc = []
-            # rotate data
-            x0r, y0r = self.sr.rotate(tp['x'], tp['y'], self.sr.rotation, 0.,
-                                      self.sr.yedge[0])
-            x0r += self.sr.xul
-            y0r += self.sr.yul - self.sr.yedge[0]
-            # build polyline array
-            arr = np.vstack((x0r, y0r)).T
-            # select based on layer
-            if kon >= 0:
-                kk = p['k'].copy().reshape(p.shape[0], 1)
-                kk = np.repeat(kk, 2, axis=1)
-                arr = np.ma.masked_where((kk != kon), arr)
-            else:
-                arr = np.ma.asarray(arr)
-            # append line to linecol if there is some unmasked segment
-            if not arr.mask.all():
-                linecol.append(arr)
+        # concatenate the pathlines so that the travel time selection,
+        # rotation, and layer selection are done once for all pathlines
+        nlines = len(pl)
+        if nlines < 1:
+            return None
+        lengths = np.array([p.shape[0] for p in pl], dtype=np.int)
+        lineid = np.repeat(np.arange(nlines), lengths)
+        x = np.concatenate([p['x'] for p in pl])
+        y = np.concatenate([p['y'] for p in pl])
+        k = np.concatenate([p['k'] for p in pl])
+
+        if travel_time is not None:
+            time = np.concatenate([p['time'] for p in pl])
+            idx = _travel_time_selection(time, travel_time)
+            x, y, k, lineid = x[idx], y[idx], k[idx], lineid[idx]
+            lengths = np.bincount(lineid, minlength=nlines)
+
+        # rotate data
+        x0r, y0r = self.sr.rotate(x, y, self.sr.rotation, 0.,
+                                  self.sr.yedge[0])
+        x0r += self.sr.xul
+        y0r += self.sr.yul - self.sr.yedge[0]
+        # build polyline array
+        arr = np.ma.asarray(np.column_stack((x0r, y0r)))
+        # select based on layer
+        if kon >= 0:
+            active = (k == kon)
+            arr = np.ma.masked_where(np.repeat(~active[:, np.newaxis], 2,
+                                               axis=1), arr)
+        else:
+            active = np.ones(k.shape, dtype=np.bool)
+        # only include lines that have some unmasked segment
+        nactive = np.bincount(lineid, weights=active, minlength=nlines)
+        offsets = np.cumsum(lengths)
+        linecol = [line for line, n in zip(np.split(arr, offsets[:-1]),
+                                           nactive) if n > 0]
+
         # create line collection
         lc = None
         if len(linecol) > 0:
@@ -815,7 +800,7 @@ class ModelMap(object):
             idx = (ep[ksel] == k) & (ep[isel] == i) & (ep[jsel] == j)
             tep = ep[idx]
         else:
-            tep = ep.copy()
+            tep = ep
 
         if 'ax' in kwargs:
             ax = kwargs.pop('ax')
@@ -864,3 +849,54 @@ class ModelMap(object):
             cb = plt.colorbar(sp, shrink=shrink)
             cb.set_label(colorbar_label)
         return sp
+
+
+def _travel_time_selection(time, travel_time):
+    """
+    Get a boolean array that selects the pathline times that satisfy the
+    travel_time constraint passed to ModelMap.plot_pathline.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        pathline times
+    travel_time : float or str
+        travel time selection. If a float is passed, times less than or
+        equal to travel_time are selected. If a string is passed, the
+        logical constraints <=, <, >=, and > can be added in front of the
+        time value.
+
+    Returns
+    -------
+    idx : numpy.ndarray
+        boolean array that is True for selected times
+
+    """
+    if isinstance(travel_time, str):
+        if '<=' in travel_time:
+            t = float(travel_time.replace('<=', ''))
+            idx = (time <= t)
+        elif '<' in travel_time:
+            t = float(travel_time.replace('<', ''))
+            idx = (time < t)
+        elif '>=' in travel_time:
+            t = float(travel_time.replace('>=', ''))
+            idx = (time >= t)
+        elif '>' in travel_time:
+            t = float(travel_time.replace('>', ''))
+            idx = (time > t)
+        else:
+            try:
+                t = float(travel_time)
+                idx = (time <= t)
+            except:
+                errmsg = 'flopy.map.plot_pathline travel_time ' + \
+                         'variable cannot be parsed. ' + \
+                         'Acceptable logical variables are , ' + \
+                         '<=, <, >=, and >. ' + \
+                         'You passed {}'.format(travel_time)
+                raise Exception(errmsg)
+    else:
+        t = float(travel_time)
+        idx = (time <= t)
+    return idx
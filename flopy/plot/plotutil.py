@@ -8,6 +8,7 @@ from __future__ import print_function
 import os
 import sys
 import math
+import threading
 import numpy as np
 try:
     from matplotlib.colors import LinearSegmentedColormap
@@ -610,9 +611,9 @@ class SwiConcentration():
             self.__nu = nu
             self.__istrat = istrat
             if istrat == 1:
-                self.__nsrf = self.nu.shape - 1
+                self.__nsrf = self.__nu.shape[0] - 1
             else:
-                self.__nsrf = self.nu.shape - 2
+                self.__nsrf = self.__nu.shape[0] - 2
         else:
             try:
                 dis = model.get_package('DIS')
@@ -641,6 +642,9 @@ class SwiConcentration():
         ----------
         zeta : dictionary of numpy arrays
             Dictionary of zeta results. zeta keys are zero-based zeta surfaces.
+            The zeta arrays can be of shape (nlay, nrow, ncol), or of shape
+            (ntimes, nlay, nrow, ncol) to calculate the concentration for a
+            stack of time steps at once.
         layer : int
             Concentration will be calculated for the specified layer.  If layer 
             is None, then the concentration will be calculated for all layers. 
@@ -660,23 +664,21 @@ class SwiConcentration():
         >>> conc = c.calc_conc(z, layer=0)
 
         """
-        conc = np.zeros((self.__nlay, self.__nrow, self.__ncol), np.float)
-        
-        pct = {}
-        for isrf in range(self.__nsrf):
-            z = zeta[isrf]
-            pct[isrf] = (self.__botm[:-1, :, :] - z[:, :, :]) / self.__b[:, :, :]
-        for isrf in range(self.__nsrf):
-            p = pct[isrf]
-            if self.__istrat == 1:
-                conc[:, :, :] += self.__nu[isrf] * p[:, :, :]
-                if isrf+1 == self.__nsrf:
-                    conc[:, :, :] += self.__nu[isrf+1] * (1. - p[:, :, :])
+        # fraction of each layer above each zeta surface, with all surfaces
+        # stacked along the first axis
+        z = np.array([zeta[isrf] for isrf in range(self.__nsrf)])
+        pct = (self.__botm[:-1, :, :] - z) / self.__b
+        if self.__istrat == 1:
+            nu = np.asarray(self.__nu, dtype=np.float).ravel()
+            conc = np.tensordot(nu[:self.__nsrf], pct, axes=1)
+            conc += nu[self.__nsrf] * (1. - pct[-1])
+        else:
             #TODO linear option
+            conc = np.zeros(pct.shape[1:], np.float)
         if layer is None:
             return conc
         else:
-            return conc[layer, :, :]
+            return conc[..., layer, :, :]
 
 
 
@@ -1080,14 +1082,75 @@ def plot_cvfd(verts, iverts, ax=None, layer=0, cmap='Dark2',
     return pc
 
 
-def saturated_thickness(head, top, botm, laytyp, mask_values=None):
+def _run_time_chunks(func, arrays, nthreads):
+    """
+    Call func for contiguous chunks of time steps of the 4-D arrays in a
+    pool of threads and concatenate the results.  Arrays that are None or
+    that do not have a time axis are passed to each call unchanged.  The
+    first exception raised by func is raised again in the calling thread.
+
+    """
+    ntimes = [a.shape[0] for a in arrays if a is not None and a.ndim == 4]
+    ntimes = ntimes[0]
+    nthreads = max(1, min(nthreads, ntimes))
+    bounds = np.linspace(0, ntimes, nthreads + 1).astype(int)
+    results = [None] * nthreads
+    errors = []
+
+    def worker(n):
+        t = slice(bounds[n], bounds[n + 1])
+        args = [a[t] if a is not None and a.ndim == 4 else a for a in arrays]
+        try:
+            results[n] = func(*args)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,))
+               for n in range(nthreads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+    if isinstance(results[0], tuple):
+        return tuple(None if r[0] is None else np.concatenate(r)
+                     for r in zip(*results))
+    return np.concatenate(results)
+
+
+def cell_thickness(top, botm):
+    """
+    Calculate the thickness of each cell from the top and botm arrays.
+
+    Parameters
+    ----------
+    top : numpy.ndarray
+        top array of shape (nrow, ncol)
+    botm : numpy.ndarray
+        botm array of shape (nlay, nrow, ncol)
+
+    Returns
+    -------
+    thickness : numpy.ndarray
+        Cell thickness of shape (nlay, nrow, ncol).
+
+    """
+    tops = np.concatenate((np.asarray(top)[np.newaxis], botm[:-1]))
+    return tops - botm
+
+
+def saturated_thickness(head, top, botm, laytyp, mask_values=None,
+                        thickness=None, nthreads=1):
     """
     Calculate the saturated thickness.
 
     Parameters
     ----------
     head : numpy.ndarray
-        head array
+        head array of shape (nlay, nrow, ncol), or of shape
+        (ntimes, nlay, nrow, ncol) for a stack of time steps
     top : numpy.ndarray
         top array of shape (nrow, ncol)
     botm : numpy.ndarray
@@ -1096,41 +1159,49 @@ def saturated_thickness(head, top, botm, laytyp, mask_values=None):
         confined (0) or convertible (1) of shape (nlay)
     mask_values : list of floats
         If head is one of these values, then set sat to top - bot
+    thickness : numpy.ndarray
+        precomputed cell thickness of shape (nlay, nrow, ncol) (see
+        cell_thickness), which can be reused for many time steps.
+        (default is None)
+    nthreads : int
+        number of threads used to process a stack of time steps.
+        (default is 1)
 
     Returns
     -------
     sat_thk : numpy.ndarray
-        Saturated thickness of shape (nlay, nrow, ncol).
+        Saturated thickness of shape (nlay, nrow, ncol) or
+        (ntimes, nlay, nrow, ncol).
 
     """
-    nlay, nrow, ncol = head.shape
+    nlay = head.shape[-3]
+    botm = botm[:nlay]
+    if thickness is None:
+        thickness = cell_thickness(top, botm)
+    if head.ndim == 4 and nthreads > 1:
+        return _run_time_chunks(
+            lambda h: saturated_thickness(h, top, botm, laytyp, mask_values,
+                                          thickness),
+            [head], nthreads)
+
     sat_thk = np.empty(head.shape, dtype=head.dtype)
-    for k in range(nlay):
-        if k == 0:
-            t = top
-        else:
-            t = botm[k-1, :, :]
-        sat_thk[k, :, :] = t - botm[k, :, :]
-    for k in range(nlay):
-        if laytyp[k] != 0:
-            dh = np.zeros((nrow, ncol), dtype=head.dtype)
-            s = sat_thk[k, :, :]
-
-            for mv in mask_values:
-                idx = (head[k, :, :] == mv)
-                dh[idx] = s[idx]
-
-            if k == 0:
-                t = top
-            else:
-                t = botm[k-1, :, :]
-            t = np.where(head[k, :, :] > t, t, head[k, :, :])
-            dh = np.where(dh == 0, t - botm[k, :, :], dh)
-            sat_thk[k, :, :] = dh[:, :]
+    sat_thk[...] = thickness
+    conv = np.asarray(laytyp)[:nlay] != 0
+    if conv.any():
+        tops = (thickness + botm)[conv]
+        h = head[..., conv, :, :]
+        t = np.where(h > tops, tops, h)
+        dh = t - botm[conv]
+        if mask_values is not None and len(mask_values) > 0:
+            s = thickness[conv]
+            masked = np.in1d(h, mask_values).reshape(h.shape) & (s != 0)
+            dh = np.where(masked, s, dh)
+        sat_thk[..., conv, :, :] = dh
     return sat_thk
 
 
-def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
+def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk,
+                                nthreads=1):
     """
     Using the MODFLOW discharge, calculate the cell centered specific discharge
     by dividing by the flow width and then averaging to the cell center.
@@ -1151,61 +1222,66 @@ def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
         MODFLOW delc array
     sat_thk : numpy.ndarray
         Saturated thickness for each cell
+    nthreads : int
+        number of threads used to process a stack of time steps.
+        (default is 1)
 
     Returns
     -------
     (qx, qy, qz) : tuple of numpy.ndarrays
         Specific discharge arrays that have been interpolated to cell centers.
 
+    Notes
+    -----
+    The flow arrays can be of shape (nlay, nrow, ncol), or of shape
+    (ntimes, nlay, nrow, ncol) for a stack of time steps.  sat_thk can
+    have the same shape as the flow arrays or be of shape
+    (nlay, nrow, ncol) for all time steps.
+
     """
+    arrays = [Qx, Qy, Qz, sat_thk]
+    if nthreads > 1 and any(a is not None and a.ndim == 4 for a in arrays):
+        return _run_time_chunks(
+            lambda qx, qy, qz, s: centered_specific_discharge(qx, qy, qz,
+                                                              delr, delc, s),
+            arrays, nthreads)
+
     qx = None
     qy = None
     qz = None
 
     if Qx is not None:
 
-        nlay, nrow, ncol = Qx.shape
         qx = np.zeros(Qx.shape, dtype=Qx.dtype)
+        area = delc[:, np.newaxis] * 0.5 * (sat_thk[..., :, :-1] +
+                                            sat_thk[..., :, 1:])
+        area = np.broadcast_to(area, Qx[..., :-1].shape)
+        idx = area > 0.
+        qx[..., :-1][idx] = Qx[..., :-1][idx] / area[idx]
 
-        for k in range(nlay):
-            for j in range(ncol-1):
-                area = delc[:] * 0.5 * (sat_thk[k, :, j] + sat_thk[k, :, j + 1])
-                idx = area > 0.
-                qx[k, idx, j] = Qx[k, idx, j] / area[idx]
-
-        qx[:, :, 1:] = 0.5 * (qx[:, :, 0:ncol-1] + qx[:, :, 1:ncol])
-        qx[:, :, 0] = 0.5 * qx[:, :, 0]
+        qx[..., 1:] = 0.5 * (qx[..., :-1] + qx[..., 1:])
+        qx[..., 0] = 0.5 * qx[..., 0]
 
     if Qy is not None:
 
-        nlay, nrow, ncol = Qy.shape
         qy = np.zeros(Qy.shape, dtype=Qy.dtype)
+        area = delr * 0.5 * (sat_thk[..., :-1, :] + sat_thk[..., 1:, :])
+        area = np.broadcast_to(area, Qy[..., :-1, :].shape)
+        idx = area > 0.
+        qy[..., :-1, :][idx] = Qy[..., :-1, :][idx] / area[idx]
 
-        for k in range(nlay):
-            for i in range(nrow-1):
-                area = delr[:] * 0.5 * (sat_thk[k, i, :] + sat_thk[k, i + 1, :])
-                idx = area > 0.
-                qy[k, i, idx] = Qy[k, i, idx] / area[idx]
-
-        qy[:, 1:, :] = 0.5 * (qy[:, 0:nrow-1, :] + qy[:, 1:nrow, :])
-        qy[:, 0, :] = 0.5 * qy[:, 0, :]
+        qy[..., 1:, :] = 0.5 * (qy[..., :-1, :] + qy[..., 1:, :])
+        qy[..., 0, :] = 0.5 * qy[..., 0, :]
         qy = -qy
 
-
     if Qz is not None:
-        qz = np.zeros(Qz.shape, dtype=Qz.dtype)
-        dr = delr.reshape((1, delr.shape[0]))
-        dc = delc.reshape((delc.shape[0], 1))
-        area = dr * dc
-        for k in range(nlay):
-            qz[k, :, :] = Qz[k, :, :] / area[:, :]
-        qz[1:, :, :] = 0.5 * (qz[0:nlay-1, :, :] + qz[1:nlay, :, :])
-        qz[0, :, :] = 0.5 * qz[0, :, :]
+        area = delc[:, np.newaxis] * delr[np.newaxis, :]
+        qz = (Qz / area).astype(Qz.dtype)
+        qz[..., 1:, :, :] = 0.5 * (qz[..., :-1, :, :] + qz[..., 1:, :, :])
+        qz[..., 0, :, :] = 0.5 * qz[..., 0, :, :]
         qz = -qz
 
-
     return (qx, qy, qz)
-    
 
 
 def findrowcolumn(pt, xedge, yedge):
@@ -23,8 +23,8 @@
 from .mfreadnam import parsenamefile
 from .util_array import Util3d, Util2d, Transient2d, Transient3d, read1d
 from .util_list import MfList
-from .binaryfile import BinaryHeader, HeadFile, UcnFile, CellBudgetFile, \
-    HeadUFile
+from .binaryfile import BinaryHeader, HeadFile, UcnFile, UcnFileSet, \
+    CellBudgetFile, HeadUFile
 from .formattedfile import FormattedHeadFile
 from .modpathfile import PathlineFile, EndpointFile
 from .swroutputfile import SwrStage, SwrBudget, SwrFlow, SwrExchange, \
@@ -42,3 +42,4 @@ from .postprocessing import get_transmissivities
 from .sfroutputfile import SfrFile
 from .recarray_utils import create_empty_recarray, ra_slice
 from .mtlistfile import MtListBudget
+from .gridintersect import GridIntersect
@@ -1,13 +1,16 @@
 """
-Module to read MODFLOW binary output files.  The module contains three
+Module to read MODFLOW binary output files.  The module contains four
 important classes that can be accessed by the user.
 
 *  HeadFile (Binary head file.  Can also be used for drawdown)
 *  UcnFile (Binary concentration file from MT3DMS)
+*  UcnFileSet (Binary concentration files for all MT3DMS species)
 *  CellBudgetFile (Binary cell-by-cell flow file)
 
 """
 from __future__ import print_function
+import os
+import re
 import numpy as np
 import warnings
 from collections import OrderedDict
@@ -507,6 +510,396 @@ class UcnFile(BinaryLayerFile):
         return
 
 
+class UcnFileSet(object):
+    """
+    UcnFileSet Class.
+
+    Parameters
+    ----------
+    model : flopy.mt3d.Mt3dms
+        MT3DMS or MT3D-USGS model.  The concentration files are discovered
+        in the model workspace and the number of species is taken from the
+        btn package.  Default is None.
+    model_ws : string
+        Directory with the concentration files if model is None.
+        Default is the current working directory.
+    filenames : list of strings
+        Names of the concentration files, in species order.  If filenames
+        is specified, model and model_ws are not used to discover the
+        files.  Default is None.
+    sorbed : bool
+        Read the sorbed-phase concentration files (MT3DnnnS.UCN) instead
+        of the dissolved-phase files (MT3Dnnn.UCN).  Default is False.
+    text : string
+        Name of the text string in the ucn files.  Default is
+        'CONCENTRATION'
+    precision : string
+        'auto', 'single' or 'double'.  Default is 'auto'.
+    verbose : bool
+        Write information to the screen.  Default is False.
+
+    Attributes
+    ----------
+    filenames : list of strings
+        Names of the concentration files.  Species are zero-based indices
+        into this list.
+    nspecies : int
+        Number of species.
+
+    Methods
+    -------
+
+    See Also
+    --------
+
+    Notes
+    -----
+    MT3DMS writes one concentration file for every species, and the files
+    of a simulation contain the same records.  The UcnFileSet class builds
+    the index of the first file with a UcnFile instance, checks that the
+    other files have the same layout and shares the index between them.
+    Every file is memory-mapped, so data are read without seeking and a
+    UcnFileSet can be used from several threads at the same time.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> mt = flopy.mt3d.Mt3dms.load('p7.nam', model_ws='model')
+    >>> ucnobj = flopy.utils.UcnFileSet(mt)
+    >>> times = ucnobj.get_times()
+    >>> conc = ucnobj.get_data(species=[0, 2], totim=times[-1])
+    >>> ts = ucnobj.get_ts((0, 10, 10))
+
+    """
+
+    def __init__(self, model=None, model_ws='.', filenames=None,
+                 sorbed=False, text='concentration', precision='auto',
+                 verbose=False):
+        ncomp = None
+        if model is not None:
+            model_ws = model.model_ws
+            ncomp = model.ncomp
+        if filenames is None:
+            filenames = self._find_files(model_ws, sorbed, ncomp)
+        if len(filenames) == 0:
+            raise Exception('UcnFileSet error: no concentration files ' +
+                            'found in {}'.format(model_ws))
+        self.filenames = list(filenames)
+        self.nspecies = len(self.filenames)
+        self.verbose = verbose
+
+        # build the shared index from the first file
+        kwargs = {}
+        if model is not None:
+            kwargs['sr'] = model.sr
+        ucn = UcnFile(self.filenames[0], text=text, precision=precision,
+                      verbose=verbose, **kwargs)
+        ucn.close()
+        self._ucn = ucn
+        self.precision = ucn.precision
+        self.realtype = ucn.realtype
+        self.header_dtype = ucn.header_dtype
+        self.recordarray = ucn.recordarray
+        self.iposarray = ucn.iposarray
+        self.times = ucn.times
+        self.kstpkper = ucn.kstpkper
+        self.nlay = ucn.nlay
+        self.nrow = ucn.nrow
+        self.ncol = ucn.ncol
+        self.sr = ucn.sr
+        self.totalbytes = ucn.totalbytes
+
+        # time and layer of every record
+        totim = self.recordarray['totim']
+        newtime = np.ones(totim.shape, dtype=np.bool)
+        newtime[1:] = totim[1:] != totim[:-1]
+        itime = np.cumsum(newtime) - 1
+        self._recidx = np.full((len(self.times), self.nlay), -1,
+                               dtype=np.int64)
+        self._recidx[itime, self.recordarray['ilay'] - 1] = \
+            np.arange(len(self.recordarray))
+
+        self._stride = self._get_stride()
+        self._maps = []
+        self._data = []
+        for fname in self.filenames:
+            self._map_file(fname)
+        return
+
+    @staticmethod
+    def _find_files(model_ws, sorbed=False, ncomp=None):
+        """
+        Find the MT3Dnnn.UCN or MT3DnnnS.UCN files in model_ws, sorted by
+        species number.
+
+        """
+        suffix = 'S' if sorbed else ''
+        pattern = re.compile(r'^MT3D(\d{{3}}){}\.UCN$'.format(suffix),
+                             re.IGNORECASE)
+        found = []
+        for fname in os.listdir(model_ws):
+            match = pattern.match(fname)
+            if match is None:
+                continue
+            icomp = int(match.group(1))
+            if ncomp is not None and icomp > ncomp:
+                continue
+            found.append((icomp, os.path.join(model_ws, fname)))
+        return [fname for icomp, fname in sorted(found)]
+
+    def _get_stride(self):
+        """
+        Get the number of bytes between records.  The records of a
+        concentration file have the same size, so the files can be mapped
+        as a strided array.
+
+        """
+        ipos = self.iposarray.astype(np.int64)
+        if len(ipos) < 2:
+            return self.totalbytes
+        stride = ipos[1] - ipos[0]
+        if not np.all(np.diff(ipos) == stride):
+            raise Exception('UcnFileSet error: records in ' +
+                            '{} '.format(self.filenames[0]) +
+                            'do not have the same size')
+        return stride
+
+    def _map_file(self, fname):
+        """
+        Memory-map a concentration file and check that the headers match
+        the shared index.
+
+        """
+        nbytes = os.path.getsize(fname)
+        if nbytes != self.totalbytes:
+            raise Exception('UcnFileSet error: size of {} '.format(fname) +
+                            '({}) is not equal to '.format(nbytes) +
+                            'size of {} '.format(self.filenames[0]) +
+                            '({})'.format(self.totalbytes))
+        nrec = len(self.recordarray)
+        ipos0 = int(self.iposarray[0])
+        mm = np.memmap(fname, dtype=np.uint8, mode='r')
+        hsize = self.header_dtype.itemsize
+        headers = np.ndarray((nrec,), dtype=self.header_dtype, buffer=mm,
+                             offset=ipos0 - hsize, strides=(self._stride,))
+        if not (np.array_equal(headers['totim'], self.recordarray['totim'])
+                and np.array_equal(headers['ilay'],
+                                   self.recordarray['ilay'])):
+            raise Exception('UcnFileSet error: records in {} '.format(fname) +
+                            'are not equal to records in ' +
+                            '{}'.format(self.filenames[0]))
+        isize = self.realtype(1).nbytes
+        data = np.ndarray((nrec, self.nrow, self.ncol), dtype=self.realtype,
+                          buffer=mm, offset=ipos0,
+                          strides=(self._stride, self.ncol * isize, isize))
+        if self.verbose:
+            print('mapped {} records of {}'.format(nrec, fname))
+        self._maps.append(mm)
+        self._data.append(data)
+        return
+
+    def _get_species(self, species):
+        """
+        Get a list of zero-based species indices.
+
+        """
+        if species is None:
+            return list(range(self.nspecies))
+        if np.isscalar(species):
+            species = [species]
+        species = [int(s) for s in species]
+        for s in species:
+            if s < 0 or s > self.nspecies - 1:
+                raise Exception('Invalid species {}. '.format(s) +
+                                'There are {} species.'.format(self.nspecies))
+        return species
+
+    def _get_time_indices(self, kstpkper=None, totim=None, idx=None):
+        """
+        Get the time indices for kstpkper, totim or a record index.
+
+        """
+        if kstpkper is not None:
+            if isinstance(kstpkper, tuple):
+                kstpkper = [kstpkper]
+            lookup = {}
+            for itim, kk in enumerate(self.get_kstpkper()):
+                lookup.setdefault(kk, itim)
+            itimes = []
+            for kk in kstpkper:
+                kk = (int(kk[0]), int(kk[1]))
+                if kk not in lookup:
+                    raise Exception('get_data() error: kstpkper not ' +
+                                    'found:{0}'.format(kk))
+                itimes.append(lookup[kk])
+            return itimes
+        elif totim is not None:
+            times = np.array(self.times)
+            itimes = []
+            for t in np.atleast_1d(totim):
+                itim = np.where(times == t)[0]
+                if len(itim) == 0:
+                    msg = 'totim value ({}) not found in file...'.format(t)
+                    raise Exception(msg)
+                itimes.append(itim[0])
+            return itimes
+        elif idx is not None:
+            irec = np.atleast_1d(idx)
+            itimes = []
+            for i in irec:
+                itimes.append(np.where(self._recidx == i)[0][0])
+            return itimes
+        return [len(self.times) - 1]
+
+    def get_times(self):
+        """
+        Get a list of unique times in the files
+
+        Returns
+        ----------
+        out : list of floats
+            List contains unique simulation times (totim) in the files.
+
+        """
+        return self.times
+
+    def get_kstpkper(self):
+        """
+        Get a list of unique stress periods and time steps in the files
+
+        Returns
+        ----------
+        out : list of (kstp, kper) tuples
+            List of unique kstp, kper combinations in the files.  kstp and
+            kper values are zero-based.
+
+        """
+        kstpkper = []
+        for kstp, kper in self.kstpkper:
+            kstpkper.append((kstp - 1, kper - 1))
+        return kstpkper
+
+    def get_data(self, species=None, kstpkper=None, idx=None, totim=None,
+                 mflay=None):
+        """
+        Get concentrations for one or more species and times.
+
+        Parameters
+        ----------
+        species : int or list of ints
+            Zero-based species index or list of indices.  If None, all
+            species are returned.  (Default is None.)
+        kstpkper : tuple of ints or list of tuples
+            A tuple containing the time step and stress period (kstp, kper),
+            or a list of tuples.  These are zero-based kstp and kper values.
+        idx : int or list of ints
+            The zero-based record number, or a list of record numbers.
+        totim : float or list of floats
+            The simulation time or a list of simulation times.
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (nspecies, nlay, nrow, ncol).  If a list of
+            times is specified, the array has size
+            (ntimes, nspecies, nlay, nrow, ncol).  The species dimension is
+            removed if species is an int and the layer dimension is
+            removed if mflay is specified.
+
+        Notes
+        -----
+        if kstpkper, idx and totim are None, will return the last entry
+
+        """
+        multitime = False
+        for v in (totim, idx):
+            if v is not None and not np.isscalar(v):
+                multitime = True
+        if kstpkper is not None and not isinstance(kstpkper, tuple):
+            multitime = True
+        itimes = self._get_time_indices(kstpkper=kstpkper, totim=totim,
+                                        idx=idx)
+        slist = self._get_species(species)
+
+        if mflay is None:
+            layers = np.arange(self.nlay)
+        else:
+            layers = np.array([mflay])
+        recidx = self._recidx[np.ix_(itimes, layers)]
+        missing = recidx < 0
+        recidx[missing] = 0
+
+        data = np.empty((len(itimes), len(slist), len(layers), self.nrow,
+                         self.ncol), dtype=self.realtype)
+        for isp, s in enumerate(slist):
+            data[:, isp] = self._data[s][recidx]
+        if missing.any():
+            data.transpose(0, 2, 1, 3, 4)[missing] = np.nan
+
+        if mflay is not None:
+            data = data[:, :, 0]
+        if species is not None and np.isscalar(species):
+            data = data[:, 0]
+        if not multitime:
+            data = data[0]
+        return data
+
+    def get_ts(self, idx, species=None):
+        """
+        Get a time series for one or more species from the files.
+
+        Parameters
+        ----------
+        idx : tuple of ints, or a list of a tuple of ints
+            idx can be (layer, row, column) or it can be a list in the form
+            [(layer, row, column), (layer, row, column), ...].  The layer,
+            row, and column values must be zero based.
+        species : int or list of ints
+            Zero-based species index or list of indices.  If None, all
+            species are returned.  (Default is None.)
+
+        Returns
+        ----------
+        out : numpy array
+            Array has size (ntimes, nspecies * ncells + 1).  The first
+            column in the data array will contain time (totim).  The other
+            columns contain the cells for the first species, then the
+            cells for the second species, and so on.
+
+        """
+        kijlist = self._ucn._build_kijlist(idx)
+        slist = self._get_species(species)
+        kij = np.array(kijlist, dtype=np.int64).reshape(-1, 3)
+        recidx = self._recidx[:, kij[:, 0]]
+        missing = recidx < 0
+        recidx[missing] = 0
+        i = kij[:, 1][np.newaxis, :]
+        j = kij[:, 2][np.newaxis, :]
+
+        ncell = len(kij)
+        result = np.empty((len(self.times), len(slist) * ncell + 1),
+                          dtype=self.realtype)
+        result[:, 0] = self.times
+        for isp, s in enumerate(slist):
+            values = self._data[s][recidx, i, j]
+            values[missing] = np.nan
+            result[:, 1 + isp * ncell:1 + (isp + 1) * ncell] = values
+        return result
+
+    def close(self):
+        """
+        Release the memory maps of the files.
+
+        """
+        self._data = []
+        self._maps = []
+        return
+
+
 class CellBudgetFile(object):
     """
     CellBudgetFile Class.
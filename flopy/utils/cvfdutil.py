@@ -1,4 +1,3 @@
-from collections import OrderedDict
 import numpy as np
 
 
@@ -95,8 +94,124 @@ def segment_face(ivert, ivlist1, ivlist2, vertices):
     return
 
 
+def _isin(codes, sorted_codes):
+    """
+    Check if codes are in a sorted array of codes.
+
+    """
+    if len(sorted_codes) == 0:
+        return np.zeros(len(codes), dtype=bool)
+    pos = np.searchsorted(sorted_codes, codes)
+    pos = np.minimum(pos, len(sorted_codes) - 1)
+    return sorted_codes[pos] == codes
+
+
+def _unique_vertices(xy, snap_tolerance=None):
+    """
+    Number the unique vertices in the order that they are first used.
+
+    Parameters
+    ----------
+    xy : ndarray
+        x, y coordinates of the cell vertices
+    snap_tolerance : float
+        if specified, vertices that round to the same multiple of
+        snap_tolerance are merged
+
+    Returns
+    -------
+    ivert : ndarray
+        vertex number of each point in xy
+    verts : ndarray
+        x, y coordinates of each vertex
+
+    """
+    keys = xy
+    if snap_tolerance:
+        keys = np.round(xy / snap_tolerance)
+    # lexsort is stable so the first point of each group of equal points
+    # is the first occurrence of the vertex
+    order = np.lexsort((keys[:, 1], keys[:, 0]))
+    skeys = keys[order]
+    new = np.ones(len(order), dtype=bool)
+    new[1:] = (skeys[1:, 0] != skeys[:-1, 0]) | (skeys[1:, 1] != skeys[:-1, 1])
+    group = np.empty(len(order), dtype=np.int)
+    group[order] = np.cumsum(new) - 1
+    first = order[new]
+    number = np.empty(len(first), dtype=np.int)
+    number[np.argsort(first)] = np.arange(len(first))
+    return number[group], xy[np.sort(first)]
+
+
+def _add_hanging_nodes(ivert, nverts, verts, snap_tolerance=None):
+    """
+    Add vertices of neighboring cells that are on the faces of a cell
+    (hanging nodes) to the vertices of the cell.
+
+    The faces of the cells are hashed as (start, end) vertex pairs. A face
+    that is not shared by a neighboring cell in the opposite direction
+    (a -> b) is checked against the faces of the other cells that start at
+    its end vertex (b -> m); m is a hanging node if it is on the face. The
+    check is repeated until no vertices are added, so faces with more than
+    one hanging node are also completed.
+
+    """
+    nvert = len(verts)
+    ncells = len(nverts)
+    while True:
+        ends = np.cumsum(nverts)
+        cell = np.repeat(np.arange(ncells), nverts)
+        isface = np.ones(len(ivert), dtype=bool)
+        isface[ends - 1] = False
+        face = np.where(isface)[0]
+        u, v, c = ivert[face], ivert[face + 1], cell[face]
+
+        # faces without a matching face in the opposite direction
+        unmatched = ~_isin(v * nvert + u, np.sort(u * nvert + v))
+        face, u, v, c = face[unmatched], u[unmatched], v[unmatched], \
+                        c[unmatched]
+
+        # pair each face (a -> b) with the unmatched faces that start at b
+        order = np.argsort(u, kind='mergesort')
+        lo = np.searchsorted(u[order], v, side='left')
+        hi = np.searchsorted(u[order], v, side='right')
+        n = hi - lo
+        i1 = np.repeat(np.arange(len(u)), n)
+        i2 = order[np.repeat(lo, n) + np.arange(n.sum()) -
+                   np.repeat(np.cumsum(n) - n, n)]
+        a, b, m = u[i1], v[i1], v[i2]
+        keep = (c[i1] != c[i2]) & (m != a)
+        i1, a, b, m = i1[keep], a[keep], b[keep], m[keep]
+
+        # hanging nodes are on the face between a and b
+        ab = verts[b] - verts[a]
+        am = verts[m] - verts[a]
+        len2 = (ab ** 2).sum(axis=1)
+        dot = (ab * am).sum(axis=1)
+        dist = np.abs(ab[:, 0] * am[:, 1] - ab[:, 1] * am[:, 0]) / \
+               np.sqrt(len2)
+        tol = 1e-9 * np.sqrt(len2)
+        if snap_tolerance:
+            tol = np.maximum(tol, snap_tolerance)
+        hanging = (dist <= tol) & (dot > 0.) & (dot < len2)
+        if not hanging.any():
+            break
+
+        # add one hanging node per face, the one closest to b, before b
+        i1, m, dot = i1[hanging], m[hanging], dot[hanging]
+        idx = np.lexsort((-dot, i1))
+        i1, m = i1[idx], m[idx]
+        first = np.ones(len(i1), dtype=bool)
+        first[1:] = i1[1:] != i1[:-1]
+        i1, m = i1[first], m[first]
+        ivert = np.insert(ivert, face[i1] + 1, m)
+        nverts = nverts + np.bincount(c[i1], minlength=ncells)
+    return ivert, nverts
+
+
 def to_cvfd(vertdict, nodestart=None, nodestop=None,
-            skip_hanging_node_check=False, verbose=False):
+            skip_hanging_node_check=False, snap_tolerance=None,
+            verbose=False):
     """
     Convert a vertex dictionary
 
@@ -104,6 +219,7 @@ def to_cvfd(vertdict, nodestart=None, nodestop=None,
     ----------
     vertdict
         vertdict is a dictionary {icell: [(x1, y1), (x2, y2), (x3, y3), ...]}
+        or an array of shape (ncells, nverts, 2)
 
     nodestart : int
         starting node number. (default is zero)
@@ -115,6 +231,12 @@ def to_cvfd(vertdict, nodestart=None, nodestop=None,
         skip the hanging node check.  this may only be necessary for quad-based
         grid refinement. (default is False)
 
+    snap_tolerance : float
+        if specified, vertices that are within about snap_tolerance of each
+        other are merged, and vertices that are within snap_tolerance of a
+        cell face are added as hanging nodes. (default is None, vertices
+        must be identical)
+
     verbose : bool
         print messages to the screen. (default is False)
 
@@ -134,85 +256,49 @@ def to_cvfd(vertdict, nodestart=None, nodestop=None,
         nodestop = len(vertdict)
     ncells = nodestop - nodestart
 
-    # First create vertexdict {(x1, y1): ivert1, (x2, y2): ivert2, ...} and
-    # vertexlist [[ivert1, ivert2, ...], [ivert9, ivert10, ...], ...]
-    # In the process, filter out any duplicate vertices
-    vertexdict = OrderedDict()
-    vertexlist = []
-    xcyc = np.empty((ncells, 2), dtype=np.float)
-    iv = 0
-    nvertstart = 0
+    # First number the unique vertices and create the list of vertex
+    # numbers for each cell
     if verbose:
         print('Converting vertdict to cvfd representation.')
         print('Number of cells in vertdict is: {}'.format(len(vertdict)))
         print('Cell {} up to {} (but not including) will be processed.'
               .format(nodestart, nodestop))
-    for icell in range(nodestart, nodestop):
-        points = vertdict[icell]
-        nvertstart += len(points)
-        xc, yc = centroid_of_polygon(points)
-        xcyc[icell, 0] = xc
-        xcyc[icell, 1] = yc
-        ivertlist = []
-        for p in points:
-            pt = tuple(p)
-            if pt in vertexdict:
-                ivert = vertexdict[pt]
-            else:
-                vertexdict[pt] = iv
-                ivert = iv
-                iv += 1
-            ivertlist.append(ivert)
-        if ivertlist[0] != ivertlist[-1]:
-            raise Exception('Cell {} not closed'.format(icell))
-        vertexlist.append(ivertlist)
-
-    # next create vertex_cell_dict = {}; for each vertex, store list of cells
-    # that use it
-    nvert = len(vertexdict)
+    if isinstance(vertdict, np.ndarray):
+        xy = np.asarray(vertdict[nodestart:nodestop], dtype=np.float)
+        nverts = np.full(ncells, xy.shape[1], dtype=np.int)
+        xy = xy[:, :, :2].reshape(-1, 2)
+    else:
+        points = [np.asarray(vertdict[icell], dtype=np.float)[:, :2]
+                  for icell in range(nodestart, nodestop)]
+        nverts = np.array([len(p) for p in points], dtype=np.int)
+        xy = np.concatenate(points)
+    ivert, verts = _unique_vertices(xy, snap_tolerance)
+    ends = np.cumsum(nverts)
+    notclosed = np.where(ivert[ends - nverts] != ivert[ends - 1])[0]
+    if len(notclosed) > 0:
+        raise Exception('Cell {} not closed'.format(notclosed[0] +
+                                                     nodestart))
+    nvert = len(verts)
     if verbose:
-        print('Started with {} vertices.'.format(nvertstart))
+        print('Started with {} vertices.'.format(len(xy)))
         print('Ended up with {} vertices.'.format(nvert))
-        print('Reduced total number of vertices by {}'.format(nvertstart -
+        print('Reduced total number of vertices by {}'.format(len(xy) -
                                                               nvert))
-        print('Creating dict of vertices with their associated cells')
-    vertex_cell_dict = OrderedDict()
-    for icell in range(nodestart, nodestop):
-        ivertlist = vertexlist[icell]
-        for ivert in ivertlist:
-            if ivert in vertex_cell_dict:
-                vertex_cell_dict[ivert].append(icell)
-            else:
-                vertex_cell_dict[ivert] = [icell]
-
-    # Now, go through each vertex and look at the cells that use the vertex.
+
     # For quadtree-like grids, there may be a need to add a new hanging node
     # vertex to the larger cell.
-    if verbose:
-        print('Done creating dict of vertices with their associated cells')
-        print('Checking for hanging nodes.')
-    vertexdict_keys = list(vertexdict.keys())
-    for ivert, cell_list in vertex_cell_dict.items():
-        for icell1 in cell_list:
-            for icell2 in cell_list:
-
-                # skip if same cell
-                if icell1 == icell2:
-                    continue
-
-                # skip if share face already
-                ivertlist1 = vertexlist[icell1]
-                ivertlist2 = vertexlist[icell2]
-                if shared_face(ivertlist1, ivertlist2):
-                    continue
-
-                # don't share a face, so need to segment if necessary
-                segment_face(ivert, ivertlist1, ivertlist2, vertexdict_keys)
-    if verbose:
-        print('Done checking for hanging nodes.')
-
-    verts = np.array(vertexdict_keys)
-    iverts = vertexlist
+    if not skip_hanging_node_check:
+        if verbose:
+            print('Checking for hanging nodes.')
+        ivert, nverts = _add_hanging_nodes(ivert, nverts, verts,
+                                           snap_tolerance)
+        if verbose:
+            print('Done checking for hanging nodes.')
+
+    ivert = ivert.tolist()
+    ends = np.cumsum(nverts).tolist()
+    starts = [0] + ends[:-1]
+    iverts = [ivert[i0:i1] for i0, i1 in zip(starts, ends)]
 
     return verts, iverts
 
@@ -2,6 +2,7 @@
 Module for input/output utilities
 """
 import sys
+import itertools
 import numpy as np
 
 def _fmt_string(array, float_format='{}'):
@@ -269,6 +270,64 @@ def loadtxt(file, delimiter=' ', dtype=None, skiprows=0, use_pandas=True, **kwar
     else:
         return np.loadtxt(file, dtype=dtype, skiprows=skiprows, **kwargs)
 
+def loadtxt_chunks(file, chunksize, delimiter=' ', dtype=None, skiprows=0,
+                   use_pandas=True, **kwargs):
+    """Generator that loads a text file in chunks of at most chunksize
+    rows. Uses pandas if it is available.
+
+    Parameters
+    ----------
+    file : file or str
+        File or filename to read.
+    chunksize : int
+        Maximum number of rows in each chunk.
+    delimiter : str, optional
+        The string used to separate values. By default, this is any whitespace.
+    dtype : data-type, optional
+        Data-type of the resulting arrays
+    skiprows : int, optional
+        Skip the first skiprows lines; default: 0.
+    use_pandas : bool
+        If true, the much faster pandas.read_csv method is used.
+    kwargs : dict
+        Keyword arguments passed to numpy.loadtxt or pandas.read_csv.
+
+    Yields
+    ------
+    ra : np.recarray
+        Numpy record array with the next chunksize rows of the file.
+    """
+    try:
+        if use_pandas:
+            import pandas as pd
+            if delimiter.isspace():
+                kwargs['delim_whitespace'] = True
+            if isinstance(dtype, np.dtype) and 'names' not in kwargs:
+                kwargs['names'] = dtype.names
+    except:
+        pd = False
+
+    if use_pandas and pd:
+        for df in pd.read_csv(file, dtype=dtype, skiprows=skiprows,
+                              chunksize=chunksize, **kwargs):
+            yield df.to_records(index=False)
+    else:
+        if isinstance(file, str):
+            f = open(file, 'r')
+        else:
+            f = file
+        for i in range(skiprows):
+            f.readline()
+        while True:
+            lines = list(itertools.islice(f, chunksize))
+            if len(lines) < 1:
+                break
+            ra = np.loadtxt(lines, dtype=dtype, ndmin=1, **kwargs)
+            yield ra.view(np.recarray)
+        if f is not file:
+            f.close()
+
+
 def get_url_text(url, error_msg=None):
     """Get text from a url, using either python 3 or 2."""
     try:
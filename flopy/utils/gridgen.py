@@ -122,6 +122,11 @@ class Gridgen(object):
     surface_interpolation : str
         Default gridgen method for interpolating elevations.  Valid options
         include 'replicate' (default) and 'interpolate'
+    native : bool
+        If true, the quadtree grid is built in memory with
+        flopy.utils.quadtree.QuadtreeBuilder instead of the gridgen program,
+        and the grid information is not written to or read from files.
+        (default is False)
 
     Notes
     -----
@@ -131,17 +136,22 @@ class Gridgen(object):
     """
 
     def __init__(self, dis, model_ws='.', exe_name='gridgen',
-                 surface_interpolation='replicate'):
+                 surface_interpolation='replicate', native=False):
         self.nodes = 0
         self.nja = 0
         self.nodelay = np.zeros((dis.nlay), dtype=np.int)
         self._vertdict = {}
         self.dis = dis
         self.model_ws = model_ws
-        exe_name = which(exe_name)
-        if exe_name is None:
-            raise Exception('Cannot find gridgen binary executable')
-        self.exe_name = os.path.abspath(exe_name)
+        self.native = native
+        self._qtbuilder = None
+        if native:
+            self.exe_name = None
+        else:
+            exe_name = which(exe_name)
+            if exe_name is None:
+                raise Exception('Cannot find gridgen binary executable')
+            self.exe_name = os.path.abspath(exe_name)
 
         # Set default surface interpolation for all surfaces (nlay + 1)
         surface_interpolation = surface_interpolation.upper()
@@ -247,9 +257,12 @@ class Gridgen(object):
         self.nodes = 0
         self.nja = 0
 
-        # Create shapefile or set shapefile to feature
+        # Create shapefile or set shapefile to feature; the native builder
+        # uses feature lists directly
         adname = 'ad{}'.format(len(self._addict))
-        if isinstance(feature, list):
+        if isinstance(feature, list) and self.native:
+            shapefile = feature
+        elif isinstance(feature, list):
             # Create a shapefile
             adname_w_path = os.path.join(self.model_ws, adname)
             features_to_shapefile(feature, 'polygon', adname_w_path)
@@ -258,8 +271,10 @@ class Gridgen(object):
             shapefile = feature
 
         self._addict[adname] = shapefile
-        sn = os.path.join(self.model_ws, shapefile + '.shp')
-        assert os.path.isfile(sn), 'Shapefile does not exist: {}'.format(sn)
+        if not isinstance(shapefile, list):
+            sn = os.path.join(self.model_ws, shapefile + '.shp')
+            assert os.path.isfile(sn), \
+                'Shapefile does not exist: {}'.format(sn)
 
         for k in layers:
             self._active_domain[k] = adname
@@ -290,9 +305,12 @@ class Gridgen(object):
         self.nodes = 0
         self.nja = 0
 
-        # Create shapefile or set shapefile to feature
+        # Create shapefile or set shapefile to feature; the native builder
+        # uses feature lists directly
         rfname = 'rf{}'.format(len(self._rfdict))
-        if isinstance(features, list):
+        if isinstance(features, list) and self.native:
+            shapefile = features
+        elif isinstance(features, list):
             rfname_w_path = os.path.join(self.model_ws, rfname)
             features_to_shapefile(features, featuretype, rfname_w_path)
             shapefile = rfname
@@ -300,8 +318,10 @@ class Gridgen(object):
             shapefile = features
 
         self._rfdict[rfname] = [shapefile, featuretype, level]
-        sn = os.path.join(self.model_ws, shapefile + '.shp')
-        assert os.path.isfile(sn), 'Shapefile does not exist: {}'.format(sn)
+        if not isinstance(shapefile, list):
+            sn = os.path.join(self.model_ws, shapefile + '.shp')
+            assert os.path.isfile(sn), \
+                'Shapefile does not exist: {}'.format(sn)
 
         for k in layers:
             self._refinement_features[k].append(rfname)
@@ -323,6 +343,10 @@ class Gridgen(object):
         None
 
         """
+        if self.native:
+            self._build_native()
+            return
+
         fname = os.path.join(self.model_ws, '_gridgen_build.dfn')
         f = open(fname, 'w')
 
@@ -371,6 +395,112 @@ class Gridgen(object):
 
         return
 
+    def _build_native(self):
+        """
+        Build the quadtree grid in memory with QuadtreeBuilder
+
+        """
+        from .quadtree import QuadtreeBuilder
+        for isurf, s in enumerate(self.surface_interpolation):
+            if s == 'ASCIIGRID':
+                raise Exception('Error.  ASCIIGRID surface interpolation '
+                                'is not supported for native=True')
+        nlay = self.dis.nlay
+        surfaces = [self.dis.top.array] + [self.dis.botm[k].array
+                                           for k in range(nlay)]
+        qtb = QuadtreeBuilder(self.dis.parent.sr, nlay, surfaces,
+                              self.surface_interpolation)
+
+        def get_features(shapefile):
+            if isinstance(shapefile, list):
+                return shapefile
+            return os.path.join(self.model_ws, shapefile)
+
+        for k in range(nlay):
+            if self._active_domain[k] is not None:
+                adname = self._active_domain[k]
+                qtb.add_active_domain(get_features(self._addict[adname]),
+                                      [k])
+            for rfname in self._refinement_features[k]:
+                shapefile, featuretype, level = self._rfdict[rfname]
+                qtb.add_refinement_features(get_features(shapefile),
+                                            featuretype, level, [k])
+        qtb.build()
+        self._qtbuilder = qtb
+        self.nodelay = qtb.nodelay.copy()
+        self._vertices = qtb.get_vertices()
+        return
+
+    def _get_usgdata(self):
+        """
+        Get the grid information that gridgen writes with grid_to_usgdata,
+        from memory for a native grid or from the gridgen output files.
+
+        """
+        if self.native:
+            if self._qtbuilder is None:
+                raise Exception('Error.  The grid has not been built.')
+            return self._qtbuilder.get_usgdata()
+
+        # nodes, nlay, ivsd, itmuni, lenuni, idsymrd, laycbd
+        fname = os.path.join(self.model_ws, 'qtg.nod')
+        f = open(fname, 'r')
+        line = f.readline()
+        ll = line.strip().split()
+        nodes = int(ll.pop(0))
+        f.close()
+        nlay = self.dis.nlay
+        usgdata = {'nodes': nodes}
+
+        # nodelay
+        nodelay = np.empty((nlay), dtype=np.int)
+        fname = os.path.join(self.model_ws, 'qtg.nodesperlay.dat')
+        f = open(fname, 'r')
+        usgdata['nodelay'] = read1d(f, nodelay)
+        f.close()
+
+        # top and bot
+        for name in ['top', 'bot']:
+            a = np.empty((nodes), dtype=np.float32)
+            istart = 0
+            for k in range(nlay):
+                istop = istart + nodelay[k]
+                fname = os.path.join(self.model_ws,
+                                     'quadtreegrid.{}{}.dat'.format(name,
+                                                                    k + 1))
+                f = open(fname, 'r')
+                a[istart:istop] = read1d(f, a[istart:istop])
+                f.close()
+                istart = istop
+            usgdata[name] = a
+
+        # area
+        fname = os.path.join(self.model_ws, 'qtg.area.dat')
+        f = open(fname, 'r')
+        area = np.empty((nodes), dtype=np.float32)
+        usgdata['area'] = read1d(f, area)
+        f.close()
+
+        # iac
+        iac = np.empty((nodes), dtype=np.int)
+        fname = os.path.join(self.model_ws, 'qtg.iac.dat')
+        f = open(fname, 'r')
+        iac = read1d(f, iac)
+        f.close()
+        usgdata['iac'] = iac
+        njag = iac.sum()
+
+        # ja, fldr, cl12 and fahl
+        for name, fname, dtype in [('ja', 'qtg.ja.dat', np.int),
+                                   ('fldr', 'qtg.fldr.dat', np.int),
+                                   ('cl12', 'qtg.c1.dat', np.float32),
+                                   ('fahl', 'qtg.fahl.dat', np.float32)]:
+            a = np.empty((njag), dtype=dtype)
+            f = open(os.path.join(self.model_ws, fname), 'r')
+            usgdata[name] = read1d(f, a)
+            f.close()
+        return usgdata
+
     def get_vertices(self, nodenumber):
         """
         Return a list of 5 vertices for the cell.  The first vertex should
@@ -385,6 +515,8 @@ class Gridgen(object):
         list of vertices : list
 
         """
+        if self.native:
+            return self._vertices[nodenumber].tolist()
         return self._vertdict[nodenumber]
 
     def get_center(self, nodenumber):
@@ -416,6 +548,10 @@ class Gridgen(object):
         None
 
         """
+        if self.native:
+            raise Exception('Error.  export requires the gridgen program '
+                            'and cannot be used with native=True')
+
         # Create the export definition file
         fname = os.path.join(self.model_ws, '_gridgen_export.dfn')
         f = open(fname, 'w')
@@ -527,6 +663,20 @@ class Gridgen(object):
 
         if ax is None:
             ax = plt.gca()
+
+        if self.native:
+            from ..plot.plotutil import plot_cvfd
+            istart = self.nodelay[:layer].sum()
+            istop = istart + self.nodelay[layer]
+            verts = self._vertices[istart:istop, :4].reshape(-1, 2)
+            iverts = np.arange(len(verts)).reshape(-1, 4).tolist()
+            pc = plot_cvfd(verts, iverts, ax=ax, edgecolor=edgecolor,
+                           facecolor=facecolor, cmap=cmap, a=a,
+                           masked_values=masked_values, **kwargs)
+            plt.xlim(verts[:, 0].min(), verts[:, 0].max())
+            plt.ylim(verts[:, 1].min(), verts[:, 1].max())
+            return pc
+
         shapename = os.path.join(self.model_ws, 'qtgrid')
         xmin, xmax, ymin, ymax = shapefile_extents(shapename)
 
@@ -549,6 +699,8 @@ class Gridgen(object):
             Recarray representation of the node file with zero-based indexing
 
         """
+        if self.native:
+            return self._qtbuilder.get_nod_recarray()
 
         # nodes, nlay, ivsd, itmuni, lenuni, idsymrd, laycbd
         fname = os.path.join(self.model_ws, 'qtg.nod')
@@ -566,12 +718,8 @@ class Gridgen(object):
                  itmuni=4, lenuni=2):
 
         # nodes, nlay, ivsd, itmuni, lenuni, idsymrd, laycbd
-        fname = os.path.join(self.model_ws, 'qtg.nod')
-        f = open(fname, 'r')
-        line = f.readline()
-        ll = line.strip().split()
-        nodes = int(ll.pop(0))
-        f.close()
+        usgdata = self._get_usgdata()
+        nodes = usgdata['nodes']
         nlay = self.dis.nlay
         ivsd = 0
         idsymrd = 0
@@ -581,107 +729,52 @@ class Gridgen(object):
         self.nodes = nodes
 
         # nodelay
-        nodelay = np.empty((nlay), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.nodesperlay.dat')
-        f = open(fname, 'r')
-        nodelay = read1d(f, nodelay)
-        f.close()
-
-        # top
-        top = [0] * nlay
-        for k in range(nlay):
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.top{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            tpk = np.empty((nodelay[k]), dtype=np.float32)
-            tpk = read1d(f, tpk)
-            f.close()
-            if tpk.min() == tpk.max():
-                tpk = tpk.min()
-            else:
-                tpk = Util2d(model, (1, nodelay[k]), np.float32,
-                             np.reshape(tpk, (1, nodelay[k])),
-                             name='top {}'.format(k + 1))
-            top[k] = tpk
-
-        # bot
-        bot = [0] * nlay
-        for k in range(nlay):
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.bot{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            btk = np.empty((nodelay[k]), dtype=np.float32)
-            btk = read1d(f, btk)
-            f.close()
-            if btk.min() == btk.max():
-                btk = btk.min()
-            else:
-                btk = Util2d(model, (1, nodelay[k]), np.float32,
-                             np.reshape(btk, (1, nodelay[k])),
-                             name='bot {}'.format(k + 1))
-            bot[k] = btk
-
-        # area
-        area = [0] * nlay
-        fname = os.path.join(self.model_ws, 'qtg.area.dat')
-        f = open(fname, 'r')
-        anodes = np.empty((nodes), dtype=np.float32)
-        anodes = read1d(f, anodes)
-        f.close()
-        istart = 0
-        for k in range(nlay):
-            istop = istart + nodelay[k]
-            ark = anodes[istart: istop]
-            if ark.min() == ark.max():
-                ark = ark.min()
-            else:
-                ark = Util2d(model, (1, nodelay[k]), np.float32,
-                             np.reshape(ark, (1, nodelay[k])),
-                             name='area layer {}'.format(k + 1))
-            area[k] = ark
-            istart = istop
+        nodelay = usgdata['nodelay']
+
+        # top, bot and area
+        layerarrays = {}
+        for name, label in [('top', 'top {}'), ('bot', 'bot {}'),
+                            ('area', 'area layer {}')]:
+            a = usgdata[name]
+            lst = [0] * nlay
+            istart = 0
+            for k in range(nlay):
+                istop = istart + nodelay[k]
+                ak = a[istart:istop]
+                if ak.min() == ak.max():
+                    ak = ak.min()
+                else:
+                    ak = Util2d(model, (1, nodelay[k]), np.float32,
+                                np.reshape(ak, (1, nodelay[k])),
+                                name=label.format(k + 1))
+                lst[k] = ak
+                istart = istop
+            layerarrays[name] = lst
+        top = layerarrays['top']
+        bot = layerarrays['bot']
+        area = layerarrays['area']
 
         # iac
-        iac = np.empty((nodes), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.iac.dat')
-        f = open(fname, 'r')
-        iac = read1d(f, iac)
-        f.close()
+        iac = usgdata['iac']
 
         # Calculate njag and save as nja to self
         njag = iac.sum()
         self.nja = njag
 
         # ja
-        ja = np.empty((njag), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.ja.dat')
-        f = open(fname, 'r')
-        ja = read1d(f, ja)
-        f.close()
+        ja = usgdata['ja']
 
         # ivc
-        fldr = np.empty((njag), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.fldr.dat')
-        f = open(fname, 'r')
-        fldr = read1d(f, fldr)
+        fldr = usgdata['fldr']
         ivc = np.where(abs(fldr) == 3, 1, 0)
-        f.close()
 
         cl1 = None
         cl2 = None
         # cl12
-        cl12 = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.c1.dat')
-        f = open(fname, 'r')
-        cl12 = read1d(f, cl12)
-        f.close()
+        cl12 = usgdata['cl12']
 
         # fahl
-        fahl = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.fahl.dat')
-        f = open(fname, 'r')
-        fahl = read1d(f, fahl)
-        f.close()
+        fahl = usgdata['fahl']
 
         # create dis object instance
         disu = ModflowDisU(model, nodes=nodes, nlay=nlay, njag=njag, ivsd=ivsd,
@@ -699,89 +792,27 @@ class Gridgen(object):
         gridprops = {}
 
         # nodes, nlay, ivsd, itmuni, lenuni, idsymrd, laycbd
-        fname = os.path.join(self.model_ws, 'qtg.nod')
-        f = open(fname, 'r')
-        line = f.readline()
-        ll = line.strip().split()
-        nodes = int(ll.pop(0))
-        f.close()
+        usgdata = self._get_usgdata()
+        nodes = usgdata['nodes']
         nlay = self.dis.nlay
         gridprops['nodes'] = nodes
         gridprops['nlay'] = nlay
 
-
-        # nodelay
-        nodelay = np.empty((nlay), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.nodesperlay.dat')
-        f = open(fname, 'r')
-        nodelay = read1d(f, nodelay)
-        f.close()
-        gridprops['nodelay'] = nodelay
-
-        # top
-        top = np.empty((nodes), dtype=np.float32)
-        istart = 0
-        for k in range(nlay):
-            istop = istart + nodelay[k]
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.top{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            tpk = np.empty((nodelay[k]), dtype=np.float32)
-            tpk = read1d(f, tpk)
-            f.close()
-            top[istart:istop] = tpk
-            istart = istop
-        gridprops['top'] = top
-
-        # bot
-        bot = np.empty((nodes), dtype=np.float32)
-        istart = 0
-        for k in range(nlay):
-            istop = istart + nodelay[k]
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.bot{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            btk = np.empty((nodelay[k]), dtype=np.float32)
-            btk = read1d(f, btk)
-            f.close()
-            bot[istart:istop] = btk
-            istart = istop
-        gridprops['bot'] = bot
-
-        # area
-        fname = os.path.join(self.model_ws, 'qtg.area.dat')
-        f = open(fname, 'r')
-        area = np.empty((nodes), dtype=np.float32)
-        area = read1d(f, area)
-        f.close()
-        gridprops['area'] = area
-
-        # iac
-        iac = np.empty((nodes), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.iac.dat')
-        f = open(fname, 'r')
-        iac = read1d(f, iac)
-        f.close()
-        gridprops['iac'] = iac
+        # nodelay, top, bot, area and iac
+        for name in ['nodelay', 'top', 'bot', 'area', 'iac']:
+            gridprops[name] = usgdata[name]
+        top = usgdata['top']
+        bot = usgdata['bot']
+        iac = usgdata['iac']
 
         # Calculate njag and save as nja to self
         njag = iac.sum()
         gridprops['nja'] = njag
 
-        # ja
-        ja = np.empty((njag), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.ja.dat')
-        f = open(fname, 'r')
-        ja = read1d(f, ja)
-        f.close()
+        # ja, fldr
+        ja = usgdata['ja']
         gridprops['ja'] = ja
-
-        # fldr
-        fldr = np.empty((njag), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.fldr.dat')
-        f = open(fname, 'r')
-        fldr = read1d(f, fldr)
-        f.close()
+        fldr = usgdata['fldr']
         gridprops['fldr'] = fldr
 
         # ivc
@@ -793,19 +824,10 @@ class Gridgen(object):
         cl1 = None
         cl2 = None
         # cl12
-        cl12 = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.c1.dat')
-        f = open(fname, 'r')
-        cl12 = read1d(f, cl12)
-        f.close()
-        gridprops['cl12'] = cl12
+        gridprops['cl12'] = usgdata['cl12']
 
         # fahl
-        fahl = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.fahl.dat')
-        f = open(fname, 'r')
-        fahl = read1d(f, fahl)
-        f.close()
+        fahl = usgdata['fahl']
         gridprops['fahl'] = fahl
 
         # ihc
@@ -816,22 +838,18 @@ class Gridgen(object):
         ihc = np.where(abs(fldr) == 3, 0, ihc)
         gridprops['ihc'] = ihc
 
-        #hwva
+        # hwva; horizontal face areas are divided by the average thickness
+        # of the connected cells. The first connection of each cell is the
+        # cell itself.
         hwva = fahl.copy()
-        ipos = 0
-        for n in range(nodes):
-            for j in range(iac[n]):
-                if j == 0:
-                    pass
-                elif ihc[ipos] == 0:
-                    pass
-                else:
-                    m = ja[ipos] - 1
-                    dzn = top[n] - bot[n]
-                    dzm = top[m] - bot[m]
-                    dzavg = 0.5 * (dzn + dzm)
-                    hwva[ipos] = hwva[ipos] / dzavg
-                ipos += 1
+        n = np.repeat(np.arange(nodes), iac)
+        m = ja - 1
+        diag = np.zeros(len(ja), dtype=bool)
+        diag[np.cumsum(iac) - iac] = True
+        idx = ~diag & (ihc != 0)
+        dzavg = 0.5 * ((top[n[idx]] - bot[n[idx]]) +
+                       (top[m[idx]] - bot[m[idx]]))
+        hwva[idx] = hwva[idx] / dzavg
         gridprops['hwva'] = hwva
 
         # angldegx
@@ -845,22 +863,26 @@ class Gridgen(object):
 
         # vertices -- not optimized for redundant vertices yet
         nvert = nodes * 4
-        vertices = np.empty((nvert, 2), dtype=np.float)
-        ipos = 0
-        for n in range(nodes):
-            vs = self.get_vertices(n)
-            for x, y in vs[:-1]:  # do not include last vertex
-                vertices[ipos, 0] = x
-                vertices[ipos, 1] = y
-                ipos += 1
+        if self.native:
+            vertices = self._vertices[:, :4].reshape(nvert, 2).copy()
+            cellxy = self._qtbuilder.get_cellxy()
+        else:
+            vertices = np.empty((nvert, 2), dtype=np.float)
+            ipos = 0
+            for n in range(nodes):
+                vs = self.get_vertices(n)
+                for x, y in vs[:-1]:  # do not include last vertex
+                    vertices[ipos, 0] = x
+                    vertices[ipos, 1] = y
+                    ipos += 1
+
+            cellxy = np.empty((nodes, 2), dtype=np.float)
+            for n in range(nodes):
+                x, y = self.get_center(n)
+                cellxy[n, 0] = x
+                cellxy[n, 1] = y
         gridprops['nvert'] = nvert
         gridprops['vertices'] = vertices
-
-        cellxy = np.empty((nodes, 2), dtype=np.float)
-        for n in range(nodes):
-            x, y = self.get_center(n)
-            cellxy[n, 0] = x
-            cellxy[n, 1] = y
         gridprops['cellxy'] = cellxy
 
         return gridprops
@@ -974,7 +996,11 @@ class Gridgen(object):
         # use the cvfdutil helper to eliminate redundant vertices and add
         # hanging nodes
         from .cvfdutil import to_cvfd
-        verts, iverts = to_cvfd(self._vertdict, nodestop=ncpl, verbose=verbose)
+        if self.native:
+            vertdict = self._vertices
+        else:
+            vertdict = self._vertdict
+        verts, iverts = to_cvfd(vertdict, nodestop=ncpl, verbose=verbose)
         nvert = verts.shape[0]
 
         # opts
@@ -1055,7 +1081,17 @@ class Gridgen(object):
         result : np.recarray
             Recarray of the intersection properties.
 
+        Notes
+        -----
+        Features can be intersected with a structured grid without running
+        gridgen using flopy.utils.gridintersect.GridIntersect.
+
         """
+        if self.native:
+            if isinstance(features, str):
+                features = os.path.join(self.model_ws, features)
+            return self._qtbuilder.intersect(features, featuretype, layer)
+
         ifname = 'intersect_feature'
         if isinstance(features, list):
             ifname_w_path = os.path.join(self.model_ws, ifname)
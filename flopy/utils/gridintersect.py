@@ -0,0 +1,444 @@
+"""
+Module for intersecting point, line and polygon features with a structured
+model grid without running the gridgen program.
+
+"""
+import numpy as np
+
+
+def _read_shapefile_features(shpname, featuretype):
+    """
+    Read the features in a shapefile into the list structure that is used
+    by Gridgen (a point is an (x, y) tuple, a line or polygon is a list of
+    parts that are each a list of (x, y) vertices).
+
+    """
+    from ..export.shapefile_utils import import_shapefile
+    sf = import_shapefile()
+    if not shpname.lower().endswith('.shp'):
+        shpname += '.shp'
+    sfobj = sf.Reader(shpname)
+    features = []
+    for shape in sfobj.shapes():
+        points = shape.points
+        if featuretype == 'point':
+            features.append(points[0])
+            continue
+        breaks = list(shape.parts) + [len(points)]
+        features.append([points[breaks[i]:breaks[i + 1]]
+                         for i in range(len(breaks) - 1)])
+    return features
+
+
+def _edge_crossings(a0, a1, edges):
+    """
+    Find where a set of segments cross a set of ascending grid lines.
+
+    Parameters
+    ----------
+    a0, a1 : np.ndarray
+        start and end coordinate of each segment
+    edges : np.ndarray
+        ascending grid line coordinates
+
+    Returns
+    -------
+    seg : np.ndarray
+        segment index of each crossing
+    t : np.ndarray
+        relative position of each crossing along the segment
+
+    """
+    lo = np.searchsorted(edges, np.minimum(a0, a1), side='right')
+    hi = np.searchsorted(edges, np.maximum(a0, a1), side='left')
+    n = np.maximum(hi - lo, 0)
+    seg = np.repeat(np.arange(len(a0)), n)
+    offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    k = np.repeat(lo, n) + offset
+    t = (edges[k] - a0[seg]) / (a1[seg] - a0[seg])
+    return seg, t
+
+
+def _merge_pieces(start, end, *keys):
+    """
+    Find groups of consecutive line pieces that have the same keys and
+    where each piece starts where the previous piece ends (within a
+    relative tolerance of 1e-9).
+
+    Returns
+    -------
+    ifirst, ilast : np.ndarray
+        index of the first and last piece in each group
+
+    """
+    n = len(start)
+    if n == 0:
+        return np.zeros(0, dtype=np.int), np.zeros(0, dtype=np.int)
+    newgroup = np.ones(n, dtype=bool)
+    tol = 1e-9 * max(1., np.abs(end).max())
+    newgroup[1:] = np.abs(start[1:] - end[:-1]) > tol
+    for key in keys:
+        newgroup[1:] |= key[1:] != key[:-1]
+    ifirst = np.where(newgroup)[0]
+    ilast = np.append(ifirst[1:], n) - 1
+    return ifirst, ilast
+
+
+class GridIntersect(object):
+    """
+    Class to intersect points, lines and polygons with a structured grid.
+    The intersections are computed in-process with numpy, so unlike
+    Gridgen.intersect() no input files are written and no external program
+    is run.
+
+    Parameters
+    ----------
+    sr : flopy.utils.reference.SpatialReference
+        Spatial reference of the structured grid. Features are given in the
+        real-world coordinates of sr (offset, rotation and length
+        multiplier are accounted for).
+
+    Notes
+    -----
+    Features can either be the name of a shapefile or a list of features in
+    the format used by Gridgen: a point is an (x, y) tuple and a line or
+    polygon is a list of parts, each a list of (x, y) vertices. For
+    polygons, parts with the same orientation as the first part add area
+    and parts with the opposite orientation are holes.
+
+    Each feature is only compared with the rows and columns covered by its
+    bounding box, and features that are outside of the grid are skipped,
+    so large sets of features can be intersected with large grids.
+
+    Node numbers are zero-based and include the layer offset
+    (layer * nrow * ncol), which matches the numbering of a Gridgen grid
+    that has not been refined.
+
+    Examples
+    --------
+    >>> import flopy
+    >>> ix = flopy.utils.GridIntersect(m.sr)
+    >>> rivers = ix.intersect('rivers', 'line')
+    >>> rivers.length
+
+    """
+
+    def __init__(self, sr):
+        self.sr = sr
+        self.nrow = sr.nrow
+        self.ncol = sr.ncol
+        self.delr = np.asarray(sr.delr, dtype=np.float64)
+        self.delc = np.asarray(sr.delc, dtype=np.float64)
+        self.xedge = np.asarray(sr.xedge, dtype=np.float64)
+        self.yedge = np.asarray(sr.yedge, dtype=np.float64)
+        self.length_multiplier = sr.length_multiplier
+        return
+
+    def intersect(self, features, featuretype, layer=0):
+        """
+        Intersect features with the grid.
+
+        Parameters
+        ----------
+        features : str or list
+            features can be either a string containing the name of a shapefile
+            or it can be a list of points, lines, or polygons
+        featuretype : str
+            Must be either 'point', 'line', or 'polygon'
+        layer : int
+            Layer (zero based) used to calculate the node numbers.
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray of the intersection properties.
+
+        """
+        featuretype = featuretype.lower()
+        if featuretype == 'point':
+            return self.intersect_points(features, layer=layer)
+        elif featuretype == 'line':
+            return self.intersect_lines(features, layer=layer)
+        elif featuretype == 'polygon':
+            return self.intersect_polygons(features, layer=layer)
+        raise Exception('Unrecognized feature type: {}'.format(featuretype))
+
+    def _locate(self, x, y):
+        """
+        Row and column of points in model coordinates; -1, nrow and ncol
+        are returned for points above, below, left and right of the grid.
+
+        """
+        j = np.searchsorted(self.xedge, x, side='right') - 1
+        i = np.searchsorted(-self.yedge, -y, side='right') - 1
+        j = np.where(x == self.xedge[-1], self.ncol - 1, j)
+        i = np.where(y == self.yedge[-1], self.nrow - 1, i)
+        j = np.clip(j, -1, self.ncol)
+        i = np.clip(i, -1, self.nrow)
+        return i, j
+
+    def _get_parts(self, features, featuretype):
+        """
+        Flatten line or polygon features into vertex arrays in model
+        coordinates with the feature and part number of each vertex.
+
+        """
+        if isinstance(features, str):
+            features = _read_shapefile_features(features, featuretype)
+        xy, fid, pid = [], [], []
+        ipart = 0
+        for i, feature in enumerate(features):
+            for part in feature:
+                part = np.asarray(part, dtype=np.float64)[:, :2]
+                if featuretype == 'polygon' and \
+                        not np.array_equal(part[0], part[-1]):
+                    part = np.vstack((part, part[:1]))
+                xy.append(part)
+                fid.append(np.full(len(part), i, dtype=np.int))
+                pid.append(np.full(len(part), ipart, dtype=np.int))
+                ipart += 1
+        if len(xy) == 0:
+            empty = np.zeros(0, dtype=np.float64)
+            return empty, empty, empty.astype(np.int), empty.astype(np.int)
+        xy = np.concatenate(xy)
+        x, y = self.sr.transform(xy[:, 0], xy[:, 1], inverse=True)
+        return x, y, np.concatenate(fid), np.concatenate(pid)
+
+    def _split_segments(self, x0, y0, x1, y1):
+        """
+        Split segments at the grid lines they cross.
+
+        Returns
+        -------
+        seg : np.ndarray
+            segment index of each piece
+        t0, t1 : np.ndarray
+            relative start and end position of each piece along its segment
+        i, j : np.ndarray
+            row and column of each piece (see _locate)
+
+        """
+        nseg = len(x0)
+        sx, tx = _edge_crossings(x0, x1, self.xedge)
+        sy, ty = _edge_crossings(-y0, -y1, -self.yedge)
+        seg = np.concatenate((np.arange(nseg), np.arange(nseg), sx, sy))
+        t = np.concatenate((np.zeros(nseg), np.ones(nseg), tx, ty))
+        idx = np.lexsort((t, seg))
+        seg, t = seg[idx], t[idx]
+        keep = (seg[:-1] == seg[1:]) & (t[1:] > t[:-1])
+        t0, t1 = t[:-1][keep], t[1:][keep]
+        seg = seg[:-1][keep]
+        tm = 0.5 * (t0 + t1)
+        xm = x0[seg] + tm * (x1[seg] - x0[seg])
+        ym = y0[seg] + tm * (y1[seg] - y0[seg])
+        i, j = self._locate(xm, ym)
+        return seg, t0, t1, i, j
+
+    def intersect_points(self, features, layer=0):
+        """
+        Find the cells that contain a list of points.
+
+        Parameters
+        ----------
+        features : str or list
+            name of a point shapefile or a list of (x, y) points
+        layer : int
+            Layer (zero based) used to calculate the node numbers.
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray with nodenumber, row, column and pointid for each point
+            that is in the grid.
+
+        """
+        if isinstance(features, str):
+            features = _read_shapefile_features(features, 'point')
+        dtype = [('nodenumber', np.int), ('row', np.int),
+                 ('column', np.int), ('pointid', np.int)]
+        xy = np.asarray(features, dtype=np.float64)
+        if len(xy) == 0:
+            xy = xy.reshape(0, 2)
+        x, y = self.sr.transform(xy[:, 0], xy[:, 1], inverse=True)
+        i, j = self._locate(x, y)
+        pointid = np.where((i >= 0) & (i < self.nrow) &
+                           (j >= 0) & (j < self.ncol))[0]
+        result = np.recarray(len(pointid), dtype=dtype)
+        result['row'] = i[pointid]
+        result['column'] = j[pointid]
+        result['nodenumber'] = (layer * self.nrow + result.row) * self.ncol + \
+                               result.column
+        result['pointid'] = pointid
+        return result
+
+    def intersect_lines(self, features, layer=0):
+        """
+        Intersect lines with the grid. All of the segments of all of the
+        lines are split at the grid lines in one vectorized pass.
+
+        Parameters
+        ----------
+        features : str or list
+            name of a line shapefile or a list of lines, each a list of
+            parts with (x, y) vertices
+        layer : int
+            Layer (zero based) used to calculate the node numbers.
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray with nodenumber, row, column, arcid, length,
+            starting_distance and ending_distance for each continuous piece
+            of a line that is in a cell. Distances are measured along the
+            line from its first vertex, in the units of the features.
+
+        """
+        dtype = [('nodenumber', np.int), ('row', np.int),
+                 ('column', np.int), ('arcid', np.int),
+                 ('length', np.float64), ('starting_distance', np.float64),
+                 ('ending_distance', np.float64)]
+        x, y, fid, pid = self._get_parts(features, 'line')
+        valid = pid[:-1] == pid[1:]
+        x0, y0 = x[:-1][valid], y[:-1][valid]
+        x1, y1 = x[1:][valid], y[1:][valid]
+        segfid, segpid = fid[:-1][valid], pid[:-1][valid]
+
+        # distance along each line to the start of each segment
+        seglen = np.hypot(x1 - x0, y1 - y0) * self.length_multiplier
+        cumlen = np.cumsum(seglen) - seglen
+        fids, first, inv = np.unique(segfid, return_index=True,
+                                     return_inverse=True)
+        segstart = cumlen - cumlen[first][inv]
+
+        # skip segments outside of the grid
+        inside = (np.maximum(x0, x1) >= self.xedge[0]) & \
+                 (np.minimum(x0, x1) <= self.xedge[-1]) & \
+                 (np.maximum(y0, y1) >= self.yedge[-1]) & \
+                 (np.minimum(y0, y1) <= self.yedge[0])
+        idx = np.where(inside)[0]
+        seg, t0, t1, i, j = self._split_segments(x0[idx], y0[idx],
+                                                 x1[idx], y1[idx])
+        seg = idx[seg]
+        # pieces that are in the grid; very short pieces where a line passes
+        # through a cell corner are skipped
+        ingrid = (i >= 0) & (i < self.nrow) & (j >= 0) & (j < self.ncol) & \
+                 (t1 - t0 > 1e-10)
+        seg, t0, t1 = seg[ingrid], t0[ingrid], t1[ingrid]
+        i, j = i[ingrid], j[ingrid]
+        start = segstart[seg] + t0 * seglen[seg]
+        end = segstart[seg] + t1 * seglen[seg]
+        node = i * self.ncol + j
+
+        # combine consecutive pieces of the same part in the same cell
+        ifirst, ilast = _merge_pieces(start, end, node, segpid[seg])
+        result = np.recarray(len(ifirst), dtype=dtype)
+        result['row'] = i[ifirst]
+        result['column'] = j[ifirst]
+        result['nodenumber'] = layer * self.nrow * self.ncol + node[ifirst]
+        result['arcid'] = segfid[seg[ifirst]]
+        result['starting_distance'] = start[ifirst]
+        result['ending_distance'] = end[ilast]
+        result['length'] = np.add.reduceat(end - start, ifirst) \
+            if len(ifirst) > 0 else 0.
+        return result
+
+    def intersect_polygons(self, features, layer=0, mintol=1e-10):
+        """
+        Intersect polygons with the grid. The area of a polygon in each
+        cell of its bounding box is found by integrating the polygon edges,
+        split at the grid lines, over the rows below them.
+
+        Parameters
+        ----------
+        features : str or list
+            name of a polygon shapefile or a list of polygons, each a list
+            of parts with (x, y) vertices
+        layer : int
+            Layer (zero based) used to calculate the node numbers.
+        mintol : float
+            cells with an area fraction less than mintol are not included
+            (default is 1e-10)
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray with nodenumber, row, column, polyid, area and fraction
+            (the area divided by the cell area) for each cell that a polygon
+            covers. Areas are in the units of the features.
+
+        """
+        dtype = [('nodenumber', np.int), ('row', np.int),
+                 ('column', np.int), ('polyid', np.int),
+                 ('area', np.float64), ('fraction', np.float64)]
+        x, y, fid, pid = self._get_parts(features, 'polygon')
+        ybot = self.yedge[1:]
+        xe, ye = self.xedge, -self.yedge
+        results = []
+        if len(fid) > 0:
+            breaks = np.where(np.diff(fid) != 0)[0] + 1
+            starts = np.append(0, breaks)
+            ends = np.append(breaks, len(fid))
+        else:
+            starts = ends = []
+        for n0, n1 in zip(starts, ends):
+            px, py, ppid = x[n0:n1], y[n0:n1], pid[n0:n1]
+
+            # rows and columns covered by the bounding box of the polygon
+            c0 = max(np.searchsorted(xe, px.min(), side='right') - 1, 0)
+            c1 = min(np.searchsorted(xe, px.max(), side='left'), self.ncol)
+            r0 = max(np.searchsorted(ye, -py.max(), side='right') - 1, 0)
+            r1 = min(np.searchsorted(ye, -py.min(), side='left'), self.nrow)
+            if c0 >= c1 or r0 >= r1:
+                continue
+
+            # orientation of the first part
+            p0 = ppid == ppid[0]
+            sign = np.sign(np.sum(px[p0][:-1] * py[p0][1:] -
+                                  px[p0][1:] * py[p0][:-1]))
+            if sign == 0:
+                continue
+
+            valid = ppid[:-1] == ppid[1:]
+            x0, y0 = px[:-1][valid], py[:-1][valid]
+            x1, y1 = px[1:][valid], py[1:][valid]
+            seg, t0, t1, i, j = self._split_segments(x0, y0, x1, y1)
+            keep = (j >= c0) & (j < c1) & (i < r1)
+            seg, t0, t1 = seg[keep], t0[keep], t1[keep]
+            i, j = i[keep], j[keep]
+            dx = (t1 - t0) * (x1[seg] - x0[seg])
+            ym = y0[seg] + 0.5 * (t0 + t1) * (y1[seg] - y0[seg])
+
+            # area = -sum(integral of (y - ybot) dx) over the edges in each
+            # cell plus -sum(dx) * delc for the edges above each cell
+            nr, nc = r1 - r0, c1 - c0
+            incell = i >= r0
+            icell = (i[incell] - r0) * nc + j[incell] - c0
+            area = np.bincount(icell,
+                               weights=-dx[incell] * (ym[incell] -
+                                                      ybot[i[incell]]),
+                               minlength=nr * nc)
+            area = area.astype(np.float64).reshape(nr, nc)
+            iabove = (np.maximum(i + 1, r0) - r0) * nc + j - c0
+            above = np.bincount(iabove, weights=-dx,
+                                minlength=(nr + 1) * nc)
+            above = above.astype(np.float64).reshape(nr + 1, nc)
+            area += np.cumsum(above, axis=0)[:nr] * \
+                    self.delc[r0:r1, np.newaxis]
+            area *= sign
+            fraction = area / (self.delc[r0:r1, np.newaxis] *
+                               self.delr[np.newaxis, c0:c1])
+            ii, jj = np.where(fraction > mintol)
+            ra = np.recarray(len(ii), dtype=dtype)
+            ra['row'] = ii + r0
+            ra['column'] = jj + c0
+            ra['polyid'] = fid[n0]
+            ra['area'] = area[ii, jj] * self.length_multiplier ** 2
+            ra['fraction'] = fraction[ii, jj]
+            results.append(ra)
+        if len(results) > 0:
+            result = np.concatenate(results).view(np.recarray)
+        else:
+            result = np.recarray(0, dtype=dtype)
+        result['nodenumber'] = (layer * self.nrow + result.row) * self.ncol + \
+                               result.column
+        return result
@@ -186,21 +186,97 @@ class Lgr(object):
 
         return parentlist
 
-    def get_exchange_data(self):
+    def get_child_layer_map(self):
+        """
+        Return the zero-based parent layer for each child layer, using the
+        same layer mapping as get_parent_indices.
+
+        """
+        kpc = np.zeros(self.dis.nlay, dtype=np.int)
+        kcstart = 0
+        for k in range(self.nplbeg, self.nplend + 1):
+            kcend = kcstart + self.ncppl[k]
+            kpc[kcstart:kcend] = k
+            kcstart = kcend
+        return kpc
+
+    def _get_connection_arrays(self):
+        """
+        Find the child cells on the boundary of the child grid and the parent
+        cells they are connected to.  The connections are returned in the
+        same order as looping over the child cells and calling
+        get_parent_connections for each of them.
+
+        """
+        nlayc, nrowc, ncolc = self.dis.nlay, self.dis.nrow, self.dis.ncol
+        nlayp, nrowp, ncolp = (self.parent.dis.nlay, self.parent.dis.nrow,
+                               self.parent.dis.ncol)
+        ncpp = self.ncpp
+        kpc = self.get_child_layer_map()
+        ipc = self.nprbeg + np.arange(nrowc) // ncpp
+        jpc = self.npcbeg + np.arange(ncolc) // ncpp
+
+        # candidate child layers, rows and columns for each direction:
+        # left, right, back, front and bottom
+        kall = np.arange(nlayc)
+        iall = np.arange(nrowc)
+        jall = np.arange(ncolc)
+        kbot = kall[kall + 1 == self.ncppl[kpc]]
+        candidates = [(kall, iall, jall[jall % ncpp == 0], 0, -1, -1),
+                      (kall, iall, jall[(jall + 1) % ncpp == 0], 0, 1, 1),
+                      (kall, iall[iall % ncpp == 0], jall, -1, 0, 2),
+                      (kall, iall[(iall + 1) % ncpp == 0], jall, 1, 0, -2),
+                      (kbot, iall, jall, 0, 0, -3)]
+
+        kc, ic, jc, kp, ip, jp, idir = [], [], [], [], [], [], []
+        for k, i, j, di, dj, d in candidates:
+            k, i, j = [a.ravel() for a in np.meshgrid(k, i, j,
+                                                      indexing='ij')]
+            kk = kpc[k] + (1 if d == -3 else 0)
+            ii = ipc[i] + di
+            jj = jpc[j] + dj
+            inside = (kk < nlayp) & (ii >= 0) & (ii < nrowp) & \
+                     (jj >= 0) & (jj < ncolp)
+            k, i, j, kk, ii, jj = [a[inside] for a in (k, i, j, kk, ii, jj)]
+            active = self.ibndp[kk, ii, jj] != 0
+            kc.append(k[active])
+            ic.append(i[active])
+            jc.append(j[active])
+            kp.append(kk[active])
+            ip.append(ii[active])
+            jp.append(jj[active])
+            idir.append(np.full(active.sum(), d, dtype=np.int))
+        kc, ic, jc, kp, ip, jp, idir = [np.concatenate(a) for a in
+                                        (kc, ic, jc, kp, ip, jp, idir)]
+
+        # order by child cell, then by direction within the child cell
+        # (the direction blocks were concatenated in the required order)
+        idx = np.argsort((kc * nrowc + ic) * ncolc + jc, kind='mergesort')
+        return [a[idx] for a in (kp, ip, jp, kc, ic, jc, idir)]
+
+    def get_exchange_data(self, recarray=False):
         """
         Get the list of parent/child connections
 
         <cellidm1> <cellidm2> <ihc> <cl1> <cl2> <hwva> <angledegx>
 
+        Parameters
+        ----------
+        recarray : bool
+            If True, return a numpy recarray with cellidm1, cellidm2, ihc,
+            cl1, cl2, hwva and angldegx fields, where the cell ids are
+            (layer, row, column) tuples, that can be passed as exchangedata
+            to flopy.mf6.ModflowGwfgwf.  (default is False)
+
         Returns
         -------
-            exglist : list
-                list of connections between parent and child
+            exglist : list or np.recarray
+                list of connections between parent and child, with
+                (kp, ip, jp, kc, ic, jc, ihc, cl1, cl2, hwva, angldegx)
+                for each connection if recarray is False
 
         """
-
-        exglist = []
-        nlayc, nrowc, ncolc = self.dis.nlay, self.dis.nrow, self.dis.ncol
+        kp, ip, jp, kc, ic, jc, idir = self._get_connection_arrays()
         delrc = self.dis.delr.array
         delcc = self.dis.delc.array
         delrp = self.parent.dis.delr.array
@@ -209,58 +285,51 @@ class Lgr(object):
         botp = self.parent.dis.botm.array
         topc = self.dis.top.array
         botc = self.dis.botm.array
-        for kc in range(nlayc):
-            for ic in range(nrowc):
-                for jc in range(ncolc):
-                    plist = self.get_parent_connections(kc, ic, jc)
-                    for (kp, ip, jp), idir in plist:
-
-                        # horizontal or vertical connection
-                        ihc = 1
-                        if self.ncppl[kp] > 1:
-                            ihc = 2
-                        if abs(idir) == 3:
-                            ihc = 0
-
-                        # angldegx
-                        angldegx = 0
-                        if idir == 2:
-                            angldegx = 90.
-                        elif idir == -1:
-                            angldegx = 180.
-                        elif idir == -2:
-                            angldegx = 270
-
-                        # vertical connection
-                        cl1 = None
-                        cl2 = None
-                        hwva = None
-
-                        tpp = topp[ip, jp]
-                        btp = botp[kp, ip, jp]
-                        if kp > 0:
-                            tpp = botp[kp - 1, ip, jp]
-
-                        tpc = topc[ic, jc]
-                        btc = botc[kc, ic, jc]
-                        if kc > 0:
-                            tpc = botc[kc - 1, ic, jc]
-
-                        if ihc == 0:
-                            cl1 = 0.5 * (tpp - btp)
-                            cl2 = 0.5 * (tpc - btc)
-                            hwva = delrc[jc] * delcc[ic]
-                        else:
-                            if abs(idir) == 1:
-                                cl1 = 0.5 * delrp[jp]
-                                cl2 = 0.5 * delrc[jc]
-                                hwva = delcc[ic]
-                            elif abs(idir) == 2:
-                                cl1 = 0.5 * delcp[ip]
-                                cl2 = 0.5 * delcc[ic]
-                                hwva = delrc[jc]
-
-                        exg = (kp, ip, jp, kc, ic, jc, ihc, cl1, cl2, hwva,
-                               angldegx)
-                        exglist.append(exg)
+
+        # horizontal or vertical connection
+        vertical = np.abs(idir) == 3
+        ihc = np.where(self.ncppl[self.get_child_layer_map()[kc]] > 1, 2, 1)
+        ihc[vertical] = 0
+
+        # angldegx
+        angldegx = np.zeros(len(idir), dtype=np.float)
+        angldegx[idir == 2] = 90.
+        angldegx[idir == -1] = 180.
+        angldegx[idir == -2] = 270.
+
+        # cell thicknesses
+        zp = np.vstack((topp[np.newaxis], botp))
+        zc = np.vstack((topc[np.newaxis], botc))
+        dzp = zp[kp, ip, jp] - zp[kp + 1, ip, jp]
+        dzc = zc[kc, ic, jc] - zc[kc + 1, ic, jc]
+
+        xdir = np.abs(idir) == 1
+        cl1 = np.where(xdir, 0.5 * delrp[jp], 0.5 * delcp[ip])
+        cl2 = np.where(xdir, 0.5 * delrc[jc], 0.5 * delcc[ic])
+        hwva = np.where(xdir, delcc[ic], delrc[jc])
+        cl1[vertical] = 0.5 * dzp[vertical]
+        cl2[vertical] = 0.5 * dzc[vertical]
+        hwva[vertical] = delrc[jc[vertical]] * delcc[ic[vertical]]
+
+        if recarray:
+            dtype = np.dtype([('cellidm1', np.object),
+                              ('cellidm2', np.object), ('ihc', np.int),
+                              ('cl1', np.float), ('cl2', np.float),
+                              ('hwva', np.float), ('angldegx', np.float)])
+            exgdata = np.recarray(len(idir), dtype=dtype)
+            exgdata['cellidm1'] = list(zip(kp.tolist(), ip.tolist(),
+                                           jp.tolist()))
+            exgdata['cellidm2'] = list(zip(kc.tolist(), ic.tolist(),
+                                           jc.tolist()))
+            exgdata['ihc'] = ihc
+            exgdata['cl1'] = cl1
+            exgdata['cl2'] = cl2
+            exgdata['hwva'] = hwva
+            exgdata['angldegx'] = angldegx
+            return exgdata
+
+        exglist = list(zip(kp.tolist(), ip.tolist(), jp.tolist(),
+                           kc.tolist(), ic.tolist(), jc.tolist(),
+                           ihc.tolist(), cl1.tolist(), cl2.tolist(),
+                           hwva.tolist(), angldegx.tolist()))
         return exglist
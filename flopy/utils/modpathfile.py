@@ -7,11 +7,235 @@ important classes that can be accessed by the user.
 
 """
 
+import os
+import shutil
 import numpy as np
-from ..utils.flopy_io import loadtxt
+from ..utils.flopy_io import loadtxt, loadtxt_chunks
 from ..utils.recarray_utils import ra_slice
 
-class PathlineFile():
+try:
+    _range = xrange
+except NameError:
+    _range = range
+
+
+def _get_offsets(pid, nid):
+    """
+    Get the offset of the first record for each zero-based particle id in
+    an array of records sorted by particle id.
+
+    Parameters
+    ----------
+    pid : numpy.ndarray
+        zero-based particle ids of the records
+    nid : int
+        number of particle ids
+
+    Returns
+    -------
+    offsets : numpy.ndarray
+        array of length nid + 1 with the offset of the first record of each
+        particle. The records for particle n are offsets[n]:offsets[n + 1].
+
+    """
+    counts = np.bincount(pid, minlength=nid)
+    offsets = np.zeros(counts.shape[0] + 1, dtype=np.int)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _cell_key(k, i, j):
+    """
+    Get a unique integer key for zero-based layer, row, column indices.
+    """
+    return (np.asarray(k, dtype=np.int64) * 2**42 +
+            np.asarray(i, dtype=np.int64) * 2**21 +
+            np.asarray(j, dtype=np.int64))
+
+
+class _ModpathFile(object):
+    """
+    Base class with the data loading methods shared by the PathlineFile
+    and EndpointFile classes.
+
+    """
+    # default number of records read at a time by the chunked reader
+    chunksize = 1000000
+    # field used to select records with time_window
+    timename = 'time'
+
+    def _load_data(self, partids=None, time_window=None, dest_cells=None,
+                   chunksize=None, cache=False):
+        """
+           Load the MODPATH data. The whole file is read at once unless
+           a chunksize, a selection (partids, time_window, dest_cells), or
+           a binary cache is specified. In that case the file is read in
+           chunks and only the selected records are kept in memory.
+        """
+        self._cache_data = None
+        if cache:
+            if isinstance(cache, str):
+                cachefile = cache
+            else:
+                cachefile = self.fname + '.npy'
+            if not self._valid_cache(cachefile):
+                self._write_cache(cachefile, chunksize)
+            self._cache_data = np.load(cachefile, mmap_mode='r')
+            self.cachefile = cachefile
+
+        select = partids is not None or time_window is not None or \
+                 dest_cells is not None
+
+        if not select:
+            if self._cache_data is not None:
+                data = self._cache_data
+            elif chunksize is None:
+                data = loadtxt(self.file, dtype=self.dtype,
+                               skiprows=self.skiprows)
+                # convert layer, row, and column indices; particle id and
+                # group; and line segment indices to zero-based
+                for n in self.kijnames:
+                    data[n] -= 1
+            else:
+                data = _concatenate(list(self._iter_chunks(chunksize)),
+                                    self.dtype)
+        else:
+            if dest_cells is not None:
+                partids = self._get_dest_partids(dest_cells, partids,
+                                                 chunksize)
+            chunks = []
+            for ra in self._iter_chunks(chunksize):
+                idx = np.ones(ra.shape[0], dtype=np.bool)
+                if partids is not None:
+                    idx &= _in_partids(ra['particleid'], partids)
+                if time_window is not None:
+                    t = ra[self.timename]
+                    tmin, tmax = time_window
+                    if tmin is not None:
+                        idx &= t >= tmin
+                    if tmax is not None:
+                        idx &= t <= tmax
+                chunks.append(np.array(ra[idx]))
+            data = _concatenate(chunks, self.dtype)
+        return data.view(np.recarray)
+
+    def _iter_chunks(self, chunksize=None):
+        """
+           Iterate over the records in chunks of at most chunksize records.
+           Layer, row, and column indices, particle ids and groups, and line
+           segment indices are zero-based in the chunks.
+        """
+        if chunksize is None:
+            chunksize = self.chunksize
+        if self._cache_data is not None:
+            data = self._cache_data
+            for i0 in range(0, data.shape[0], chunksize):
+                yield data[i0:i0 + chunksize]
+        else:
+            self.file.seek(0)
+            for ra in loadtxt_chunks(self.file, chunksize, dtype=self.dtype,
+                                     skiprows=self.skiprows):
+                chunk = np.empty(ra.shape[0], dtype=self.dtype)
+                for n in self.dtype.names:
+                    chunk[n] = ra[n]
+                for n in self.kijnames:
+                    chunk[n] -= 1
+                yield chunk
+
+    def _get_dest_partids(self, dest_cells, partids=None, chunksize=None):
+        """
+           Get the zero-based particle ids with records in dest_cells.
+        """
+        dest = np.array(dest_cells, dtype=np.int64).reshape(-1, 3)
+        dest = _cell_key(dest[:, 0], dest[:, 1], dest[:, 2])
+        ids = []
+        for ra in self._iter_chunks(chunksize):
+            idx = np.in1d(_cell_key(ra['k'], ra['i'], ra['j']), dest)
+            if partids is not None:
+                idx &= _in_partids(ra['particleid'], partids)
+            ids.append(np.unique(ra['particleid'][idx]))
+        return np.unique(_concatenate(ids, np.int))
+
+    def _valid_cache(self, cachefile):
+        """
+           Determine if cachefile exists, is newer than the MODPATH file,
+           and has the same dtype as the MODPATH file.
+        """
+        if not os.path.isfile(cachefile):
+            return False
+        if os.path.getmtime(cachefile) < os.path.getmtime(self.fname):
+            return False
+        try:
+            data = np.load(cachefile, mmap_mode='r')
+        except:
+            return False
+        return data.dtype == self.dtype
+
+    def _write_cache(self, cachefile, chunksize=None):
+        """
+           Convert the MODPATH file to a binary numpy (.npy) file. The
+           file is converted in chunks so that the whole file does not have
+           to be held in memory.
+        """
+        tmpfile = cachefile + '.tmp'
+        nrec = 0
+        with open(tmpfile, 'wb') as f:
+            for chunk in self._iter_chunks(chunksize):
+                chunk.tofile(f)
+                nrec += chunk.shape[0]
+        header = {'descr': np.lib.format.dtype_to_descr(self.dtype),
+                  'fortran_order': False, 'shape': (nrec,)}
+        with open(cachefile, 'wb') as f:
+            np.lib.format.write_array_header_1_0(f, header)
+            with open(tmpfile, 'rb') as ftmp:
+                shutil.copyfileobj(ftmp, f)
+        os.remove(tmpfile)
+
+    def _build_particle_index(self):
+        """
+           Build an index of the records for each particle. The index is
+           created by sorting the particle ids once (a stable sort is used
+           so that the order of the records for a particle is preserved)
+           and storing the offset of the first record of each particle.
+        """
+        pid = self._data['particleid']
+        if np.all(pid[1:] >= pid[:-1]):
+            self._sortidx = None
+        else:
+            self._sortidx = np.argsort(pid, kind='mergesort')
+        self._offsets = _get_offsets(pid, self.nid)
+
+    def _get_sorted_data(self):
+        """
+           Get the data sorted by particle id.
+        """
+        if self._sortidx is None:
+            return self._data
+        return self._data[self._sortidx]
+
+
+def _concatenate(chunks, dtype):
+    """
+    Concatenate a list of arrays, which may be empty.
+    """
+    if len(chunks) < 1:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(chunks)
+
+
+def _in_partids(pid, partids):
+    """
+    Get a boolean array that is True for particle ids in partids. partids
+    can be a range (or xrange), which is evaluated without building the
+    list of particle ids, or a list or array of particle ids.
+    """
+    if isinstance(partids, _range):
+        if getattr(partids, 'step', None) == 1:
+            return (pid >= partids.start) & (pid < partids.stop)
+        partids = list(partids)
+    return np.in1d(pid, partids)
+
+class PathlineFile(_ModpathFile):
     """
     PathlineFile Class.
 
@@ -21,6 +245,27 @@ class PathlineFile():
         Name of the pathline file
     verbose : bool
         Write information to the screen.  Default is False.
+    partids : range, list, or numpy.ndarray
+        Zero-based particle ids to load. A range (e.g. range(1000, 2000))
+        selects a range of particle ids without building a list of ids.
+        All particles are loaded if partids is None. Default is None.
+    time_window : tuple
+        (tmin, tmax) tuple with the minimum and maximum pathline times to
+        load. Either value can be None. Default is None.
+    dest_cells : list or array of tuples
+        (k, i, j) of destination cells (zero-based). Only pathlines that
+        pass through one of the destination cells are loaded.
+        Default is None.
+    chunksize : int
+        Number of records that are read at a time. If chunksize is None,
+        the whole file is read at once unless a selection or cache is
+        specified, in which case 1,000,000 records are read at a time.
+        Default is None.
+    cache : bool or str
+        If True or a file name, the pathline file is converted once to a
+        binary numpy (.npy) file (filename + '.npy' if cache is True) that
+        is memory-mapped in later sessions. The binary file is rebuilt if
+        the pathline file is newer than it. Default is False.
 
     Attributes
     ----------
@@ -45,7 +290,9 @@ class PathlineFile():
     """
     kijnames = ['k', 'i', 'j', 'particleid', 'particlegroup', 'linesegmentindex']
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, partids=None,
+                 time_window=None, dest_cells=None, chunksize=None,
+                 cache=False):
         """
         Class constructor.
 
@@ -53,13 +300,15 @@ class PathlineFile():
         self.fname = filename
         self.dtype, self.outdtype = self._get_dtypes()
         self._build_index()
-        self._data = loadtxt(self.file, dtype=self.dtype, skiprows=self.skiprows)
+        self._data = self._load_data(partids=partids, time_window=time_window,
+                                     dest_cells=dest_cells,
+                                     chunksize=chunksize, cache=cache)
         # set number of particle ids
-        self.nid = self._data['particleid'].max()
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        for n in self.kijnames:
-            self._data[n] -= 1
+        self.nid = 0
+        if self._data.shape[0] > 0:
+            self.nid = self._data['particleid'].max() + 1
+        # build index of the records for each particle
+        self._build_particle_index()
         # close the input file
         self.file.close()
         return
@@ -161,17 +410,31 @@ class PathlineFile():
         >>> p1 = pthobj.get_data(partid=1)
 
         """
-        idx = self._data['particleid'] == partid
+        if 0 <= partid < self._offsets.shape[0] - 1:
+            i0, i1 = self._offsets[partid], self._offsets[partid + 1]
+        else:
+            i0, i1 = 0, 0
+        if self._sortidx is None:
+            ta = self._data[i0:i1]
+        else:
+            ta = self._data[self._sortidx[i0:i1]]
         if totim is not None:
             if ge:
-                idx = (self._data['time'] >= totim) & (self._data['particleid'] == partid)
+                idx = ta['time'] >= totim
             else:
-                idx = (self._data['time'] <= totim) & (self._data['particleid'] == partid)
-        else:
-            idx = self._data['particleid'] == partid
-        self._ta = self._data[idx]
-        ra = np.rec.fromarrays((self._ta['x'], self._ta['y'], self._ta['z'],
-                                self._ta['time'], self._ta['k'], self._ta['particleid']), dtype=self.outdtype)
+                idx = ta['time'] <= totim
+            ta = ta[idx]
+        self._ta = ta
+        return self._get_outdata(ta)
+
+    def _get_outdata(self, ta):
+        """
+           Build the x, y, z, time, k, and particleid recarray returned
+           by get_data and get_alldata.
+        """
+        ra = np.rec.fromarrays((ta['x'], ta['y'], ta['z'],
+                                ta['time'], ta['k'], ta['particleid']),
+                               dtype=self.outdtype)
         return ra
 
     def get_alldata(self, totim=None, ge=True):
@@ -210,10 +473,17 @@ class PathlineFile():
         >>> p = pthobj.get_alldata()
 
         """
-        plist = []
-        for partid in range(self.nid):
-            plist.append(self.get_data(partid=partid, totim=totim, ge=ge))
-        return plist
+        ta = self._get_sorted_data()
+        offsets = self._offsets
+        if totim is not None:
+            if ge:
+                idx = ta['time'] >= totim
+            else:
+                idx = ta['time'] <= totim
+            ta = ta[idx]
+            offsets = _get_offsets(ta['particleid'], self.nid)
+        ra = self._get_outdata(ta)
+        return np.split(ra, offsets[1:-1])
 
     def get_destination_pathline_data(self, dest_cells):
         """Get pathline data for set of destination cells.
@@ -336,7 +606,7 @@ class PathlineFile():
         recarray2shp(pthdata, geoms, shpname=shpname, epsg=sr.epsg, **kwargs)
 
 
-class EndpointFile():
+class EndpointFile(_ModpathFile):
     """
     EndpointFile Class.
 
@@ -346,6 +616,27 @@ class EndpointFile():
         Name of the endpoint file
     verbose : bool
         Write information to the screen.  Default is False.
+    partids : range, list, or numpy.ndarray
+        Zero-based particle ids to load. A range (e.g. range(1000, 2000))
+        selects a range of particle ids without building a list of ids.
+        All particles are loaded if partids is None. Default is None.
+    time_window : tuple
+        (tmin, tmax) tuple with the minimum and maximum final times to
+        load. Either value can be None. Default is None.
+    dest_cells : list or array of tuples
+        (k, i, j) of destination cells (zero-based). Only endpoints with a
+        final k, i, j in one of the destination cells are loaded.
+        Default is None.
+    chunksize : int
+        Number of records that are read at a time. If chunksize is None,
+        the whole file is read at once unless a selection or cache is
+        specified, in which case 1,000,000 records are read at a time.
+        Default is None.
+    cache : bool or str
+        If True or a file name, the endpoint file is converted once to a
+        binary numpy (.npy) file (filename + '.npy' if cache is True) that
+        is memory-mapped in later sessions. The binary file is rebuilt if
+        the endpoint file is newer than it. Default is False.
 
     Attributes
     ----------
@@ -371,8 +662,11 @@ class EndpointFile():
 
     """
     kijnames = ['k0', 'i0', 'j0', 'k', 'i', 'j', 'particleid', 'particlegroup']
+    timename = 'finaltime'
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, partids=None,
+                 time_window=None, dest_cells=None, chunksize=None,
+                 cache=False):
         """
         Class constructor.
 
@@ -380,13 +674,15 @@ class EndpointFile():
         self.fname = filename
         self.dtype = self._get_dtypes()
         self._build_index()
-        self._data = loadtxt(self.file, dtype=self.dtype, skiprows=self.skiprows)
+        self._data = self._load_data(partids=partids, time_window=time_window,
+                                     dest_cells=dest_cells,
+                                     chunksize=chunksize, cache=cache)
         # set number of particle ids
-        self.nid = self._data['particleid'].max()
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        for n in self.kijnames:
-            self._data[n] -= 1
+        self.nid = 0
+        if self._data.shape[0] > 0:
+            self.nid = self._data['particleid'].max() + 1
+        # build index of the records for each particle
+        self._build_particle_index()
 
         # close the input file
         self.file.close()
@@ -505,8 +801,14 @@ class EndpointFile():
         >>> e1 = endobj.get_data(partid=1)
 
         """
-        idx = self._data['particleid'] == partid
-        ra = self._data[idx]
+        if 0 <= partid < self._offsets.shape[0] - 1:
+            i0, i1 = self._offsets[partid], self._offsets[partid + 1]
+        else:
+            i0, i1 = 0, 0
+        if self._sortidx is None:
+            ra = self._data[i0:i1].copy()
+        else:
+            ra = self._data[self._sortidx[i0:i1]]
         return ra
 
     def get_alldata(self):
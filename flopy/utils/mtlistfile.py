@@ -4,7 +4,10 @@ Support SFT budget also
 
 """
 import os
+import re
+import io
 import sys
+import mmap
 import warnings
 from datetime import timedelta
 import numpy as np
@@ -12,6 +15,23 @@ import numpy as np
 from ..utils.utils_def import totim_to_datetime
 
 
+# block headers of the groundwater and stream (SFT) mass budgets.  Both
+# header lines contain 'component', which is used to find candidate lines
+# with a fast substring search before the patterns are applied.
+_block_re = re.compile(br'>>>for component no\.\s*(\d+)|'
+                       br'stream mass budgets at end of transport step'
+                       br'.*?for component\s+(\d+)',
+                       re.IGNORECASE)
+_block_anchors = (b'COMPONENT', b'component')
+
+# number of bytes that are decoded for a budget block at first
+_block_size = 2 ** 14
+
+
+class _EOFError(Exception):
+    pass
+
+
 class MtListBudget(object):
     """
     MT3D mass budget reader
@@ -30,6 +50,14 @@ class MtListBudget(object):
     >>> incremental, cumulative = mt_list.get_budget()
     >>> df_in, df_out = mt_list.get_dataframes(start_datetime="10-21-2015")
 
+    The list file of a running simulation can be tailed by parsing it
+    again with resume=True, which only reads the budgets that were
+    written since the last call
+
+    >>> mt_list = MtListBudget("my_mt3d.list")
+    >>> df_gw, df_sw = mt_list.parse(species=[1])
+    >>> df_gw, df_sw = mt_list.parse(species=[1], resume=True)
+
     """
 
     def __init__(self, file_name):
@@ -50,10 +78,26 @@ class MtListBudget(object):
         self.sw_budget_key = "STREAM MASS BUDGETS AT END OF TRANSPORT STEP".lower()
         self.time_key = "TOTAL ELAPSED TIME SINCE BEGINNING OF SIMULATION".lower()
 
+        self._reset()
         return
 
+    def _reset(self):
+        self.gw_data = {}
+        self.sw_data = {}
+        self.lcount = 0
+        # number of records that have been read and the columns of each
+        # component
+        self._gw_nrec = {}
+        self._sw_nrec = {}
+        self._gw_cols = {}
+        self._sw_cols = {}
+        # byte offset up to which the file has been parsed and the byte
+        # offset, budget type and component of each parsed budget block
+        self.offset = 0
+        self.index = []
+
     def parse(self, forgive=True, diff=True, start_datetime=None,
-              time_unit='d'):
+              time_unit='d', species=None, resume=False):
         """main entry point for parsing the list file.
 
         Parameters
@@ -67,6 +111,14 @@ class MtListBudget(object):
             Default is None.
         time_unit : str
             str to pass to pandas.to_timedelta.  Default is 'd' (days)
+        species : list of ints
+            component numbers to read.  The budgets of other components are
+            skipped.  Default is None (all components)
+        resume : bool
+            continue parsing from the end of the last complete budget that
+            was read by the previous call, for example to follow the list
+            file of a running simulation.  A budget that is still being
+            written is read by the next call.  Default is False
 
         Returns
         -------
@@ -79,50 +131,19 @@ class MtListBudget(object):
         except:
             print("must use pandas")
             return
-        self.gw_data = {}
-        self.sw_data = {}
-        self.lcount = 0
-        with open(self.file_name) as f:
-            while True:
-                line = self._readline(f)
-
-                if line is None:
-                    break
-                if self.gw_budget_key in line:
-                    if forgive:
-                        try:
-                            self._parse_gw(f, line)
-                        except Exception as e:
-                            warnings.warn(
-                                "error parsing GW mass budget starting on line {0}: {1} ".
-                                format(self.lcount, str(e)))
-                            break
-                    else:
-                        self._parse_gw(f, line)
-                elif self.sw_budget_key in line:
-                    if forgive:
-                        try:
-                            self._parse_sw(f, line)
-                        except Exception as e:
-                            warnings.warn(
-                                "error parsing SW mass budget starting on line {0}: {1} ".
-                                format(self.lcount, str(e)))
-                            break
-                    else:
-                        self._parse_sw(f, line)
+        if not resume:
+            self._reset()
+        self._scan(forgive, species, resume)
 
         if len(self.gw_data) == 0:
             raise Exception("no groundwater budget info found...")
 
-        # trim the lists so that they are all the same lenght
+        # trim the columns so that they are all the same length
         # in case of a read fail
-        min_len = 1e+10
-        for i, lst in self.gw_data.items():
-            min_len = min(min_len, len(lst))
-        for i, lst in self.gw_data.items():
-            self.gw_data[i] = lst[:min_len]
-        df_gw = pd.DataFrame(self.gw_data)
-        df_gw.loc[:, "totim"] = df_gw.pop("totim_1")
+        min_len = min(self._gw_nrec.values())
+        df_gw = pd.DataFrame(self._get_columns(self.gw_data, min_len))
+        df_gw.loc[:, "totim"] = df_gw.pop(
+            "totim_{0}".format(min(self._gw_nrec)))
 
 
         # if cumulative:
@@ -143,15 +164,11 @@ class MtListBudget(object):
             df_gw.index = df_gw.totim
         df_sw = None
         if len(self.sw_data) > 0:
-            # trim the lists so that they are all the same lenght
+            # trim the columns so that they are all the same length
             # in case of a read fail
-            min_len = 1e+10
-            for i, lst in self.sw_data.items():
-                min_len = min(min_len, len(lst))
+            min_len = min(self._sw_nrec.values())
             min_len = min(min_len, df_gw.shape[0])
-            for i, lst in self.sw_data.items():
-                self.sw_data[i] = lst[:min_len]
-            df_sw = pd.DataFrame(self.sw_data)
+            df_sw = pd.DataFrame(self._get_columns(self.sw_data, min_len))
             df_sw.loc[:, "totim"] = df_gw.totim.iloc[:min_len].values
 
             # if cumulative:
@@ -175,6 +192,169 @@ class MtListBudget(object):
                 df_gw.pop(col)
         return df_gw, df_sw
 
+    @staticmethod
+    def _get_columns(data, n):
+        columns = {}
+        for col, arr in data.items():
+            columns[col] = arr[:n]
+        return columns
+
+    def _scan(self, forgive, species, resume):
+        """
+        Find the budget blocks in the memory-mapped list file with a
+        compiled pattern, starting at self.offset, and parse them into
+        preallocated columns.
+
+        """
+        if os.path.getsize(self.file_name) == 0:
+            return
+        with open(self.file_name, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                # index the blocks that will be parsed
+                blocks = []
+                for start, kind, comp in self._find_blocks(mm, self.offset):
+                    if species is not None and comp not in species:
+                        continue
+                    blocks.append((start, kind, comp))
+                self._allocate(blocks)
+
+                for n, (start, kind, comp) in enumerate(blocks):
+                    if n + 1 < len(blocks):
+                        end = blocks[n + 1][0]
+                    else:
+                        end = len(mm)
+                    try:
+                        nbytes = self._parse_block(mm, start, end, kind, comp)
+                    except Exception as e:
+                        if isinstance(e, _EOFError) and resume:
+                            # the budget is still being written
+                            break
+                        if not forgive:
+                            raise
+                        self.lcount += self._line_number(mm, start) - 1
+                        label = 'GW' if kind == 'gw' else 'SW'
+                        warnings.warn(
+                            "error parsing {0} mass budget starting on line "
+                            "{1}: {2} ".format(label, self.lcount, str(e)))
+                        break
+                    self.index.append((start, kind, comp))
+                    self.offset = start + nbytes
+            finally:
+                mm.close()
+
+    def _parse_block(self, mm, start, end, kind, comp):
+        """
+        Parse the budget block that starts at byte offset start.  Only the
+        beginning of the block is decoded, up to the last complete line,
+        which is extended if the budget is longer or can not be parsed.
+
+        """
+        nbytes = _block_size
+        while True:
+            stop = min(start + nbytes, end)
+            if stop < end:
+                # never cut a budget line
+                eol = mm.rfind(b'\n', start, stop)
+                if eol >= start:
+                    stop = eol + 1
+            text = mm[start:stop].decode('ascii', 'replace')
+            try:
+                if kind == 'gw':
+                    return self._parse_gw(text, comp)
+                else:
+                    return self._parse_sw(text, comp)
+            except Exception:
+                if start + nbytes >= end:
+                    raise
+                nbytes *= 4
+
+    @staticmethod
+    def _find_blocks(mm, pos):
+        """
+        Generator of the byte offset, budget type ('gw' or 'sw') and
+        component number of the budget block headers after pos.
+
+        """
+        size = len(mm)
+        found = [mm.find(anchor, pos) for anchor in _block_anchors]
+        while True:
+            hits = [i for i in found if i >= 0]
+            if len(hits) == 0:
+                break
+            i = min(hits)
+            start = mm.rfind(b'\n', pos, i) + 1
+            if start == 0:
+                start = pos
+            end = mm.find(b'\n', i)
+            if end < 0:
+                end = size
+            match = _block_re.search(mm[start:end])
+            if match is not None:
+                if match.group(1) is not None:
+                    yield start, 'gw', int(match.group(1))
+                else:
+                    yield start, 'sw', int(match.group(2))
+            pos = end
+            found = [mm.find(anchor, pos) if 0 <= j < pos else j
+                     for anchor, j in zip(_block_anchors, found)]
+
+    @staticmethod
+    def _line_number(mm, offset):
+        lcount = 1
+        chunk = 2 ** 24
+        for pos in range(0, offset, chunk):
+            lcount += mm[pos:min(pos + chunk, offset)].count(b'\n')
+        return lcount
+
+    def _allocate(self, blocks):
+        """
+        Preallocate the budget columns for the number of budget blocks of
+        each component.
+
+        """
+        self._nalloc = {}
+        for start, kind, comp in blocks:
+            key = (kind, comp)
+            self._nalloc[key] = self._nalloc.get(key, 0) + 1
+        for data, nrec, cols, kind in [
+                (self.gw_data, self._gw_nrec, self._gw_cols, 'gw'),
+                (self.sw_data, self._sw_nrec, self._sw_cols, 'sw')]:
+            for comp, names in cols.items():
+                n = nrec[comp] + self._nalloc.get((kind, comp), 0)
+                for col in names:
+                    data[col] = self._resize(data[col], n)
+
+    @staticmethod
+    def _resize(arr, n):
+        if n <= len(arr):
+            return arr
+        newarr = np.zeros(n, dtype=arr.dtype)
+        if arr.dtype.kind == 'f':
+            newarr[:] = np.nan
+        newarr[:len(arr)] = arr
+        return newarr
+
+    def _store(self, data, nrec, cols, kind, comp, record):
+        """
+        Store the values of a budget block in the preallocated columns.
+
+        """
+        irec = nrec.get(comp, 0)
+        names = cols.setdefault(comp, [])
+        for col, val in record:
+            if col not in data:
+                n = max(irec + self._nalloc.get((kind, comp), 0), irec + 1)
+                if isinstance(val, int):
+                    data[col] = np.zeros(n, dtype=np.int)
+                else:
+                    data[col] = np.full(n, np.nan)
+                names.append(col)
+            elif irec >= len(data[col]):
+                data[col] = self._resize(data[col], irec + 1)
+            data[col][irec] = val
+        nrec[comp] = irec + 1
+
     def _diff(self, df):
         try:
             import pandas as pd
@@ -213,13 +393,19 @@ class MtListBudget(object):
             return None
         return line
 
-    def _parse_gw(self, f, line):
-        raw = line.strip().split()
-        comp = int(raw[-1][:2])
+    def _parse_gw(self, text, comp):
+        """
+        Parse a groundwater mass budget block and return the number of
+        bytes that were read.
+
+        """
+        f = io.StringIO(text)
+        self.lcount = 0
+        line = self._readline(f)
         for _ in range(7):
             line = self._readline(f)
             if line is None:
-                raise Exception(
+                raise _EOFError(
                     "EOF while reading from component header to totim")
         try:
             totim = float(line.split()[-2])
@@ -230,7 +416,7 @@ class MtListBudget(object):
         for _ in range(3):
             line = self._readline(f)
             if line is None:
-                raise Exception("EOF while reading from totim to time step")
+                raise _EOFError("EOF while reading from totim to time step")
         raw = line.strip().split()
         try:
             kper = int(raw[-1])
@@ -239,20 +425,19 @@ class MtListBudget(object):
         except Exception as e:
             raise Exception("error parsing time step info on line {0}: {1}".
                             format(self.lcount, str(e)))
+        record = []
         for lab, val in zip(["totim", "kper", "kstp", "tkstp"],
                             [totim, kper, kstp, tkstp]):
             lab += '_{0}'.format(comp)
-            if lab not in self.gw_data.keys():
-                self.gw_data[lab] = []
-            self.gw_data[lab].append(val)
+            record.append((lab, val))
         for _ in range(4):
             line = self._readline(f)
             if line is None:
-                raise Exception("EOF while reading from time step to budget")
+                raise _EOFError("EOF while reading from time step to budget")
         while True:
             line = self._readline(f)
             if line is None:
-                raise Exception("EOF while reading budget")
+                raise _EOFError("EOF while reading budget")
             elif '-----' in line:
                 break
             try:
@@ -263,9 +448,11 @@ class MtListBudget(object):
             item += "_{0}".format(comp)
             for lab, val in zip(["_in", "_out"], [ival, oval]):
                 iitem = item + lab + "_cum"
-                if iitem not in self.gw_data.keys():
-                    self.gw_data[iitem] = []
-                self.gw_data[iitem].append(val)
+                record.append((iitem, val))
+        self._store(self.gw_data, self._gw_nrec, self._gw_cols, 'gw', comp,
+                    record)
+        # one character was decoded for each byte
+        return f.tell()
 
     def _parse_gw_line(self, line):
         raw = line.lower().split(':')
@@ -274,26 +461,32 @@ class MtListBudget(object):
         oval = -1.0 * float(raw[1].split()[1])
         return item, ival, oval
 
-    def _parse_sw(self, f, line):
+    def _parse_sw(self, text, comp):
+        """
+        Parse a stream mass budget block and return the number of bytes
+        that were read.
+
+        """
+        f = io.StringIO(text)
+        self.lcount = 0
+        line = self._readline(f)
         raw = line.split()
-        comp = int(raw[-1])
         kper = int(raw[-4])
         kstp = int(raw[-7][:-1])
         tkstp = int(raw[-10][:-1])
+        record = []
         for lab, val in zip(["kper", "kstp", "tkstp"], [kper, kstp, tkstp]):
             lab += '_{0}'.format(comp)
-            if lab not in self.gw_data.keys():
-                self.sw_data[lab] = []
-            self.sw_data[lab].append(val)
+            record.append((lab, val))
         for _ in range(4):
             line = self._readline(f)
             if line is None:
-                raise Exception(
+                raise _EOFError(
                     "EOF while reading from time step to SW budget")
         while True:
             line = self._readline(f)
             if line is None:
-                raise Exception("EOF while reading 'in' SW budget")
+                raise _EOFError("EOF while reading 'in' SW budget")
             elif '------' in line:
                 break
             try:
@@ -301,24 +494,22 @@ class MtListBudget(object):
             except Exception as e:
                 raise Exception(
                     "error parsing 'in' SW items on line {0}: {1}".format(
-                        self.lcountm, str(e)))
+                        self.lcount, str(e)))
             item += '_{0}_{1}'.format(comp, 'in')
             for lab, val in zip(['_cum', '_flx'], [cval, fval]):
                 iitem = item + lab
-                if iitem not in self.sw_data.keys():
-                    self.sw_data[iitem] = []
-                self.sw_data[iitem].append(val)
+                record.append((iitem, val))
         line = self._readline(f)
         if line is None:
-            raise Exception("EOF while reading 'in' SW budget")
+            raise _EOFError("EOF while reading 'in' SW budget")
         # in_tots = self._parse_sw_line(line)
         line = self._readline(f)
         if line is None:
-            raise Exception("EOF while reading 'in' SW budget")
+            raise _EOFError("EOF while reading 'in' SW budget")
         while True:
             line = self._readline(f)
             if line is None:
-                raise Exception()
+                raise _EOFError("EOF while reading 'out' SW budget")
             elif '------' in line:
                 break
             try:
@@ -330,13 +521,15 @@ class MtListBudget(object):
             item += '_{0}_{1}'.format(comp, 'out')
             for lab, val in zip(['_cum', '_flx'], [cval, fval]):
                 iitem = item + lab
-                if iitem not in self.sw_data.keys():
-                    self.sw_data[iitem] = []
-                self.sw_data[iitem].append(val)
+                record.append((iitem, val))
         line = self._readline(f)
         if line is None:
-            raise Exception("EOF while reading 'out' SW budget")
+            raise _EOFError("EOF while reading 'out' SW budget")
         # out_tots = self._parse_sw_line(line)
+        self._store(self.sw_data, self._sw_nrec, self._sw_cols, 'sw', comp,
+                    record)
+        # one character was decoded for each byte
+        return f.tell()
 
     def _parse_sw_line(self, line):
         # print(line)
@@ -104,53 +104,123 @@ def get_transmissivities(heads, m,
     T = thick * hk
     return T
 
-def get_water_table(heads, nodata, per_idx=None):
+def _get_heads_by_period(heads, per_idx=None):
+    """Get the selected stress periods and a generator that returns the
+    3-D heads array of each of them in turn, so that only one stress
+    period of heads is in memory at a time.
+
+    Parameters
+    ----------
+    heads : 3 or 4-D np.ndarray or binary head file object
+        Heads array, or a binary head file object such as
+        flopy.utils.HeadFile that is read one time at a time.
+    per_idx : int or sequence of ints
+        stress periods (or times of a head file) to return. If None,
+        returns all stress periods (default).
+
+    Returns
+    -------
+    per_idx : list of ints
+    hds : generator of 3-D np.ndarrays
+    """
+    if hasattr(heads, 'get_times') and hasattr(heads, 'get_data'):
+        times = heads.get_times()
+        nper = len(times)
+
+        def get_heads(per):
+            return heads.get_data(totim=times[per])
+    else:
+        heads = np.asanyarray(heads)
+        if heads.ndim < 4:
+            heads = np.array(heads, ndmin=4)
+        nper = heads.shape[0]
+
+        def get_heads(per):
+            return heads[per]
+
+    if per_idx is None:
+        per_idx = list(range(nper))
+    elif np.isscalar(per_idx):
+        per_idx = [per_idx]
+    return per_idx, (np.asarray(get_heads(per)) for per in per_idx)
+
+
+def _get_result_array(shape, dtype, filename=None):
+    """Allocate the array for the results of all stress periods, either
+    in memory or as a memory-mapped .npy file if filename is specified.
+    """
+    if filename is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(filename, mode='w+', dtype=dtype,
+                                     shape=shape)
+
+
+def _fill_result_array(per_idx, results, filename=None):
+    """Store the result of each stress period in the result array.
+    """
+    result = None
+    for n, res in enumerate(results):
+        if result is None:
+            result = _get_result_array((len(per_idx),) + res.shape,
+                                       res.dtype, filename)
+        result[n] = res
+    if result is None:
+        return np.array([])
+    if filename is not None:
+        result.flush()
+    return np.squeeze(result)
+
+
+def _water_table(hds, nodata):
+    """Get the water table of a 3-D heads array.
+    """
+    valid = hds != nodata
+    # first layer with a valid head in each column
+    k = np.argmax(valid, axis=0)
+    i, j = np.ogrid[:hds.shape[1], :hds.shape[2]]
+    wt = hds[k, i, j]
+    wt[~valid[k, i, j]] = nodata
+    return wt
+
+
+def get_water_table(heads, nodata, per_idx=None, filename=None):
     """Get a 2D array representing the water table
     elevation for each stress period in heads array.
     
     Parameters
     ----------
-    heads : 3 or 4-D np.ndarray
-        Heads array.
+    heads : 3 or 4-D np.ndarray or binary head file object
+        Heads array, or a binary head file object such as
+        flopy.utils.HeadFile, which is read one time at a time.
     nodata : real
         HDRY value indicating dry cells.
     per_idx : int or sequence of ints
         stress periods to return. If None,
         returns all stress periods (default).
+    filename : str
+        If specified, the results are written to a .npy file that is
+        returned as a memory-mapped array, for results that do not
+        fit in memory. (default is None)
     Returns
     -------
     wt : 2 or 3-D np.ndarray of water table elevations
         for each stress period.
     """
-    heads = np.array(heads, ndmin=4)
-    nper, nlay, nrow, ncol = heads.shape
-    if per_idx is None:
-        per_idx = list(range(nper))
-    elif np.isscalar(per_idx):
-        per_idx = [per_idx]
-    wt = []
-    for per in per_idx:
-        wt_per = []
-        for i in range(nrow):
-            for j in range(ncol):
-                for k in range(nlay):
-                    if heads[per, k, i, j] != nodata:
-                        wt_per.append(heads[per, k, i, j])
-                        break
-                    elif k == nlay - 1:
-                        wt_per.append(nodata)
-        assert len(wt_per) == nrow * ncol
-        wt.append(np.reshape(wt_per, (nrow, ncol)))
-    return np.squeeze(wt)
-
-def get_saturated_thickness(heads, m, nodata, per_idx=None):
+    per_idx, hds = _get_heads_by_period(heads, per_idx)
+    return _fill_result_array(per_idx,
+                              (_water_table(h, nodata) for h in hds),
+                              filename)
+
+
+def get_saturated_thickness(heads, m, nodata, per_idx=None, filename=None):
     """Calculates the saturated thickness for each cell from the heads
     array for each stress period.
 
     Parameters
     ----------
-    heads : 3 or 4-D np.ndarray
-        Heads array.
+    heads : 3 or 4-D np.ndarray or binary head file object
+        Heads array, or a binary head file object such as
+        flopy.utils.HeadFile, which is read one time at a time.
     m : flopy.modflow.Modflow object
         Must have a flopy.modflow.ModflowDis object attached.
     nodata : real
@@ -158,39 +228,38 @@ def get_saturated_thickness(heads, m, nodata, per_idx=None):
     per_idx : int or sequence of ints
         stress periods to return. If None,
         returns all stress periods (default).
+    filename : str
+        If specified, the results are written to a .npy file that is
+        returned as a memory-mapped array, for results that do not
+        fit in memory. (default is None)
     Returns
     -------
     sat_thickness : 3 or 4-D np.ndarray
         Array of saturated thickness
     """
-    # internal calculations done on a masked array
-    heads = np.ma.array(heads, ndmin=4, mask=heads == nodata)
     botm = m.dis.botm.array
     thickness = m.dis.thickness.array
-    nper, nlay, nrow, ncol = heads.shape
-    if per_idx is None:
-        per_idx = list(range(nper))
-    elif np.isscalar(per_idx):
-        per_idx = [per_idx]
+    per_idx, hds = _get_heads_by_period(heads, per_idx)
 
-    sat_thickness = []
-    for per in per_idx:
-        hds = heads[per]
-        perthickness = hds - botm
-        conf = perthickness > thickness
-        perthickness[conf] = thickness[conf]
+    def sat_thickness(h):
+        perthickness = np.minimum(h - botm, thickness)
         # convert to nan-filled array, as is expected(!?)
-        sat_thickness.append(perthickness.filled(np.nan))
-    return np.squeeze(sat_thickness)
+        perthickness[h == nodata] = np.nan
+        return perthickness
 
-def get_gradients(heads, m, nodata, per_idx=None):
+    return _fill_result_array(per_idx, (sat_thickness(h) for h in hds),
+                              filename)
+
+
+def get_gradients(heads, m, nodata, per_idx=None, filename=None):
     """Calculates the hydraulic gradients from the heads
     array for each stress period.
 
     Parameters
     ----------
-    heads : 3 or 4-D np.ndarray
-        Heads array.
+    heads : 3 or 4-D np.ndarray or binary head file object
+        Heads array, or a binary head file object such as
+        flopy.utils.HeadFile, which is read one time at a time.
     m : flopy.modflow.Modflow object
         Must have a flopy.modflow.ModflowDis object attached.
     nodata : real
@@ -198,30 +267,28 @@ def get_gradients(heads, m, nodata, per_idx=None):
     per_idx : int or sequence of ints
         stress periods to return. If None,
         returns all stress periods (default).
+    filename : str
+        If specified, the results are written to a .npy file that is
+        returned as a memory-mapped array, for results that do not
+        fit in memory. (default is None)
     Returns
     -------
     grad : 3 or 4-D np.ndarray
         Array of hydraulic gradients
     """
-    # internal calculations done on a masked array
-    heads = np.ma.array(heads, ndmin=4, mask=heads == nodata)
-    nper, nlay, nrow, ncol = heads.shape
-    if per_idx is None:
-        per_idx = list(range(nper))
-    elif np.isscalar(per_idx):
-        per_idx = [per_idx]
+    zcentroids = m.dis.zcentroids
+    per_idx, hds = _get_heads_by_period(heads, per_idx)
 
-    grad = []
-    for per in per_idx:
-        hds = heads[per]
-        zcnt_per = np.ma.array(m.dis.zcentroids, mask=hds.mask)
-        unsat = zcnt_per > hds
-        zcnt_per[unsat] = hds[unsat]
-
-        # apply .diff on data and mask components separately
-        diff_mask = np.diff(hds.mask, axis=0)
-        dz = np.ma.array(np.diff(zcnt_per.data, axis=0), mask=diff_mask)
-        dh = np.ma.array(np.diff(hds.data, axis=0), mask=diff_mask)
-        # convert to nan-filled array, as is expected(!?)
-        grad.append((dh/dz).filled(np.nan))
-    return np.squeeze(grad)
+    def gradients(h):
+        valid = h != nodata
+        zcnt = np.where(valid & (zcentroids > h), h, zcentroids)
+        dz = np.diff(zcnt, axis=0)
+        dh = np.diff(h, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grad = dh / dz
+        # gradients are undefined if either of the cells is dry
+        grad[~(valid[:-1] & valid[1:]) | ~np.isfinite(grad)] = np.nan
+        return grad
+
+    return _fill_result_array(per_idx, (gradients(h) for h in hds),
+                              filename)
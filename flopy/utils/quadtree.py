@@ -0,0 +1,715 @@
+"""
+Module for building layered quadtree grids in memory. The QuadtreeBuilder
+class is used by Gridgen when it is created with native=True and produces
+the same grid information as the gridgen quadtreebuilder and
+grid_to_usgdata commands without writing or reading any files.
+
+"""
+import numpy as np
+from .reference import SpatialReference
+from .gridintersect import GridIntersect, _read_shapefile_features, \
+    _merge_pieces
+
+
+def _split_leaves(leaves, split):
+    """
+    Replace the leaves flagged in split with their four children.
+
+    """
+    lev, i, j = leaves
+    keep = ~split
+    ls, i2, j2 = lev[split] + 1, 2 * i[split], 2 * j[split]
+    lev = np.concatenate([lev[keep]] + [ls] * 4)
+    i = np.concatenate((i[keep], i2, i2, i2 + 1, i2 + 1))
+    j = np.concatenate((j[keep], j2, j2 + 1, j2, j2 + 1))
+    return lev, i, j
+
+
+def _isin(codes, sorted_codes):
+    """
+    Check if codes are in a sorted array of unique codes. This is faster
+    than np.in1d because only the codes that are searched for are sorted.
+
+    """
+    if len(sorted_codes) == 0:
+        return np.zeros(len(codes), dtype=bool)
+    pos = np.searchsorted(sorted_codes, codes)
+    pos = np.minimum(pos, len(sorted_codes) - 1)
+    return sorted_codes[pos] == codes
+
+
+class QuadtreeBuilder(object):
+    """
+    Build a layered quadtree grid from a structured base grid.
+
+    Cells are split into four cells at each level of refinement. A cell is
+    split until it reaches the highest level of the refinement features that
+    intersect it, and cells are then split further until adjacent cells
+    differ by no more than one level of refinement.
+
+    Parameters
+    ----------
+    sr : flopy.utils.reference.SpatialReference
+        Spatial reference of the base grid
+    nlay : int
+        number of layers
+    surfaces : list
+        nlay + 1 arrays of shape (nrow, ncol) (or scalars) with the model
+        top followed by the bottom of each layer
+    surface_interpolation : list of str
+        'REPLICATE' (use the value of the base grid cell) or 'INTERPOLATE'
+        (bilinear interpolation of the base grid cell values) for each of
+        the nlay + 1 surfaces. (default is 'REPLICATE' for all surfaces)
+    smoothing : str
+        'full' to limit the level difference to one for cells that are
+        adjacent in a layer and for cells that overlap in adjacent layers,
+        or 'horizontal' to only limit the difference in a layer.
+        (default is 'full')
+
+    Attributes
+    ----------
+    nodes : int
+        number of cells (available after build)
+    nodelay : np.ndarray
+        number of cells in each layer
+    layer, level, row, column : np.ndarray
+        layer, level of refinement and base grid row and column of each cell
+
+    Notes
+    -----
+    Features are given in the format used by Gridgen: a point is an (x, y)
+    tuple and a line or polygon is a list of parts, each a list of (x, y)
+    vertices. The name of a shapefile can also be used.
+
+    Cells are numbered by layer, then by the row and column of the base grid
+    cell and then in quadtree order (upper left, upper right, lower left,
+    lower right) within a base grid cell.
+
+    Examples
+    --------
+    >>> qtb = QuadtreeBuilder(m.sr, dis.nlay, [dis.top.array] +
+    ...                       list(dis.botm.array))
+    >>> qtb.add_refinement_features(wells, 'point', 3, range(dis.nlay))
+    >>> qtb.build()
+    >>> usgdata = qtb.get_usgdata()
+
+    """
+
+    def __init__(self, sr, nlay, surfaces, surface_interpolation=None,
+                 smoothing='full'):
+        self.sr = sr
+        self.nlay = nlay
+        self.nrow = sr.nrow
+        self.ncol = sr.ncol
+        self.delr = np.asarray(sr.delr, dtype=np.float64)
+        self.delc = np.asarray(sr.delc, dtype=np.float64)
+        self.xedge = np.asarray(sr.xedge, dtype=np.float64)
+        self.yedge = np.asarray(sr.yedge, dtype=np.float64)
+        if len(surfaces) != nlay + 1:
+            raise Exception('Error.  {} surfaces are needed for {} '
+                            'layers'.format(nlay + 1, nlay))
+        self.surfaces = [np.ones((self.nrow, self.ncol), dtype=np.float64) *
+                         np.asarray(s, dtype=np.float64) for s in surfaces]
+        if surface_interpolation is None:
+            surface_interpolation = ['REPLICATE'] * (nlay + 1)
+        surface_interpolation = [s.upper() for s in surface_interpolation]
+        for s in surface_interpolation:
+            if s not in ['REPLICATE', 'INTERPOLATE']:
+                raise Exception('Error.  Unknown surface interpolation '
+                                'method: {}.  Must be INTERPOLATE or '
+                                'REPLICATE'.format(s))
+        self.surface_interpolation = surface_interpolation
+        smoothing = smoothing.lower()
+        if smoothing not in ['full', 'horizontal']:
+            raise Exception('Error.  Unknown smoothing option: {}.  Must be '
+                            'full or horizontal'.format(smoothing))
+        self.smoothing = smoothing
+
+        self._refinement_features = [[] for k in range(nlay)]
+        self._active_domain = [[] for k in range(nlay)]
+        self._intersectors = {}
+        self._codes = {}
+        self.nodes = 0
+        return
+
+    def add_refinement_features(self, features, featuretype, level, layers):
+        """
+        Parameters
+        ----------
+        features : str or list
+            features can be either a string containing the name of a shapefile
+            or it can be a list of points, lines, or polygons
+        featuretype : str
+            Must be either 'point', 'line', or 'polygon'
+        level : int
+            The level of refinement for this features
+        layers : list
+            A list of layers (zero based) for which this refinement features
+            applies.
+
+        Returns
+        -------
+        None
+
+        """
+        featuretype = featuretype.lower()
+        if featuretype not in ['point', 'line', 'polygon']:
+            raise Exception('Unrecognized feature type: {}'.format(
+                featuretype))
+        if isinstance(features, str):
+            features = _read_shapefile_features(features, featuretype)
+        for k in layers:
+            self._refinement_features[k].append((features, featuretype,
+                                                 int(level)))
+        self.nodes = 0
+        return
+
+    def add_active_domain(self, features, layers):
+        """
+        Parameters
+        ----------
+        features : str or list
+            features can be either a string containing the name of a polygon
+            shapefile or it can be a list of polygons. Cells that intersect
+            the polygons are active.
+        layers : list
+            A list of layers (zero based) for which this active domain
+            applies.
+
+        Returns
+        -------
+        None
+
+        """
+        if isinstance(features, str):
+            features = _read_shapefile_features(features, 'polygon')
+        for k in layers:
+            self._active_domain[k].append(features)
+        self.nodes = 0
+        return
+
+    def _get_intersector(self, level):
+        """
+        GridIntersect object for the base grid with each cell split into
+        2**level by 2**level cells.
+
+        """
+        if level not in self._intersectors:
+            n = 2 ** level
+            sr = SpatialReference(delr=np.repeat(self.delr / n, n),
+                                  delc=np.repeat(self.delc / n, n),
+                                  lenuni=self.sr.lenuni, xll=self.sr.xll,
+                                  yll=self.sr.yll, rotation=self.sr.rotation,
+                                  length_multiplier=self.sr.length_multiplier)
+            self._intersectors[level] = GridIntersect(sr)
+        return self._intersectors[level]
+
+    def _feature_codes(self, features, featuretype, level):
+        """
+        Sorted codes (i * ncol + j on the grid of the level) of the cells at
+        a level of refinement that intersect a list of features.
+
+        """
+        key = (id(features), featuretype, level)
+        if key not in self._codes:
+            ix = self._get_intersector(level)
+            ra = ix.intersect(features, featuretype)
+            self._codes[key] = np.unique(ra.row * ix.ncol + ra.column)
+        return self._codes[key]
+
+    def _deep_codes(self, leaves, maxlevel):
+        """
+        For each level, the codes of the cells at that level that contain
+        leaves that are at least two levels finer.
+
+        """
+        lev, i, j = leaves
+        deep = {}
+        di = dj = np.zeros(0, dtype=np.int)
+        for level in range(maxlevel - 2, -1, -1):
+            # parents of the cells in the finer level and the ancestors of
+            # the leaves that are two levels finer
+            idx = lev == level + 2
+            di = np.concatenate((di >> 1, i[idx] >> 2))
+            dj = np.concatenate((dj >> 1, j[idx] >> 2))
+            codes = np.unique(di * (self.ncol << level) + dj)
+            di, dj = np.divmod(codes, self.ncol << level)
+            deep[level] = codes
+        return deep
+
+    def _smooth(self, leaves):
+        """
+        Split cells until the level difference between adjacent cells is
+        no more than one.
+
+        """
+        while True:
+            maxlevel = max([lv[0].max() for lv in leaves])
+            deep = [self._deep_codes(lv, maxlevel) for lv in leaves]
+            nsplit = 0
+            for k in range(self.nlay):
+                lev, i, j = leaves[k]
+                split = np.zeros(len(lev), dtype=bool)
+                for level in range(maxlevel - 1):
+                    idx = np.where(lev == level)[0]
+                    if len(idx) == 0:
+                        continue
+                    nr, nc = self.nrow << level, self.ncol << level
+                    il, jl = i[idx], j[idx]
+                    s = np.zeros(len(idx), dtype=bool)
+                    codes = deep[k][level]
+                    if len(codes) > 0:
+                        for di, dj in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                            ii, jj = il + di, jl + dj
+                            valid = (ii >= 0) & (ii < nr) & (jj >= 0) & \
+                                    (jj < nc)
+                            s |= valid & _isin(ii * nc + jj, codes)
+                    if self.smoothing == 'full':
+                        for kk in (k - 1, k + 1):
+                            if 0 <= kk < self.nlay:
+                                s |= _isin(il * nc + jl, deep[kk][level])
+                    split[idx] = s
+                if split.any():
+                    nsplit += split.sum()
+                    leaves[k] = _split_leaves(leaves[k], split)
+            if nsplit == 0:
+                break
+        return leaves
+
+    def build(self):
+        """
+        Build the quadtree grid.
+
+        Returns
+        -------
+        None
+
+        """
+        ii, jj = np.meshgrid(np.arange(self.nrow), np.arange(self.ncol),
+                             indexing='ij')
+        base = (np.zeros(self.nrow * self.ncol, dtype=np.int), ii.ravel(),
+                jj.ravel())
+        leaves = [base for k in range(self.nlay)]
+        self._codes = {}
+
+        # refine the cells that intersect the refinement features
+        maxlevel = max([0] + [rf[2] for rfk in self._refinement_features
+                              for rf in rfk])
+        for level in range(maxlevel):
+            for k in range(self.nlay):
+                lev, i, j = leaves[k]
+                atlevel = lev == level
+                features = [rf for rf in self._refinement_features[k]
+                            if rf[2] > level]
+                if len(features) == 0 or not atlevel.any():
+                    continue
+                codes = np.unique(np.concatenate(
+                    [self._feature_codes(f, ftype, level)
+                     for f, ftype, flevel in features]))
+                split = atlevel & _isin(i * (self.ncol << level) + j, codes)
+                leaves[k] = _split_leaves(leaves[k], split)
+
+        leaves = self._smooth(leaves)
+
+        # remove cells that are outside of the active domain
+        for k in range(self.nlay):
+            if len(self._active_domain[k]) == 0:
+                continue
+            lev, i, j = leaves[k]
+            keep = np.zeros(len(lev), dtype=bool)
+            for level in np.unique(lev):
+                idx = lev == level
+                codes = i[idx] * (self.ncol << level) + j[idx]
+                for features in self._active_domain[k]:
+                    keep[idx] |= _isin(codes, self._feature_codes(
+                        features, 'polygon', level))
+            leaves[k] = (lev[keep], i[keep], j[keep])
+
+        self._set_cells(leaves)
+        self._set_connections()
+        return
+
+    def _set_cells(self, leaves):
+        """
+        Order the cells and calculate the cell geometry and elevations.
+
+        """
+        maxlevel = max([lv[0].max() for lv in leaves if len(lv[0]) > 0] + [0])
+        layer, level, row, column, ii, jj = [], [], [], [], [], []
+        nodelay = np.zeros(self.nlay, dtype=np.int)
+        for k, (lev, i, j) in enumerate(leaves):
+            r, c = i >> lev, j >> lev
+            il, jl = i - (r << lev), j - (c << lev)
+
+            # quadtree order within each base grid cell
+            si, sj = il << (maxlevel - lev), jl << (maxlevel - lev)
+            zorder = np.zeros(len(lev), dtype=np.int64)
+            for b in range(maxlevel - 1, -1, -1):
+                zorder = zorder * 4 + ((si >> b) & 1) * 2 + ((sj >> b) & 1)
+            idx = np.lexsort((zorder, c, r))
+            nodelay[k] = len(idx)
+            layer.append(np.full(len(idx), k, dtype=np.int))
+            level.append(lev[idx])
+            row.append(r[idx])
+            column.append(c[idx])
+            ii.append(il[idx])
+            jj.append(jl[idx])
+        if nodelay.sum() == 0:
+            raise Exception('Quadtree grid has no active cells.')
+        self.nodelay = nodelay
+        self.nodes = nodelay.sum()
+        self.layer = np.concatenate(layer)
+        self.level = np.concatenate(level)
+        self.row = np.concatenate(row)
+        self.column = np.concatenate(column)
+        self._i = np.concatenate(ii)
+        self._j = np.concatenate(jj)
+        self._maxlevel = maxlevel
+
+        # cell edges in model coordinates; cells on the edge of a base grid
+        # cell use the base grid edge so that shared vertices are identical
+        n = 2 ** self.level
+        dx = self.delr[self.column] / n
+        dy = self.delc[self.row] / n
+        self.xmin = self.xedge[self.column] + self._j * dx
+        self.xmax = np.where(self._j + 1 == n, self.xedge[self.column + 1],
+                             self.xedge[self.column] + (self._j + 1) * dx)
+        self.ymax = self.yedge[self.row] - self._i * dy
+        self.ymin = np.where(self._i + 1 == n, self.yedge[self.row + 1],
+                             self.yedge[self.row] - (self._i + 1) * dy)
+        self.dx = self.xmax - self.xmin
+        self.dy = self.ymax - self.ymin
+        self.area = self.dx * self.dy
+        self.xc = 0.5 * (self.xmin + self.xmax)
+        self.yc = 0.5 * (self.ymin + self.ymax)
+
+        # elevations
+        self.top = self._get_surface(self.layer)
+        self.bot = self._get_surface(self.layer + 1)
+
+        # lookup of the cells in each layer by level, row and column
+        self._ntot = (self.nrow << maxlevel) * (self.ncol << maxlevel)
+        self._keys = []
+        self._nodes = []
+        istart = 0
+        for k in range(self.nlay):
+            istop = istart + nodelay[k]
+            key = self._get_key(self.level[istart:istop],
+                                *self._get_ij(istart, istop))
+            idx = np.argsort(key)
+            self._keys.append(key[idx])
+            self._nodes.append(np.arange(istart, istop)[idx])
+            istart = istop
+        return
+
+    def _get_ij(self, istart=0, istop=None):
+        """
+        Row and column of cells on the grid of their level.
+
+        """
+        lev = self.level[istart:istop]
+        i = (self.row[istart:istop] << lev) + self._i[istart:istop]
+        j = (self.column[istart:istop] << lev) + self._j[istart:istop]
+        return i, j
+
+    def _get_key(self, lev, i, j):
+        return lev * self._ntot + i * (self.ncol << lev) + j
+
+    def _find(self, k, lev, i, j):
+        """
+        Node number of the cells in layer k with a level, row and column.
+        -1 is returned if the cell is not in the grid.
+
+        """
+        valid = (lev >= 0) & (lev <= self._maxlevel)
+        lv = np.where(valid, lev, 0)
+        valid &= (i >= 0) & (i < (self.nrow << lv)) & (j >= 0) & \
+                 (j < (self.ncol << lv))
+        keys = self._keys[k]
+        if len(keys) == 0:
+            return np.full(len(lev), -1, dtype=np.int)
+        key = self._get_key(lv, np.where(valid, i, 0), np.where(valid, j, 0))
+        pos = np.minimum(np.searchsorted(keys, key), len(keys) - 1)
+        found = valid & (keys[pos] == key)
+        return np.where(found, self._nodes[k][pos], -1)
+
+    def _find_leaf(self, k, lev, i, j):
+        """
+        Node number of the cells in layer k that contain cells with a level,
+        row and column.
+
+        """
+        node = np.full(len(i), -1, dtype=np.int)
+        for d in range(lev + 1):
+            idx = node < 0
+            node[idx] = self._find(k, np.full(idx.sum(), lev - d, dtype=np.int),
+                                   i[idx] >> d, j[idx] >> d)
+        return node
+
+    def _get_surface(self, isurf):
+        """
+        Value of a surface for each cell.
+
+        """
+        isurf = np.asarray(isurf)
+        values = np.empty(self.nodes, dtype=np.float64)
+        xcenter = np.asarray(self.sr.xcenter, dtype=np.float64)
+        ycenter = np.asarray(self.sr.ycenter, dtype=np.float64)
+        for s in np.unique(isurf):
+            idx = isurf == s
+            r, c = self.row[idx], self.column[idx]
+            surface = self.surfaces[s]
+            if self.surface_interpolation[s] == 'REPLICATE':
+                values[idx] = surface[r, c]
+                continue
+
+            # bilinear interpolation between base grid cell centers
+            fx = np.interp(self.xc[idx], xcenter, np.arange(self.ncol))
+            fy = np.interp(-self.yc[idx], -ycenter, np.arange(self.nrow))
+            j0 = np.floor(fx).astype(np.int)
+            i0 = np.floor(fy).astype(np.int)
+            j1 = np.minimum(j0 + 1, self.ncol - 1)
+            i1 = np.minimum(i0 + 1, self.nrow - 1)
+            wx, wy = fx - j0, fy - i0
+            values[idx] = (1. - wy) * ((1. - wx) * surface[i0, j0] +
+                                       wx * surface[i0, j1]) + \
+                          wy * ((1. - wx) * surface[i1, j0] +
+                                wx * surface[i1, j1])
+        return values
+
+    def _set_connections(self):
+        """
+        Find the connections between cells and calculate the connection
+        properties in the form written by gridgen grid_to_usgdata.
+
+        """
+        dz = self.top - self.bot
+        src, dst, fldr, cl12, fahl = [], [], [], [], []
+
+        def add(n, m, direction, cn, cm, face):
+            dzavg = 0.5 * (dz[n] + dz[m])
+            fa = face if abs(direction) == 3 else face * dzavg
+            src.extend([n, m])
+            dst.extend([m, n])
+            fldr.extend([np.full(len(n), direction, dtype=np.int),
+                         np.full(len(n), -direction, dtype=np.int)])
+            cl12.extend([cn, cm])
+            fahl.extend([fa, fa])
+
+        istart = 0
+        for k in range(self.nlay):
+            istop = istart + self.nodelay[k]
+            nodes = np.arange(istart, istop)
+            lev = self.level[nodes]
+            i, j = self._get_ij(istart, istop)
+
+            # connections to the cells to the right (fldr = 1) and below
+            # (fldr = -2); the level difference is no more than one
+            for direction, di, dj in ((1, 0, 1), (-2, 1, 0)):
+                ia, ja = i + di, j + dj
+                if direction == 1:
+                    width = self.dy
+                    cl = 0.5 * self.dx
+                    # the two finer cells along the left edge of (ia, ja)
+                    fine = ((2 * ia, 2 * ja), (2 * ia + 1, 2 * ja))
+                else:
+                    width = self.dx
+                    cl = 0.5 * self.dy
+                    fine = ((2 * ia, 2 * ja), (2 * ia, 2 * ja + 1))
+                for lm, im, jm in [(lev, ia, ja),
+                                   (lev - 1, ia >> 1, ja >> 1)] + \
+                        [(lev + 1, fi, fj) for fi, fj in fine]:
+                    m = self._find(k, lm, im, jm)
+                    idx = m >= 0
+                    n, m = nodes[idx], m[idx]
+                    face = np.minimum(width[n], width[m])
+                    add(n, m, direction, cl[n], cl[m], face)
+
+            # connections to the overlapping cells in the layer below
+            # (fldr = -3)
+            if k < self.nlay - 1:
+                below = np.arange(istop, istop + self.nodelay[k + 1])
+                ib, jb = self._get_ij(istop, istop + self.nodelay[k + 1])
+                levb = self.level[below]
+                for d in range(self._maxlevel + 1):
+                    # cells in the layer below that are the same size or
+                    # larger
+                    idx = lev >= d
+                    m = self._find(k + 1, lev[idx] - d, i[idx] >> d,
+                                   j[idx] >> d)
+                    n = nodes[idx][m >= 0]
+                    m = m[m >= 0]
+                    add(n, m, -3, 0.5 * dz[n], 0.5 * dz[m], self.area[n])
+                    if d == 0:
+                        continue
+                    # cells in the layer below that are smaller
+                    idx = levb >= d
+                    n = self._find(k, levb[idx] - d, ib[idx] >> d,
+                                   jb[idx] >> d)
+                    m = below[idx][n >= 0]
+                    n = n[n >= 0]
+                    add(n, m, -3, 0.5 * dz[n], 0.5 * dz[m], self.area[m])
+            istart = istop
+
+        # diagonal entries followed by the connected cells in order
+        nodes = np.arange(self.nodes)
+        src = np.concatenate([nodes] + src)
+        dst = np.concatenate([nodes] + dst)
+        fldr = np.concatenate([np.zeros(self.nodes, dtype=np.int)] + fldr)
+        cl12 = np.concatenate([np.zeros(self.nodes)] + cl12)
+        fahl = np.concatenate([np.zeros(self.nodes)] + fahl)
+        idx = np.argsort(src * (self.nodes + 1) +
+                         np.where(dst == src, 0, dst + 1))
+        self.iac = np.bincount(src, minlength=self.nodes)
+        self.ja = dst[idx]
+        self.fldr = fldr[idx]
+        self.cl12 = cl12[idx]
+        self.fahl = fahl[idx]
+        self.nja = len(self.ja)
+        return
+
+    def get_usgdata(self):
+        """
+        Get the grid information that is written by the gridgen
+        grid_to_usgdata command.
+
+        Returns
+        -------
+        usgdata : dict
+            dictionary with nodes, nodelay, top, bot, area, iac, ja
+            (one-based), fldr, cl12 and fahl
+
+        """
+        usgdata = {'nodes': self.nodes, 'nodelay': self.nodelay.copy(),
+                   'top': self.top.astype(np.float32),
+                   'bot': self.bot.astype(np.float32),
+                   'area': self.area.astype(np.float32),
+                   'iac': self.iac.copy(), 'ja': self.ja + 1,
+                   'fldr': self.fldr.copy(),
+                   'cl12': self.cl12.astype(np.float32),
+                   'fahl': self.fahl.astype(np.float32)}
+        return usgdata
+
+    def get_vertices(self):
+        """
+        Get the vertices of each cell in real-world coordinates.
+
+        Returns
+        -------
+        vertices : np.ndarray
+            array of shape (nodes, 5, 2) with the upper left, upper right,
+            lower right, lower left and upper left vertex of each cell
+
+        """
+        x = np.column_stack((self.xmin, self.xmax, self.xmax, self.xmin,
+                             self.xmin))
+        y = np.column_stack((self.ymax, self.ymax, self.ymin, self.ymin,
+                             self.ymax))
+        x, y = self.sr.transform(x, y)
+        return np.stack((x, y), axis=-1)
+
+    def get_cellxy(self):
+        """
+        Get the cell centers in real-world coordinates.
+
+        Returns
+        -------
+        cellxy : np.ndarray
+            array of shape (nodes, 2)
+
+        """
+        x, y = self.sr.transform(self.xc, self.yc)
+        return np.column_stack((x, y))
+
+    def get_nod_recarray(self):
+        """
+        Get the information that is written to the gridgen qtg.nod file.
+
+        Returns
+        -------
+        node_ra : np.recarray
+            Recarray with zero-based node and layer numbers
+
+        """
+        dt = np.dtype([('node', np.int), ('layer', np.int),
+                       ('x', np.float), ('y', np.float), ('z', np.float),
+                       ('dx', np.float), ('dy', np.float), ('dz', np.float),
+                       ])
+        node_ra = np.recarray(self.nodes, dtype=dt)
+        node_ra['node'] = np.arange(self.nodes)
+        node_ra['layer'] = self.layer
+        cellxy = self.get_cellxy()
+        node_ra['x'] = cellxy[:, 0]
+        node_ra['y'] = cellxy[:, 1]
+        node_ra['z'] = 0.5 * (self.top + self.bot)
+        node_ra['dx'] = self.dx
+        node_ra['dy'] = self.dy
+        node_ra['dz'] = self.top - self.bot
+        return node_ra
+
+    def intersect(self, features, featuretype, layer):
+        """
+        Intersect features with the cells in a layer. The features are
+        intersected with the base grid at the finest level of refinement
+        in the layer and the results are combined for each cell.
+
+        Parameters
+        ----------
+        features : str or list
+            features can be either a string containing the name of a shapefile
+            or it can be a list of points, lines, or polygons
+        featuretype : str
+            Must be either 'point', 'line', or 'polygon'
+        layer : int
+            Layer (zero based) to intersect with.
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray of the intersection properties with zero-based node
+            numbers.
+
+        """
+        featuretype = featuretype.lower()
+        istart = self.nodelay[:layer].sum()
+        istop = istart + self.nodelay[layer]
+        maxlevel = self.level[istart:istop].max()
+        ix = self._get_intersector(maxlevel)
+        ra = ix.intersect(features, featuretype)
+        node = self._find_leaf(layer, maxlevel, ra.row, ra.column)
+        ra = ra[node >= 0]
+        node = node[node >= 0]
+        if featuretype == 'point':
+            dtype = [('nodenumber', np.int), ('pointid', np.int)]
+            result = np.recarray(len(ra), dtype=dtype)
+            result['nodenumber'] = node
+            result['pointid'] = ra.pointid
+        elif featuretype == 'line':
+            dtype = [('nodenumber', np.int), ('arcid', np.int),
+                     ('length', np.float64),
+                     ('starting_distance', np.float64),
+                     ('ending_distance', np.float64)]
+            ifirst, ilast = _merge_pieces(ra.starting_distance,
+                                          ra.ending_distance, node, ra.arcid)
+            result = np.recarray(len(ifirst), dtype=dtype)
+            result['nodenumber'] = node[ifirst]
+            result['arcid'] = ra.arcid[ifirst]
+            result['starting_distance'] = ra.starting_distance[ifirst]
+            result['ending_distance'] = ra.ending_distance[ilast]
+            result['length'] = np.add.reduceat(ra.length, ifirst) \
+                if len(ifirst) > 0 else 0.
+        else:
+            dtype = [('nodenumber', np.int), ('polyid', np.int),
+                     ('area', np.float64), ('fraction', np.float64)]
+            key = ra.polyid * self.nodes + node
+            ukey, first, inv = np.unique(key, return_index=True,
+                                         return_inverse=True)
+            result = np.recarray(len(ukey), dtype=dtype)
+            result['nodenumber'] = node[first]
+            result['polyid'] = ra.polyid[first]
+            result['area'] = np.bincount(inv, weights=ra.area,
+                                         minlength=len(ukey))
+            result['fraction'] = result.area / \
+                                 (self.area[result.nodenumber] *
+                                  self.sr.length_multiplier ** 2)
+        return result
@@ -533,6 +533,8 @@ class SpatialReference(object):
         self._ycentergrid = None
         self._xcentergrid = None
         self._vertices = None
+        self._kdtree = None
+        self._delaunay = None
         return
 
     @property
@@ -913,23 +915,47 @@ class SpatialReference(object):
                               epsg=epsg, prj=prj)
 
     def get_vertices(self, i, j):
-        """Get vertices for a single cell or sequence if i, j locations."""
-        pts = []
+        """Get vertices for a single cell or sequence if i, j locations.
+
+        Parameters
+        ----------
+        i : int or sequence of ints
+            zero-based row(s)
+        j : int or sequence of ints
+            zero-based column(s)
+
+        Returns
+        -------
+        vertices : list or numpy.ndarray
+            list of the five [x, y] vertices (closed ring) of a single
+            cell, or a numpy.ndarray with a shape of (ncells, 5, 2) with
+            the vertices of each cell if i and j are sequences.
+
+        """
         xgrid, ygrid = self.xgrid, self.ygrid
-        pts.append([xgrid[i, j], ygrid[i, j]])
-        pts.append([xgrid[i + 1, j], ygrid[i + 1, j]])
-        pts.append([xgrid[i + 1, j + 1], ygrid[i + 1, j + 1]])
-        pts.append([xgrid[i, j + 1], ygrid[i, j + 1]])
-        pts.append([xgrid[i, j], ygrid[i, j]])
         if np.isscalar(i):
+            pts = []
+            pts.append([xgrid[i, j], ygrid[i, j]])
+            pts.append([xgrid[i + 1, j], ygrid[i + 1, j]])
+            pts.append([xgrid[i + 1, j + 1], ygrid[i + 1, j + 1]])
+            pts.append([xgrid[i, j + 1], ygrid[i, j + 1]])
+            pts.append([xgrid[i, j], ygrid[i, j]])
             return pts
-        else:
-            vrts = np.array(pts).transpose([2, 0, 1])
-            return [v.tolist() for v in vrts]
+        i = np.asarray(i, dtype=np.int)
+        j = np.asarray(j, dtype=np.int)
+        vrts = np.empty((i.shape[0], 5, 2), dtype=np.float)
+        for iv, (di, dj) in enumerate([(0, 0), (1, 0), (1, 1), (0, 1),
+                                       (0, 0)]):
+            vrts[:, iv, 0] = xgrid[i + di, j + dj]
+            vrts[:, iv, 1] = ygrid[i + di, j + dj]
+        return vrts
 
     def get_rc(self, x, y):
         """Return the row and column of a point or sequence of points
-        in real-world coordinates.
+        in real-world coordinates. The points are located using the cell
+        edges (searchsorted) so that large batches of points can be
+        located on large grids. Points outside of the grid are assigned
+        to the closest row and column.
 
         Parameters
         ----------
@@ -941,14 +967,24 @@ class SpatialReference(object):
         r : row or sequence of rows (zero-based)
         c : column or sequence of columns (zero-based)
         """
-        if np.isscalar(x):
-            c = (np.abs(self.xcentergrid[0] - x)).argmin()
-            r = (np.abs(self.ycentergrid[:, 0] - y)).argmin()
-        else:
-            xcp = np.array([self.xcentergrid[0]] * (len(x)))
-            ycp = np.array([self.ycentergrid[:, 0]] * (len(x)))
-            c = (np.abs(xcp.transpose() - x)).argmin(axis=0)
-            r = (np.abs(ycp.transpose() - y)).argmin(axis=0)
+        scalar = np.isscalar(x)
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+
+        # convert the points to model coordinates, which accounts for the
+        # offset, rotation, and length multiplier of the grid
+        x, y = self.transform(x, y, inverse=True)
+
+        # locate the points using the cell edges. Points outside of the
+        # grid are assigned to the closest row or column.
+        xedge = self.xedge
+        yedge = self.yedge
+        c = np.searchsorted(xedge, x, side='left') - 1
+        r = np.searchsorted(-yedge, -y, side='left') - 1
+        c = np.clip(c, 0, self.ncol - 1)
+        r = np.clip(r, 0, self.nrow - 1)
+        if scalar:
+            return r[0], c[0]
         return r, c
 
     def get_grid_map_plotter(self):
@@ -1235,34 +1271,29 @@ class SpatialReference(object):
 
     @property
     def vertices(self):
-        """Returns a list of vertices for"""
+        """Returns a (nrow * ncol, 5, 2) array with the vertices of every
+        cell in the grid (row major order)"""
         if self._vertices is None:
             self._set_vertices()
         return self._vertices
 
     def _set_vertices(self):
         """populate vertices for the whole grid"""
-        jj, ii = np.meshgrid(range(self.ncol), range(self.nrow))
-        jj, ii = jj.ravel(), ii.ravel()
-        self._vertices = self.get_vertices(ii, jj)
-        # vrts = np.array(self.get_vertices(ii, jj)).transpose([2, 0, 1])
-        # self._vertices = [v.tolist() for v in vrts]  # conversion to lists
-
-        """
-        code above is 3x faster
         xgrid, ygrid = self.xgrid, self.ygrid
-        ij = list(map(list, zip(xgrid[:-1, :-1].ravel(), ygrid[:-1, :-1].ravel())))
-        i1j = map(list, zip(xgrid[1:, :-1].ravel(), ygrid[1:, :-1].ravel()))
-        i1j1 = map(list, zip(xgrid[1:, 1:].ravel(), ygrid[1:, 1:].ravel()))
-        ij1 = map(list, zip(xgrid[:-1, 1:].ravel(), ygrid[:-1, 1:].ravel()))
-        self._vertices = np.array(map(list, zip(ij, i1j, i1j1, ij1, ij)))
-        """
+        vrts = np.empty((self.nrow, self.ncol, 5, 2), dtype=np.float)
+        vrts[:, :, 0, 0], vrts[:, :, 0, 1] = xgrid[:-1, :-1], ygrid[:-1, :-1]
+        vrts[:, :, 1, 0], vrts[:, :, 1, 1] = xgrid[1:, :-1], ygrid[1:, :-1]
+        vrts[:, :, 2, 0], vrts[:, :, 2, 1] = xgrid[1:, 1:], ygrid[1:, 1:]
+        vrts[:, :, 3, 0], vrts[:, :, 3, 1] = xgrid[:-1, 1:], ygrid[:-1, 1:]
+        vrts[:, :, 4] = vrts[:, :, 0]
+        self._vertices = vrts.reshape((-1, 5, 2))
 
     def interpolate(self, a, xi, method='nearest'):
         """
-        Use the griddata method to interpolate values from an array onto the
-        points defined in xi.  For any values outside of the grid, use
-        'nearest' to find a value for them.
+        Interpolate values from an array onto the points defined in xi.
+        For any values outside of the grid, use 'nearest' to find a value
+        for them. The KD-tree and triangulation of the cell centers are
+        built on the first call and reused for later interpolations.
 
         Parameters
         ----------
@@ -1282,27 +1313,74 @@ class SpatialReference(object):
 
         """
         try:
-            from scipy.interpolate import griddata
+            from scipy.interpolate import LinearNDInterpolator, \
+                CloughTocher2DInterpolator
         except:
             print('scipy not installed\ntry pip install scipy')
             return None
 
-        # Create a 2d array of points for the grid centers
+        if method not in ('linear', 'nearest', 'cubic'):
+            raise ValueError('Unknown interpolation method {}'.format(method))
+
+        # Create a 2d array of points for the xi points
+        if isinstance(xi, tuple):
+            shape = np.broadcast(*xi).shape
+            xi = np.column_stack([np.broadcast_to(v, shape).ravel()
+                                  for v in xi])
+        else:
+            xi = np.asarray(xi, dtype=np.float64)
+            shape = xi.shape[:-1]
+            xi = xi.reshape((-1, 2))
+        values = np.asarray(a).ravel()
+
+        # nearest values are used directly for method='nearest' and to
+        # replace nan's for points outside of the triangulation for
+        # method='linear' and 'cubic'
+        tree = self._get_kdtree()
+        bn = values[tree.query(xi)[1]]
+        if method == 'nearest':
+            b = bn
+        else:
+            tri = self._get_delaunay()
+            if method == 'linear':
+                ip = LinearNDInterpolator(tri, values, fill_value=np.nan)
+            else:
+                ip = CloughTocher2DInterpolator(tri, values,
+                                                fill_value=np.nan)
+            b = ip(xi)
+            idx = np.isnan(b)
+            b[idx] = bn[idx]
+
+        return b.reshape(shape)
+
+    def _get_center_points(self):
+        """
+        Get a (ncol * nrow, 2) array with the cell centers of the grid.
+        """
         points = np.empty((self.ncol * self.nrow, 2))
         points[:, 0] = self.xcentergrid.flatten()
         points[:, 1] = self.ycentergrid.flatten()
+        return points
 
-        # Use the griddata function to interpolate to the xi points
-        b = griddata(points, a.flatten(), xi, method=method, fill_value=np.nan)
-
-        # if method is linear or cubic, then replace nan's with a value
-        # interpolated using nearest
-        if method != 'nearest':
-            bn = griddata(points, a.flatten(), xi, method='nearest')
-            idx = np.isnan(b)
-            b[idx] = bn[idx]
+    def _get_kdtree(self):
+        """
+        Get a KD-tree of the cell centers. The KD-tree is built once and
+        reused until the spatial reference is changed.
+        """
+        if self._kdtree is None:
+            from scipy.spatial import cKDTree
+            self._kdtree = cKDTree(self._get_center_points())
+        return self._kdtree
 
-        return b
+    def _get_delaunay(self):
+        """
+        Get a Delaunay triangulation of the cell centers. The triangulation
+        is built once and reused until the spatial reference is changed.
+        """
+        if self._delaunay is None:
+            from scipy.spatial import Delaunay
+            self._delaunay = Delaunay(self._get_center_points())
+        return self._delaunay
 
     def get_2d_vertex_connectivity(self):
         """
@@ -1656,8 +1734,151 @@ class SpatialReferenceUnstructured(SpatialReference):
 
     def __setattr__(self, key, value):
         super(SpatialReference, self).__setattr__(key, value)
+        # reset the cell locator if the grid geometry changes
+        if key in ('xc', 'yc', 'verts', 'iverts'):
+            super(SpatialReference, self).__setattr__('_kdtree', None)
+            super(SpatialReference, self).__setattr__('_cellverts', None)
         return
 
+    def intersect(self, x, y, chunksize=100000):
+        """
+        Get the cells that contain a point or sequence of points. Points
+        outside of the extent of the grid are dropped first. Candidate
+        cells are found with a KD-tree of the cell centers, which is built
+        on the first call and reused, and then checked with a vectorized
+        point-in-polygon test.
+
+        Parameters
+        ----------
+        x : scalar or sequence of x coordinates
+        y : scalar or sequence of y coordinates
+        chunksize : int
+            number of points (times the number of candidate cells) that
+            are located at a time (default is 100000)
+
+        Returns
+        -------
+        node : int or numpy.ndarray
+            zero-based cell number (the position in iverts) of the cell
+            that contains each point. -1 is returned for points that are
+            not in a cell.
+
+        """
+        scalar = np.isscalar(x)
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        ncells = len(self.iverts)
+        node = np.full(x.shape, -1, dtype=np.int)
+
+        # points outside of the extent of the grid are not in a cell
+        xv, yv, nv = self._get_cell_vertices()
+        points = np.flatnonzero((xv.min() <= x) & (x <= xv.max()) &
+                                (yv.min() <= y) & (y <= yv.max()))
+
+        try:
+            tree = self._get_cell_kdtree()
+        except ImportError:
+            tree = None
+        if tree is not None:
+            # a point can only be in a cell with a center that is not
+            # farther away than the farthest vertex of any cell from its
+            # center.  points that are not in one of the k nearest cells
+            # and have k cells within that distance are checked again
+            # with more candidates
+            n = len(self.iverts)
+            xc = np.asarray(self.xc)[:n, None]
+            yc = np.asarray(self.yc)[:n, None]
+            rmax = np.sqrt((xv - xc) ** 2 + (yv - yc) ** 2).max()
+            rmax *= 1. + 1.e-9
+            k = min(8, ncells)
+            while points.shape[0] > 0:
+                remaining = []
+                step = max(chunksize // k, 1)
+                for i0 in range(0, points.shape[0], step):
+                    pts = points[i0:i0 + step]
+                    candidates = tree.query(np.column_stack((x[pts],
+                                                             y[pts])),
+                                            k=k, distance_upper_bound=rmax)[1]
+                    candidates = candidates.reshape((-1, k))
+                    valid = candidates < ncells
+                    inside = self._point_in_cells(
+                        x[pts, None], y[pts, None],
+                        np.where(valid, candidates, 0)) & valid
+                    found = inside.any(axis=1)
+                    first = inside.argmax(axis=1)
+                    idx = np.arange(candidates.shape[0])
+                    node[pts[found]] = candidates[idx, first][found]
+                    remaining.append(pts[~found & valid[:, -1]])
+                if k == ncells:
+                    break
+                points = np.concatenate(remaining)
+                k = min(4 * k, ncells)
+        elif points.shape[0] > 0:
+            # check the points against every cell with a bounding box
+            # that contains the point
+            xmin, xmax = xv.min(axis=1), xv.max(axis=1)
+            ymin, ymax = yv.min(axis=1), yv.max(axis=1)
+            step = max(chunksize // ncells, 1)
+            for i0 in range(0, points.shape[0], step):
+                pts = points[i0:i0 + step]
+                ipt, cells = np.nonzero((xmin <= x[pts, None]) &
+                                        (x[pts, None] <= xmax) &
+                                        (ymin <= y[pts, None]) &
+                                        (y[pts, None] <= ymax))
+                inside = self._point_in_cells(x[pts][ipt], y[pts][ipt],
+                                              cells)
+                # lowest cell number that contains each point
+                ipt, first = np.unique(ipt[inside], return_index=True)
+                node[pts[ipt]] = cells[inside][first]
+
+        if scalar:
+            return node[0]
+        return node
+
+    def _get_cell_kdtree(self):
+        """
+        Get a KD-tree of the cell centers (of the first layer if the
+        grid is layered).
+        """
+        if getattr(self, '_kdtree', None) is None:
+            from scipy.spatial import cKDTree
+            n = len(self.iverts)
+            points = np.column_stack((np.asarray(self.xc)[:n],
+                                      np.asarray(self.yc)[:n]))
+            self._kdtree = cKDTree(points)
+        return self._kdtree
+
+    def _get_cell_vertices(self):
+        """
+        Get (ncells, maxnv) arrays with the x and y coordinates of the
+        cell vertices and the number of vertices in each cell. Cells with
+        fewer than maxnv vertices are padded with their last vertex.
+        """
+        if getattr(self, '_cellverts', None) is None:
+            nv = np.array([len(iv) for iv in self.iverts], dtype=np.int)
+            iv = np.empty((len(self.iverts), nv.max()), dtype=np.int)
+            for i, ivc in enumerate(self.iverts):
+                iv[i, :nv[i]] = ivc
+                iv[i, nv[i]:] = ivc[-1]
+            verts = np.asarray(self.verts)
+            self._cellverts = (verts[iv, 0], verts[iv, 1], nv)
+        return self._cellverts
+
+    def _point_in_cells(self, x, y, cells):
+        """
+        Ray casting point-in-polygon test of points (x, y) against the
+        cells, which is vectorized over points and cells.
+        """
+        xv, yv, nv = self._get_cell_vertices()
+        x0, y0 = xv[cells], yv[cells]
+        x1, y1 = np.roll(x0, -1, axis=-1), np.roll(y0, -1, axis=-1)
+        x = np.asarray(x)[..., None]
+        y = np.asarray(y)[..., None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crosses = ((y0 > y) != (y1 > y)) & \
+                      (x < (x1 - x0) * (y - y0) / (y1 - y0) + x0)
+        return crosses.sum(axis=-1) % 2 == 1
+
     def get_extent(self):
         """
         Get the extent of the grid
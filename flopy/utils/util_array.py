@@ -2164,6 +2164,21 @@ class Util2d(object):
             raise Exception("Util2d.get_file_entry() error: " + \
                             "unrecognized 'how':{0}".format(how))
 
+    def write_file_entry(self, f):
+        """
+        Write the file entry of the array to an open file.  Template arrays
+        (flopy.pest.tplarray.Util2dTpl) have the same method, so package
+        writers can write both kinds of arrays.
+
+        Parameters
+        ----------
+        f : file object
+            open file
+
+        """
+        f.write(self.get_file_entry())
+        return
+
     @property
     def string(self):
         """
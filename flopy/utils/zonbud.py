@@ -6,11 +6,6 @@ from itertools import groupby
 from collections import OrderedDict
 from ..utils.utils_def import totim_to_datetime
 
-try:
-    import pandas as pd
-except:
-    pass
-
 
 class ZoneBudget(object):
     """